@@ -0,0 +1,124 @@
+"""
+JSON benchmark baselines: save the metrics of a run and compare a later run with them.
+
+A baseline file holds the run's metadata (commit, Python, platform, settings)
+and a flat dict of metrics per scenario. compare() flags a metric as a
+regression when it is worse than the baseline by more than its tolerance:
+lower is better for latency, memory, CPU and calls, higher for throughput.
+
+Usage:
+    save_baseline(path, scenarios, settings={'time_scale': 0.01})
+    regressions = compare(load_baseline(path)['scenarios'], scenarios)
+"""
+
+import json
+import platform
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Relative tolerance and direction of each compared metric
+METRICS = {
+    'docs_per_sec': {'tolerance': 0.15, 'higher_is_better': True},
+    'latency_p50': {'tolerance': 0.20, 'higher_is_better': False},
+    'latency_p95': {'tolerance': 0.25, 'higher_is_better': False},
+    'latency_p99': {'tolerance': 0.30, 'higher_is_better': False},
+    'peak_rss_mb': {'tolerance': 0.15, 'higher_is_better': False},
+    'cpu_ms_per_doc': {'tolerance': 0.30, 'higher_is_better': False},
+    'bedrock_calls_per_doc': {'tolerance': 0.0, 'higher_is_better': False},
+}
+
+
+@dataclass
+class Regression:
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline if self.baseline else float('inf')
+
+    def __str__(self) -> str:
+        return (f"{self.scenario}: {self.metric} {self.baseline:.4g} -> {self.current:.4g} "
+                f"({self.change:+.1%})")
+
+
+def git_commit() -> Optional[str]:
+    """Short hash of HEAD (with -dirty for local changes), None outside git."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_baseline(path: Path, scenarios: Dict[str, Dict[str, Any]], settings: Dict[str, Any] = None) -> None:
+    """
+    Write a baseline file.
+
+    Args:
+        path: Output file
+        scenarios: Metrics per scenario name
+        settings: Benchmark settings the metrics depend on
+    """
+    baseline = {
+        'meta': {
+            'commit': git_commit(),
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'settings': settings or {},
+        },
+        'scenarios': scenarios,
+    }
+    Path(path).write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def compare(baseline: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]],
+            metrics: Dict[str, Dict[str, Any]] = None, scale: float = 1.0) -> List[Regression]:
+    """
+    Compare scenario metrics with a baseline.
+
+    Scenarios or metrics missing on either side are skipped.
+
+    Args:
+        baseline: Metrics per scenario of the baseline
+        current: Metrics per scenario of this run
+        metrics: Tolerance and direction per metric (default METRICS)
+        scale: Multiplies every tolerance (noisy machines)
+
+    Returns:
+        list: Regressions, in scenario order
+    """
+    metrics = metrics or METRICS
+    regressions = []
+    for scenario, values in current.items():
+        reference = baseline.get(scenario)
+        if reference is None:
+            continue
+        for metric, rule in metrics.items():
+            old, new = reference.get(metric), values.get(metric)
+            if old is None or new is None:
+                continue
+            allowed = rule['tolerance'] * scale
+            if rule['higher_is_better']:
+                worse = new < old * (1 - allowed)
+            else:
+                worse = new > old * (1 + allowed) + 1e-9
+            if worse:
+                regressions.append(Regression(scenario, metric, old, new))
+    return regressions
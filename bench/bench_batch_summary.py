@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark cleaning and serializing a batch summary with 500 documents.
+
+Each document in detailed_results embeds a whole extraction payload: a nested
+structure of extracted fields plus the text extracted from the PDF, as
+save_batch_summary receives them. A share of the documents carry PyPDF/Textract
+noise (form feeds, NEL, double spaces) so some strings do change.
+
+Compares:
+  legacy    recursive clean_dict_for_json (copies everything) + json.dumps
+  current   copy-on-write clean_dict_for_json + json.dumps
+  streamed  iter_json_chunks into a spooled file (as save_batch_summary does)
+
+Time is the best of --repeat runs; memory is the tracemalloc peak above the
+input, in a separate run.
+
+Usage:
+    python bench/bench_batch_summary.py [--documents 500] [--text-kb 20] [--dirty 0.2] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'functions'))
+
+from shared.report_generator import clean_dict_for_json, iter_json_chunks
+from shared.text_utils import clean_text_for_json
+
+WORDS = ("razón social NIT 900.123.456-7 Cámara de Comercio de Bogotá representante legal "
+         "matrícula mercantil sociedad anónima accionistas participación año 2023 señor").split()
+
+
+def legacy_clean_dict_for_json(obj):
+    """clean_dict_for_json as previously implemented."""
+    if isinstance(obj, dict):
+        return {key: legacy_clean_dict_for_json(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [legacy_clean_dict_for_json(item) for item in obj]
+    elif isinstance(obj, str):
+        return clean_text_for_json(obj)
+    else:
+        return obj
+
+
+def build_summary(documents: int, text_kb: int, dirty: float, seed: int = 7):
+    rng = random.Random(seed)
+
+    def text(words: int, noisy: bool) -> str:
+        separators = [' ', ' ', ' ', '  ', '\x0c', '\n'] if noisy else [' ']
+        return ''.join(rng.choice(WORDS) + rng.choice(separators) for _ in range(words)).strip()
+
+    results = []
+    for i in range(documents):
+        noisy = rng.random() < dirty
+        shareholders = [{'name': text(3, noisy), 'id_number': str(rng.randint(10**7, 10**9)),
+                         'percentage': round(rng.random() * 100, 2)} for _ in range(rng.randint(2, 8))]
+        results.append({
+            'success': True,
+            'category': rng.choice(['ACC', 'CECRL', 'CERL', 'RUB', 'RUT']),
+            'document_number': str(900000000 + i),
+            'path': f"s3://bucket/par-servicios-poc/CERL/{900000000 + i}/documento_{i}.pdf",
+            'extraction_result': {
+                'companyName': text(4, noisy),
+                'documentType': 'CERL',
+                'legalRepresentatives': [{'name': text(3, noisy), 'role': text(2, noisy)}],
+                'shareholders': shareholders,
+                'comments': text(40, noisy),
+            },
+            'model_info': {'model_id': 'us.amazon.nova-pro-v1:0', 'input_tokens': rng.randint(1000, 9000),
+                           'output_tokens': rng.randint(200, 900), 'processing_time': rng.random() * 10},
+            'extracted_text': text(text_kb * 1024 // 9, noisy),
+        })
+    return {
+        'batch_summary': {'process_type': 'extraction', 'total_documents': documents},
+        'by_category': {},
+        'batch_metadata': {'processing_mode': 'simplified_processing'},
+        'detailed_results': results,
+    }
+
+
+def run_legacy(summary):
+    return len(json.dumps(legacy_clean_dict_for_json(summary), indent=2, ensure_ascii=False).encode('utf-8'))
+
+
+def run_current(summary):
+    return len(json.dumps(clean_dict_for_json(summary), indent=2, ensure_ascii=False).encode('utf-8'))
+
+
+def run_streamed(summary):
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as body:
+        for chunk in iter_json_chunks(summary):
+            body.write(chunk.encode('utf-8'))
+        return body.tell()
+
+
+def measure(func, summary, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = func(summary)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(summary)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--documents', type=int, default=500)
+    parser.add_argument('--text-kb', type=int, default=20, help='Extracted text per document')
+    parser.add_argument('--dirty', type=float, default=0.2, help='Share of documents with noisy text')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    summary = build_summary(args.documents, args.text_kb, args.dirty)
+    expected = legacy_clean_dict_for_json(summary)
+    assert clean_dict_for_json(summary) == expected
+    assert ''.join(iter_json_chunks(summary)) == json.dumps(expected, indent=2, ensure_ascii=False)
+
+    print(f"Batch summary: {args.documents} documents, {args.text_kb} KB text each, {args.dirty:.0%} noisy")
+    print(f"  {'variant':10s} {'time ms':>9s} {'peak MB':>9s} {'JSON MB':>9s}")
+    for label, func in (('legacy', run_legacy), ('current', run_current), ('streamed', run_streamed)):
+        elapsed, peak, size = measure(func, summary, args.repeat)
+        print(f"  {label:10s} {elapsed * 1000:9.1f} {peak / 2**20:9.1f} {size / 2**20:9.1f}")
+
+    start = time.perf_counter()
+    legacy_clean_dict_for_json(summary)
+    legacy_clean = time.perf_counter() - start
+    start = time.perf_counter()
+    clean_dict_for_json(summary)
+    current_clean = time.perf_counter() - start
+    print(f"\n  clean only: legacy {legacy_clean * 1000:.1f} ms, current {current_clean * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark clean_text_for_json on synthetic Textract-like text from 10 KB to 10 MB.
+
+Compares the previous implementation (five str.replace passes, then
+unicodedata.category for every character) with the current one and with the
+streaming iter_clean_text over 64 KB chunks. Every run checks that all three
+produce identical output. Three texts: Spanish (non-ASCII), ASCII-only and
+"dirty" Spanish with form feeds, NEL, zero-width spaces and NULs, as found in
+Textract and PyPDF output.
+
+Usage:
+    python bench/bench_clean_text.py [--sizes 10K,100K,1M,10M] [--repeat 3] [--chunk 65536]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'functions'))
+
+from shared.text_utils import clean_text_for_json, iter_clean_text
+
+WORDS = ("razón social NIT 900.123.456-7 Cámara de Comercio de Bogotá representante legal "
+         "matrícula mercantil sociedad anónima accionistas participación año 2023 señor").split()
+NOISE = ['\x0c', '\x85', '\u200b', '\x00', '\u2028', '\t', '\r\n']
+
+
+def legacy_clean_text_for_json(text):
+    """clean_text_for_json as previously implemented."""
+    if not isinstance(text, str):
+        return text
+    text = text.replace('\u2028', ' ')
+    text = text.replace('\u2029', ' ')
+    text = text.replace('\u000B', ' ')
+    text = text.replace('\u000C', ' ')
+    text = text.replace('\u0085', ' ')
+    text = ''.join(char for char in text if unicodedata.category(char) not in ['Cc', 'Cf'] or char in ['\n', '\r', '\t'])
+    return ' '.join(text.split())
+
+
+def build_text(size: int, kind: str, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    pieces, length = [], 0
+    while length < size:
+        word = rng.choice(WORDS)
+        if kind == 'ascii':
+            word = word.encode('ascii', 'ignore').decode('ascii')
+        separator = rng.choice(NOISE) if kind == 'dirty' and rng.random() < 0.05 else ' '
+        pieces.append(word + separator)
+        length += len(word) + 1
+    return ''.join(pieces)[:size]
+
+
+def parse_size(value: str) -> int:
+    units = {'K': 1024, 'M': 1024 * 1024}
+    return int(float(value[:-1]) * units[value[-1].upper()]) if value[-1].upper() in units else int(value)
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='10K,100K,1M,10M')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--chunk', type=int, default=64 * 1024)
+    args = parser.parse_args()
+
+    print(f"{'text':8s} {'size':>8s} {'legacy ms':>10s} {'current ms':>11s} {'stream ms':>10s} {'speedup':>8s}")
+    for kind in ('spanish', 'ascii', 'dirty'):
+        for label in args.sizes.split(','):
+            text = build_text(parse_size(label), kind)
+            chunks = [text[i:i + args.chunk] for i in range(0, len(text), args.chunk)]
+
+            expected = legacy_clean_text_for_json(text)
+            assert clean_text_for_json(text) == expected, f"{kind} {label}: output differs"
+            assert ''.join(iter_clean_text(chunks)) == expected, f"{kind} {label}: streaming output differs"
+
+            legacy = best_of(lambda: legacy_clean_text_for_json(text), args.repeat)
+            current = best_of(lambda: clean_text_for_json(text), args.repeat)
+            stream = best_of(lambda: sum(1 for _ in iter_clean_text(chunks)), args.repeat)
+            print(f"{kind:8s} {label:>8s} {legacy * 1000:10.2f} {current * 1000:11.2f} {stream * 1000:10.2f} "
+                  f"{legacy / current:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
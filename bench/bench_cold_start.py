@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Cold-start import regression benchmark for the three Lambda handlers.
+
+Profiles the import of each handler in fresh interpreters (see import_profiler)
+and compares the median wall-clock import time with its budget in
+bench/cold_start_budget.json. Exits with status 1 when a handler is over
+budget or imports a module listed as deferred for it (a module that must
+only be imported on first use). Budgets are for a developer laptop or CI
+runner; Lambda with little memory has less CPU, so cold starts there are slower.
+
+Usage:
+    python bench/bench_cold_start.py [--runs 5] [--budget bench/cold_start_budget.json]
+        [--handler extraction-scoring] [--scale 1.5] [--report]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from import_profiler import FUNCTIONS_DIR, profile_handler
+
+DEFAULT_BUDGET = Path(__file__).resolve().parent / 'cold_start_budget.json'
+
+
+def check_handler(name: str, budget: dict, runs: int, scale: float, report: bool) -> bool:
+    profile = profile_handler(FUNCTIONS_DIR / name / 'src', runs=runs)
+    if report:
+        print(profile.report(15))
+        print()
+
+    limit_ms = budget['import_ms'] * scale
+    imported = {record.module for record in profile.records}
+    eager = sorted(module for module in budget.get('deferred', []) if module in imported)
+
+    within = profile.wall_median_ms <= limit_ms and not eager
+    status = 'OK  ' if within else 'FAIL'
+    print(f"{status} {name:22s} median {profile.wall_median_ms:7.1f} ms  budget {limit_ms:7.1f} ms  "
+          f"({len(profile.records)} modules)")
+    for module in eager:
+        print(f"     {module} must be imported on first use, not at cold start")
+    return within
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--budget', type=Path, default=DEFAULT_BUDGET)
+    parser.add_argument('--handler', action='append', help='Only check these handlers')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget (slow machines)')
+    parser.add_argument('--report', action='store_true', help='Print the per-module import report')
+    args = parser.parse_args()
+
+    budgets = json.loads(args.budget.read_text(encoding='utf-8'))['handlers']
+    names = args.handler or list(budgets)
+
+    results = [check_handler(name, budgets[name], args.runs, args.scale, args.report) for name in names]
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
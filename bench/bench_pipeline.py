@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Throughput and latency benchmark suite for the three Lambda handlers.
+
+Each scenario drives one handler with synthetic SQS batches of a given size
+and PDF size (see simulator.harness), against fake AWS services with
+lognormal latencies. A final scenario runs the whole pipeline through the
+simulator. Every scenario runs in a fresh process so its peak RSS is its own.
+
+Reported per scenario:
+  docs/s          documents per simulated second of handler time
+  p50/p95/p99     invocation latency in simulated seconds (end to end for the pipeline)
+  RSS MB          peak resident set size of the scenario's process
+  CPU ms/doc      real CPU time per document (not affected by --time-scale)
+  calls/doc       Bedrock requests per document, throttled ones included
+
+--save writes the metrics as a JSON baseline; --compare checks them against
+a baseline (see baseline.py) and exits with status 1 on regressions. Compare
+runs made with the same settings on the same machine.
+
+Usage:
+    python bench/bench_pipeline.py [--handler classification] [--batch-sizes 1,3,10] [--pdf-pages 1,20]
+        [--batches 4] [--time-scale 0.01] [--pipeline-documents 30] [--save bench/baseline.json]
+        [--compare bench/baseline.json] [--tolerance-scale 1.5]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from baseline import compare, load_baseline, save_baseline
+from simulator import (
+    LatencyModel,
+    ModelProfile,
+    PipelineSimulator,
+    SimulationConfig,
+    percentile,
+    synthetic_documents,
+)
+from simulator.harness import HandlerHarness
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+HANDLERS = ('classification', 'extraction-scoring', 'fallback-processing')
+
+
+@dataclass
+class Scenario:
+    name: str
+    function: str
+    batch_size: int
+    pages: int
+    batches: int
+
+
+def peak_rss_mb():
+    """Peak RSS of this process in MB, None where getrusage is unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def _config(settings: Dict[str, Any]) -> SimulationConfig:
+    return SimulationConfig(
+        time_scale=settings['time_scale'],
+        default_model=ModelProfile(latency=LatencyModel(median=settings['model_latency'], sigma=0.35)),
+        log_level='CRITICAL',
+        seed=settings['seed'],
+    )
+
+
+def run_handler_scenario(scenario: Scenario, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Invoke one handler with `batches` batches; returns the scenario metrics."""
+    documents = synthetic_documents(scenario.batch_size * scenario.batches, pages=(scenario.pages, scenario.pages),
+                                    scanned_rate=settings['scanned_rate'], seed=settings['seed'])
+    harness = HandlerHarness(scenario.function, documents, _config(settings))
+    try:
+        with harness.active():
+            results = [harness.invoke(batch) for batch in harness.batches(scenario.batch_size)]
+    finally:
+        harness.close()
+
+    docs = sum(result.size for result in results)
+    latencies = [result.seconds for result in results]
+    return {
+        'docs': docs,
+        'pdf_kb': sum(len(d.pdf) for d in documents) / len(documents) / 1024,
+        'docs_per_sec': docs / sum(latencies) if sum(latencies) else 0.0,
+        'latency_p50': percentile(latencies, 50),
+        'latency_p95': percentile(latencies, 95),
+        'latency_p99': percentile(latencies, 99),
+        'peak_rss_mb': peak_rss_mb(),
+        'cpu_ms_per_doc': sum(result.cpu_seconds for result in results) * 1000 / docs,
+        'bedrock_calls_per_doc': harness.bedrock_calls() / docs,
+        'errors': sum(result.failed_messages + (1 if result.error else 0) for result in results),
+    }
+
+
+def run_pipeline_scenario(documents: int, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Run documents through the simulated pipeline; returns the scenario metrics."""
+    docs = synthetic_documents(documents, scanned_rate=settings['scanned_rate'], seed=settings['seed'])
+    cpu_started = time.process_time()
+    report = PipelineSimulator(docs, _config(settings)).run()
+    finished = documents - report.outcomes['pending'] - report.outcomes['lost']
+    return {
+        'docs': documents,
+        'pdf_kb': sum(len(d.pdf) for d in docs) / len(docs) / 1024,
+        'docs_per_sec': report.throughput_per_minute / 60,
+        'latency_p50': report.latency['p50'],
+        'latency_p95': report.latency['p95'],
+        'latency_p99': report.latency['p99'],
+        'peak_rss_mb': peak_rss_mb(),
+        'cpu_ms_per_doc': (time.process_time() - cpu_started) * 1000 / documents,
+        'bedrock_calls_per_doc': report.bedrock['calls_per_document'],
+        'errors': documents - finished,
+    }
+
+
+def run_isolated(func, *args):
+    """Run func(*args) in a fresh interpreter (spawn) and return its result."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(func, *args).result()
+
+
+def format_row(name: str, metrics: Dict[str, Any]) -> str:
+    def value(key, width, digits):
+        v = metrics.get(key)
+        return '-'.rjust(width) if v is None else f"{v:{width}.{digits}f}"
+
+    return (f"  {name:38s} {metrics['docs']:5d} {value('docs_per_sec', 7, 3)} {value('latency_p50', 7, 1)} "
+            f"{value('latency_p95', 7, 1)} {value('latency_p99', 7, 1)} {value('peak_rss_mb', 7, 1)} "
+            f"{value('cpu_ms_per_doc', 8, 1)} {value('bedrock_calls_per_doc', 6, 2)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--handler', action='append', choices=HANDLERS, help='Only these handlers')
+    parser.add_argument('--batch-sizes', default='1,3,10', help='SQS batch sizes (comma separated)')
+    parser.add_argument('--pdf-pages', default='1,20', help='PDF sizes in pages (comma separated)')
+    parser.add_argument('--batches', type=int, default=4, help='Invocations per scenario')
+    parser.add_argument('--pipeline-documents', type=int, default=30, help='0 skips the pipeline scenario')
+    parser.add_argument('--time-scale', type=float, default=0.01, help='Real seconds per simulated second')
+    parser.add_argument('--model-latency', type=float, default=2.5, help='Median Bedrock latency (s)')
+    parser.add_argument('--scanned-rate', type=float, default=0.0, help='Share of PDFs without text')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--in-process', action='store_true', help='Do not isolate scenarios (RSS is cumulative)')
+    parser.add_argument('--save', help='Write the metrics to this baseline file')
+    parser.add_argument('--compare', help='Compare with this baseline file')
+    parser.add_argument('--tolerance-scale', type=float, default=1.0, help='Multiply every tolerance')
+    parser.add_argument('--json', action='store_true', help='Print the metrics as JSON')
+    args = parser.parse_args()
+
+    settings = {'time_scale': args.time_scale, 'model_latency': args.model_latency,
+                'scanned_rate': args.scanned_rate, 'seed': args.seed, 'batches': args.batches}
+    scenarios = [
+        Scenario(f"{handler}/batch{size}/{pages}p", handler, size, pages, args.batches)
+        for handler in (args.handler or HANDLERS)
+        for size in (int(s) for s in args.batch_sizes.split(','))
+        for pages in (int(p) for p in args.pdf_pages.split(','))
+    ]
+
+    def run(func, *func_args):
+        return func(*func_args) if args.in_process else run_isolated(func, *func_args)
+
+    if not args.json:
+        print(f"  {'scenario':38s} {'docs':>5s} {'docs/s':>7s} {'p50 s':>7s} {'p95 s':>7s} {'p99 s':>7s} "
+              f"{'RSS MB':>7s} {'CPU ms/doc':>8s} {'calls':>6s}")
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = run(run_handler_scenario, scenario, settings)
+        if not args.json:
+            print(format_row(scenario.name, results[scenario.name]), flush=True)
+    if args.pipeline_documents:
+        name = f"pipeline/{args.pipeline_documents}docs"
+        results[name] = run(run_pipeline_scenario, args.pipeline_documents, settings)
+        if not args.json:
+            print(format_row(name, results[name]), flush=True)
+
+    if args.json:
+        print(json.dumps({'settings': settings, 'scenarios': results}, indent=2))
+    if args.save:
+        save_baseline(args.save, results, settings)
+        print(f"\nBaseline saved to {args.save}")
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        if baseline['meta'].get('settings') != settings:
+            print(f"\nWarning: baseline settings differ: {baseline['meta'].get('settings')}")
+        regressions = compare(baseline['scenarios'], results, scale=args.tolerance_scale)
+        print(f"\nCompared with {args.compare} (commit {baseline['meta'].get('commit')}): "
+              f"{len(regressions)} regression(s)")
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark prompt loading: import-time cost of the startup prompt registry and
+per-document lookup cost against the previous read-every-time loader.
+
+The import is timed in fresh interpreters (as in a Lambda cold start) with
+LAMBDA_TASK_ROOT pointing at a function's src directory. Lookups cycle through
+every prompt set of that function.
+
+Usage:
+    python bench/bench_prompt_loader.py [--function extraction-scoring] [--imports 10] [--lookups 10000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'functions'))
+
+from shared.prompt_loader import PromptLoader
+
+IMPORT_SNIPPET = """
+import json, sys, time
+sys.path.insert(0, {functions!r})
+start = time.perf_counter()
+from shared.prompt_loader import prompt_loader
+print(json.dumps({{"import_ms": (time.perf_counter() - start) * 1000,
+                  "load_ms": prompt_loader.load_seconds * 1000,
+                  "prompt_sets": len(prompt_loader.prompt_hashes())}}))
+"""
+
+
+def legacy_get_prompts(task_root: str, name: str):
+    """Lookup as previously implemented: two exists() checks and two reads per call."""
+    base = Path(task_root) / "instructions"
+    directory = base if name == 'classification' else base / name
+    system_path = directory / "system.txt"
+    user_path = directory / "user.txt"
+    if not system_path.exists():
+        raise FileNotFoundError(system_path)
+    if not user_path.exists():
+        raise FileNotFoundError(user_path)
+    return system_path.read_text(encoding='utf-8'), user_path.read_text(encoding='utf-8')
+
+
+def time_imports(task_root: str, runs: int):
+    env = dict(os.environ, LAMBDA_TASK_ROOT=task_root)
+    snippet = IMPORT_SNIPPET.format(functions=str(REPO_ROOT / 'functions'))
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', snippet], env=env, capture_output=True,
+                                text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def time_lookups(func, names, lookups: int) -> float:
+    start = time.perf_counter()
+    for i in range(lookups):
+        func(names[i % len(names)])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--function', default='extraction-scoring',
+                        choices=['classification', 'extraction-scoring', 'fallback-processing'])
+    parser.add_argument('--imports', type=int, default=10)
+    parser.add_argument('--lookups', type=int, default=10000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    task_root = str(REPO_ROOT / 'functions' / args.function / 'src')
+
+    imports = time_imports(task_root, args.imports)
+    print(f"Import of shared.prompt_loader ({args.function}, {imports[0]['prompt_sets']} prompt sets, "
+          f"{args.imports} fresh interpreters):")
+    for key in ('import_ms', 'load_ms'):
+        values = [result[key] for result in imports]
+        print(f"  {key:10s} median {statistics.median(values):7.2f} ms   max {max(values):7.2f} ms")
+
+    loader = PromptLoader(task_root=task_root)
+    reloading = PromptLoader(task_root=task_root, hot_reload=True)
+    names = list(loader.prompt_hashes())
+
+    timings = [
+        ("read-every-time", time_lookups(lambda name: legacy_get_prompts(task_root, name), names, args.lookups)),
+        ("registry", time_lookups(loader.get_prompt_set, names, args.lookups)),
+        ("registry + mtime", time_lookups(reloading.get_prompt_set, names, args.lookups)),
+    ]
+    print(f"\nLookups ({args.lookups} across {len(names)} prompt sets):")
+    for label, elapsed in timings:
+        print(f"  {label:18s} {elapsed / args.lookups * 1e6:9.2f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
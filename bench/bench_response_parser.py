@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Benchmark extraction-response parsing over a corpus of raw model responses.
+
+Compares the previous multi-stage parse_extraction_response (fenced regex,
+brace loop, generic JSON regex, natural-language regexes compiled per call)
+with shared.response_parser, and reports throughput, parse-path frequencies
+and how often both produce the same data. With --model-id the corpus is also
+run through the per-model-family parser registry and its stats are printed.
+
+The corpus is every raw_response_*.json under --raw-dir (a local copy of the
+RAW/ folder of the destination bucket; defaults to testing/test_documents).
+
+Usage:
+    python bench/bench_response_parser.py [--raw-dir testing/test_documents] [--repeat 5]
+        [--model-id us.amazon.nova-pro-v1:0]
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'functions'))
+
+from shared.response_parser import parse_extraction_text, parse_unstructured_text, \
+    build_for_review_response, build_parse_failed_response
+from shared.parser_registry import parser_registry
+
+
+def load_corpus(raw_dir: Path):
+    """Load response texts from raw_response_*.json files."""
+    texts = []
+    for path in sorted(raw_dir.rglob('raw_response_*.json')):
+        try:
+            raw = json.loads(path.read_text(encoding='utf-8'))
+            content = raw['output']['message']['content'] if 'output' in raw else raw['content']
+            texts.append(content[0]['text'])
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            print(f"  skipping {path}: {e}")
+    return texts
+
+
+def legacy_parse(text: str):
+    """Parsing as previously implemented in bedrock_client.parse_extraction_response."""
+    match = re.search(r"```json\s*(\{[\s\S]*?\})\s*```", text)
+    if match:
+        try:
+            return json.loads(match.group(1)), 'fenced_json'
+        except json.JSONDecodeError:
+            pass
+
+    try:
+        start_idx = text.find('{')
+        if start_idx != -1:
+            brace_count = 0
+            end_idx = -1
+            for i in range(start_idx, len(text)):
+                if text[i] == '{':
+                    brace_count += 1
+                elif text[i] == '}':
+                    brace_count -= 1
+                    if brace_count == 0:
+                        end_idx = i
+                        break
+            if end_idx != -1:
+                return json.loads(text[start_idx:end_idx + 1]), 'raw_json'
+    except (json.JSONDecodeError, ValueError):
+        pass
+
+    json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
+    for match_text in re.findall(json_pattern, text, re.DOTALL):
+        try:
+            return json.loads(match_text), 'nested_json'
+        except json.JSONDecodeError:
+            continue
+
+    if "ForReview" in text or "no document" in text.lower() or "not see any PDF" in text:
+        return build_for_review_response(), 'for_review'
+
+    try:
+        return legacy_natural_language(text), 'natural_language'
+    except Exception:
+        return build_parse_failed_response(text), 'parse_failed'
+
+
+def legacy_natural_language(text: str) -> dict:
+    """Previous parse_natural_language_response (patterns compiled per call)."""
+    extracted_data = {
+        "result": {
+            "parsing_method": "natural_language_extraction",
+            "original_response": text[:1000]
+        },
+        "DocumentType": "company",
+        "Category": "unknown"
+    }
+
+    # Extraer NIT/Identificación fiscal
+    nit_patterns = [
+        r"NIT[:\s]*\.?(\d+[\.\-]\d+[\.\-]\d+)",
+        r"NIT[:\s]*(\d+[\.\-]\d+[\.\-]\d+)",
+        r"NIT[:\s]*(\d+)",
+        r"identificación[:\s]+(\d+[\.\-]\d+[\.\-]\d+)",
+        r"número[:\s]+(\d+[\.\-]\d+[\.\-]\d+)"
+    ]
+    
+    for pattern in nit_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            extracted_data["result"]["TaxId"] = match.group(1).strip()
+            break
+    
+    # Extraer nombre de empresa
+    company_patterns = [
+        r"sociedad\s+([^\n]+?)(?:\s+NIT|\s+de|\n)",
+        r"empresa\s+([^\n]+?)(?:\s+NIT|\s+de|\n)",
+        r"compañía\s+([^\n]+?)(?:\s+NIT|\s+de|\n)",
+        r"([A-Z][A-Z\s]+S\.A\.S?)",
+        r"([A-Z][A-Z\s]+LTDA)",
+        r"([A-Z][A-Z\s]+S\.A)"
+    ]
+    
+    for pattern in company_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            company_name = match.group(1).strip()
+            if len(company_name) > 3:  # Evitar coincidencias muy cortas
+                extracted_data["result"]["PrincipalCompanyName"] = company_name
+                break
+    
+    # Buscar tabla de accionistas o socios
+    related_parties = []
+    
+    # Patrón para encontrar información de accionistas
+    shareholder_patterns = [
+        r"(\w+(?:\s+\w+)*)\s*\|\s*(\d+[\.\,\d]*)\s*\|\s*(\d+[\.\,\d]*)\s*\|\s*(\d+%?)",
+        r"(\w+(?:\s+\w+)*)\s+(\d+[\.\,\d]+)\s+(\d+[\.\,\d]+)\s+(\d+%?)",
+    ]
+    
+    for pattern in shareholder_patterns:
+        matches = re.findall(pattern, text, re.IGNORECASE)
+        for match in matches:
+            name, doc, shares, percentage = match
+            if len(name.strip()) > 2:  # Nombres válidos
+                related_parties.append({
+                    "name": name.strip(),
+                    "identification": doc.strip(),
+                    "shares": shares.strip(),
+                    "percentage": percentage.strip()
+                })
+    
+    if related_parties:
+        extracted_data["result"]["RelatedParties"] = related_parties
+    
+    # Determinar categoría basada en contenido
+    if "accionista" in text.lower() or "acciones" in text.lower():
+        extracted_data["result"]["DocumentCategory"] = "Shareholder Information"
+        extracted_data["Category"] = "ACC"
+    elif "representante" in text.lower() or "legal" in text.lower():
+        extracted_data["result"]["DocumentCategory"] = "Legal Representative"
+        extracted_data["Category"] = "CERL"
+    
+    # Marcar campos faltantes como ForReview
+    required_fields = ["PrincipalCompanyName", "TaxId", "DocumentCategory"]
+    for field in required_fields:
+        if field not in extracted_data["result"]:
+            extracted_data["result"][field] = "ForReview"
+    
+    # Agregar metadatos de extracción
+    extracted_data["result"]["extraction_confidence"] = "medium"
+    extracted_data["result"]["requires_verification"] = True
+    
+    return extracted_data
+
+
+def time_corpus(func, texts, repeat: int):
+    best = float('inf')
+    paths = Counter()
+    results = []
+    for _ in range(repeat):
+        paths = Counter()
+        results = []
+        start = time.perf_counter()
+        for text in texts:
+            data, path = func(text)
+            paths[path] += 1
+            results.append(data)
+        best = min(best, time.perf_counter() - start)
+    return best, paths, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--raw-dir', type=Path, default=REPO_ROOT / 'testing' / 'test_documents')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--model-id', help='Model that produced the corpus (enables the registry run)')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    texts = load_corpus(args.raw_dir)
+    if not texts:
+        print(f"No raw_response_*.json files found under {args.raw_dir}")
+        return
+    total_mb = sum(len(t.encode('utf-8')) for t in texts) / 1e6
+    print(f"Corpus: {len(texts)} responses, {total_mb:.2f} MB from {args.raw_dir}")
+
+    legacy_time, legacy_paths, legacy_results = time_corpus(legacy_parse, texts, args.repeat)
+    new_time, new_paths, new_results = time_corpus(parse_extraction_text, texts, args.repeat)
+    timings = [("legacy parser", legacy_time), ("single-pass parser", new_time)]
+
+    if args.model_id:
+        def registry_parse(text):
+            outcome = parser_registry.parse_text(text, args.model_id)
+            return outcome if outcome.data is not None else parse_unstructured_text(text)
+
+        parser_registry.reset_stats()
+        registry_time, _, _ = time_corpus(registry_parse, texts, args.repeat)
+        timings.append(("registry parser", registry_time))
+
+    for label, elapsed in timings:
+        print(f"  {label:20s} {elapsed * 1000:8.1f} ms  "
+              f"{len(texts) / elapsed:9.0f} responses/s  {total_mb / elapsed:7.1f} MB/s")
+    print(f"  speedup:             {legacy_time / new_time:8.1f}x")
+
+    print("\nParse-path frequencies (legacy -> single-pass):")
+    for path in sorted(set(legacy_paths) | set(new_paths)):
+        print(f"  {path:18s} {legacy_paths[path]:6d} -> {new_paths[path]:6d}")
+
+    same = sum(1 for old, new in zip(legacy_results, new_results) if old == new)
+    print(f"\nIdentical results: {same}/{len(texts)}")
+
+    if args.model_id:
+        print(f"\nRegistry stats for {args.model_id} (all repeats):")
+        for family, stats in parser_registry.stats().items():
+            print(f"  {family}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
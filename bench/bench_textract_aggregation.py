@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark Textract block aggregation on a synthetic 500-page response.
+
+Compares the previous inline aggregation from extract_pdf_text_with_textract
+(which rebuilt the list of page headers for every page of every result page)
+with TextractTextAggregator.
+
+Usage:
+    python bench/bench_textract_aggregation.py [--pages 500] [--lines 50] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'functions'))
+
+from shared.textract_aggregator import TextractTextAggregator
+
+BLOCKS_PER_RESPONSE = 1000  # Textract's maximum page size for GetDocumentTextDetection
+
+
+def build_synthetic_responses(pages: int, lines_per_page: int, seed: int = 7):
+    """Build NextToken-paginated Textract responses with PAGE, LINE and WORD blocks."""
+    rng = random.Random(seed)
+    blocks = []
+    for page in range(1, pages + 1):
+        blocks.append({'BlockType': 'PAGE', 'Page': page})
+        for i in range(lines_per_page):
+            words = [f"palabra{rng.randint(0, 9999)}" for _ in range(rng.randint(3, 10))]
+            top = (i + 1) / (lines_per_page + 2)
+            blocks.append({
+                'BlockType': 'LINE',
+                'Page': page,
+                'Text': ' '.join(words),
+                'Geometry': {'BoundingBox': {'Top': top, 'Left': 0.05, 'Height': 0.012, 'Width': 0.8}},
+            })
+            for word in words:
+                blocks.append({'BlockType': 'WORD', 'Page': page, 'Text': word})
+
+    responses = []
+    for start in range(0, len(blocks), BLOCKS_PER_RESPONSE):
+        responses.append({'Blocks': blocks[start:start + BLOCKS_PER_RESPONSE]})
+    return responses
+
+
+def legacy_aggregate(responses) -> str:
+    """Aggregation as previously inlined in extract_pdf_text_with_textract."""
+    all_lines = []
+    for result_response in responses:
+        page_lines = {}
+        for block in result_response.get('Blocks', []):
+            if block['BlockType'] == 'LINE':
+                page_num = block.get('Page', 1)
+                line_text = block.get('Text', '').strip()
+                if line_text:
+                    if page_num not in page_lines:
+                        page_lines[page_num] = []
+                    page_lines[page_num].append(line_text)
+
+        for page_num in sorted(page_lines.keys()):
+            if page_num not in [item for item in all_lines if item.startswith("--- PÁGINA")]:
+                all_lines.append(f"--- PÁGINA {page_num} ---")
+            for line in page_lines[page_num]:
+                all_lines.append(line)
+    return '\n'.join(all_lines)
+
+
+def streaming_aggregate(responses) -> str:
+    aggregator = TextractTextAggregator()
+    for result_response in responses:
+        aggregator.add_blocks(result_response.get('Blocks', []))
+    return aggregator.render()
+
+
+def time_best(func, responses, repeat: int):
+    best = float('inf')
+    output = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func(responses)
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--lines', type=int, default=50, help='LINE blocks per page')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    responses = build_synthetic_responses(args.pages, args.lines)
+    total_blocks = sum(len(r['Blocks']) for r in responses)
+    print(f"Synthetic Textract output: {args.pages} pages, {total_blocks} blocks, {len(responses)} result pages")
+
+    legacy_time, legacy_text = time_best(legacy_aggregate, responses, args.repeat)
+    streaming_time, streaming_text = time_best(streaming_aggregate, responses, args.repeat)
+
+    print(f"  legacy aggregation:    {legacy_time * 1000:9.1f} ms")
+    print(f"  streaming aggregation: {streaming_time * 1000:9.1f} ms")
+    print(f"  speedup:               {legacy_time / streaming_time:9.1f}x")
+    print(f"  legacy headers:        {legacy_text.count('--- PÁGINA')}")
+    print(f"  streaming headers:     {streaming_text.count('--- PÁGINA')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Import-time profiler for the Lambda handlers.
+
+Imports a handler module in a fresh interpreter (as in a Lambda cold start)
+with `python -X importtime` and reports the cost of every imported module:
+self time, cumulative time (including the modules it imported) and the
+aggregate per top-level package. Wall-clock import time is measured
+separately without -X importtime, whose own overhead inflates the numbers.
+
+The same per-module trace can be taken in AWS by setting the environment
+variable PYTHONPROFILEIMPORTTIME=1 on a function; it goes to CloudWatch (stderr).
+
+Usage:
+    python bench/import_profiler.py functions/extraction-scoring/src [--top 25]
+
+    from import_profiler import profile_handler
+    profile = profile_handler(Path('functions/fallback-processing/src'))
+    print(profile.report())
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict, namedtuple
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FUNCTIONS_DIR = REPO_ROOT / 'functions'
+
+ImportRecord = namedtuple('ImportRecord', ['module', 'self_us', 'cumulative_us', 'depth'])
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+_WALL_CLOCK_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"import_ms": (time.perf_counter() - start) * 1000}}))
+"""
+
+
+def handler_environment(handler_dir: Path) -> Dict[str, str]:
+    """Environment of a Lambda cold start: task root on the handler, shared importable."""
+    env = dict(os.environ)
+    env['LAMBDA_TASK_ROOT'] = str(handler_dir)
+    env['PYTHONPATH'] = os.pathsep.join([str(handler_dir), str(FUNCTIONS_DIR)])
+    env.setdefault('REGION', 'us-east-2')
+    env.setdefault('AWS_DEFAULT_REGION', env['REGION'])
+    env.pop('PYTHONPROFILEIMPORTTIME', None)
+    return env
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parse the `-X importtime` trace (one line per module, nested by indentation)."""
+    records = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return records
+
+
+class ImportProfile:
+    """Per-module import costs of one handler import."""
+
+    def __init__(self, module: str, records: List[ImportRecord], wall_ms: List[float]):
+        self.module = module
+        self.records = records
+        self.wall_ms = wall_ms
+
+    @property
+    def total_ms(self) -> float:
+        """Cumulative import time of the handler module, from the trace."""
+        own = [r for r in self.records if r.module == self.module and r.depth == 0]
+        return own[-1].cumulative_us / 1000 if own else 0.0
+
+    @property
+    def wall_median_ms(self) -> float:
+        return statistics.median(self.wall_ms) if self.wall_ms else 0.0
+
+    def top(self, n: int = 20, key: str = 'cumulative_us') -> List[ImportRecord]:
+        return sorted(self.records, key=lambda r: getattr(r, key), reverse=True)[:n]
+
+    def by_package(self) -> Dict[str, float]:
+        """Self time per top-level package in ms (shared.* is split per module)."""
+        packages = defaultdict(float)
+        for record in self.records:
+            name = record.module if record.module.startswith('shared.') else record.module.split('.')[0]
+            packages[name] += record.self_us / 1000
+        return dict(sorted(packages.items(), key=lambda item: item[1], reverse=True))
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'module': self.module,
+            'wall_median_ms': round(self.wall_median_ms, 2),
+            'wall_ms': [round(ms, 2) for ms in self.wall_ms],
+            'importtime_total_ms': round(self.total_ms, 2),
+            'modules_imported': len(self.records),
+            'by_package_ms': {name: round(ms, 2) for name, ms in self.by_package().items()},
+        }
+
+    def report(self, top: int = 20) -> str:
+        lines = [
+            f"{self.module}: {len(self.records)} modules, wall median {self.wall_median_ms:.1f} ms "
+            f"(-X importtime total {self.total_ms:.1f} ms)",
+            "",
+            f"  {'package':32s} {'self ms':>9s}",
+        ]
+        for name, ms in list(self.by_package().items())[:top]:
+            lines.append(f"  {name:32s} {ms:9.2f}")
+        lines += ["", f"  {'module':48s} {'self ms':>9s} {'cumul ms':>9s}"]
+        for record in self.top(top):
+            lines.append(f"  {'  ' * record.depth + record.module:48s} "
+                         f"{record.self_us / 1000:9.2f} {record.cumulative_us / 1000:9.2f}")
+        return '\n'.join(lines)
+
+
+def profile_handler(handler_dir: Path, module: str = 'index', runs: int = 5) -> ImportProfile:
+    """
+    Profile the cold-start import of a handler module.
+
+    Args:
+        handler_dir: Directory of the handler (functions/<name>/src)
+        module: Module imported by the Lambda runtime
+        runs: Fresh interpreters used for the wall-clock measurement
+
+    Returns:
+        ImportProfile
+    """
+    handler_dir = Path(handler_dir).resolve()
+    env = handler_environment(handler_dir)
+
+    traced = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=handler_dir, env=env, capture_output=True, text=True)
+    if traced.returncode != 0:
+        raise RuntimeError(f"Importing {module} from {handler_dir} failed:\n{traced.stderr[-2000:]}")
+
+    wall_ms = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', _WALL_CLOCK_SNIPPET.format(module=module)],
+                                cwd=handler_dir, env=env, capture_output=True, text=True, check=True).stdout
+        wall_ms.append(json.loads(output.strip().splitlines()[-1])['import_ms'])
+
+    return ImportProfile(module, parse_importtime(traced.stderr), wall_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('handler_dir', type=Path)
+    parser.add_argument('--module', default='index')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help='Print the profile as JSON')
+    args = parser.parse_args()
+
+    profile = profile_handler(args.handler_dir, args.module, args.runs)
+    print(json.dumps(profile.to_dict(), indent=2) if args.json else profile.report(args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Lambda memory recommendations from the handlers' memory records.
+
+Every invocation logs a 'memory' record (see shared/memory_profile.py) with
+the container's peak RSS, the invocation's RSS growth, duration, CPU time and
+the function's memory setting. This script reads the records from log files (CloudWatch exports, `aws logs tail`
+output, .gz included) or straight from CloudWatch Logs. For each function it
+estimates the duration and cost at every standard memory size and recommends:
+
+  cheapest   lowest estimated cost among the sizes that fit the peak RSS plus headroom
+  balanced   fastest size costing at most --cost-tolerance more than the cheapest
+
+Sizes are fitted to the container peak (container_peak_rss_mb), the highest
+RSS a container reached over all its invocations: that is what must fit in
+the memory setting. The growth of single invocations (rss_growth_mb, the
+container peak at the end minus the one at the start) is reported next to it.
+It shows which invocations raise the peak, and it is zero for invocations
+that stay below an earlier one.
+
+Duration model: Lambda gives CPU in proportion to memory, one full vCPU at
+1769 MB. The handlers are single-threaded Python, so only CPU time scales,
+up to one vCPU. Time spent waiting on Bedrock, Textract and S3 does not:
+
+  duration(m) = (duration - cpu) + cpu * min(current, 1769) / min(m, 1769)
+
+Traced invocations (TRACEMALLOC_SAMPLE_RATE) add the stages with the highest
+traced peaks and their largest allocation sites.
+
+Usage:
+    python bench/memory_advisor.py logs:/aws/lambda/dev-fallback-processing --since 2026-10-01
+    python bench/memory_advisor.py ./exported_logs [--headroom 0.3] [--arch arm64] [--json]
+"""
+
+import argparse
+import gzip
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+from usage_report import percentile
+
+# Standard memory sizes considered, MB
+MEMORY_SIZES = (256, 512, 768, 1024, 1536, 1769, 2048, 3008, 4096, 6144, 8192, 10240)
+
+# Memory at which a function gets one full vCPU
+FULL_VCPU_MB = 1769
+
+# On-demand prices, USD per GB-second and per request
+GB_SECOND_PRICE = {'x86_64': 0.0000166667, 'arm64': 0.0000133334}
+REQUEST_PRICE = 0.0000002
+
+_MARKER = '{"event": "memory"'
+
+
+def parse_records(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Memory records in log lines, whatever prefix the log formatter added."""
+    decoder = json.JSONDecoder()
+    for line in lines:
+        start = line.find(_MARKER)
+        if start < 0:
+            continue
+        try:
+            yield decoder.raw_decode(line[start:])[0]
+        except ValueError:
+            continue
+
+
+def iter_local_lines(path: Path) -> Iterator[str]:
+    files = sorted(p for p in Path(path).rglob('*') if p.is_file()) if Path(path).is_dir() else [Path(path)]
+    for file in files:
+        opener = gzip.open if file.suffix == '.gz' else open
+        with opener(file, 'rt', encoding='utf-8', errors='replace') as handle:
+            yield from handle
+
+
+def iter_log_group_lines(log_group: str, since: str = None) -> Iterator[str]:
+    import boto3
+
+    kwargs = {'logGroupName': log_group, 'filterPattern': '"container_peak_rss_mb"'}
+    if since:
+        start = datetime.fromisoformat(since)
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        kwargs['startTime'] = int(start.timestamp() * 1000)
+    for page in boto3.client('logs').get_paginator('filter_log_events').paginate(**kwargs):
+        for event in page.get('events', []):
+            yield event['message']
+
+
+def estimate_duration_ms(duration_ms: float, cpu_ms: float, current_mb: int, memory_mb: int) -> float:
+    """Duration of an invocation moved from current_mb to memory_mb (see the module docstring)."""
+    cpu_ms = min(cpu_ms, duration_ms)
+    speedup = min(current_mb, FULL_VCPU_MB) / min(memory_mb, FULL_VCPU_MB)
+    return (duration_ms - cpu_ms) + cpu_ms * speedup
+
+
+def invocation_cost(memory_mb: int, duration_ms: float, arch: str = 'x86_64') -> float:
+    """On-demand cost of one invocation in USD."""
+    return memory_mb / 1024 * duration_ms / 1000 * GB_SECOND_PRICE[arch] + REQUEST_PRICE
+
+
+def _most_common(values: List[Any]) -> Any:
+    values = [value for value in values if value]
+    return max(set(values), key=values.count) if values else None
+
+
+def _top_stages(records: List[Dict[str, Any]], limit: int = 5) -> List[Dict[str, Any]]:
+    stages: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        for stage in record.get('stages') or []:
+            entry = stages.setdefault(stage['name'], {'name': stage['name'], 'peaks': [], 'sites': {}})
+            entry['peaks'].append(stage.get('peak_traced_mb') or 0.0)
+            for site in stage.get('top_allocations') or []:
+                entry['sites'][site['site']] = max(entry['sites'].get(site['site'], 0.0), site['size_kb'])
+    top = []
+    for entry in stages.values():
+        sites = sorted(entry['sites'].items(), key=lambda item: -item[1])[:3]
+        top.append({
+            'name': entry['name'],
+            'samples': len(entry['peaks']),
+            'peak_traced_p95_mb': percentile(entry['peaks'], 95),
+            'peak_traced_max_mb': max(entry['peaks']),
+            'largest_allocations': [{'site': site, 'size_kb': size} for site, size in sites],
+        })
+    return sorted(top, key=lambda stage: -stage['peak_traced_max_mb'])[:limit]
+
+
+def advise(records: Iterable[Dict[str, Any]], headroom: float = 0.25, cost_tolerance: float = 0.10,
+           arch: str = 'x86_64', current_mb: int = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Memory recommendation per function.
+
+    Args:
+        records: Memory records
+        headroom: Fraction added to the highest container peak RSS seen
+        cost_tolerance: Extra cost accepted for the balanced recommendation
+        arch: 'x86_64' or 'arm64' (GB-second price)
+        current_mb: Memory setting to assume for records that have none
+
+    Returns:
+        dict: function -> invocations, current setting, container peak RSS,
+              invocation RSS growth and duration percentiles, per-size
+              estimates, recommendations and top stages
+    """
+    by_function: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        if record.get('duration_ms') is not None and record.get('container_peak_rss_mb') is not None:
+            by_function.setdefault(record.get('function') or 'unknown', []).append(record)
+
+    report = {}
+    for function, function_records in sorted(by_function.items()):
+        current = _most_common([r.get('memory_limit_mb') for r in function_records]) or current_mb
+        peaks = [r['container_peak_rss_mb'] for r in function_records]
+        growths = [r['rss_growth_mb'] for r in function_records if r.get('rss_growth_mb') is not None]
+        durations = [r['duration_ms'] for r in function_records]
+        entry = {
+            'invocations': len(function_records),
+            'current_mb': current,
+            'container_peak_rss_p50_mb': percentile(peaks, 50),
+            'container_peak_rss_p99_mb': percentile(peaks, 99),
+            'container_peak_rss_max_mb': max(peaks),
+            'rss_growth_p99_mb': percentile(growths, 99) if growths else None,
+            'rss_growth_max_mb': max(growths) if growths else None,
+            'duration_p50_ms': percentile(durations, 50),
+            'duration_p95_ms': percentile(durations, 95),
+            'cpu_share': round(sum(min(r.get('cpu_ms') or 0.0, r['duration_ms']) for r in function_records)
+                               / (sum(durations) or 1.0), 3),
+            'top_stages': _top_stages(function_records),
+        }
+        if current is None:
+            entry['error'] = 'No memory setting in the records; pass --current-mb'
+            report[function] = entry
+            continue
+
+        required = entry['container_peak_rss_max_mb'] * (1 + headroom)
+        sizes = sorted(set(MEMORY_SIZES) | {current})
+        estimates = []
+        for memory_mb in sizes:
+            estimated = [estimate_duration_ms(r['duration_ms'], r.get('cpu_ms') or 0.0, current, memory_mb)
+                         for r in function_records]
+            mean_cost = sum(invocation_cost(memory_mb, d, arch) for d in estimated) / len(estimated)
+            estimates.append({
+                'memory_mb': memory_mb,
+                'fits': memory_mb >= required,
+                'duration_p50_ms': round(percentile(estimated, 50), 1),
+                'duration_p95_ms': round(percentile(estimated, 95), 1),
+                'cost_per_1k_usd': round(mean_cost * 1000, 6),
+            })
+        entry['estimates'] = estimates
+        entry['required_mb'] = round(required, 1)
+
+        fitting = [e for e in estimates if e['fits']]
+        if not fitting:
+            entry['error'] = f"Container peak RSS plus headroom ({required:.0f} MB) exceeds every size"
+        else:
+            cheapest = min(fitting, key=lambda e: (e['cost_per_1k_usd'], e['memory_mb']))
+            affordable = [e for e in fitting if e['cost_per_1k_usd'] <= cheapest['cost_per_1k_usd'] * (1 + cost_tolerance)]
+            balanced = min(affordable, key=lambda e: (e['duration_p95_ms'], e['memory_mb']))
+            entry['cheapest_mb'] = cheapest['memory_mb']
+            entry['balanced_mb'] = balanced['memory_mb']
+        report[function] = entry
+    return report
+
+
+def format_report(report: Dict[str, Dict[str, Any]]) -> str:
+    lines = []
+    for function, entry in report.items():
+        lines.append(f"{function}: {entry['invocations']} invocations at {entry['current_mb']} MB, "
+                     f"container peak RSS p50 {entry['container_peak_rss_p50_mb']:.0f} / "
+                     f"p99 {entry['container_peak_rss_p99_mb']:.0f} / max {entry['container_peak_rss_max_mb']:.0f} MB, "
+                     f"CPU {entry['cpu_share']:.0%} of duration")
+        if entry['rss_growth_max_mb'] is not None:
+            lines.append(f"  invocation RSS growth p99 {entry['rss_growth_p99_mb']:.0f} / "
+                         f"max {entry['rss_growth_max_mb']:.0f} MB")
+        if 'estimates' in entry:
+            lines.append(f"  {'memory MB':>9s} {'fits':>5s} {'p50 ms':>9s} {'p95 ms':>9s} {'$ / 1k':>9s}")
+            for e in entry['estimates']:
+                marks = ' '.join(label for label, key in (('current', 'current_mb'), ('cheapest', 'cheapest_mb'),
+                                                          ('balanced', 'balanced_mb'))
+                                 if entry.get(key) == e['memory_mb'])
+                lines.append(f"  {e['memory_mb']:9d} {'yes' if e['fits'] else 'no':>5s} {e['duration_p50_ms']:9.0f} "
+                             f"{e['duration_p95_ms']:9.0f} {e['cost_per_1k_usd']:9.4f}  {marks}")
+        if entry.get('error'):
+            lines.append(f"  {entry['error']}")
+        for stage in entry['top_stages']:
+            sites = ', '.join(f"{s['site']} {s['size_kb'] / 1024:.1f} MB" for s in stage['largest_allocations'])
+            lines.append(f"  stage {stage['name']:16s} traced peak p95 {stage['peak_traced_p95_mb']:.1f} / "
+                         f"max {stage['peak_traced_max_mb']:.1f} MB ({stage['samples']} samples){': ' + sites if sites else ''}")
+        lines.append('')
+    return '\n'.join(lines) if lines else 'No memory records found'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('source', help='Log file or directory, or logs:<log group>')
+    parser.add_argument('--since', help='First day (or ISO timestamp) to read from CloudWatch Logs')
+    parser.add_argument('--headroom', type=float, default=0.25, help='Fraction added to the highest container peak RSS')
+    parser.add_argument('--cost-tolerance', type=float, default=0.10,
+                        help='Extra cost accepted for the balanced recommendation')
+    parser.add_argument('--arch', choices=sorted(GB_SECOND_PRICE), default='x86_64')
+    parser.add_argument('--current-mb', type=int, help='Memory setting of records that do not have one')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    if args.source.startswith('logs:'):
+        lines = iter_log_group_lines(args.source[5:], args.since)
+    else:
+        lines = iter_local_lines(args.source)
+    report = advise(parse_records(lines), args.headroom, args.cost_tolerance, args.arch, args.current_mb)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Replay captured production batches through the current handler code.
+
+Reads the RAW/ Bedrock responses and the batch summaries of the results
+bucket (an s3:// prefix or a local copy), rebuilds each function's SQS
+batches and invokes the handlers with them against fake AWS services (see
+bench/simulator/replay.py). Bedrock answers with the recorded responses,
+throttling errors and latencies, so a replay is offline and deterministic
+and runs --time-scale times as long as the recorded waits.
+
+Reported per function: throughput, batch duration percentiles, CPU time per
+document, Bedrock calls (replayed, unrecorded, throttled) and the documents
+that succeeded when recorded but not in the replay. Unrecorded calls are
+requests the current code makes that production did not; the simulator's
+generated answers serve them.
+
+--save writes the metrics as a JSON baseline; --compare checks them against
+a baseline (see baseline.py). The exit status is 1 when a recorded success
+fails or a metric regresses.
+
+Usage:
+    python bench/replay_batches.py s3://prod-json-evaluation-results [--pdfs s3://prod-filling-desk]
+    python bench/replay_batches.py ./results-copy --pdfs ./origin-copy [--function extraction-scoring]
+        [--time-scale 0.01] [--concurrency 1] [--save replay.json] [--compare replay.json] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from baseline import METRICS, compare, load_baseline, save_baseline
+from simulator import SimulationConfig
+from simulator.replay import PHASE_FUNCTIONS, ReplayHarness, capture_documents, load_capture
+
+# Replay metrics compared with a baseline: the pipeline ones plus the share of recorded successes
+REPLAY_METRICS = dict(METRICS, success_rate={'tolerance': 0.0, 'higher_is_better': True})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('source', help='Results bucket (s3://bucket[/prefix]) or a local copy of it')
+    parser.add_argument('--pdfs', help='Origin bucket (s3://bucket) or a local copy, for the source PDFs')
+    parser.add_argument('--function', action='append', choices=sorted(set(PHASE_FUNCTIONS.values())),
+                        help='Only these functions')
+    parser.add_argument('--time-scale', type=float, default=0.01, help='Real seconds per simulated second')
+    parser.add_argument('--concurrency', type=int, default=1, help='Batches replayed at once (1 keeps their order)')
+    parser.add_argument('--max-gap', type=float, default=120.0,
+                        help='Seconds between saves that start a new batch (recordings outside any summary)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help='Write the metrics to this baseline file')
+    parser.add_argument('--compare', help='Compare with this baseline file')
+    parser.add_argument('--tolerance-scale', type=float, default=1.0, help='Multiply every tolerance')
+    parser.add_argument('--json', action='store_true', help='Print the reports as JSON')
+    args = parser.parse_args()
+
+    capture = load_capture(args.source, max_gap=args.max_gap)
+    documents, placeholders = capture_documents(capture, args.pdfs)
+    functions = [f for f in (args.function or PHASE_FUNCTIONS.values()) if capture.batches_of(f)]
+    if not args.json:
+        print(f"{len(capture.recordings)} recorded responses ({capture.skipped} skipped), "
+              f"{len(capture.batches)} batches, {len(documents)} documents\n")
+
+    config = SimulationConfig(time_scale=args.time_scale, concurrency=max(args.concurrency, 1),
+                              log_level='CRITICAL', seed=args.seed)
+    reports = {}
+    for function in functions:
+        harness = ReplayHarness(function, capture, documents, config, placeholders)
+        reports[function] = harness.replay(args.concurrency)
+        if not args.json:
+            print(reports[function].format() + '\n', flush=True)
+
+    results = {function: report.metrics() for function, report in reports.items()}
+    settings = {'source': args.source, 'time_scale': args.time_scale, 'concurrency': args.concurrency,
+                'seed': args.seed}
+    if args.json:
+        print(json.dumps({'settings': settings, 'functions': [r.to_dict() for r in reports.values()]}, indent=2))
+    if args.save:
+        save_baseline(args.save, results, settings)
+        print(f"\nBaseline saved to {args.save}")
+
+    failed = any(report.regressions for report in reports.values())
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        if baseline['meta'].get('settings') != settings:
+            print(f"\nWarning: baseline settings differ: {baseline['meta'].get('settings')}")
+        regressions = compare(baseline['scenarios'], results, REPLAY_METRICS, args.tolerance_scale)
+        print(f"\nCompared with {args.compare} (commit {baseline['meta'].get('commit')}): "
+              f"{len(regressions)} regression(s)")
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+        failed = failed or bool(regressions)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
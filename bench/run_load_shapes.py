@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Run the pipeline simulator under different traffic shapes and compare them.
+
+Each shape (see bench/simulator/load_shapes.py) uploads the same documents to
+the origin bucket over --duration simulated seconds. Each upload sends an S3
+ObjectCreated notification to the classification queue. The event source
+mappings start with --initial-concurrency batches and scale up by
+--scale-up-per-minute while their queue has a backlog. Batches above the
+function's --concurrency are throttled. Their messages come back after
+--visibility-timeout, and classification messages go to the dead-letter queue
+after 10 receives. New execution environments wait --cold-start seconds.
+
+Reported per shape:
+  e2e p50/p95/p99  upload to last handler, simulated seconds
+  age p95/max      ApproximateAgeOfOldestMessage of the classification queue, sampled
+  depth            highest classification queue depth (visible plus in flight)
+  λ thr            share of invocations throttled, all functions
+  bedrock thr      share of Bedrock calls throttled (--rpm sets the quota)
+  cold             cold starts, all functions
+  peak             highest concurrent classification invocations
+
+Usage:
+    python bench/run_load_shapes.py [--shapes poisson,burst,ramp,diurnal] [--documents 60] [--duration 1800]
+        [--burst-size 20] [--concurrency 10] [--initial-concurrency 2] [--maximum-concurrency 20]
+        [--rpm 100] [--time-scale 0.005] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import replace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from simulator import (
+    LatencyModel,
+    ModelProfile,
+    PipelineSimulator,
+    SimulationConfig,
+    default_functions,
+    synthetic_documents,
+)
+from simulator.load_shapes import LOAD_SHAPES, arrivals
+
+
+def run_shape(shape: str, args) -> dict:
+    params = {}
+    if shape == 'burst':
+        params = {'burst_size': args.burst_size, 'burst_seconds': args.burst_seconds}
+    elif shape == 'diurnal':
+        params = {'period': args.period or args.duration, 'amplitude': args.amplitude}
+    times = arrivals(shape, args.documents, args.duration, seed=args.seed, **params)
+
+    functions = [replace(f, initial_concurrency=args.initial_concurrency, scale_up_per_minute=args.scale_up_per_minute,
+                         maximum_concurrency=args.maximum_concurrency, cold_start=args.cold_start)
+                 for f in default_functions(args.concurrency)]
+    config = SimulationConfig(
+        time_scale=args.time_scale,
+        concurrency=args.concurrency,
+        functions=functions,
+        default_model=ModelProfile(latency=LatencyModel(median=args.model_latency, sigma=0.35),
+                                   requests_per_minute=args.rpm),
+        visibility_timeout=args.visibility_timeout,
+        max_simulated_seconds=args.duration + args.max_hours * 3600,
+        log_level='CRITICAL',
+        seed=args.seed,
+    )
+    documents = synthetic_documents(args.documents, seed=args.seed)
+    report = PipelineSimulator(documents, config).run(arrivals=times).to_dict()
+
+    stats = report['functions']
+    invocations = sum(s['invocations'] for s in stats.values())
+    throttles = sum(s['throttles'] for s in stats.values())
+    classification = stats['classification']
+    return {
+        'shape': shape,
+        'params': params,
+        'documents': report['documents'],
+        'outcomes': report['outcomes'],
+        'completed': report['completed'],
+        'simulated_seconds': report['simulated_seconds'],
+        'throughput_per_minute': report['throughput_per_minute'],
+        'latency': report['latency'],
+        'queue_age': classification['queue_age'],
+        'max_queue_depth': classification['max_queue_depth'],
+        'lambda_throttle_rate': throttles / (throttles + invocations) if throttles + invocations else 0.0,
+        'bedrock_throttle_rate': report['bedrock']['throttle_rate'],
+        'cold_starts': sum(s['cold_starts'] for s in stats.values()),
+        'peak_concurrency': classification['peak_concurrency'],
+        'functions': stats,
+    }
+
+
+def format_row(result: dict) -> str:
+    def seconds(value, width=7):
+        return '-'.rjust(width) if value is None else f"{value:{width}.1f}"
+
+    latency, age = result['latency'], result['queue_age']
+    pending = result['outcomes'].get('pending', 0) + result['outcomes'].get('lost', 0)
+    return (f"  {result['shape']:8s} {result['documents']:5d} {result['throughput_per_minute']:7.2f} "
+            f"{seconds(latency['p50'])} {seconds(latency['p95'])} {seconds(latency['p99'])} "
+            f"{seconds(age['p95'])} {seconds(age['max'])} {result['max_queue_depth']:5d} "
+            f"{result['lambda_throttle_rate']:6.1%} {result['bedrock_throttle_rate']:6.1%} "
+            f"{result['cold_starts']:4d} {result['peak_concurrency']:4d} "
+            f"{result['outcomes'].get('dead_letter', 0):4d} {pending:4d}"
+            + ('' if result['completed'] else '  [stopped]'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--shapes', default=','.join(LOAD_SHAPES), help='Traffic shapes (comma separated)')
+    parser.add_argument('--documents', type=int, default=60)
+    parser.add_argument('--duration', type=float, default=1800.0, help='Simulated seconds the uploads span')
+    parser.add_argument('--burst-size', type=int, default=20, help='Documents per bulk upload (burst)')
+    parser.add_argument('--burst-seconds', type=float, default=30.0, help='Length of a bulk upload (burst)')
+    parser.add_argument('--period', type=float, default=None, help='Cycle length (diurnal, default: --duration)')
+    parser.add_argument('--amplitude', type=float, default=0.8, help='Trough depth, 0 to 1 (diurnal)')
+    parser.add_argument('--concurrency', type=int, default=10, help='Concurrent invocations allowed per function')
+    parser.add_argument('--initial-concurrency', type=int, default=5, help='Batches a mapping starts with')
+    parser.add_argument('--scale-up-per-minute', type=float, default=300.0, help='Batches a mapping adds per minute')
+    parser.add_argument('--maximum-concurrency', type=int, default=None,
+                        help='Batches a mapping scales to (above --concurrency, the extra ones are throttled)')
+    parser.add_argument('--cold-start', type=float, default=1.0, help='Init time of a new execution environment (s)')
+    parser.add_argument('--visibility-timeout', type=float, default=960.0, help='Queue visibility timeout (s)')
+    parser.add_argument('--rpm', type=float, default=None, help='Bedrock requests per minute per model')
+    parser.add_argument('--model-latency', type=float, default=2.5, help='Median Bedrock latency (s)')
+    parser.add_argument('--time-scale', type=float, default=0.005, help='Real seconds per simulated second')
+    parser.add_argument('--max-hours', type=float, default=6.0, help='Simulated time allowed after the last upload')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+    args = parser.parse_args()
+
+    shapes = [shape.strip() for shape in args.shapes.split(',') if shape.strip()]
+    unknown = [shape for shape in shapes if shape not in LOAD_SHAPES]
+    if unknown:
+        parser.error(f"unknown shapes: {', '.join(unknown)}")
+
+    if not args.json:
+        print(f"  {'shape':8s} {'docs':>5s} {'doc/min':>7s} {'e2e p50':>7s} {'e2e p95':>7s} {'e2e p99':>7s} "
+              f"{'age p95':>7s} {'age max':>7s} {'depth':>5s} {'λ thr':>6s} {'br thr':>6s} {'cold':>4s} "
+              f"{'peak':>4s} {'dlq':>4s} {'left':>4s}")
+    results = []
+    for shape in shapes:
+        results.append(run_shape(shape, args))
+        if not args.json:
+            print(format_row(results[-1]), flush=True)
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Run documents through the whole pipeline against fake AWS services.
+
+The real classification, extraction-scoring and fallback-processing handlers
+process the documents through simulated SQS event source mappings, S3,
+DynamoDB, Bedrock and Textract (see bench/simulator). Bedrock and Textract
+latency, throttling and failures are configurable; waits run --time-scale
+times as long as they would in AWS, so an hour of pipeline time takes 36 s at
+0.01. CPU work is not scaled: corpus PDFs take real time to parse, so
+measure them at --time-scale 0.1 or above.
+
+Prints throughput, end-to-end p50/p95/p99 latency, per-function duration and
+queue wait, and Bedrock usage (--json for the full report).
+
+Usage:
+    python bench/run_pipeline_sim.py [--documents 100] [--corpus] [--concurrency 5] [--time-scale 0.01]
+        [--throttle-rate 0.05] [--error-rate 0.01] [--malformed-rate 0.05] [--scanned-rate 0.1] [--rpm 200]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from simulator import (
+    FaultProfile,
+    LatencyModel,
+    ModelProfile,
+    PipelineSimulator,
+    SimulationConfig,
+    corpus_documents,
+    synthetic_documents,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--documents', type=int, default=100)
+    parser.add_argument('--corpus', action='store_true', help='Use testing/test_documents instead of synthetic PDFs')
+    parser.add_argument('--concurrency', type=int, default=5, help='Concurrent invocations per function')
+    parser.add_argument('--time-scale', type=float, default=0.01, help='Real seconds per simulated second')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Share of Bedrock calls throttled')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of Bedrock calls failing')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='Share of truncated model answers')
+    parser.add_argument('--scanned-rate', type=float, default=0.1, help='Share of synthetic PDFs without text')
+    parser.add_argument('--rpm', type=float, default=None, help='Bedrock requests per minute per model')
+    parser.add_argument('--model-latency', type=float, default=2.5, help='Median Bedrock latency (s)')
+    parser.add_argument('--textract-error-rate', type=float, default=0.0)
+    parser.add_argument('--env', action='append', default=[], metavar='NAME=VALUE',
+                        help='Environment override for all functions (repeatable)')
+    parser.add_argument('--max-hours', type=float, default=6.0, help='Simulated time limit')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    if args.corpus:
+        documents = corpus_documents(limit=args.documents, seed=args.seed)
+    else:
+        documents = synthetic_documents(args.documents, scanned_rate=args.scanned_rate, seed=args.seed)
+
+    config = SimulationConfig(
+        time_scale=args.time_scale,
+        concurrency=args.concurrency,
+        env=dict(item.split('=', 1) for item in args.env),
+        default_model=ModelProfile(
+            latency=LatencyModel(median=args.model_latency, sigma=0.35),
+            requests_per_minute=args.rpm,
+            faults=FaultProfile(throttle_rate=args.throttle_rate, error_rate=args.error_rate,
+                                malformed_rate=args.malformed_rate),
+        ),
+        textract_faults=FaultProfile(error_rate=args.textract_error_rate),
+        max_simulated_seconds=args.max_hours * 3600,
+        seed=args.seed,
+    )
+    report = PipelineSimulator(documents, config).run()
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print(report.format())
+
+
+if __name__ == "__main__":
+    main()
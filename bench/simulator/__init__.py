@@ -0,0 +1,33 @@
+"""
+In-process simulator of the document pipeline.
+
+Runs the real classification, extraction-scoring and fallback-processing
+handlers against fake S3, SQS, DynamoDB, Bedrock and Textract on a scaled
+clock, to measure throughput and tail latency without an AWS account.
+"""
+
+from .aws_fakes import FakeAWS, FaultProfile, LatencyModel, ModelProfile
+from .clock import SimClock
+from .documents import (
+    DocumentOracle,
+    SimDocument,
+    build_pdf,
+    corpus_documents,
+    synthetic_documents,
+)
+from .pipeline import (
+    FunctionConfig,
+    PipelineSimulator,
+    SimulationConfig,
+    SimulationReport,
+    default_functions,
+    percentile,
+    summarize,
+)
+
+__all__ = [
+    'FakeAWS', 'FaultProfile', 'LatencyModel', 'ModelProfile', 'SimClock',
+    'DocumentOracle', 'SimDocument', 'build_pdf', 'corpus_documents', 'synthetic_documents',
+    'FunctionConfig', 'PipelineSimulator', 'SimulationConfig', 'SimulationReport',
+    'default_functions', 'percentile', 'summarize',
+]
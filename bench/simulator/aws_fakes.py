@@ -0,0 +1,792 @@
+"""
+In-process fakes of the AWS services the Lambdas use.
+
+Only the client surface the functions call is implemented:
+
+    s3          get_object, put_object, head_object, upload_fileobj
+    sqs         send_message (plus receive/delete for the event source poller)
+    dynamodb    put_item (attribute_(not_)exists conditions), update_item (SET), get_item
+    bedrock     converse, invoke_model
+    textract    start_document_text_detection, get_document_text_detection
+
+Errors are botocore ClientErrors with the real error codes, so the retry and
+error handling of the functions runs unchanged. Latency is drawn from
+LatencyModels and spent on the SimClock; Bedrock and Textract take a
+FaultProfile for throttling, errors, content filtering and malformed output.
+FakeAWS.patch() replaces boto3.client and boto3.Session while a simulation runs.
+"""
+
+import base64
+import hashlib
+import io
+import itertools
+import json
+import math
+import random
+import re
+import threading
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import boto3
+from botocore.exceptions import ClientError
+
+from .clock import SimClock
+
+ACCOUNT_ID = '000000000000'
+
+
+@dataclass
+class LatencyModel:
+    """Log-normal latency: median seconds, sigma of the underlying normal, plus a per-unit cost."""
+    median: float = 0.0
+    sigma: float = 0.0
+    per_unit: float = 0.0
+    minimum: float = 0.0
+
+    def sample(self, rng: random.Random, units: float = 0.0) -> float:
+        base = self.median * math.exp(self.sigma * rng.gauss(0.0, 1.0)) if self.median > 0 else 0.0
+        return max(self.minimum, base + self.per_unit * units)
+
+
+@dataclass
+class FaultProfile:
+    """Probabilities of injected failures per call."""
+    throttle_rate: float = 0.0
+    error_rate: float = 0.0
+    content_filter_rate: float = 0.0
+    malformed_rate: float = 0.0
+
+
+def client_error(code: str, message: str, operation: str, status: int = 400) -> ClientError:
+    return ClientError({'Error': {'Code': code, 'Message': message},
+                        'ResponseMetadata': {'HTTPStatusCode': status}}, operation)
+
+
+def _response_metadata(clock: SimClock) -> Dict[str, Any]:
+    return {
+        'RequestId': str(uuid.uuid4()),
+        'HTTPStatusCode': 200,
+        'HTTPHeaders': {'date': formatdate(clock.epoch(), usegmt=True)},
+        'RetryAttempts': 0
+    }
+
+
+class _Service:
+    """Shared state of one service: clock, random source, latency and call counters."""
+
+    def __init__(self, clock: SimClock, latency: LatencyModel = None, seed: int = 0):
+        self.clock = clock
+        self.latency = latency or LatencyModel()
+        self.calls = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def _wait(self, operation: str, units: float = 0.0, latency: LatencyModel = None) -> None:
+        with self._lock:
+            self.calls[operation] += 1
+            delay = (latency or self.latency).sample(self._rng, units)
+        self.clock.sleep(delay)
+
+
+# =============================================================================
+# S3
+# =============================================================================
+
+@dataclass
+class S3Object:
+    body: bytes
+    version_id: str
+    etag: str
+    content_type: Optional[str] = None
+    written_at: float = 0.0
+
+
+class FakeS3(_Service):
+    """Buckets of versioned objects. Observers are called on every write."""
+
+    def __init__(self, clock: SimClock, latency: LatencyModel = None, seed: int = 0):
+        super().__init__(clock, latency or LatencyModel(median=0.02, sigma=0.3, per_unit=0.01), seed)
+        self.buckets: Dict[str, Dict[str, S3Object]] = {}
+        self.observers: List[Callable[[str, str, S3Object], None]] = []
+
+    def put(self, bucket: str, key: str, body: bytes, content_type: str = None) -> S3Object:
+        """Write an object directly (seeding, no latency)."""
+        obj = S3Object(body=body, version_id=uuid.uuid4().hex, etag=f'"{hashlib.md5(body).hexdigest()}"',
+                       content_type=content_type, written_at=self.clock.now())
+        with self._lock:
+            self.buckets.setdefault(bucket, {})[key] = obj
+        for observer in self.observers:
+            observer(bucket, key, obj)
+        return obj
+
+    def get(self, bucket: str, key: str) -> Optional[S3Object]:
+        with self._lock:
+            return self.buckets.get(bucket, {}).get(key)
+
+    def keys(self, bucket: str, prefix: str = '') -> List[str]:
+        with self._lock:
+            return sorted(key for key in self.buckets.get(bucket, {}) if key.startswith(prefix))
+
+    def _existing(self, bucket: str, key: str, operation: str) -> S3Object:
+        obj = self.get(bucket, key)
+        if obj is None:
+            if operation == 'HeadObject':
+                raise client_error('404', 'Not Found', operation, 404)
+            raise client_error('NoSuchKey', 'The specified key does not exist.', operation, 404)
+        return obj
+
+    # Client API
+
+    def get_object(self, Bucket, Key, **kwargs):
+        obj = self._existing(Bucket, Key, 'GetObject')
+        self._wait('get_object', len(obj.body) / 2**20)
+        return {'Body': io.BytesIO(obj.body), 'ContentLength': len(obj.body), 'VersionId': obj.version_id,
+                'ETag': obj.etag, 'ContentType': obj.content_type, 'ResponseMetadata': _response_metadata(self.clock)}
+
+    def head_object(self, Bucket, Key, **kwargs):
+        self._wait('head_object')
+        obj = self._existing(Bucket, Key, 'HeadObject')
+        return {'ContentLength': len(obj.body), 'VersionId': obj.version_id, 'ETag': obj.etag,
+                'ContentType': obj.content_type, 'ResponseMetadata': _response_metadata(self.clock)}
+
+    def put_object(self, Bucket, Key, Body, ContentType=None, **kwargs):
+        body = Body.encode('utf-8') if isinstance(Body, str) else bytes(Body)
+        self._wait('put_object', len(body) / 2**20)
+        obj = self.put(Bucket, Key, body, ContentType)
+        return {'VersionId': obj.version_id, 'ETag': obj.etag, 'ResponseMetadata': _response_metadata(self.clock)}
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, **kwargs):
+        body = Fileobj.read()
+        self._wait('upload_fileobj', len(body) / 2**20)
+        self.put(Bucket, Key, body, (ExtraArgs or {}).get('ContentType'))
+
+
+# =============================================================================
+# SQS
+# =============================================================================
+
+@dataclass
+class SQSMessage:
+    message_id: str
+    body: str
+    sent_at: float
+    visible_at: float
+    receive_count: int = 0
+    first_received_at: Optional[float] = None
+    receipt_handle: Optional[str] = None
+
+
+@dataclass
+class FakeQueue:
+    name: str
+    url: str
+    arn: str
+    visibility_timeout: float = 960.0
+    max_receive_count: Optional[int] = None
+    dead_letter_queue: Optional['FakeQueue'] = None
+    messages: deque = field(default_factory=deque)
+    in_flight: Dict[str, SQSMessage] = field(default_factory=dict)
+    sent: int = 0
+    deleted: int = 0
+
+
+class FakeSQS(_Service):
+    """Standard queues with visibility timeouts, receive counts and redrive to a dead-letter queue."""
+
+    def __init__(self, clock: SimClock, latency: LatencyModel = None, seed: int = 0, region: str = 'us-east-2'):
+        super().__init__(clock, latency or LatencyModel(median=0.01, sigma=0.3), seed)
+        self.region = region
+        self.queues: Dict[str, FakeQueue] = {}
+        self.observers: List[Callable[[FakeQueue, SQSMessage], None]] = []
+        self._changed = threading.Condition(self._lock)
+
+    def create_queue(self, name: str, visibility_timeout: float = 960.0, max_receive_count: int = None,
+                     dead_letter_queue: FakeQueue = None) -> FakeQueue:
+        queue = FakeQueue(
+            name=name,
+            url=f"https://sqs.{self.region}.amazonaws.com/{ACCOUNT_ID}/{name}",
+            arn=f"arn:aws:sqs:{self.region}:{ACCOUNT_ID}:{name}",
+            visibility_timeout=visibility_timeout,
+            max_receive_count=max_receive_count,
+            dead_letter_queue=dead_letter_queue
+        )
+        self.queues[queue.url] = queue
+        return queue
+
+    def _queue(self, url: str, operation: str) -> FakeQueue:
+        queue = self.queues.get(url)
+        if queue is None:
+            raise client_error('AWS.SimpleQueueService.NonExistentQueue',
+                               'The specified queue does not exist.', operation)
+        return queue
+
+    def enqueue(self, queue: FakeQueue, body: str) -> SQSMessage:
+        """Add a message directly (no latency)."""
+        now = self.clock.now()
+        message = SQSMessage(message_id=str(uuid.uuid4()), body=body, sent_at=now, visible_at=now)
+        with self._changed:
+            queue.messages.append(message)
+            queue.sent += 1
+            self._changed.notify_all()
+        for observer in self.observers:
+            observer(queue, message)
+        return message
+
+    def send_message(self, QueueUrl, MessageBody, **kwargs):
+        queue = self._queue(QueueUrl, 'SendMessage')
+        self._wait('send_message')
+        message = self.enqueue(queue, MessageBody)
+        return {'MessageId': message.message_id,
+                'MD5OfMessageBody': hashlib.md5(MessageBody.encode('utf-8')).hexdigest(),
+                'ResponseMetadata': _response_metadata(self.clock)}
+
+    def receive(self, queue: FakeQueue, max_messages: int) -> List[SQSMessage]:
+        """
+        Receive up to max_messages visible messages. Messages that exceeded the
+        queue's maxReceiveCount are moved to its dead-letter queue instead.
+        """
+        now = self.clock.now()
+        received, dead = [], []
+        with self._changed:
+            self._requeue_expired(queue, now)
+            while queue.messages and len(received) < max_messages:
+                message = queue.messages.popleft()
+                if queue.max_receive_count and message.receive_count >= queue.max_receive_count:
+                    dead.append(message)
+                    continue
+                message.receive_count += 1
+                if message.first_received_at is None:
+                    message.first_received_at = now
+                message.visible_at = now + queue.visibility_timeout
+                message.receipt_handle = uuid.uuid4().hex
+                queue.in_flight[message.receipt_handle] = message
+                received.append(message)
+        for message in dead:
+            if queue.dead_letter_queue is not None:
+                with self._changed:
+                    message.visible_at = now
+                    queue.dead_letter_queue.messages.append(message)
+                    queue.dead_letter_queue.sent += 1
+        return received
+
+    def delete(self, queue: FakeQueue, message: SQSMessage) -> None:
+        with self._changed:
+            if queue.in_flight.pop(message.receipt_handle, None) is not None:
+                queue.deleted += 1
+            self._changed.notify_all()
+
+    def _requeue_expired(self, queue: FakeQueue, now: float) -> None:
+        for handle, message in list(queue.in_flight.items()):
+            if message.visible_at <= now:
+                del queue.in_flight[handle]
+                queue.messages.append(message)
+
+    def next_visible_at(self, queue: FakeQueue) -> Optional[float]:
+        """Simulated time at which the queue next has a visible message (None if empty)."""
+        with self._lock:
+            if queue.messages:
+                return self.clock.now()
+            return min((m.visible_at for m in queue.in_flight.values()), default=None)
+
+    def wait_for_messages(self, real_timeout: float) -> None:
+        """Block until a message is sent or deleted, or the real timeout passes."""
+        with self._changed:
+            self._changed.wait(real_timeout)
+
+    def depth(self, queue: FakeQueue) -> Tuple[int, int]:
+        """(visible, in flight) message counts."""
+        with self._lock:
+            return len(queue.messages), len(queue.in_flight)
+
+    def oldest_age(self, queue: FakeQueue) -> float:
+        """Age of the oldest message not yet deleted, like ApproximateAgeOfOldestMessage (0 when empty)."""
+        now = self.clock.now()
+        with self._lock:
+            oldest = min((m.sent_at for m in list(queue.messages) + list(queue.in_flight.values())), default=now)
+        return now - oldest
+
+
+# =============================================================================
+# DynamoDB
+# =============================================================================
+
+class FakeDynamoDB(_Service):
+    """Tables of attribute-value items with conditional writes."""
+
+    def __init__(self, clock: SimClock, latency: LatencyModel = None, seed: int = 0):
+        super().__init__(clock, latency or LatencyModel(median=0.008, sigma=0.3), seed)
+        self.tables: Dict[str, Tuple[Tuple[str, ...], Dict[Tuple, Dict[str, Any]]]] = {}
+        self.conditional_check_failures = 0
+
+        class ConditionalCheckFailedException(ClientError):
+            pass
+
+        class ResourceNotFoundException(ClientError):
+            pass
+
+        class Exceptions:
+            pass
+
+        self.exceptions = Exceptions()
+        self.exceptions.ConditionalCheckFailedException = ConditionalCheckFailedException
+        self.exceptions.ResourceNotFoundException = ResourceNotFoundException
+
+    def create_table(self, name: str, key_attributes: Tuple[str, ...] = ('pk',)) -> None:
+        self.tables[name] = (tuple(key_attributes), {})
+
+    def items(self, name: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.tables[name][1].values())
+
+    def _table(self, name: str, operation: str):
+        if name not in self.tables:
+            raise self.exceptions.ResourceNotFoundException(
+                {'Error': {'Code': 'ResourceNotFoundException', 'Message': 'Requested resource not found'}},
+                operation)
+        return self.tables[name]
+
+    @staticmethod
+    def _key(key_attributes, item) -> Tuple:
+        return tuple(json.dumps(item[attr], sort_keys=True) for attr in key_attributes)
+
+    def _check_condition(self, expression: Optional[str], existing: Optional[Dict[str, Any]],
+                         names: Dict[str, str], operation: str) -> None:
+        if not expression:
+            return
+        for function, attribute in re.findall(r'(attribute_not_exists|attribute_exists)\(\s*([#\w]+)\s*\)',
+                                              expression):
+            attribute = names.get(attribute, attribute)
+            present = existing is not None and attribute in existing
+            if present == (function == 'attribute_not_exists'):
+                with self._lock:
+                    self.conditional_check_failures += 1
+                raise self.exceptions.ConditionalCheckFailedException(
+                    {'Error': {'Code': 'ConditionalCheckFailedException',
+                               'Message': 'The conditional request failed'}}, operation)
+
+    # Client API
+
+    def put_item(self, TableName, Item, ConditionExpression=None, ExpressionAttributeNames=None, **kwargs):
+        key_attributes, items = self._table(TableName, 'PutItem')
+        self._wait('put_item')
+        key = self._key(key_attributes, Item)
+        with self._lock:
+            existing = items.get(key)
+        self._check_condition(ConditionExpression, existing, ExpressionAttributeNames or {}, 'PutItem')
+        with self._lock:
+            items[key] = dict(Item)
+        return {'ResponseMetadata': _response_metadata(self.clock)}
+
+    def get_item(self, TableName, Key, **kwargs):
+        key_attributes, items = self._table(TableName, 'GetItem')
+        self._wait('get_item')
+        with self._lock:
+            item = items.get(self._key(key_attributes, Key))
+        response = {'ResponseMetadata': _response_metadata(self.clock)}
+        if item is not None:
+            response['Item'] = dict(item)
+        return response
+
+    def update_item(self, TableName, Key, UpdateExpression, ExpressionAttributeNames=None,
+                    ExpressionAttributeValues=None, ConditionExpression=None, **kwargs):
+        key_attributes, items = self._table(TableName, 'UpdateItem')
+        self._wait('update_item')
+        names = ExpressionAttributeNames or {}
+        values = ExpressionAttributeValues or {}
+        key = self._key(key_attributes, Key)
+        with self._lock:
+            existing = items.get(key)
+        self._check_condition(ConditionExpression, existing, names, 'UpdateItem')
+
+        assignments = re.match(r'\s*SET\s+(.+)$', UpdateExpression, re.IGNORECASE)
+        if not assignments:
+            raise client_error('ValidationException', f"Unsupported UpdateExpression: {UpdateExpression}",
+                               'UpdateItem')
+        with self._lock:
+            item = dict(items.get(key) or Key)
+            for assignment in assignments.group(1).split(','):
+                attribute, value = (part.strip() for part in assignment.split('='))
+                item[names.get(attribute, attribute)] = values[value]
+            items[key] = item
+        return {'ResponseMetadata': _response_metadata(self.clock)}
+
+
+# =============================================================================
+# Bedrock
+# =============================================================================
+
+@dataclass
+class ModelProfile:
+    """Behaviour of one Bedrock model: latency, output speed, quota and injected faults."""
+    latency: LatencyModel = field(default_factory=lambda: LatencyModel(median=2.5, sigma=0.35))
+    output_tokens_per_second: float = 60.0
+    requests_per_minute: Optional[float] = None
+    faults: FaultProfile = field(default_factory=FaultProfile)
+
+
+# The response a request should get: (category, result fields) or None to let the oracle decide
+Oracle = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: float, now: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, per_minute / 60.0 * 5)  # about 5 s of burst
+        self.tokens = self.capacity
+        self.updated = now
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class FakeBedrock(_Service):
+    """
+    bedrock-runtime converse/invoke_model. The oracle maps a request to the
+    answer a correct model would give (see documents.DocumentOracle); the model
+    profile decides how long it takes and whether it fails instead.
+    """
+
+    def __init__(self, clock: SimClock, oracle: Oracle, models: Dict[str, ModelProfile] = None,
+                 default_profile: ModelProfile = None, seed: int = 0):
+        super().__init__(clock, None, seed)
+        self.oracle = oracle
+        self.models = dict(models or {})
+        self.default_profile = default_profile or ModelProfile()
+        self.usage = Counter()
+        self.outcomes = Counter()
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._ids = itertools.count(1)
+
+    def profile(self, model_id: str) -> ModelProfile:
+        return self.models.get(model_id, self.default_profile)
+
+    def _admit(self, model_id: str, operation: str) -> str:
+        """Throttling and error injection. Returns the normal/content_filtered/malformed outcome."""
+        profile = self.profile(model_id)
+        now = self.clock.now()
+        if profile.requests_per_minute:
+            with self._lock:
+                bucket = self._buckets.setdefault(model_id, _TokenBucket(profile.requests_per_minute, now))
+                admitted = bucket.take(now)
+            if not admitted:
+                self._count(model_id, 'throttled')
+                raise client_error('ThrottlingException', 'Too many requests, please wait before trying again.',
+                                   operation, 429)
+
+        faults = profile.faults
+        draw = self._random()
+        for outcome, rate in (('throttled', faults.throttle_rate), ('error', faults.error_rate),
+                              ('content_filtered', faults.content_filter_rate),
+                              ('malformed', faults.malformed_rate)):
+            if draw < rate:
+                break
+            draw -= rate
+        else:
+            outcome = 'ok'
+
+        if outcome == 'throttled':
+            self._count(model_id, 'throttled')
+            self.clock.sleep(0.05)
+            raise client_error('ThrottlingException', 'Too many tokens, please wait before trying again.',
+                               operation, 429)
+        if outcome == 'error':
+            self._count(model_id, 'error')
+            self.clock.sleep(profile.latency.median / 2)
+            raise client_error('ModelErrorException', 'The model encountered an error processing the request.',
+                               operation, 424)
+        return outcome
+
+    def _count(self, model_id: str, outcome: str) -> None:
+        with self._lock:
+            self.outcomes[(model_id, outcome)] += 1
+
+    @staticmethod
+    def _input_tokens(messages: List[Dict[str, Any]], system) -> int:
+        chars = len(json.dumps(system or '', ensure_ascii=False))
+        documents = 0
+        for message in messages:
+            for block in message.get('content', []):
+                if 'document' in block or block.get('type') == 'document':
+                    documents += 1
+                else:
+                    chars += len(block.get('text', ''))
+        return chars // 4 + documents * 1500
+
+    def _answer(self, request: Dict[str, Any], outcome: str) -> Tuple[Optional[Dict[str, Any]], str, str]:
+        """(tool input or None, text, stop reason) for a request."""
+        answer = self.oracle(request)
+        tool = request.get('tool_name')
+        if outcome == 'content_filtered':
+            return None, 'I cannot help with this document.', 'content_filtered'
+        text = json.dumps(answer, ensure_ascii=False)
+        if outcome == 'malformed':
+            # Cut off mid-string, as a response that ran out of tokens
+            return None, text[:max(10, len(text) // 2)], 'max_tokens'
+        if tool:
+            return answer, '', 'tool_use'
+        return None, text, 'end_turn'
+
+    def _generate(self, model_id: str, operation: str, request: Dict[str, Any]):
+        outcome = self._admit(model_id, operation)
+        tool_input, text, stop_reason = self._answer(request, outcome)
+        input_tokens = self._input_tokens(request['messages'], request.get('system'))
+        output_tokens = max(1, len(json.dumps(tool_input) if tool_input is not None else text) // 4)
+        profile = self.profile(model_id)
+        self._wait(f"{operation}:{model_id}", output_tokens / profile.output_tokens_per_second, profile.latency)
+        self._count(model_id, outcome)
+        with self._lock:
+            self.usage[(model_id, 'input_tokens')] += input_tokens
+            self.usage[(model_id, 'output_tokens')] += output_tokens
+        return tool_input, text, stop_reason, input_tokens, output_tokens
+
+    # Client API
+
+    def converse(self, modelId, messages, inferenceConfig=None, system=None, toolConfig=None, **kwargs):
+        tool_name = None
+        if toolConfig:
+            tool_name = toolConfig['tools'][0]['toolSpec']['name']
+        request = {'model_id': modelId, 'messages': messages, 'system': system, 'tool_name': tool_name}
+        tool_input, text, stop_reason, input_tokens, output_tokens = self._generate(modelId, 'converse', request)
+
+        content = [{'text': text}] if text else []
+        if tool_input is not None:
+            content.append({'toolUse': {'toolUseId': f"tooluse_{next(self._ids)}", 'name': tool_name,
+                                        'input': tool_input}})
+        return {
+            'ResponseMetadata': _response_metadata(self.clock),
+            'output': {'message': {'role': 'assistant', 'content': content}},
+            'stopReason': stop_reason,
+            'usage': {'inputTokens': input_tokens, 'outputTokens': output_tokens,
+                      'totalTokens': input_tokens + output_tokens},
+            'metrics': {'latencyMs': 0}
+        }
+
+    def invoke_model(self, modelId, body, contentType=None, accept=None, **kwargs):
+        payload = json.loads(body)
+        tool_name = payload['tools'][0]['name'] if payload.get('tools') else None
+        request = {'model_id': modelId, 'messages': payload.get('messages', []), 'system': payload.get('system'),
+                   'tool_name': tool_name}
+        tool_input, text, stop_reason, input_tokens, output_tokens = self._generate(modelId, 'invoke_model',
+                                                                                    request)
+        if stop_reason == 'content_filtered':
+            stop_reason = 'refusal'
+        content = [{'type': 'text', 'text': text}] if text else []
+        if tool_input is not None:
+            content.append({'type': 'tool_use', 'id': f"toolu_{next(self._ids)}", 'name': tool_name,
+                            'input': tool_input})
+        response_body = {
+            'id': f"msg_{uuid.uuid4().hex[:24]}", 'type': 'message', 'role': 'assistant', 'model': modelId,
+            'content': content, 'stop_reason': stop_reason,
+            'usage': {'input_tokens': input_tokens, 'output_tokens': output_tokens}
+        }
+        return {
+            'ResponseMetadata': _response_metadata(self.clock),
+            'contentType': 'application/json',
+            'body': io.BytesIO(json.dumps(response_body, ensure_ascii=False).encode('utf-8'))
+        }
+
+
+def request_documents(request: Dict[str, Any]) -> Tuple[List[str], List[bytes], List[str]]:
+    """
+    What a Bedrock request carries about the document: S3 URIs of document
+    blocks, raw document bytes (Converse bytes or Anthropic base64) and texts.
+    """
+    uris, blobs, texts = [], [], []
+    for message in request.get('messages', []):
+        for block in message.get('content', []):
+            if 'document' in block:
+                source = block['document'].get('source', {})
+                if 's3Location' in source:
+                    uris.append(source['s3Location']['uri'])
+                elif 'bytes' in source:
+                    blobs.append(source['bytes'])
+            elif block.get('type') == 'document':
+                blobs.append(base64.b64decode(block['source']['data']))
+            elif 'text' in block:
+                texts.append(block['text'])
+    return uris, blobs, texts
+
+
+# =============================================================================
+# Textract
+# =============================================================================
+
+@dataclass
+class TextractJob:
+    job_id: str
+    bucket: str
+    key: str
+    started_at: float
+    ready_at: float
+    failed: bool
+    blocks: List[Dict[str, Any]]
+
+
+class FakeTextract(_Service):
+    """Asynchronous text detection jobs whose LINE blocks come from a text source."""
+
+    def __init__(self, clock: SimClock, s3: FakeS3, text_source: Callable[[str, str, bytes], List[List[str]]],
+                 job_latency: LatencyModel = None, latency: LatencyModel = None,
+                 faults: FaultProfile = None, page_size: int = 1000, seed: int = 0):
+        super().__init__(clock, latency or LatencyModel(median=0.05, sigma=0.3), seed)
+        self.s3 = s3
+        self.text_source = text_source
+        self.job_latency = job_latency or LatencyModel(median=6.0, sigma=0.4, per_unit=1.5)
+        self.faults = faults or FaultProfile()
+        self.page_size = page_size
+        self.jobs: Dict[str, TextractJob] = {}
+
+    @staticmethod
+    def build_blocks(pages: List[List[str]]) -> List[Dict[str, Any]]:
+        blocks = []
+        for page_number, lines in enumerate(pages, 1):
+            blocks.append({'BlockType': 'PAGE', 'Id': uuid.uuid4().hex, 'Page': page_number})
+            height = 0.9 / max(len(lines), 1)
+            for index, line in enumerate(lines):
+                blocks.append({
+                    'BlockType': 'LINE', 'Id': uuid.uuid4().hex, 'Page': page_number, 'Text': line,
+                    'Confidence': 99.0,
+                    'Geometry': {'BoundingBox': {'Top': 0.05 + index * height, 'Left': 0.1,
+                                                 'Width': 0.8, 'Height': height * 0.8}}
+                })
+        return blocks
+
+    # Client API
+
+    def start_document_text_detection(self, DocumentLocation, **kwargs):
+        location = DocumentLocation['S3Object']
+        self._wait('start_document_text_detection')
+        if self._random() < self.faults.throttle_rate:
+            raise client_error('ProvisionedThroughputExceededException', 'Rate exceeded',
+                               'StartDocumentTextDetection')
+        obj = self.s3.get(location['Bucket'], location['Name'])
+        if obj is None:
+            raise client_error('InvalidS3ObjectException', 'Unable to get object metadata from S3.',
+                               'StartDocumentTextDetection')
+        pages = self.text_source(location['Bucket'], location['Name'], obj.body)
+        now = self.clock.now()
+        with self._lock:
+            duration = self.job_latency.sample(self._rng, len(pages))
+        job = TextractJob(job_id=uuid.uuid4().hex, bucket=location['Bucket'], key=location['Name'],
+                          started_at=now, ready_at=now + duration,
+                          failed=self._random() < self.faults.error_rate, blocks=self.build_blocks(pages))
+        with self._lock:
+            self.jobs[job.job_id] = job
+        return {'JobId': job.job_id, 'ResponseMetadata': _response_metadata(self.clock)}
+
+    def get_document_text_detection(self, JobId, NextToken=None, MaxResults=None, **kwargs):
+        self._wait('get_document_text_detection')
+        job = self.jobs.get(JobId)
+        if job is None:
+            raise client_error('InvalidJobIdException', 'Invalid job id', 'GetDocumentTextDetection')
+        metadata = _response_metadata(self.clock)
+        if self.clock.now() < job.ready_at:
+            return {'JobStatus': 'IN_PROGRESS', 'ResponseMetadata': metadata}
+        if job.failed:
+            return {'JobStatus': 'FAILED', 'StatusMessage': 'Simulated job failure', 'ResponseMetadata': metadata}
+
+        size = MaxResults or self.page_size
+        start = int(NextToken or 0)
+        response = {
+            'JobStatus': 'SUCCEEDED',
+            'DocumentMetadata': {'Pages': max((b['Page'] for b in job.blocks), default=0)},
+            'Blocks': job.blocks[start:start + size],
+            'ResponseMetadata': metadata
+        }
+        if start + size < len(job.blocks):
+            response['NextToken'] = str(start + size)
+        return response
+
+
+# =============================================================================
+# boto3 entry points
+# =============================================================================
+
+class FakeAWS:
+    """
+    The fake services behind boto3.client()/boto3.Session().client().
+
+    Args:
+        clock: Simulated clock
+        oracle: Answer source of FakeBedrock
+        textract_text: Page texts FakeTextract returns for an S3 object
+        models: Bedrock model profiles by model id
+        textract_faults: Faults of Textract jobs
+        client_latency: Cost of creating a client (boto3 client creation is not free)
+        seed: Random seed
+    """
+
+    def __init__(self, clock: SimClock, oracle: Oracle,
+                 textract_text: Callable[[str, str, bytes], List[List[str]]],
+                 models: Dict[str, ModelProfile] = None, default_model: ModelProfile = None,
+                 textract_faults: FaultProfile = None, textract_job_latency: LatencyModel = None,
+                 client_latency: LatencyModel = None, region: str = 'us-east-2', seed: int = 0):
+        self.clock = clock
+        self.s3 = FakeS3(clock, seed=seed + 1)
+        self.sqs = FakeSQS(clock, seed=seed + 2, region=region)
+        self.dynamodb = FakeDynamoDB(clock, seed=seed + 3)
+        self.bedrock = FakeBedrock(clock, oracle, models, default_model, seed=seed + 4)
+        self.textract = FakeTextract(clock, self.s3, textract_text, job_latency=textract_job_latency,
+                                     faults=textract_faults, seed=seed + 5)
+        self.client_latency = client_latency or LatencyModel()
+        self.clients_created = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._services = {'s3': self.s3, 'sqs': self.sqs, 'dynamodb': self.dynamodb,
+                          'bedrock-runtime': self.bedrock, 'textract': self.textract}
+
+    def client(self, service_name, region_name=None, config=None, **kwargs):
+        if service_name not in self._services:
+            raise ValueError(f"Service not simulated: {service_name}")
+        with self._lock:
+            self.clients_created[service_name] += 1
+            delay = self.client_latency.sample(self._rng)
+        self.clock.sleep(delay)
+        return self._services[service_name]
+
+    def session(self, *args, **kwargs):
+        fake = self
+
+        class Session:
+            def client(self, service_name=None, region_name=None, config=None, **kw):
+                return fake.client(service_name, region_name, config)
+
+        return Session()
+
+    def use_bedrock(self, bedrock: FakeBedrock) -> None:
+        """Serve bedrock-runtime clients from another FakeBedrock (e.g. a replay of recorded responses)."""
+        self.bedrock = bedrock
+        self._services['bedrock-runtime'] = bedrock
+
+    def call_counts(self) -> Dict[str, int]:
+        """Calls per service operation (bedrock operations are per model)."""
+        counts = {}
+        for name, service in self._services.items():
+            for operation, count in service.calls.items():
+                counts[f"{name}.{operation}"] = count
+        return counts
+
+    @contextmanager
+    def patch(self):
+        """Route boto3.client and boto3.Session to the fakes."""
+        original_client, original_session = boto3.client, boto3.Session
+        boto3.client = self.client
+        boto3.Session = self.session
+        try:
+            yield self
+        finally:
+            boto3.client, boto3.Session = original_client, original_session
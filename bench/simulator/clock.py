@@ -0,0 +1,86 @@
+"""
+Simulated time for the pipeline simulator.
+
+The handlers wait a lot: BATCH_PROCESSING_DELAY between documents,
+INTER_CALL_DELAY before every Bedrock call, exponential backoff on throttling
+and 10 s Textract polling. SimClock runs all of it time_scale times faster:
+every simulated second lasts time_scale real seconds. The loaded handler
+modules get a ScaledTime in place of the time module (and a scaled
+threading.Event for cancellable waits), so their sleeps, time.time() and
+perf_counter() all run on the simulated clock.
+
+CPU work is not scaled: at small time scales, CPU-bound steps (PDF parsing,
+JSON cleaning) look time_scale^-1 times slower in simulated time. Use
+time_scale=1 to measure them.
+"""
+
+import threading
+import time as _time
+
+
+class SimClock:
+    """Simulated seconds since the clock started."""
+
+    def __init__(self, time_scale: float = 1.0):
+        if time_scale <= 0:
+            raise ValueError("time_scale must be positive")
+        self.time_scale = time_scale
+        self._start = _time.perf_counter()
+        self._epoch = _time.time()
+
+    def now(self) -> float:
+        """Simulated seconds since start."""
+        return (_time.perf_counter() - self._start) / self.time_scale
+
+    def epoch(self) -> float:
+        """Simulated Unix time."""
+        return self._epoch + self.now()
+
+    def real_seconds(self, simulated: float) -> float:
+        return simulated * self.time_scale
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            _time.sleep(seconds * self.time_scale)
+
+    def wait(self, event: threading.Event, timeout: float = None) -> bool:
+        """Wait for an event for a simulated timeout."""
+        return event.wait(None if timeout is None else timeout * self.time_scale)
+
+
+class ScaledTime:
+    """Drop-in for the time module of a loaded handler: waits and clocks run on a SimClock."""
+
+    def __init__(self, clock: SimClock):
+        self._clock = clock
+
+    def sleep(self, seconds):
+        self._clock.sleep(seconds)
+
+    def time(self):
+        return self._clock.epoch()
+
+    def perf_counter(self):
+        return self._clock.now()
+
+    def monotonic(self):
+        return self._clock.now()
+
+    def __getattr__(self, name):
+        return getattr(_time, name)
+
+
+class ScaledThreading:
+    """Drop-in for the threading module of a loaded handler: Event.wait timeouts are simulated."""
+
+    def __init__(self, clock: SimClock):
+        clock_ = clock
+
+        class Event(threading.Event):
+            def wait(self, timeout=None):
+                return super().wait(None if timeout is None else timeout * clock_.time_scale)
+
+        self.Event = Event
+
+    def __getattr__(self, name):
+        return getattr(threading, name)
@@ -0,0 +1,298 @@
+"""
+Documents for the pipeline simulator and the oracle that answers for them.
+
+SimDocument is one PDF in the origin bucket with its ground truth: the
+category a correct classifier returns and the fields a correct extraction
+returns (valid against the category schema). Documents come from
+synthetic_documents(), which writes small text PDFs (or image-only "scanned"
+ones, with no text layer, to exercise the Textract path), or from
+corpus_documents(), which loads testing/test_documents/{CATEGORY}/{number}/*.pdf.
+
+Every synthetic PDF carries a reference line ("Referencia: SIM-...") in its
+text, so DocumentOracle can tell which document a Bedrock request is about
+whether it arrives as an S3 location, PDF bytes or extracted text.
+"""
+
+import io
+import logging
+import random
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ('CERL', 'CECRL', 'RUT', 'RUB', 'ACC')
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CORPUS_DIR = REPO_ROOT / 'testing' / 'test_documents'
+
+_COMPANIES = ('INVERSIONES ANDINAS', 'TRANSPORTES DEL CARIBE', 'AGROINDUSTRIAL LLANOS', 'SERVICIOS TECNICOS',
+              'CONSTRUCTORA PACIFICO', 'COMERCIALIZADORA NORTE', 'DISTRIBUIDORA CENTRAL', 'LOGISTICA ORIENTE')
+_SUFFIXES = ('S.A.S.', 'S.A.', 'LTDA')
+_FIRST_NAMES = ('MARIA', 'JUAN', 'CAROLINA', 'ANDRES', 'LUISA', 'FELIPE', 'DIANA', 'CARLOS')
+_LAST_NAMES = ('GOMEZ', 'RODRIGUEZ', 'MARTINEZ', 'LOPEZ', 'GARCIA', 'HERNANDEZ', 'RAMIREZ', 'TORRES')
+_TITLES = {
+    'CERL': 'CERTIFICADO DE EXISTENCIA Y REPRESENTACION LEGAL',
+    'CECRL': 'CEDULA DE CIUDADANIA DEL REPRESENTANTE LEGAL',
+    'RUT': 'REGISTRO UNICO TRIBUTARIO - DIAN',
+    'RUB': 'REGISTRO UNICO DE BENEFICIARIOS FINALES',
+    'ACC': 'COMPOSICION ACCIONARIA',
+}
+_FILLER = ('La sociedad tiene por objeto social principal la prestacion de servicios y el comercio en general.',
+           'Matricula mercantil renovada el 15 de marzo del ano en curso ante la camara de comercio.',
+           'El representante legal tendra las facultades establecidas en los estatutos sociales vigentes.',
+           'Este certificado refleja la situacion juridica registral de la sociedad a la fecha de expedicion.',
+           'Los actos de registro aqui certificados quedan en firme diez dias habiles despues de su inscripcion.')
+
+
+@dataclass
+class SimDocument:
+    """A PDF in the origin bucket and the answers a correct model gives for it."""
+    key: str
+    category: str
+    document_number: str
+    pdf: bytes
+    fields: Dict[str, Any]
+    pages: Optional[List[List[str]]] = None
+    reference: Optional[str] = None
+    scanned: bool = False
+
+    @property
+    def file_id(self) -> str:
+        return Path(self.key).stem
+
+    def text_pages(self) -> List[List[str]]:
+        """Lines per page, as OCR would read them (corpus PDFs: their text layer)."""
+        if self.pages is None:
+            self.pages = _pdf_text_pages(self.pdf)
+        return self.pages
+
+    def text(self, limit: int = None) -> str:
+        text = '\n'.join(line for page in self.text_pages() for line in page)
+        return text[:limit] if limit else text
+
+
+def _pdf_text_pages(pdf_bytes: bytes) -> List[List[str]]:
+    try:
+        from PyPDF2 import PdfReader
+        reader = PdfReader(io.BytesIO(pdf_bytes))
+        return [[line for line in (page.extract_text() or '').splitlines() if line.strip()] for page in reader.pages]
+    except Exception as e:
+        logger.warning(f"Could not read PDF text: {e}")
+        return [[]]
+
+
+def _pdf_string(text: str) -> str:
+    encoded = text.encode('latin-1', 'replace').decode('latin-1')
+    return encoded.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def build_pdf(pages: Sequence[Sequence[str]], text_layer: bool = True, marker: str = None) -> bytes:
+    """
+    Minimal PDF with one Helvetica text line per entry, uncompressed. Without a
+    text layer each page only draws boxes where the lines are, like a scan.
+    The marker goes into a comment of every page's content stream: invisible
+    to text extraction, but kept in the bytes of any page copy.
+    """
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None,
+               '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>']
+    page_ids = []
+    for lines in pages:
+        if text_layer:
+            body = ['BT /F1 10 Tf 14 TL 50 800 Td'] + [f"({_pdf_string(line)}) '" for line in lines] + ['ET']
+        else:
+            body = [f"50 {790 - 14 * i} {min(500, 5 * len(line))} 9 re f" for i, line in enumerate(lines)]
+        if marker:
+            body.insert(0, f"% {marker}")
+        stream = '\n'.join(body).encode('latin-1')
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode('latin-1') + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(output.tell())
+        data = obj if isinstance(obj, bytes) else obj.encode('latin-1')
+        output.write(f"{number} 0 obj\n".encode('latin-1') + data + b"\nendobj\n")
+    xref = output.tell()
+    output.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1'))
+    output.write(''.join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1'))
+    output.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1'))
+    return output.getvalue()
+
+
+def expected_fields(category: str, rng: random.Random, document_number: str) -> Dict[str, Any]:
+    """Extraction result of a correct model for a document of the category (schema-valid)."""
+    company = f"{rng.choice(_COMPANIES)} {rng.choice(_SUFFIXES)}"
+    tax_id = f"{document_number[:3]}.{document_number[3:6]}.{document_number[6:9] or '000'}-{rng.randint(0, 9)}"
+    first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+    if category == 'CECRL':
+        return {'result': {'FirstName': first, 'LastName': last, 'IdentificationNumber': document_number}}
+    if category == 'ACC':
+        return {'result': {
+            'PrincipalCompanyName': company, 'TaxId': tax_id,
+            'RelatedParties': [{'Type': 'person', 'FirstName': first, 'LastName': last,
+                                'IdentificationNumber': str(rng.randint(10**7, 10**9))}]
+        }}
+    return {'result': {'CompanyName': company, 'TaxId': tax_id}}
+
+
+def union_fields(document_number: str = '900000000') -> Dict[str, Any]:
+    """A result valid for every category schema (answer for documents the oracle cannot place)."""
+    fields = {}
+    for category in CATEGORIES:
+        fields.update(expected_fields(category, random.Random(0), document_number)['result'])
+    return {'result': fields}
+
+
+def _document_lines(category: str, fields: Dict[str, Any], document_number: str, reference: str,
+                    rng: random.Random, lines: int) -> List[str]:
+    result = fields['result']
+    header = [_TITLES.get(category, 'DOCUMENTO'), f"Referencia: {reference}", f"Numero: {document_number}"]
+    header += [f"{name}: {value}" for name, value in result.items() if isinstance(value, str)]
+    return header + [rng.choice(_FILLER) for _ in range(max(0, lines - len(header)))]
+
+
+def synthetic_documents(count: int, folder_prefix: str = 'par-servicios-poc',
+                        categories: Sequence[str] = CATEGORIES, scanned_rate: float = 0.0,
+                        blank_rate: float = 0.0, pages: Sequence[int] = (1, 3), lines_per_page: int = 30,
+                        seed: int = 7) -> List[SimDocument]:
+    """
+    Generate text PDFs with known categories and fields.
+
+    Args:
+        count: Number of documents
+        folder_prefix: Prefix of the origin keys ({prefix}/{category}/{number}/{file}.pdf)
+        categories: Categories to draw from (uniformly)
+        scanned_rate: Share of documents without a text layer (PyPDF finds no text)
+        blank_rate: Share of documents a correct model classifies as BLANK (no extraction)
+        pages: Inclusive range of pages per document
+        lines_per_page: Text lines per page
+        seed: Random seed
+
+    Returns:
+        list: SimDocuments
+    """
+    rng = random.Random(seed)
+    documents = []
+    for index in range(count):
+        folder_category = rng.choice(list(categories))
+        category = 'BLANK' if rng.random() < blank_rate else folder_category
+        document_number = str(rng.randint(800000000, 999999999))
+        reference = f"SIM-{document_number}-{index:05d}"
+        fields = expected_fields(folder_category, rng, document_number)
+        scanned = rng.random() < scanned_rate
+        page_lines = [_document_lines(folder_category, fields, document_number, reference, rng, lines_per_page)
+                      for _ in range(rng.randint(pages[0], pages[-1]))]
+        key = f"{folder_prefix}/{folder_category}/{document_number}/doc_{index:05d}_{folder_category}.pdf"
+        documents.append(SimDocument(
+            key=key, category=category, document_number=document_number,
+            pdf=build_pdf(page_lines, text_layer=not scanned, marker=reference), fields=fields,
+            pages=page_lines, reference=reference, scanned=scanned
+        ))
+    return documents
+
+
+def corpus_documents(root: Path = CORPUS_DIR, folder_prefix: str = 'par-servicios-poc', limit: int = None,
+                     categories: Iterable[str] = CATEGORIES, seed: int = 7) -> List[SimDocument]:
+    """
+    Load the real test PDFs. The folder category is the ground truth category;
+    fields are synthetic but schema-valid.
+
+    Args:
+        root: Corpus directory ({root}/{CATEGORY}/{number}/*.pdf)
+        folder_prefix: Prefix of the origin keys
+        limit: Maximum number of documents (spread over categories in file order)
+        categories: Categories to load
+        seed: Random seed of the synthetic fields
+
+    Returns:
+        list: SimDocuments
+    """
+    rng = random.Random(seed)
+    paths = sorted(p for category in categories for p in (Path(root) / category).glob('*/*.pdf'))
+    if limit is not None:
+        # Round-robin over categories so small samples cover all of them
+        by_category = {}
+        for path in paths:
+            by_category.setdefault(path.parts[-3], []).append(path)
+        paths = [p for group in zip(*by_category.values()) for p in group][:limit] if by_category else []
+    documents = []
+    for path in paths:
+        category, document_number = path.parts[-3], path.parts[-2]
+        documents.append(SimDocument(
+            key=f"{folder_prefix}/{category}/{document_number}/{path.name}",
+            category=category, document_number=document_number, pdf=path.read_bytes(),
+            fields=expected_fields(category, rng, document_number)
+        ))
+    return documents
+
+
+class DocumentOracle:
+    """
+    Answers Bedrock requests the way a correct model would, for known documents.
+
+    A request is matched to a document by its S3 location, by the reference
+    line in its text or PDF bytes, or by the exact PDF bytes. It is a
+    classification request when it calls the classification tool or carries
+    one of the classification prompts.
+    """
+
+    def __init__(self, documents: Iterable[SimDocument], bucket: str,
+                 classification_prompts: Iterable[str] = (), classification_tool: str = 'record_classification'):
+        self.by_uri: Dict[str, SimDocument] = {}
+        self.by_reference: Dict[str, SimDocument] = {}
+        self.by_bytes: Dict[bytes, SimDocument] = {}
+        self.classification_prompts: Set[str] = set(classification_prompts)
+        self.classification_tool = classification_tool
+        self.unresolved = 0
+        for document in documents:
+            self.by_uri[f"s3://{bucket}/{document.key}"] = document
+            self.by_bytes[document.pdf] = document
+            if document.reference:
+                self.by_reference[document.reference] = document
+        self._reference = re.compile(r'SIM-\d{6,}-\d{5}')
+
+    def resolve(self, uris: List[str], blobs: List[bytes], texts: List[str]) -> Optional[SimDocument]:
+        for uri in uris:
+            if uri in self.by_uri:
+                return self.by_uri[uri]
+        for blob in blobs:
+            if blob in self.by_bytes:
+                return self.by_bytes[blob]
+        for content in texts + [blob.decode('latin-1') for blob in blobs]:
+            match = self._reference.search(content)
+            if match and match.group(0) in self.by_reference:
+                return self.by_reference[match.group(0)]
+        return None
+
+    def is_classification(self, request: Dict[str, Any], texts: List[str]) -> bool:
+        if request.get('tool_name'):
+            return request['tool_name'] == self.classification_tool
+        return any(text in self.classification_prompts for text in texts)
+
+    def __call__(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        from .aws_fakes import request_documents
+
+        uris, blobs, texts = request_documents(request)
+        document = self.resolve(uris, blobs, texts)
+        if document is None:
+            self.unresolved += 1
+        if self.is_classification(request, texts):
+            if document is None:
+                return {'category': 'BY_REVIEW', 'text': ''}
+            return {'category': document.category, 'text': document.text(limit=2000)}
+        return document.fields if document is not None else union_fields()
+
+    def textract_pages(self, bucket: str, key: str, body: bytes) -> List[List[str]]:
+        """Page texts FakeTextract returns for an object."""
+        document = self.by_uri.get(f"s3://{bucket}/{key}") or self.by_bytes.get(body)
+        if document is None:
+            return [["DOCUMENTO SIN IDENTIFICAR"]]
+        return document.text_pages()
@@ -0,0 +1,127 @@
+"""
+Drive a single function's handler with SQS batches against the fakes.
+
+Unlike PipelineSimulator, nothing polls the queues: every call to invoke()
+is one handler invocation on one warm container, with a batch built the way
+the upstream stage would build it (S3 event notifications for classification,
+classification's extraction payload for extraction-scoring and
+fallback-processing). Messages the handler sends downstream stay in the fake
+queues.
+
+Usage:
+    harness = HandlerHarness('extraction-scoring', synthetic_documents(9), SimulationConfig(time_scale=0.01))
+    with harness.active():
+        for batch in harness.batches(3):
+            print(harness.invoke(batch))
+"""
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import List, Optional, Sequence
+
+from .documents import SimDocument
+from .pipeline import (
+    DEFAULT_ENV,
+    ORIGIN_BUCKET,
+    LambdaContext,
+    SimulatedAccount,
+    SimulationConfig,
+    default_functions,
+    extraction_body,
+    s3_event_body,
+    sqs_record,
+)
+
+
+@dataclass
+class BatchResult:
+    """One invocation of a handler. Durations are simulated seconds, CPU time is real."""
+    function: str
+    size: int
+    seconds: float
+    cpu_seconds: float
+    status_code: Optional[int]
+    failed_messages: int
+    error: Optional[str] = None
+
+
+class HandlerHarness(SimulatedAccount):
+    """
+    Invokes one function with synthetic SQS batches.
+
+    Args:
+        function: Function name (classification, extraction-scoring, fallback-processing)
+        documents: Documents the batches are built from
+        config: Simulation settings (config.functions is ignored)
+    """
+
+    def __init__(self, function: str, documents: Sequence[SimDocument], config: SimulationConfig = None):
+        config = config or SimulationConfig()
+        functions = [f for f in default_functions(config.concurrency) if f.name == function]
+        if not functions:
+            raise ValueError(f"Unknown function: {function}")
+        super().__init__(documents, replace(config, functions=functions))
+        self.loaded = self.functions[0]
+        self.queue = self.queues[self.loaded.config.queue]
+        self._receive_lock = threading.Lock()
+        for document in self.documents:
+            self.aws.s3.put(ORIGIN_BUCKET, document.key, document.pdf, 'application/pdf')
+
+    def body(self, document: SimDocument) -> str:
+        """The message body the upstream stage sends for a document."""
+        if self.loaded.config.name == 'classification':
+            return s3_event_body(document, self.aws.s3.get(ORIGIN_BUCKET, document.key), self.aws.sqs.region)
+        return extraction_body(document, self.env.get('BEDROCK_MODEL', DEFAULT_ENV['BEDROCK_MODEL']))
+
+    def batches(self, size: int) -> List[List[SimDocument]]:
+        """The documents split into batches of `size`."""
+        return [self.documents[i:i + size] for i in range(0, len(self.documents), size)]
+
+    def invoke(self, documents: Sequence[SimDocument]) -> BatchResult:
+        """
+        Invoke the handler with one SQS event holding a message per document.
+        Must run inside active(); concurrent calls each get their own messages.
+
+        Args:
+            documents: Documents of the batch
+
+        Returns:
+            BatchResult
+        """
+        sqs = self.aws.sqs
+        with self._receive_lock:
+            for document in documents:
+                sqs.enqueue(self.queue, self.body(document))
+            messages = sqs.receive(self.queue, len(documents))
+        event = {'Records': [sqs_record(m, self.queue, self.clock, sqs.region) for m in messages]}
+
+        started, cpu_started = self.clock.now(), time.process_time()
+        response, error = None, None
+        try:
+            response = self.loaded.handler(event, LambdaContext(self.loaded.config, self.clock, sqs.region))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        seconds, cpu_seconds = self.clock.now() - started, time.process_time() - cpu_started
+
+        failed = set()
+        if error:
+            failed = {m.message_id for m in messages}
+        elif self.loaded.config.report_batch_item_failures and isinstance(response, dict):
+            failed = {item.get('itemIdentifier') for item in response.get('batchItemFailures', [])}
+        for message in messages:
+            sqs.delete(self.queue, message)
+
+        return BatchResult(
+            function=self.loaded.config.name,
+            size=len(messages),
+            seconds=seconds,
+            cpu_seconds=cpu_seconds,
+            status_code=response.get('statusCode') if isinstance(response, dict) else None,
+            failed_messages=len(failed),
+            error=error,
+        )
+
+    def bedrock_calls(self) -> int:
+        """Bedrock requests so far, including throttled ones."""
+        return sum(self.aws.bedrock.outcomes.values())
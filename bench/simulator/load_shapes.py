@@ -0,0 +1,85 @@
+"""
+Arrival times for PipelineSimulator.run(arrivals=...) following a traffic shape.
+
+Every shape spreads `count` uploads over about `duration` simulated seconds:
+
+    poisson   uploads at a constant rate, with exponential gaps
+    burst     bulk uploads of a company folder: groups of burst_size documents
+              within burst_seconds, separated by quiet periods
+    ramp      a rate growing linearly from zero
+    diurnal   a sinusoidal daily cycle: the trough at the start, the peak
+              half a period later (amplitude 1 stops traffic at the trough)
+
+Usage:
+    times = arrivals('burst', 60, duration=1800, seed=1, burst_size=20)
+    report = PipelineSimulator(synthetic_documents(60), config).run(arrivals=times)
+"""
+
+import math
+import random
+from typing import Callable, Dict, List
+
+
+def poisson_arrivals(count: int, duration: float, rng: random.Random) -> List[float]:
+    rate = count / duration if duration > 0 else float('inf')
+    times, now = [], 0.0
+    for _ in range(count):
+        times.append(now)
+        now += rng.expovariate(rate) if rate != float('inf') else 0.0
+    return times
+
+
+def burst_arrivals(count: int, duration: float, rng: random.Random, burst_size: int = 20,
+                   burst_seconds: float = 30.0) -> List[float]:
+    bursts = max(1, math.ceil(count / burst_size))
+    spacing = duration / bursts
+    # Each burst starts somewhere in the first half of its slot, so the quiet periods vary
+    starts = [burst * spacing + rng.uniform(0.0, max(0.0, spacing - burst_seconds) / 2) for burst in range(bursts)]
+    return sorted(starts[index // burst_size] + rng.uniform(0.0, burst_seconds) for index in range(count))
+
+
+def ramp_arrivals(count: int, duration: float, rng: random.Random) -> List[float]:
+    # Inverse CDF of a density growing linearly over [0, duration]
+    return sorted(duration * math.sqrt(rng.random()) for _ in range(count))
+
+
+def diurnal_arrivals(count: int, duration: float, rng: random.Random, period: float = 86400.0,
+                     amplitude: float = 0.8) -> List[float]:
+    amplitude = min(max(amplitude, 0.0), 1.0)
+
+    def rate(t: float) -> float:
+        return 1.0 - amplitude * math.cos(2 * math.pi * t / period)
+
+    times = []
+    while len(times) < count:
+        t = rng.uniform(0.0, duration)
+        if rng.uniform(0.0, 1.0 + amplitude) < rate(t):
+            times.append(t)
+    return sorted(times)
+
+
+LOAD_SHAPES: Dict[str, Callable[..., List[float]]] = {
+    'poisson': poisson_arrivals,
+    'burst': burst_arrivals,
+    'ramp': ramp_arrivals,
+    'diurnal': diurnal_arrivals,
+}
+
+
+def arrivals(shape: str, count: int, duration: float, seed: int = 0, **params) -> List[float]:
+    """
+    Upload times of `count` documents in simulated seconds from the start.
+
+    Args:
+        shape: poisson, burst, ramp or diurnal
+        count: Number of documents
+        duration: Simulated seconds the uploads are spread over
+        seed: Random seed
+        **params: Shape parameters (burst: burst_size, burst_seconds; diurnal: period, amplitude)
+
+    Returns:
+        list: Sorted upload times
+    """
+    if shape not in LOAD_SHAPES:
+        raise ValueError(f"Unknown load shape: {shape} (expected one of {', '.join(LOAD_SHAPES)})")
+    return LOAD_SHAPES[shape](count, duration, random.Random(seed), **params)
@@ -0,0 +1,1012 @@
+"""
+End-to-end pipeline simulator: classification -> extraction-scoring -> fallback-processing.
+
+The real handlers run in-process against the fakes of aws_fakes, fed by SQS
+event source pollers that follow the event source mappings in terraform/main.tf:
+batches of up to batch_size messages, a batching window, a concurrency limit
+per function, ReportBatchItemFailures where it is configured, visibility
+timeouts and the classification dead-letter queue. Optionally, the mappings
+scale up gradually, poll more batches than the function may run (those
+invocations are throttled) and new execution environments pay a cold start. Documents are uploaded to
+the origin bucket and announced on the classification queue as S3 event
+notifications, like the bucket notification does.
+
+Each function is loaded with its own copy of the shared package (its
+prompt_loader reads its own instructions/ at import, as in its own bundle), its
+own environment on top of the common one, and the simulated clock. One loaded
+copy serves all concurrent invocations of a function, so module globals are
+shared between them, unlike separate Lambda containers.
+
+Usage:
+    simulator = PipelineSimulator(synthetic_documents(50), SimulationConfig(time_scale=0.01))
+    report = simulator.run()
+    print(report.format())
+"""
+
+import importlib
+import json
+import logging
+import os
+import pkgutil
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import quote_plus, unquote_plus
+
+from .aws_fakes import FakeAWS, FakeQueue, FaultProfile, LatencyModel, ModelProfile, S3Object, SQSMessage
+from .clock import ScaledThreading, ScaledTime, SimClock
+from .documents import DocumentOracle, SimDocument
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+FUNCTIONS_DIR = REPO_ROOT / 'functions'
+if str(FUNCTIONS_DIR) not in sys.path:
+    sys.path.insert(0, str(FUNCTIONS_DIR))
+
+EXTRACTABLE_CATEGORIES = {'CERL', 'CECRL', 'RUT', 'RUB', 'ACC'}
+ORIGIN_BUCKET = 'sim-filling-desk'
+DESTINATION_BUCKET = 'sim-json-evaluation-results'
+IDEMPOTENCY_TABLE = 'sim-idempotency'
+MANUAL_REVIEW_TABLE = 'sim-manual-review'
+
+# Environment shared by the three functions (terraform/main.tf, dev.tfvars.example models)
+DEFAULT_ENV = {
+    'REGION': 'us-east-2',
+    'FOLDER_PREFIX': 'par-servicios-poc',
+    'S3_ORIGIN_BUCKET': ORIGIN_BUCKET,
+    'DESTINATION_BUCKET': DESTINATION_BUCKET,
+    'IDEMPOTENCY_TABLE': IDEMPOTENCY_TABLE,
+    'MANUAL_REVIEW_TABLE': MANUAL_REVIEW_TABLE,
+    'BEDROCK_MODEL': 'us.amazon.nova-pro-v1:0',
+    'FALLBACK_MODEL': 'us.anthropic.claude-sonnet-4-20250514-v1:0',
+    'BEDROCK_RETRY_ATTEMPTS': '8',
+    'INTER_CALL_DELAY': '5.0',
+    'STRUCTURED_OUTPUT': 'false',
+    'SPECULATIVE_TEXTRACT': 'false',
+    'TEXT_QUALITY_MIN_SCORE': '0.5',
+    'TEXT_CACHE_ENABLED': 'true',
+}
+
+
+@dataclass
+class FunctionConfig:
+    """
+    A Lambda function and its SQS event source mapping.
+
+    Scaling: the mapping starts with initial_concurrency concurrent batches
+    (default: all of them at once) and adds scale_up_per_minute while the
+    queue has a backlog, up to maximum_concurrency (default: concurrency). It
+    scales back down at the same rate when the queue is empty. Batches above
+    the function's concurrency are throttled: their messages become visible
+    again after the visibility timeout. Each new execution environment waits
+    cold_start simulated seconds before its first invocation.
+    """
+    name: str
+    queue: str
+    batch_size: int = 3
+    batching_window: float = 5.0
+    report_batch_item_failures: bool = False
+    concurrency: int = 5
+    timeout: float = 900.0
+    env: Dict[str, str] = field(default_factory=dict)
+    initial_concurrency: Optional[int] = None
+    scale_up_per_minute: float = 300.0
+    maximum_concurrency: Optional[int] = None
+    cold_start: float = 0.0
+
+    @property
+    def mapping_concurrency(self) -> int:
+        """Concurrent batches the event source mapping scales to."""
+        return self.maximum_concurrency or self.concurrency
+
+    @property
+    def source_dir(self) -> Path:
+        return FUNCTIONS_DIR / self.name / 'src'
+
+
+def default_functions(concurrency: int = 5) -> List[FunctionConfig]:
+    """The three functions as deployed by terraform/main.tf."""
+    return [
+        FunctionConfig('classification', 'classification', report_batch_item_failures=True,
+                       concurrency=concurrency, env={'BATCH_PROCESSING_DELAY': '2.0'}),
+        FunctionConfig('extraction-scoring', 'extraction', concurrency=concurrency,
+                       env={'BATCH_PROCESSING_DELAY': '5.0'}),
+        FunctionConfig('fallback-processing', 'fallback', report_batch_item_failures=True,
+                       concurrency=concurrency),
+    ]
+
+
+@dataclass
+class SimulationConfig:
+    """
+    Settings of one simulation run.
+
+    Args:
+        time_scale: Real seconds per simulated second (0.01 runs 100x faster)
+        concurrency: Concurrent invocations per function (reserved concurrency)
+        functions: Function configs (default: default_functions(concurrency))
+        env: Environment overrides for all functions
+        models: Bedrock model profiles by model id
+        default_model: Profile of models without their own
+        textract_faults: Faults of Textract jobs
+        textract_job_latency: Job duration (per_unit: seconds per page)
+        client_latency: Cost of creating a boto3 client
+        visibility_timeout: Visibility timeout of the queues (seconds)
+        max_receive_count: Receives before a classification message goes to the DLQ
+        max_simulated_seconds: Stop the run after this long
+        queue_sample_interval: Simulated seconds between queue depth and age samples
+        log_level: Lowest log level shown while the handlers run
+        seed: Random seed
+    """
+    time_scale: float = 1.0
+    concurrency: int = 5
+    functions: Optional[List[FunctionConfig]] = None
+    env: Dict[str, str] = field(default_factory=dict)
+    models: Dict[str, ModelProfile] = field(default_factory=dict)
+    default_model: ModelProfile = field(default_factory=ModelProfile)
+    textract_faults: FaultProfile = field(default_factory=FaultProfile)
+    textract_job_latency: Optional[LatencyModel] = None
+    client_latency: Optional[LatencyModel] = None
+    visibility_timeout: float = 960.0
+    max_receive_count: int = 10
+    max_simulated_seconds: float = 6 * 3600.0
+    queue_sample_interval: float = 10.0
+    log_level: str = 'WARNING'
+    seed: int = 0
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Linear-interpolated percentile (q in 0..100) of a sequence, None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    """Count, mean, p50/p95/p99 and max of a sample."""
+    return {
+        'count': len(values),
+        'mean': sum(values) / len(values) if values else None,
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'max': max(values) if values else None,
+    }
+
+
+# =============================================================================
+# FUNCTION LOADING
+# =============================================================================
+
+class _EnvironOverlay(Mapping):
+    """os.environ with a function's own variables on top."""
+
+    def __init__(self, overrides: Dict[str, str]):
+        self.overrides = overrides
+
+    def __getitem__(self, key):
+        if key in self.overrides:
+            return self.overrides[key]
+        return os.environ[key]
+
+    def __iter__(self):
+        return iter(set(os.environ) | set(self.overrides))
+
+    def __len__(self):
+        return len(set(os.environ) | set(self.overrides))
+
+    def copy(self):
+        return dict(self)
+
+
+class _FunctionOS:
+    """Drop-in for the os module of a loaded function: environ includes the function's variables."""
+
+    def __init__(self, overrides: Dict[str, str]):
+        self.environ = _EnvironOverlay(overrides)
+
+    def getenv(self, key, default=None):
+        return self.environ.get(key, default)
+
+    def __getattr__(self, name):
+        return getattr(os, name)
+
+
+_SHARED_PACKAGE = 'shared'
+_load_lock = threading.Lock()
+
+
+class _Discard:
+    """Writable stream that drops everything."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+_DISCARD = _Discard()
+
+
+def _is_function_module(name: str) -> bool:
+    return name == 'index' or name == _SHARED_PACKAGE or name.startswith(_SHARED_PACKAGE + '.')
+
+
+@dataclass
+class LoadedFunction:
+    config: FunctionConfig
+    handler: Any
+    modules: Dict[str, Any]
+
+    @property
+    def index(self):
+        return self.modules['index']
+
+
+def load_function(config: FunctionConfig, env: Dict[str, str], clock: SimClock) -> LoadedFunction:
+    """
+    Import a function's index module with a private copy of the shared package.
+
+    Module-level configuration is read at import, so the import runs with the
+    function's environment and LAMBDA_TASK_ROOT. sys.modules, sys.path and
+    os.environ are restored afterwards; the loaded modules then read
+    os.environ through the function's overlay and run on the simulated clock.
+
+    Args:
+        config: Function to load
+        env: Common environment (the function's own variables are added)
+        clock: Simulated clock
+
+    Returns:
+        LoadedFunction
+    """
+    function_env = dict(env, **config.env, LAMBDA_TASK_ROOT=str(config.source_dir))
+    with _load_lock:
+        saved_modules = {name: sys.modules.pop(name) for name in list(sys.modules) if _is_function_module(name)}
+        saved_env = dict(os.environ)
+        sys.path.insert(0, str(config.source_dir))
+        try:
+            os.environ.update(function_env)
+            index = importlib.import_module('index')
+        finally:
+            modules = {name: sys.modules.pop(name) for name in list(sys.modules) if _is_function_module(name)}
+            sys.modules.update(saved_modules)
+            sys.path.remove(str(config.source_dir))
+            os.environ.clear()
+            os.environ.update(saved_env)
+
+    _patch_modules(modules.values(), clock, _FunctionOS(function_env))
+    if f"{_SHARED_PACKAGE}.metrics" in modules:
+        # EMF lines are for CloudWatch; the simulator reports its own metrics
+        modules[f"{_SHARED_PACKAGE}.metrics"].metrics.stream = _DISCARD
+    return LoadedFunction(config=config, handler=index.handler, modules=modules)
+
+
+def _patch_modules(modules, clock: SimClock, os_module=os) -> None:
+    """Put the simulated clock (and an os with the function's environ) into loaded modules."""
+    replacements = (('time', time, ScaledTime(clock)), ('os', os, os_module),
+                    ('threading', threading, ScaledThreading(clock)))
+    for module in modules:
+        for attribute, original, replacement in replacements:
+            if replacement is not original and getattr(module, attribute, None) is original:
+                setattr(module, attribute, replacement)
+
+
+@contextmanager
+def runtime_shared_package(clock: SimClock):
+    """
+    Provide a patched shared package for imports made while handlers run.
+
+    Deferred imports inside functions (`from shared.aws_clients import ...`)
+    resolve through sys.modules, not through the function's copy. During the
+    run they get this copy, on the simulated clock with the common
+    environment; the previous modules are restored afterwards.
+    """
+    with _load_lock:
+        saved_modules = {name: sys.modules.pop(name) for name in list(sys.modules) if _is_function_module(name)}
+        shared = importlib.import_module(_SHARED_PACKAGE)
+        for module_info in pkgutil.iter_modules(shared.__path__):
+            try:
+                importlib.import_module(f"{_SHARED_PACKAGE}.{module_info.name}")
+            except ImportError as e:
+                logger.warning(f"shared.{module_info.name} not available to deferred imports: {e}")
+        _patch_modules([m for name, m in sys.modules.items() if _is_function_module(name)], clock)
+        if f"{_SHARED_PACKAGE}.metrics" in sys.modules:
+            sys.modules[f"{_SHARED_PACKAGE}.metrics"].metrics.stream = _DISCARD
+    try:
+        yield
+    finally:
+        with _load_lock:
+            for name in [name for name in sys.modules if _is_function_module(name)]:
+                del sys.modules[name]
+            sys.modules.update(saved_modules)
+
+
+def sqs_record(message: SQSMessage, queue: FakeQueue, clock: SimClock, region: str) -> Dict[str, Any]:
+    """The record of a received message in a Lambda SQS event."""
+    return {
+        'messageId': message.message_id,
+        'receiptHandle': message.receipt_handle,
+        'body': message.body,
+        'attributes': {
+            'ApproximateReceiveCount': str(message.receive_count),
+            'SentTimestamp': str(int((clock.epoch() - (clock.now() - message.sent_at)) * 1000)),
+            'ApproximateFirstReceiveTimestamp': str(int(clock.epoch() * 1000)),
+        },
+        'messageAttributes': {},
+        'eventSource': 'aws:sqs',
+        'eventSourceARN': queue.arn,
+        'awsRegion': region,
+    }
+
+
+def s3_event_body(document: SimDocument, obj: S3Object, region: str, bucket: str = ORIGIN_BUCKET) -> str:
+    """The S3 event notification the origin bucket sends to the classification queue."""
+    record = {
+        'eventVersion': '2.1', 'eventSource': 'aws:s3', 'awsRegion': region,
+        'eventTime': datetime.now(timezone.utc).isoformat(), 'eventName': 'ObjectCreated:Put',
+        's3': {
+            's3SchemaVersion': '1.0',
+            'bucket': {'name': bucket, 'arn': f"arn:aws:s3:::{bucket}"},
+            'object': {'key': quote_plus(document.key), 'size': len(document.pdf),
+                       'eTag': obj.etag.strip('"'), 'versionId': obj.version_id},
+        },
+    }
+    return json.dumps({'Records': [record]})
+
+
+def extraction_body(document: SimDocument, model_id: str = DEFAULT_ENV['BEDROCK_MODEL'],
+                    bucket: str = ORIGIN_BUCKET) -> str:
+    """
+    The message classification sends to the extraction queue for a correctly
+    classified document (extraction sends the same body to the fallback queue).
+    """
+    meta = {
+        'category': document.category,
+        'text': document.text(limit=2000),
+        'path': f"s3://{bucket}/{document.key}",
+        'document_number': document.document_number,
+        'model_used': model_id,
+        'requires_extraction': document.category in EXTRACTABLE_CATEGORIES,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'original_category': document.category,
+        'processing_status': 'success',
+        'fallback_used': False,
+        'total_attempts': 1,
+    }
+    return json.dumps({
+        'path': meta['path'],
+        'result': meta,
+        'document_type': 'UNKNOWN',
+        'document_number': document.document_number,
+        'category': document.category,
+    })
+
+
+class LambdaContext:
+    """The parts of the Lambda context object a handler may use."""
+
+    def __init__(self, config: FunctionConfig, clock: SimClock, region: str):
+        self.function_name = f"sim-{config.name}"
+        self.function_version = '$LATEST'
+        self.invoked_function_arn = f"arn:aws:lambda:{region}:000000000000:function:{self.function_name}"
+        self.memory_limit_in_mb = 1024
+        self.aws_request_id = str(uuid.uuid4())
+        self.log_group_name = f"/aws/lambda/{self.function_name}"
+        self.log_stream_name = datetime.now(timezone.utc).strftime('%Y/%m/%d/[$LATEST]') + uuid.uuid4().hex
+        self._deadline = clock.now() + config.timeout
+        self._clock = clock
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self._deadline - self._clock.now()) * 1000))
+
+
+# =============================================================================
+# TRACKING
+# =============================================================================
+
+@dataclass
+class StageSpan:
+    """One delivery of a document's message to a function."""
+    function: str
+    sent_at: float
+    started_at: float
+    ended_at: float
+    receive_count: int
+    failed: bool
+
+
+@dataclass
+class DocumentTrace:
+    document: SimDocument
+    submitted_at: Optional[float] = None
+    spans: List[StageSpan] = field(default_factory=list)
+    artifacts: List[str] = field(default_factory=list)
+    from_fallback: bool = False
+    classified_as: Optional[str] = None
+    dead_lettered: bool = False
+    outcome: Optional[str] = None
+
+    @property
+    def completed_at(self) -> Optional[float]:
+        return max((span.ended_at for span in self.spans), default=None)
+
+    @property
+    def latency(self) -> Optional[float]:
+        if self.submitted_at is None or self.completed_at is None:
+            return None
+        return self.completed_at - self.submitted_at
+
+
+@dataclass
+class QueueSample:
+    """Depth and age of the oldest message of a queue at one moment."""
+    queue: str
+    at: float
+    visible: int
+    in_flight: int
+    oldest_age: float
+
+
+@dataclass
+class Invocation:
+    function: str
+    started_at: float
+    ended_at: float
+    messages: int
+    failed_messages: int
+    status_code: Optional[int]
+    error: Optional[str] = None
+    timed_out: bool = False
+
+
+# =============================================================================
+# EVENT SOURCE MAPPING
+# =============================================================================
+
+class EventSourcePoller:
+    """
+    Polls a queue for a function: waits up to the batching window for a full
+    batch, invokes the handler on a worker and deletes the messages that did
+    not fail. At most `scaled` batches are in progress at a time; it follows
+    the scaling of FunctionConfig.
+    """
+
+    def __init__(self, simulator: 'PipelineSimulator', function: LoadedFunction, queue: FakeQueue):
+        self.simulator = simulator
+        self.function = function
+        self.config = function.config
+        self.queue = queue
+        self.sqs = simulator.aws.sqs
+        self.clock = simulator.clock
+        limit = self.config.mapping_concurrency
+        self.slots = threading.Semaphore(limit)
+        self.executor = ThreadPoolExecutor(max_workers=limit, thread_name_prefix=f"sim-{self.config.name}")
+        self.initial = min(limit, self.config.initial_concurrency or limit)
+        self.scaled = float(self.initial)
+        self.peak_scaled = self.initial
+        self.in_progress = 0
+        self.running = 0
+        self.peak_concurrency = 0
+        self.throttled = 0
+        self.cold_starts = 0
+        self.warm = 0
+        self._scaled_at = self.clock.now()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._poll, name=f"poller-{self.config.name}", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._thread.join()
+        self.executor.shutdown(wait=True)
+
+    def _idle_wait(self) -> None:
+        next_visible = self.sqs.next_visible_at(self.queue)
+        real = 0.05 if next_visible is None else min(0.05, max(0.001, self.clock.real_seconds(
+            next_visible - self.clock.now())))
+        self.sqs.wait_for_messages(real)
+
+    def _scale(self) -> int:
+        """Update the mapping's concurrency for the time passed and return it."""
+        now = self.clock.now()
+        with self._lock:
+            step = self.config.scale_up_per_minute * (now - self._scaled_at) / 60.0
+            self._scaled_at = now
+            if self.sqs.depth(self.queue)[0] and self.in_progress >= int(self.scaled):
+                self.scaled = min(self.config.mapping_concurrency, self.scaled + step)
+            elif not self.sqs.depth(self.queue)[0]:
+                self.scaled = max(self.initial, self.scaled - step)
+            self.peak_scaled = max(self.peak_scaled, int(self.scaled))
+            return int(self.scaled)
+
+    def _poll(self) -> None:
+        stopping = self.simulator.stopping
+        while not stopping.is_set():
+            if self.in_progress >= self._scale():
+                self.sqs.wait_for_messages(0.01)
+                continue
+            if not self.slots.acquire(timeout=0.05):
+                continue
+            batch = self.sqs.receive(self.queue, self.config.batch_size)
+            if batch and len(batch) < self.config.batch_size and self.config.batching_window > 0:
+                deadline = self.clock.now() + self.config.batching_window
+                while len(batch) < self.config.batch_size and not stopping.is_set():
+                    remaining = deadline - self.clock.now()
+                    if remaining <= 0:
+                        break
+                    self.sqs.wait_for_messages(min(0.05, self.clock.real_seconds(remaining)))
+                    batch += self.sqs.receive(self.queue, self.config.batch_size - len(batch))
+            if not batch:
+                self.slots.release()
+                self._idle_wait()
+                continue
+            with self._lock:
+                self.in_progress += 1
+            self.executor.submit(self._invoke, batch)
+
+    def _start_environment(self) -> bool:
+        """
+        Take an execution environment for an invocation: False when the
+        function is at its concurrency (the invocation is throttled).
+        """
+        with self._lock:
+            if self.running >= self.config.concurrency:
+                self.throttled += 1
+                return False
+            self.running += 1
+            self.peak_concurrency = max(self.peak_concurrency, self.running)
+            cold = self.running > self.warm
+            if cold:
+                self.warm += 1
+                self.cold_starts += 1
+        if cold and self.config.cold_start > 0:
+            self.clock.sleep(self.config.cold_start)
+        return True
+
+    def _finish(self, ran: bool) -> None:
+        with self._lock:
+            if ran:
+                self.running -= 1
+            self.in_progress -= 1
+        self.slots.release()
+
+    def _invoke(self, batch: List[SQSMessage]) -> None:
+        if not self._start_environment():
+            # Throttled: the messages stay in flight until their visibility timeout
+            self.simulator.record_throttle(self.config.name, len(batch))
+            self._finish(ran=False)
+            return
+        started = self.clock.now()
+        response, error = None, None
+        try:
+            context = LambdaContext(self.config, self.clock, self.sqs.region)
+            records = [sqs_record(m, self.queue, self.clock, self.sqs.region) for m in batch]
+            response = self.function.handler({'Records': records}, context)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.error(f"{self.config.name} invocation raised: {error}")
+        ended = self.clock.now()
+        timed_out = ended - started > self.config.timeout
+
+        failed_ids = set()
+        if error or timed_out:
+            failed_ids = {m.message_id for m in batch}
+        elif self.config.report_batch_item_failures and isinstance(response, dict):
+            reported = {item.get('itemIdentifier') for item in response.get('batchItemFailures', [])}
+            batch_ids = {m.message_id for m in batch}
+            # An unknown identifier fails the whole batch
+            failed_ids = batch_ids if reported - batch_ids else reported
+
+        for message in batch:
+            failed = message.message_id in failed_ids
+            self.simulator.record_span(message, self.config.name, started, ended, failed)
+            if not failed:
+                self.sqs.delete(self.queue, message)
+
+        status_code = response.get('statusCode') if isinstance(response, dict) else None
+        self.simulator.record_invocation(Invocation(
+            function=self.config.name, started_at=started, ended_at=ended, messages=len(batch),
+            failed_messages=len(failed_ids), status_code=status_code, error=error, timed_out=timed_out
+        ))
+        self._finish(ran=True)
+
+
+# =============================================================================
+# SIMULATOR
+# =============================================================================
+
+OUTCOMES = ('extracted', 'fallback_extracted', 'manual_review', 'classified', 'classification_failed',
+            'dead_letter', 'pending', 'lost')
+
+
+@dataclass
+class SimulationReport:
+    """Throughput, latency and service usage of a run. Times are simulated seconds."""
+    documents: int
+    outcomes: Dict[str, int]
+    simulated_seconds: float
+    real_seconds: float
+    time_scale: float
+    throughput_per_minute: float
+    latency: Dict[str, Optional[float]]
+    functions: Dict[str, Dict[str, Any]]
+    aws_calls: Dict[str, int]
+    bedrock: Dict[str, Any]
+    completed: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'documents': self.documents, 'outcomes': self.outcomes,
+            'simulated_seconds': self.simulated_seconds, 'real_seconds': self.real_seconds,
+            'time_scale': self.time_scale, 'throughput_per_minute': self.throughput_per_minute,
+            'latency': self.latency, 'functions': self.functions, 'aws_calls': self.aws_calls,
+            'bedrock': self.bedrock, 'completed': self.completed,
+        }
+
+    def format(self) -> str:
+        def seconds(value):
+            return '-' if value is None else f"{value:8.1f}"
+
+        lines = [
+            f"Documents: {self.documents} in {self.simulated_seconds:.1f} simulated s "
+            f"({self.real_seconds:.1f} real s, time scale {self.time_scale:g})"
+            + ('' if self.completed else '  [stopped at max_simulated_seconds]'),
+            f"Throughput: {self.throughput_per_minute:.2f} documents/min",
+            "Outcomes: " + ', '.join(f"{name} {count}" for name, count in self.outcomes.items() if count),
+            f"End-to-end latency s: p50 {seconds(self.latency['p50'])}  p95 {seconds(self.latency['p95'])}  "
+            f"p99 {seconds(self.latency['p99'])}  max {seconds(self.latency['max'])}",
+            "",
+            f"  {'function':22s} {'invokes':>7s} {'msgs':>5s} {'failed':>6s} {'peak':>4s} "
+            f"{'dur p50':>8s} {'dur p99':>8s} {'wait p50':>8s} {'wait p99':>8s} {'age max':>8s} {'thr':>4s}",
+        ]
+        for name, stats in self.functions.items():
+            lines.append(
+                f"  {name:22s} {stats['invocations']:7d} {stats['messages']:5d} {stats['failed_messages']:6d} "
+                f"{stats['peak_concurrency']:4d} {seconds(stats['duration']['p50'])} "
+                f"{seconds(stats['duration']['p99'])} {seconds(stats['queue_wait']['p50'])} "
+                f"{seconds(stats['queue_wait']['p99'])} {seconds(stats['queue_age']['max'])} {stats['throttles']:4d}"
+            )
+        lines.append("")
+        lines.append(f"Bedrock: {self.bedrock['calls']} calls ({self.bedrock['calls_per_document']:.2f}/document), "
+                     f"{self.bedrock['throttled']} throttled, {self.bedrock['errors']} errors, "
+                     f"{self.bedrock['input_tokens']} input / {self.bedrock['output_tokens']} output tokens")
+        return '\n'.join(lines)
+
+
+class SimulatedAccount:
+    """
+    Fake AWS resources of the pipeline (buckets, queues, tables) and the
+    functions loaded against them.
+
+    Args:
+        documents: Documents the fake models know
+        config: Simulation settings
+    """
+
+    def __init__(self, documents: Sequence[SimDocument], config: SimulationConfig = None):
+        self.config = config or SimulationConfig()
+        self.documents = list(documents)
+        self.clock = SimClock(self.config.time_scale)
+        self.oracle = DocumentOracle(self.documents, ORIGIN_BUCKET)
+        self.aws = FakeAWS(
+            self.clock, self.oracle, self.oracle.textract_pages,
+            models=self.config.models, default_model=self.config.default_model,
+            textract_faults=self.config.textract_faults, textract_job_latency=self.config.textract_job_latency,
+            client_latency=self.config.client_latency, region=DEFAULT_ENV['REGION'], seed=self.config.seed
+        )
+
+        sqs = self.aws.sqs
+        self.dead_letter_queue = sqs.create_queue('sim-classification-dlq', self.config.visibility_timeout)
+        self.queues = {
+            'classification': sqs.create_queue('sim-classification-queue', self.config.visibility_timeout,
+                                               self.config.max_receive_count, self.dead_letter_queue),
+            'extraction': sqs.create_queue('sim-extraction-queue', self.config.visibility_timeout),
+            'fallback': sqs.create_queue('sim-fallback-queue', self.config.visibility_timeout),
+        }
+        self.aws.dynamodb.create_table(IDEMPOTENCY_TABLE, ('pk',))
+        self.aws.dynamodb.create_table(MANUAL_REVIEW_TABLE, ('pk', 'sk'))
+
+        self._cache_dir = tempfile.mkdtemp(prefix='sim-text-cache-')
+        self.env = dict(DEFAULT_ENV, **self.config.env, TEXT_CACHE_LOCAL_DIR=self._cache_dir,
+                        EXTRACTION_SQS=self.queues['extraction'].url, FALLBACK_SQS=self.queues['fallback'].url)
+        logging.disable(logging.getLevelName(self.config.log_level) - 1)
+        try:
+            self.functions = [load_function(function, self.env, self.clock)
+                              for function in (self.config.functions or default_functions(self.config.concurrency))]
+        finally:
+            logging.disable(logging.NOTSET)
+        classification = self.function('classification')
+        if classification is not None:
+            self.oracle.classification_prompts.update(
+                classification.modules['shared.prompt_loader'].prompt_loader.get_classification_prompts())
+
+    def function(self, name: str) -> Optional[LoadedFunction]:
+        return next((f for f in self.functions if f.config.name == name), None)
+
+    @contextmanager
+    def active(self):
+        """
+        Route boto3 to the fakes and set the common environment while the
+        handlers run. The handlers set their loggers to INFO at import, so
+        log_level is applied with logging.disable().
+        """
+        saved_env = dict(os.environ)
+        logging.disable(logging.getLevelName(self.config.log_level) - 1)
+        os.environ.update(self.env)
+        try:
+            with self.aws.patch(), runtime_shared_package(self.clock):
+                yield self
+        finally:
+            logging.disable(logging.NOTSET)
+            os.environ.clear()
+            os.environ.update(saved_env)
+
+    def close(self) -> None:
+        """Remove the local text cache directory."""
+        shutil.rmtree(self._cache_dir, ignore_errors=True)
+
+
+class PipelineSimulator(SimulatedAccount):
+    """
+    Runs documents through the three functions against fake AWS services.
+
+    Args:
+        documents: Documents to process
+        config: Simulation settings
+    """
+
+    def __init__(self, documents: Sequence[SimDocument], config: SimulationConfig = None):
+        super().__init__(documents, config)
+        self.stopping = threading.Event()
+        self.traces: Dict[str, DocumentTrace] = {doc.key: DocumentTrace(doc) for doc in self.documents}
+        self.invocations: List[Invocation] = []
+        self.throttles: Counter = Counter()
+        self.queue_samples: List[QueueSample] = []
+        self._by_file = {(doc.document_number, doc.file_id): doc.key for doc in self.documents}
+        self._message_docs: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._ran = False
+        self.aws.sqs.observers.append(self._on_message)
+        self.aws.s3.observers.append(self._on_object)
+
+    # Tracking hooks
+
+    def _document_of_message(self, body: str) -> Optional[str]:
+        try:
+            payload = json.loads(body)
+            if 'Records' in payload:
+                return unquote_plus(payload['Records'][0]['s3']['object']['key'])
+            path = payload.get('path', '')
+            return path[5:].split('/', 1)[1] if path.startswith('s3://') else path
+        except Exception:
+            return None
+
+    def _on_message(self, queue: FakeQueue, message: SQSMessage) -> None:
+        key = self._document_of_message(message.body)
+        with self._lock:
+            if key in self.traces:
+                self._message_docs[message.message_id] = key
+
+    def _on_object(self, bucket: str, key: str, obj: S3Object) -> None:
+        if bucket != DESTINATION_BUCKET:
+            return
+        parts = key.split('/')
+        if len(parts) < 3:
+            return
+        basename = parts[-1]
+        candidates = [doc_key for (number, file_id), doc_key in self._by_file.items()
+                      if number == parts[-2] and (f"_{file_id}_" in basename or basename.endswith(f"_{file_id}.json"))]
+        if not candidates:
+            return
+        trace = self.traces[candidates[0]]
+        with self._lock:
+            trace.artifacts.append(key)
+        if basename.startswith('extraction_') and '/extraction/' in key:
+            trace.from_fallback = trace.from_fallback or json.loads(obj.body).get('came_from_fallback', False)
+        elif basename.startswith('classification_') and '/classification/' in key:
+            trace.classified_as = json.loads(obj.body).get('result', {}).get('DocumentCategory')
+
+    def record_span(self, message: SQSMessage, function: str, started: float, ended: float, failed: bool) -> None:
+        with self._lock:
+            key = self._message_docs.get(message.message_id)
+            if key is not None:
+                self.traces[key].spans.append(StageSpan(function, message.sent_at, started, ended,
+                                                        message.receive_count, failed))
+
+    def record_invocation(self, invocation: Invocation) -> None:
+        with self._lock:
+            self.invocations.append(invocation)
+
+    def record_throttle(self, function: str, messages: int) -> None:
+        with self._lock:
+            self.throttles[function] += 1
+            self.throttles[f"{function}:messages"] += messages
+
+    def _sample_queues(self) -> None:
+        interval = self.config.queue_sample_interval
+        while not self.stopping.is_set():
+            now = self.clock.now()
+            for name, queue in self.queues.items():
+                visible, in_flight = self.aws.sqs.depth(queue)
+                self.queue_samples.append(QueueSample(name, now, visible, in_flight,
+                                                      self.aws.sqs.oldest_age(queue)))
+            self.stopping.wait(self.clock.real_seconds(interval))
+
+    # Running
+
+    def submit(self, document: SimDocument) -> None:
+        """Upload a document to the origin bucket and send its S3 event notification."""
+        obj = self.aws.s3.put(ORIGIN_BUCKET, document.key, document.pdf, 'application/pdf')
+        self.traces[document.key].submitted_at = self.clock.now()
+        self.aws.sqs.enqueue(self.queues['classification'], s3_event_body(document, obj, self.aws.sqs.region))
+
+    def _feed(self, arrivals: Sequence[float]) -> None:
+        for offset, document in sorted(zip(arrivals, self.documents), key=lambda pair: pair[0]):
+            while not self.stopping.is_set() and self.clock.now() < offset:
+                self.clock.sleep(min(1.0, offset - self.clock.now()))
+            if self.stopping.is_set():
+                return
+            self.submit(document)
+
+    def _quiescent(self) -> bool:
+        if any(trace.submitted_at is None for trace in self.traces.values()):
+            return False
+        return all(self.aws.sqs.depth(queue) == (0, 0) for queue in self.queues.values())
+
+    def run(self, arrivals: Sequence[float] = None) -> SimulationReport:
+        """
+        Process all documents until every queue is drained.
+
+        Args:
+            arrivals: Simulated upload time of each document (default: all at once)
+
+        Returns:
+            SimulationReport
+        """
+        if self._ran:
+            raise RuntimeError("A PipelineSimulator runs once; create a new one")
+        self._ran = True
+        arrivals = list(arrivals) if arrivals is not None else [0.0] * len(self.documents)
+        if len(arrivals) != len(self.documents):
+            raise ValueError("arrivals must have one entry per document")
+
+        real_start = time.perf_counter()
+        completed = True
+        with self.active():
+            start = self.clock.now()
+            pollers = [EventSourcePoller(self, function, self.queues[function.config.queue])
+                       for function in self.functions]
+            for poller in pollers:
+                poller.start()
+            feeder = threading.Thread(target=self._feed, args=(arrivals,), name='sim-feeder', daemon=True)
+            feeder.start()
+            sampler = threading.Thread(target=self._sample_queues, name='sim-queue-sampler', daemon=True)
+            sampler.start()
+            try:
+                while not self._quiescent():
+                    if self.clock.now() - start > self.config.max_simulated_seconds:
+                        completed = False
+                        break
+                    time.sleep(0.01)
+            finally:
+                self.stopping.set()
+                feeder.join()
+                sampler.join()
+                for poller in pollers:
+                    poller.stop()
+        real_seconds = time.perf_counter() - real_start
+        self.close()
+        return self._report(pollers, real_seconds, completed)
+
+    # Reporting
+
+    def _outcome(self, trace: DocumentTrace, manual_review_keys: set, dead_letter_keys: set) -> str:
+        artifacts = trace.artifacts
+        if trace.document.key in dead_letter_keys:
+            return 'dead_letter'
+        if trace.document.key in manual_review_keys:
+            return 'manual_review'
+        if any('/extraction/' in key for key in artifacts):
+            return 'fallback_extracted' if trace.from_fallback else 'extracted'
+        if trace.classified_as is not None and trace.classified_as not in EXTRACTABLE_CATEGORIES:
+            return 'classified'
+        if any(key.startswith('errors/classification/') for key in artifacts):
+            return 'classification_failed'
+        if any(span.failed for span in trace.spans[-1:]):
+            return 'pending'
+        return 'lost'
+
+    def _report(self, pollers: List[EventSourcePoller], real_seconds: float, completed: bool) -> SimulationReport:
+        manual_review_keys = {item['s3_key']['S'] for item in self.aws.dynamodb.items(MANUAL_REVIEW_TABLE)
+                              if 's3_key' in item}
+        dead_letter_keys = {self._document_of_message(m.body) for m in self.dead_letter_queue.messages}
+
+        outcomes = Counter({name: 0 for name in OUTCOMES})
+        latencies = []
+        for trace in self.traces.values():
+            trace.outcome = self._outcome(trace, manual_review_keys, dead_letter_keys)
+            outcomes[trace.outcome] += 1
+            if trace.outcome not in ('pending', 'lost') and trace.latency is not None:
+                latencies.append(trace.latency)
+
+        submitted = [t.submitted_at for t in self.traces.values() if t.submitted_at is not None]
+        finished = [t.completed_at for t in self.traces.values() if t.completed_at is not None]
+        makespan = (max(finished) - min(submitted)) if submitted and finished else 0.0
+        done = len(self.documents) - outcomes['pending'] - outcomes['lost']
+
+        functions = {}
+        for poller in pollers:
+            name = poller.config.name
+            invocations = [i for i in self.invocations if i.function == name]
+            waits = [span.started_at - span.sent_at for trace in self.traces.values()
+                     for span in trace.spans if span.function == name and span.receive_count == 1]
+            samples = [sample for sample in self.queue_samples if sample.queue == poller.config.queue]
+            throttled = self.throttles[name]
+            functions[name] = {
+                'invocations': len(invocations),
+                'messages': sum(i.messages for i in invocations),
+                'failed_messages': sum(i.failed_messages for i in invocations),
+                'handler_errors': sum(1 for i in invocations if i.error or (i.status_code or 200) >= 400),
+                'timeouts': sum(1 for i in invocations if i.timed_out),
+                'peak_concurrency': poller.peak_concurrency,
+                'duration': summarize([i.ended_at - i.started_at for i in invocations]),
+                'queue_wait': summarize(waits),
+                'queue_age': summarize([sample.oldest_age for sample in samples]),
+                'max_queue_depth': max((sample.visible + sample.in_flight for sample in samples), default=0),
+                'throttles': throttled,
+                'throttled_messages': self.throttles[f"{name}:messages"],
+                'throttle_rate': throttled / (throttled + len(invocations)) if throttled + len(invocations) else 0.0,
+                'cold_starts': poller.cold_starts,
+                'peak_scaled_concurrency': poller.peak_scaled,
+            }
+
+        bedrock = self.aws.bedrock
+        attempts = Counter()
+        for (model_id, outcome), count in bedrock.outcomes.items():
+            attempts[outcome] += count
+        calls = sum(attempts.values())
+        bedrock_stats = {
+            'calls': calls,
+            'calls_per_document': calls / len(self.documents) if self.documents else 0.0,
+            'throttled': attempts['throttled'],
+            'throttle_rate': attempts['throttled'] / calls if calls else 0.0,
+            'errors': attempts['error'],
+            'content_filtered': attempts['content_filtered'],
+            'malformed': attempts['malformed'],
+            'input_tokens': sum(v for (m, kind), v in bedrock.usage.items() if kind == 'input_tokens'),
+            'output_tokens': sum(v for (m, kind), v in bedrock.usage.items() if kind == 'output_tokens'),
+            'by_model': {f"{model_id}:{outcome}": count for (model_id, outcome), count in bedrock.outcomes.items()},
+            'unresolved_documents': self.oracle.unresolved,
+        }
+        return SimulationReport(
+            documents=len(self.documents),
+            outcomes=dict(outcomes),
+            simulated_seconds=makespan,
+            real_seconds=real_seconds,
+            time_scale=self.config.time_scale,
+            throughput_per_minute=done / makespan * 60 if makespan > 0 else 0.0,
+            latency=summarize(latencies),
+            functions=functions,
+            aws_calls=self.aws.call_counts(),
+            bedrock=bedrock_stats,
+            completed=completed,
+        )
@@ -0,0 +1,641 @@
+"""
+Replay captured production traffic through the current handler code.
+
+Sources, read from the results bucket (or a local copy of it):
+
+    RAW/{category}/{number}/raw_{classification|extraction}_{file}_{ts}.json
+        the Bedrock response of every successful call. It holds the model
+        output, usage, latency (Converse metrics.latencyMs or
+        retry_info.last_attempt_seconds) and the error codes of its throttled
+        attempts, plus the source key.
+    {prefix}/batch_summaries/{process_type}/batch_summary_{ts}.json
+        which documents were processed together.
+
+load_capture() turns the artifacts into Recordings and into SQS batches per
+function. Batches come from the batch summaries. Recordings that no summary
+covers are grouped by time in the order they were saved, up to the
+function's batch size. ReplayHarness then invokes each function's handler
+with those batches. The fakes of aws_fakes serve S3, SQS, DynamoDB and
+Textract. ReplayBedrock answers every Bedrock request with the recorded
+response of its document and phase. It first raises the recorded throttling
+errors, then waits the recorded latency on the simulated clock.
+
+Replays are deterministic: the fakes and the handlers' backoff jitter are
+seeded, and batches run in recorded order (unless --concurrency is above 1).
+
+Limits:
+- Textract output is not captured; it comes from the PDF's text layer.
+- Without the source PDFs, a placeholder PDF holds the text that
+  classification recorded.
+- Requests without a recording (the code now asks something it did not
+  ask then) get the simulator's generated answer and are counted as
+  unrecorded.
+
+Usage:
+    capture = load_capture('./results-bucket-copy')
+    documents, placeholders = capture_documents(capture, pdf_source='./origin-bucket-copy')
+    harness = ReplayHarness('extraction-scoring', capture, documents, SimulationConfig(time_scale=0.01))
+    print(harness.replay().format())
+"""
+
+import json
+import logging
+import random
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .aws_fakes import FakeBedrock, LatencyModel, _response_metadata, client_error, request_documents
+from .documents import SimDocument, build_pdf, union_fields
+from .harness import BatchResult, HandlerHarness
+from .pipeline import DESTINATION_BUCKET, ORIGIN_BUCKET, SimulationConfig, default_functions, summarize
+
+logger = logging.getLogger(__name__)
+
+# Function that processed a batch summary's process_type
+PROCESS_TYPE_FUNCTIONS = {
+    'classification': 'classification',
+    'extraction': 'extraction-scoring',
+    'enhanced_fallback': 'fallback-processing',
+    'fallback': 'fallback-processing',
+}
+
+# Function that made the calls of each recording phase
+PHASE_FUNCTIONS = {
+    'classification': 'classification',
+    'extraction': 'extraction-scoring',
+    'fallback': 'fallback-processing',
+}
+
+# Latency of recordings that carry none (seconds)
+DEFAULT_LATENCY = 2.5
+
+# Time a throttled attempt takes before its error (seconds)
+THROTTLE_LATENCY = 0.05
+
+_TIMESTAMP = re.compile(r'_(\d{8}_\d{6})\.json$')
+
+
+@dataclass
+class Recording:
+    """One recorded Bedrock response and the document it was for."""
+    phase: str
+    key: str
+    category: str
+    document_number: str
+    file_id: str
+    raw_kind: str
+    model_id: Optional[str]
+    timestamp: Optional[datetime]
+    latency: float
+    error_codes: List[str]
+    content: List[Dict[str, Any]]
+    stop_reason: str
+    usage: Dict[str, Any]
+
+    @property
+    def function(self) -> str:
+        return PHASE_FUNCTIONS[self.phase]
+
+    def text(self) -> str:
+        return ''.join(block.get('text', '') for block in self.content)
+
+    def answer(self) -> Optional[Dict[str, Any]]:
+        """The tool input, or the JSON object of the text, the model answered with."""
+        for block in self.content:
+            if 'toolUse' in block:
+                return block['toolUse'].get('input')
+        text = self.text()
+        try:
+            answer, _ = json.JSONDecoder().raw_decode(text[text.find('{'):])
+        except ValueError:
+            return None
+        return answer if isinstance(answer, dict) else None
+
+    def tokens(self) -> Tuple[int, int]:
+        """(input, output) tokens, from Converse or Anthropic usage."""
+        return (self.usage.get('inputTokens', self.usage.get('input_tokens', 0)),
+                self.usage.get('outputTokens', self.usage.get('output_tokens', 0)))
+
+
+@dataclass
+class CapturedBatch:
+    """The source keys one invocation of a function processed."""
+    function: str
+    keys: List[str]
+    timestamp: Optional[datetime] = None
+
+
+@dataclass
+class Capture:
+    recordings: List[Recording] = field(default_factory=list)
+    batches: List[CapturedBatch] = field(default_factory=list)
+    skipped: int = 0
+
+    def recordings_of(self, function: str) -> List[Recording]:
+        return [r for r in self.recordings if r.function == function]
+
+    def batches_of(self, function: str) -> List[CapturedBatch]:
+        return [b for b in self.batches if b.function == function]
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+def iter_local_artifacts(directory: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    root = Path(directory)
+    for path in sorted(root.rglob('*.json')):
+        try:
+            yield path.relative_to(root).as_posix(), json.loads(path.read_text(encoding='utf-8'))
+        except ValueError as e:
+            logger.warning(f"Skipping {path}: {e}")
+
+
+def iter_s3_artifacts(uri: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    import boto3
+
+    bucket, _, prefix = uri[5:].partition('/')
+    s3 = boto3.client('s3')
+    for page in s3.get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            name = obj['Key'].rsplit('/', 1)[-1]
+            if not obj['Key'].endswith('.json') or not name.startswith(('raw_', 'batch_summary_')):
+                continue
+            try:
+                yield obj['Key'], json.loads(s3.get_object(Bucket=bucket, Key=obj['Key'])['Body'].read())
+            except ValueError as e:
+                logger.warning(f"Skipping s3://{bucket}/{obj['Key']}: {e}")
+
+
+def _timestamp(name: str) -> Optional[datetime]:
+    match = _TIMESTAMP.search(name)
+    return datetime.strptime(match.group(1), '%Y%m%d_%H%M%S') if match else None
+
+
+def _source_key(value: Optional[str]) -> Optional[str]:
+    """Object key of an s3:// URI or key."""
+    if not value:
+        return None
+    if value.startswith('s3://'):
+        return value[5:].partition('/')[2]
+    return value
+
+
+def _content(raw: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Converse content blocks of a raw response, whichever API produced it."""
+    content = raw.get('output', {}).get('message', {}).get('content')
+    if content is not None:
+        return content
+    blocks = []
+    for block in (raw.get('raw_anthropic_response') or {}).get('content', []):
+        if block.get('type') == 'text':
+            blocks.append({'text': block.get('text', '')})
+        elif block.get('type') == 'tool_use':
+            blocks.append({'toolUse': {'toolUseId': block.get('id'), 'name': block.get('name'),
+                                       'input': block.get('input', {})}})
+    return blocks
+
+
+def _latency(raw: Dict[str, Any]) -> float:
+    latency_ms = (raw.get('metrics') or {}).get('latencyMs')
+    if latency_ms:
+        return latency_ms / 1000
+    return (raw.get('retry_info') or {}).get('last_attempt_seconds') or DEFAULT_LATENCY
+
+
+def parse_recording(key: str, raw: Dict[str, Any]) -> Optional[Recording]:
+    """
+    A Recording from a RAW/ artifact.
+
+    Args:
+        key: Artifact key (its name tells the kind and the timestamp)
+        raw: Artifact content
+
+    Returns:
+        Recording, or None when the artifact has no source key or no content
+    """
+    name = key.rsplit('/', 1)[-1]
+    raw_kind = 'classification' if name.startswith('raw_classification_') else 'extraction'
+    info = raw.get('file_info') or {}
+    source_key = _source_key(info.get('source_key'))
+    content = _content(raw)
+    if not source_key or not content:
+        return None
+    phase = 'fallback' if raw.get('came_from_fallback') else raw_kind
+    model_id = raw.get(f"{raw_kind}_model_used")
+    return Recording(
+        phase=phase,
+        key=source_key,
+        category=info.get('category') or 'UNKNOWN',
+        document_number=str(info.get('document_number') or ''),
+        file_id=info.get('file_id') or Path(source_key).stem,
+        raw_kind=raw_kind,
+        model_id=None if model_id in (None, 'unknown') else model_id,
+        timestamp=_timestamp(name),
+        latency=_latency(raw),
+        error_codes=list((raw.get('retry_info') or {}).get('error_codes') or []),
+        content=content,
+        stop_reason=raw.get('stopReason') or (raw.get('raw_anthropic_response') or {}).get('stop_reason') or 'end_turn',
+        usage=raw.get('usage') or {},
+    )
+
+
+def _result_key(result: Dict[str, Any]) -> Optional[str]:
+    """Source key of a batch summary's detailed result, for each handler's result shape."""
+    info = result.get('document_info') or {}
+    payload = result.get('payload') or {}
+    for value in (result.get('key'), info.get('s3_key'), info.get('path'), result.get('path'), payload.get('path')):
+        key = _source_key(value)
+        if key and key != 'unknown':
+            return key
+    return None
+
+
+def group_batches(recordings: Sequence[Recording], batch_size: int, max_gap: float) -> List[List[Recording]]:
+    """
+    Group recordings of one function into batches: in saving order, at most
+    batch_size, and a new batch after a gap of more than max_gap seconds.
+    """
+    ordered = sorted(recordings, key=lambda r: (r.timestamp or datetime.min, r.key))
+    batches: List[List[Recording]] = []
+    for recording in ordered:
+        current = batches[-1] if batches else None
+        if (current is None or len(current) >= batch_size or
+                (recording.timestamp and current[-1].timestamp and
+                 (recording.timestamp - current[-1].timestamp).total_seconds() > max_gap)):
+            batches.append([recording])
+        else:
+            current.append(recording)
+    return batches
+
+
+def load_capture(source: str, batch_sizes: Dict[str, int] = None, max_gap: float = 120.0) -> Capture:
+    """
+    Read RAW/ responses and batch summaries and rebuild each function's batches.
+
+    Args:
+        source: Local directory or s3://bucket/prefix holding RAW/ and batch_summaries/
+        batch_sizes: Batch size per function for recordings outside any summary
+                     (default: the simulator's event source mappings)
+        max_gap: Seconds between two saves that start a new batch
+
+    Returns:
+        Capture
+    """
+    if batch_sizes is None:
+        batch_sizes = {f.name: f.batch_size for f in default_functions()}
+    artifacts = iter_s3_artifacts(source) if str(source).startswith('s3://') else iter_local_artifacts(source)
+
+    capture = Capture()
+    summaries = []
+    for key, content in artifacts:
+        name = key.rsplit('/', 1)[-1]
+        if name.startswith('raw_') and ('RAW/' in key or key.startswith('RAW')):
+            recording = parse_recording(key, content)
+            if recording is None:
+                capture.skipped += 1
+            else:
+                capture.recordings.append(recording)
+        elif name.startswith('batch_summary_'):
+            summaries.append(content)
+
+    recorded = {(r.function, r.key) for r in capture.recordings}
+    covered = set()
+    for summary in summaries:
+        info = summary.get('batch_summary') or {}
+        function = PROCESS_TYPE_FUNCTIONS.get(info.get('process_type'))
+        if function is None:
+            continue
+        keys = []
+        for result in summary.get('detailed_results') or []:
+            key = _result_key(result)
+            if key and (function, key) in recorded and key not in keys:
+                keys.append(key)
+        if keys:
+            timestamp = info.get('timestamp')
+            capture.batches.append(CapturedBatch(
+                function, keys, datetime.fromisoformat(timestamp).replace(tzinfo=None) if timestamp else None))
+            covered.update((function, key) for key in keys)
+
+    for function in PHASE_FUNCTIONS.values():
+        loose = [r for r in capture.recordings_of(function) if (function, r.key) not in covered]
+        for group in group_batches(loose, batch_sizes.get(function, 3), max_gap):
+            keys = list(dict.fromkeys(r.key for r in group))
+            capture.batches.append(CapturedBatch(function, keys, group[0].timestamp))
+
+    capture.batches.sort(key=lambda b: (b.timestamp or datetime.min, b.function))
+    return capture
+
+
+def _placeholder_pdf(text: str, lines_per_page: int = 40) -> bytes:
+    lines = [line for line in text.splitlines() if line.strip()] or ['DOCUMENTO']
+    return build_pdf([lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)])
+
+
+def _recorded_text(recordings: Sequence[Recording]) -> str:
+    """Document text a classification recording carries (the 'text' of its answer), else ''."""
+    for recording in recordings:
+        answer = recording.answer() if recording.raw_kind == 'classification' else None
+        if answer and answer.get('text'):
+            return answer['text']
+    return ''
+
+
+def capture_documents(capture: Capture, pdf_source: str = None) -> Tuple[List[SimDocument], int]:
+    """
+    The captured documents as SimDocuments, with their source PDFs when
+    pdf_source has them (a local copy of the origin bucket, or s3://bucket).
+
+    Returns:
+        tuple: (documents, number of documents replayed with a placeholder PDF)
+    """
+    by_key: Dict[str, List[Recording]] = {}
+    for recording in capture.recordings:
+        by_key.setdefault(recording.key, []).append(recording)
+
+    s3, bucket = None, None
+    if pdf_source and pdf_source.startswith('s3://'):
+        import boto3
+        s3, bucket = boto3.client('s3'), pdf_source[5:].split('/', 1)[0]
+
+    documents, placeholders = [], 0
+    for key, recordings in sorted(by_key.items()):
+        pdf = None
+        if s3 is not None:
+            try:
+                pdf = s3.get_object(Bucket=bucket, Key=key)['Body'].read()
+            except Exception as e:
+                logger.warning(f"No source PDF for {key}: {e}")
+        elif pdf_source and (Path(pdf_source) / key).is_file():
+            pdf = (Path(pdf_source) / key).read_bytes()
+        text = _recorded_text(recordings)
+        if pdf is None:
+            placeholders += 1
+            pdf = _placeholder_pdf(text or recordings[0].text())
+        first = recordings[0]
+        pages = [text.splitlines()] if text else None
+        documents.append(SimDocument(key=key, category=first.category, document_number=first.document_number,
+                                     pdf=pdf, fields=union_fields(first.document_number or '900000000'),
+                                     pages=pages))
+    return documents, placeholders
+
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+class ReplayBedrock(FakeBedrock):
+    """
+    Bedrock that answers with recorded responses.
+
+    A request is matched to its document by the simulator's oracle (S3 location
+    or PDF bytes) or, for text-only requests, by the last origin object the
+    calling thread downloaded. It matches the classification recordings when it
+    is a classification request and the extraction recordings otherwise. The
+    recordings of a document are served in order, the last one repeating; the
+    recorded throttling errors of each come first.
+    """
+
+    def __init__(self, clock, oracle, recordings: Sequence[Recording], downloads: Dict[int, str], **kwargs):
+        super().__init__(clock, oracle, **kwargs)
+        self.recordings: Dict[Tuple[str, str], List[Recording]] = {}
+        for recording in recordings:
+            self.recordings.setdefault((recording.raw_kind, recording.key), []).append(recording)
+        self.downloads = downloads
+        self.served = Counter()
+        self._pending_errors: Dict[Tuple[str, str, int], List[str]] = {}
+
+    def _next(self, request: Dict[str, Any]) -> Tuple[Optional[Recording], Optional[str]]:
+        """The recording that answers a request, and the recorded error to raise first (if any)."""
+        uris, blobs, texts = request_documents(request)
+        document = self.oracle.resolve(uris, blobs, texts)
+        key = document.key if document is not None else self.downloads.get(threading.get_ident())
+        kind = 'classification' if self.oracle.is_classification(request, texts) else 'extraction'
+        recordings = self.recordings.get((kind, key))
+        if not recordings:
+            return None, None
+        with self._lock:
+            index = min(self.served[(kind, key)], len(recordings) - 1)
+            errors = self._pending_errors.setdefault((kind, key, index), list(recordings[index].error_codes))
+            if errors:
+                return recordings[index], errors.pop(0)
+            self.served[(kind, key)] += 1
+        return recordings[index], None
+
+    def _replay(self, request: Dict[str, Any], operation: str) -> Optional[Recording]:
+        recording, code = self._next(request)
+        if recording is None:
+            self._count(request['model_id'], 'unrecorded')
+            return None
+        if code is not None:
+            self._count(request['model_id'], 'throttled')
+            self.clock.sleep(THROTTLE_LATENCY)
+            raise client_error(code, 'Recorded error, replayed', operation, 429)
+        self._wait(f"{operation}:{request['model_id']}", latency=LatencyModel(minimum=recording.latency))
+        self._count(request['model_id'], 'replayed')
+        input_tokens, output_tokens = recording.tokens()
+        with self._lock:
+            self.usage[(request['model_id'], 'input_tokens')] += input_tokens
+            self.usage[(request['model_id'], 'output_tokens')] += output_tokens
+        return recording
+
+    def converse(self, modelId, messages, inferenceConfig=None, system=None, toolConfig=None, **kwargs):
+        tool_name = toolConfig['tools'][0]['toolSpec']['name'] if toolConfig else None
+        request = {'model_id': modelId, 'messages': messages, 'system': system, 'tool_name': tool_name}
+        recording = self._replay(request, 'converse')
+        if recording is None:
+            return super().converse(modelId, messages, inferenceConfig, system, toolConfig, **kwargs)
+        input_tokens, output_tokens = recording.tokens()
+        return {
+            'ResponseMetadata': _response_metadata(self.clock),
+            'output': {'message': {'role': 'assistant', 'content': recording.content}},
+            'stopReason': recording.stop_reason,
+            'usage': {'inputTokens': input_tokens, 'outputTokens': output_tokens,
+                      'totalTokens': input_tokens + output_tokens},
+            'metrics': {'latencyMs': int(recording.latency * 1000)},
+        }
+
+    def invoke_model(self, modelId, body, contentType=None, accept=None, **kwargs):
+        import io
+
+        payload = json.loads(body)
+        tool_name = payload['tools'][0]['name'] if payload.get('tools') else None
+        request = {'model_id': modelId, 'messages': payload.get('messages', []), 'system': payload.get('system'),
+                   'tool_name': tool_name}
+        recording = self._replay(request, 'invoke_model')
+        if recording is None:
+            return super().invoke_model(modelId, body, contentType, accept, **kwargs)
+        content = []
+        for block in recording.content:
+            if 'toolUse' in block:
+                tool_use = block['toolUse']
+                content.append({'type': 'tool_use', 'id': tool_use.get('toolUseId'), 'name': tool_use.get('name'),
+                                'input': tool_use.get('input', {})})
+            elif 'text' in block:
+                content.append({'type': 'text', 'text': block['text']})
+        input_tokens, output_tokens = recording.tokens()
+        response_body = {
+            'type': 'message', 'role': 'assistant', 'model': modelId, 'content': content,
+            'stop_reason': recording.stop_reason,
+            'usage': {'input_tokens': input_tokens, 'output_tokens': output_tokens},
+        }
+        return {
+            'ResponseMetadata': _response_metadata(self.clock),
+            'contentType': 'application/json',
+            'body': io.BytesIO(json.dumps(response_body, ensure_ascii=False).encode('utf-8')),
+        }
+
+
+@dataclass
+class ReplayReport:
+    """Replay of one function's captured batches. Durations are simulated seconds, CPU time is real."""
+    function: str
+    batches: List[BatchResult]
+    documents: int
+    recorded_successes: int
+    replayed_successes: int
+    regressions: List[str]
+    bedrock: Dict[str, int]
+    placeholders: int = 0
+
+    def metrics(self) -> Dict[str, Any]:
+        """Flat metrics, comparable with bench/baseline.py."""
+        seconds = [b.seconds for b in self.batches]
+        total = sum(seconds)
+        cpu = sum(b.cpu_seconds for b in self.batches)
+        stats = summarize(seconds)
+        return {
+            'batches': len(self.batches),
+            'documents': self.documents,
+            'docs_per_sec': self.documents / total if total else None,
+            'latency_p50': stats['p50'],
+            'latency_p95': stats['p95'],
+            'latency_p99': stats['p99'],
+            'cpu_ms_per_doc': cpu * 1000 / self.documents if self.documents else None,
+            'bedrock_calls_per_doc': (self.bedrock['replayed'] + self.bedrock['unrecorded']) / self.documents
+            if self.documents else None,
+            'success_rate': self.replayed_successes / self.recorded_successes if self.recorded_successes else None,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'function': self.function, 'metrics': self.metrics(), 'bedrock': self.bedrock,
+                'recorded_successes': self.recorded_successes, 'replayed_successes': self.replayed_successes,
+                'regressions': self.regressions, 'placeholders': self.placeholders,
+                'failed_batches': [b.error for b in self.batches if b.error]}
+
+    def format(self) -> str:
+        m = self.metrics()
+
+        def number(value, spec):
+            return '-' if value is None else format(value, spec)
+
+        lines = [
+            f"{self.function}: {m['batches']} batches, {m['documents']} documents"
+            + (f" ({self.placeholders} with placeholder PDFs)" if self.placeholders else ''),
+            f"  batch duration p50 {number(m['latency_p50'], '.1f')}s p95 {number(m['latency_p95'], '.1f')}s "
+            f"p99 {number(m['latency_p99'], '.1f')}s, {number(m['docs_per_sec'], '.3f')} docs/s, "
+            f"{number(m['cpu_ms_per_doc'], '.0f')} CPU ms/doc",
+            f"  bedrock: {self.bedrock['replayed']} replayed, {self.bedrock['unrecorded']} unrecorded, "
+            f"{self.bedrock['throttled']} throttled",
+            f"  succeeded: {self.replayed_successes} of the {self.recorded_successes} recorded successes",
+        ]
+        lines.extend(f"  regression: {key}" for key in self.regressions)
+        lines.extend(f"  failed batch: {b.error}" for b in self.batches if b.error)
+        return '\n'.join(lines)
+
+
+class ReplayHarness(HandlerHarness):
+    """
+    Invokes one function with the captured batches and the recorded Bedrock responses.
+
+    Args:
+        function: Function name (classification, extraction-scoring, fallback-processing)
+        capture: Loaded capture
+        documents: capture_documents(capture)[0]
+        config: Simulation settings (model profiles are ignored: latencies and errors are the recorded ones)
+        placeholders: Documents with placeholder PDFs, for the report
+    """
+
+    def __init__(self, function: str, capture: Capture, documents: Sequence[SimDocument],
+                 config: SimulationConfig = None, placeholders: int = 0):
+        super().__init__(function, documents, config)
+        self.capture = capture
+        self.placeholders = placeholders
+        self.by_key = {document.key: document for document in self.documents}
+        self.downloads: Dict[int, str] = {}
+        self.aws.use_bedrock(ReplayBedrock(self.clock, self.oracle, capture.recordings_of(function),
+                                           self.downloads, seed=self.config.seed))
+        self._track_downloads()
+
+    def _track_downloads(self) -> None:
+        """Remember the origin object each thread downloaded last (ReplayBedrock's text-only matching)."""
+        s3, downloads = self.aws.s3, self.downloads
+        get_object = s3.get_object
+
+        def tracked_get_object(Bucket, Key, **kwargs):
+            if Bucket == ORIGIN_BUCKET:
+                downloads[threading.get_ident()] = Key
+            return get_object(Bucket=Bucket, Key=Key, **kwargs)
+
+        s3.get_object = tracked_get_object
+
+    def _successful_keys(self) -> set:
+        """Source keys the replay saved a RAW/ response for (the replay's successes)."""
+        kinds = {r.raw_kind for r in self.capture.recordings_of(self.loaded.config.name)} or {'extraction'}
+        file_ids = {}
+        for document in self.documents:
+            file_ids.setdefault(document.file_id, []).append(document.key)
+        saved = set()
+        for key in self.aws.s3.keys(DESTINATION_BUCKET, 'RAW/'):
+            name = key.rsplit('/', 1)[-1]
+            for kind in kinds:
+                prefix = f"raw_{kind}_"
+                if name.startswith(prefix):
+                    file_id = _TIMESTAMP.sub('', name[len(prefix):])
+                    saved.update(file_ids.get(file_id, []))
+        return saved
+
+    def replay(self, concurrency: int = 1) -> ReplayReport:
+        """
+        Invoke the handler with every captured batch of the function.
+
+        Args:
+            concurrency: Batches invoked at the same time (1 keeps recorded order)
+
+        Returns:
+            ReplayReport
+        """
+        function = self.loaded.config.name
+        batches = [[self.by_key[key] for key in batch.keys if key in self.by_key]
+                   for batch in self.capture.batches_of(function)]
+        batches = [batch for batch in batches if batch]
+        random.seed(self.config.seed)
+        with self.active():
+            if concurrency > 1:
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    results = list(pool.map(self.invoke, batches))
+            else:
+                results = [self.invoke(batch) for batch in batches]
+            successes = self._successful_keys()
+
+        recorded = {r.key for r in self.capture.recordings_of(function)}
+        outcomes = self.aws.bedrock.outcomes
+        bedrock = {outcome: sum(n for (_, o), n in outcomes.items() if o == outcome)
+                   for outcome in ('replayed', 'unrecorded', 'throttled', 'error')}
+        return ReplayReport(
+            function=function,
+            batches=results,
+            documents=sum(len(batch) for batch in batches),
+            recorded_successes=len(recorded),
+            replayed_successes=len(recorded & successes),
+            regressions=sorted(recorded - successes),
+            bedrock=bedrock,
+            placeholders=self.placeholders,
+        )
+
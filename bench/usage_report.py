@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Token, cost and latency tables from stored batch summaries.
+
+Reads the batch_summaries/ JSON files written by
+ReportGenerator.save_batch_summary, from a local directory or an S3 prefix,
+and adds up the per-document Bedrock usage of their detailed_results (see
+shared/usage_ledger.py). Summaries saved before usage was recorded are
+counted but contribute no calls.
+
+Tables:
+  by model     calls, tokens, cost, p50/p95 call latency, time spent in throttling backoff
+  by phase     classification / extraction / fallback calls, tokens and cost
+  by category  documents, successful documents, tokens and cost per successful document
+
+Usage:
+    python bench/usage_report.py s3://bucket/par-servicios-poc/batch_summaries/ [--since 2026-10-01] [--until 2026-10-08]
+    python bench/usage_report.py ./downloaded_summaries [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'functions'))
+
+from shared.usage_ledger import rollup
+
+
+def iter_local_summaries(directory: Path) -> Iterator[Dict[str, Any]]:
+    for path in sorted(Path(directory).rglob('batch_summary_*.json')):
+        try:
+            yield json.loads(path.read_text(encoding='utf-8'))
+        except ValueError as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+
+
+def iter_s3_summaries(uri: str) -> Iterator[Dict[str, Any]]:
+    import boto3
+
+    bucket, _, prefix = uri[5:].partition('/')
+    s3 = boto3.client('s3')
+    for page in s3.get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            if not obj['Key'].endswith('.json') or 'batch_summary_' not in obj['Key']:
+                continue
+            body = s3.get_object(Bucket=bucket, Key=obj['Key'])['Body'].read()
+            try:
+                yield json.loads(body)
+            except ValueError as e:
+                print(f"Skipping s3://{bucket}/{obj['Key']}: {e}", file=sys.stderr)
+
+
+def in_period(summary: Dict[str, Any], since: str = None, until: str = None) -> bool:
+    """Whether the summary's timestamp (ISO) falls in [since, until]; dates compare as prefixes."""
+    timestamp = summary.get('batch_summary', {}).get('timestamp', '')
+    if since and timestamp[:len(since)] < since:
+        return False
+    if until and timestamp[:len(until)] > until:
+        return False
+    return True
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def aggregate(summaries) -> Dict[str, Any]:
+    """
+    Usage of every document in the summaries.
+
+    Args:
+        summaries: Batch summary dicts
+
+    Returns:
+        dict: rollup() of all detailed results plus batches, documents and
+              per-model call latency percentiles
+    """
+    results, batches = [], 0
+    for summary in summaries:
+        batches += 1
+        results.extend(summary.get('detailed_results', []))
+
+    report = rollup(results)
+    latencies: Dict[str, List[float]] = {}
+    for result in results:
+        for call in (result.get('usage') or {}).get('calls', []):
+            latencies.setdefault(call.get('model_id') or 'unknown', []).append(call.get('latency_ms') or 0.0)
+    for model_id, totals in report['by_model'].items():
+        totals['latency_p50_ms'] = percentile(latencies.get(model_id, []), 50)
+        totals['latency_p95_ms'] = percentile(latencies.get(model_id, []), 95)
+    report['batches'] = batches
+    report['documents'] = len(results)
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"Batches: {report['batches']}  documents: {report['documents']}  "
+             f"Bedrock calls: {report['totals']['calls']}  cost: ${report['totals']['cost_usd']:.4f}", '']
+
+    lines.append(f"  {'model':48s} {'calls':>6s} {'input':>10s} {'output':>9s} {'cache rd':>9s} "
+                 f"{'cost $':>9s} {'p50 ms':>8s} {'p95 ms':>8s} {'backoff s':>9s}")
+    for model_id, t in sorted(report['by_model'].items(), key=lambda item: -item[1]['cost_usd']):
+        lines.append(f"  {model_id:48s} {t['calls']:6d} {t['input_tokens']:10d} {t['output_tokens']:9d} "
+                     f"{t['cache_read_tokens']:9d} {t['cost_usd']:9.4f} {t['latency_p50_ms']:8.0f} "
+                     f"{t['latency_p95_ms']:8.0f} {t['backoff_ms'] / 1000:9.1f}")
+
+    lines += ['', f"  {'phase':16s} {'calls':>6s} {'input':>10s} {'output':>9s} {'cost $':>9s}"]
+    for phase, t in sorted(report['by_phase'].items()):
+        lines.append(f"  {phase:16s} {t['calls']:6d} {t['input_tokens']:10d} {t['output_tokens']:9d} "
+                     f"{t['cost_usd']:9.4f}")
+
+    lines += ['', f"  {'category':10s} {'docs':>6s} {'ok':>6s} {'cost $':>9s} {'tokens/ok':>10s} {'$/ok':>9s}"]
+    for category, t in sorted(report['by_category'].items()):
+        per_doc_tokens = t['tokens_per_successful_document']
+        per_doc_cost = t['cost_per_successful_document']
+        lines.append(f"  {category:10s} {t['documents']:6d} {t['successful_documents']:6d} {t['cost_usd']:9.4f} "
+                     f"{'-' if per_doc_tokens is None else f'{per_doc_tokens:.0f}':>10s} "
+                     f"{'-' if per_doc_cost is None else f'{per_doc_cost:.5f}':>9s}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('source', help='Local directory or s3://bucket/prefix of batch summaries')
+    parser.add_argument('--since', help='First day (or ISO timestamp) to include')
+    parser.add_argument('--until', help='Last day (or ISO timestamp) to include')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    summaries = iter_s3_summaries(args.source) if args.source.startswith('s3://') else iter_local_summaries(args.source)
+    report = aggregate(s for s in summaries if in_period(s, args.since, args.until))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
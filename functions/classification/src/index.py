@@ -16,9 +16,15 @@ from shared.bedrock_client import (
     create_bedrock_client, set_model_params_anthropic,set_model_params_converse, call_bedrock_unified, 
     parse_classification, BedrockRequest, is_anthropic_model
 )
-from shared.pdf_processor import get_first_pdf_page, detect_scanned_pdf, create_message, download_pdf_from_s3
-from shared.prompt_loader import prompt_loader
-from shared.report_generator import report_generator
+from shared.pdf_processor import get_first_pdf_page, create_message, download_pdf_from_s3
+from shared.prompt_loader import prompt_loader, CLASSIFICATION_PROMPT
+from shared.parser_registry import parser_registry
+from shared.structured_output import apply_structured_output, classification_tool_config
+from shared.tracing import tracer, annotate, traced
+from shared.metrics import metrics
+from shared.profiler import profiler
+from shared.memory_profile import memory_profiler
+from shared.usage_ledger import usage_ledger
 
 # Categories that require extraction processing
 EXTRACTABLE_CATEGORIES = {'CERL', 'CECRL', 'RUT', 'RUB', 'ACC'}
@@ -38,6 +44,7 @@ ClassificationResult = namedtuple('ClassificationResult', [
     'model_used'         # str - which model was used
 ])
 
+@traced('save')
 def _save_successful_classification(classification_data: Dict[str, Any], 
                                    source_key: str, category: str, 
                                    document_number: str, model_used: str,
@@ -71,6 +78,7 @@ def _save_successful_classification(classification_data: Dict[str, Any],
             "method_used": f"pdf_claude_{model_used}",
             "processing_time_seconds": processing_time,
             "classification_timestamp": raw_response.get('ResponseMetadata', {}).get('HTTPHeaders', {}).get('date') if raw_response else None,
+            "prompt_bundle": classification_data.get('prompt_bundle'),
             "file_info": {
                 "source_key": source_key,
                 "category": category,
@@ -83,6 +91,7 @@ def _save_successful_classification(classification_data: Dict[str, Any],
         enhanced_raw['classification_model_used'] = model_used
         enhanced_raw['method_used'] = f"pdf_claude_{model_used}"
         enhanced_raw['processing_time_seconds'] = processing_time
+        enhanced_raw['prompt_bundle'] = classification_data.get('prompt_bundle')
         enhanced_raw['file_info'] = {
             'source_key': source_key,
             'category': category,
@@ -118,12 +127,26 @@ def classify_single_document(s3_record: Dict[str, Any], message_id: str,
         bedrock_client: Bedrock client
         
     Returns:
-        dict: Classification result with metadata
+        dict: Classification result with metadata, its per-stage 'timings' and Bedrock 'usage'
     """
+    with tracer.start('classification', message_id=message_id) as trace, \
+            usage_ledger.attribute('classification') as usage:
+        result = _classify_single_document(s3_record, message_id, s3_client, dynamodb_client, bedrock_client)
+        trace.set(success=bool(result.get('success')), status=result.get('status', 'processed'))
+    document_info = result.get('document_info', {})
+    usage.set(document=document_info.get('document_number'), category=document_info.get('category'))
+    result['timings'] = trace.to_dict()
+    result['usage'] = usage.summary()
+    return result
+
+def _classify_single_document(s3_record: Dict[str, Any], message_id: str,
+                              s3_client, dynamodb_client, bedrock_client) -> Dict[str, Any]:
+    """Classification of one document, run inside its trace (see classify_single_document)."""
     start_time = time.time()
     bucket = s3_record['s3']['bucket']['name']
     key = unquote_plus(s3_record['s3']['object']['key'])
     pdf_path = f"s3://{bucket}/{key}"
+    annotate(key=key)
     
     logger.info(f"Classifying document: {pdf_path}")
     
@@ -180,6 +203,7 @@ def classify_single_document(s3_record: Dict[str, Any], message_id: str,
         # Add method_used and processing_time to meta_dict
         meta_dict['method_used'] = f"pdf_claude_{classification_result.model_used}"
         meta_dict['processing_time_seconds'] = processing_time
+        meta_dict['prompt_bundle'] = prompt_loader.bundle_stamp(CLASSIFICATION_PROMPT)
         
         # Save detailed result to S3
         if classification_result.is_success:
@@ -275,6 +299,8 @@ def try_single_model_classification(bedrock_client, model_id: str, user_prompt:
                     {"cachePoint": {"type": "default"}}
                 ]
             )
+        request = apply_structured_output(request, classification_tool_config(model_id))
+        
         # Call unified Bedrock API
         raw_response = call_bedrock_unified(request, bedrock_client)
         logger.info(f"Response from Bedrock ({model_id}): stopReason={raw_response.get('stopReason')}")
@@ -352,6 +378,7 @@ def process_batch_classification(sqs_records: List[Dict], s3_client, dynamodb_cl
             logger.error(f"Error parsing SQS message {message_id}: {str(e)}")
     
     logger.info(f"PHASE 1: Processing {len(all_documents)} documents with {batch_delay}s delays")
+    metrics.put('DocumentsPerBatch', len(all_documents))
     
     # PHASE 2: Classify with delays
     classification_results = []
@@ -390,11 +417,26 @@ def process_batch_classification(sqs_records: List[Dict], s3_client, dynamodb_cl
             'key': result['document_info'].get('s3_key', 'unknown'),
             'status': 'success' if result.get('success') else 'error',
             'payload': result.get('classification_result') if result.get('success') else None,
-            'error': result.get('error') if not result.get('success') else None
+            'error': result.get('error') if not result.get('success') else None,
+            'timings': result.get('timings'),
+            'usage': result.get('usage')
         })
     
+    # Batch summary with the Bedrock usage rollup, read by bench/usage_report.py
+    # Imported here, not at cold start (see bench/cold_start_budget.json)
+    from shared.report_generator import report_generator
+    report_generator.save_batch_summary(results, 'classification', {
+        'processing_mode': 'simplified_primary_model_only',
+        'sent_to_extraction': successful_extractions
+    })
+    
+    parser_registry.log_stats()
+    
     return results, failed_message_ids
 
+@metrics.invocation('classification')
+@memory_profiler.invocation('classification')
+@profiler.invocation('classification')
 def handler(event, context):
     """
     Lambda handler function for SQS batch processing of S3 events with simplified processing.
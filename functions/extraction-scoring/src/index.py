@@ -10,7 +10,7 @@ Flow:
 2. Event validation and SQS record parsing
 3. PHASE 1: Extract from ALL documents in batch using PRIMARY MODEL ONLY
 4. PHASE 2: Save ALL results to S3
-5. Error handling and fallback queue
+5. Error handling and fallback queue (including results that fail schema validation)
 
 Architecture: Follows SOLID principles with single-responsibility functions
 """
@@ -18,13 +18,11 @@ Architecture: Follows SOLID principles with single-responsibility functions
 import json
 import logging
 import os
-import boto3
 import re
 from pathlib import Path
 from typing import Dict, Any, Tuple, List
 from datetime import datetime, timezone
 from shared.aws_clients import create_s3_client
-from datetime import datetime, timezone
 import time
 
 from shared.bedrock_client import (
@@ -36,8 +34,15 @@ from shared.sqs_handler import send_to_fallback_queue_extraction
 from shared.s3_handler import save_to_s3, extract_s3_path
 from shared.processing_result import ProcessingResult, save_processing_to_s3
 from shared.prompt_loader import prompt_loader
-from shared.report_generator import report_generator
 from shared.result_builder import build_document_info, build_model_info
+from shared.schema_validator import schema_registry
+from shared.parser_registry import parser_registry
+from shared.structured_output import apply_structured_output, extraction_tool_config
+from shared.tracing import tracer, span, traced
+from shared.metrics import metrics
+from shared.profiler import profiler
+from shared.memory_profile import memory_profiler
+from shared.usage_ledger import usage_ledger
 
 # =============================================================================
 # CONFIGURATION & SETUP
@@ -55,13 +60,23 @@ DESTINATION_BUCKET = os.environ.get("DESTINATION_BUCKET")
 REGION = os.environ.get("REGION", "us-east-2")
 FOLDER_PREFIX = os.environ.get("FOLDER_PREFIX")
 
-# Create clients
-bedrock_client = create_bedrock_client()
+# Bedrock client, created on first use and reused by warm invocations
+_bedrock_client = None
+
+def get_bedrock_client():
+    """Get the container's Bedrock client, creating it on first use."""
+    global _bedrock_client
+    if _bedrock_client is None:
+        _bedrock_client = create_bedrock_client()
+    return _bedrock_client
 
 # =============================================================================
 # MAIN ENTRY POINT
 # =============================================================================
 
+@metrics.invocation('extraction-scoring')
+@memory_profiler.invocation('extraction-scoring')
+@profiler.invocation('extraction-scoring')
 def handler(event, context):
     """
     Lambda handler for extraction-scoring service with 2-phase batch processing.
@@ -148,6 +163,7 @@ def process_batch_extraction(records: List[Dict[str, Any]]) -> Tuple[List[Dict],
             logger.error(f"Error extracting payload from message {message_id}: {str(e)}")
     
     logger.info(f"PHASE 1: Processing {len(all_extraction_requests)} extractions with {batch_delay}s delays")
+    metrics.put('DocumentsPerBatch', len(all_extraction_requests))
     
     # PHASE 2: Extract with delays
     extraction_results = []
@@ -180,12 +196,24 @@ def process_batch_extraction(records: List[Dict[str, Any]]) -> Tuple[List[Dict],
         results.append({
             'messageId': result.get('messageId', 'unknown'),
             'document_number': result['document_info'].get('document_number', 'unknown'),
+            'path': result['document_info'].get('path'),
             'category': result.get('category', 'unknown'),
             'success': result.get('success', False),
             'extraction_data': result.get('extraction_result') if result.get('success') else None,
-            'error': result.get('error') if not result.get('success') else None
+            'error': result.get('error') if not result.get('success') else None,
+            'timings': result.get('timings'),
+            'usage': result.get('usage')
         })
     
+    # Batch summary with the Bedrock usage rollup, read by bench/usage_report.py
+    # Imported here, not at cold start (see bench/cold_start_budget.json)
+    from shared.report_generator import report_generator
+    report_generator.save_batch_summary(results, 'extraction', {
+        'processing_mode': 'simplified_primary_model_only'
+    })
+    
+    parser_registry.log_stats()
+    
     return results, failed_message_ids
 
 # =============================================================================
@@ -196,7 +224,20 @@ def extract_single_document(payload: Dict[str, Any], message_id: str) -> Dict[st
     """
     Extract data from a single document using only primary model.
     MODIFIED: No guarda errores a S3 - solo envía a fallback queue
+    Per-stage timing spans are returned under 'timings', Bedrock tokens and cost under 'usage'.
     """
+    with tracer.start('extraction', message_id=message_id, category=payload.get('category'),
+                      document_number=payload.get('document_number')) as trace, \
+            usage_ledger.attribute('extraction', document=payload.get('document_number'),
+                                   category=payload.get('category')) as usage:
+        result = _extract_single_document(payload, message_id)
+        trace.set(success=bool(result.get('success')))
+    result['timings'] = trace.to_dict()
+    result['usage'] = usage.summary()
+    return result
+
+def _extract_single_document(payload: Dict[str, Any], message_id: str) -> Dict[str, Any]:
+    """Extraction of one document, run inside its trace (see extract_single_document)."""
     start_time = time.time()
     pdf_path = payload.get('path')
     document_number = payload.get('document_number')
@@ -222,10 +263,12 @@ def extract_single_document(payload: Dict[str, Any], message_id: str) -> Dict[st
         request_data = _build_extraction_request(payload)
         
         # Try extraction with primary model only
-        extraction_result, raw_response = _extract_with_single_model(primary_model, request_data['req_params'])
+        extraction_result, raw_response = _extract_with_single_model(primary_model, request_data['req_params'], category)
         
         processing_time = time.time() - start_time
         
+        prompt_bundle = prompt_loader.bundle_stamp(category)
+        
         # Build document and model info
         document_info = build_document_info(pdf_path)
         model_info = build_model_info(
@@ -242,7 +285,7 @@ def extract_single_document(payload: Dict[str, Any], message_id: str) -> Dict[st
             _save_successful_extraction(
                 data['raw_response'], data['meta'], data['payload_data'],
                 request_data['source_key'], category, document_number, extraction_result.model_used,
-                processing_time
+                processing_time, prompt_bundle
             )
         else:
             # ✅ CAMBIO: NO guardar error a S3 aquí - solo log para debugging
@@ -256,6 +299,7 @@ def extract_single_document(payload: Dict[str, Any], message_id: str) -> Dict[st
             'document_info': document_info,
             'extraction_result': extraction_result.data if extraction_result.is_success else None,
             'model_info': model_info,
+            'prompt_bundle': prompt_bundle,
             'category': category,
             'error': extraction_result.error_message if not extraction_result.is_success else None,
             'messageId': message_id,
@@ -318,6 +362,7 @@ def _extract_payload_from_record(record: Dict[str, Any]) -> Dict[str, Any]:
 # REQUEST BUILDING - PREPARE DATA FOR PROCESSING
 # =============================================================================
 
+@traced('request.build')
 def _build_extraction_request(payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     Build extraction request from payload.
@@ -388,15 +433,21 @@ def _build_extraction_request(payload: Dict[str, Any]) -> Dict[str, Any]:
 # MODEL PROCESSING - CORE EXTRACTION LOGIC
 # =============================================================================
 
-def _extract_with_single_model(model_id: str, req_params: Dict[str, Any]) -> tuple[ProcessingResult, dict]:
+def _extract_with_single_model(model_id: str, req_params: Dict[str, Any], category: str = None) -> tuple[ProcessingResult, dict]:
     """
     Pure function - call Bedrock and parse response with single model.
     SRP: Single responsibility for Bedrock interaction and parsing.
+    Parsed results are validated against the category schema; invalid results
+    fail with status 'validation_error' so they go to the fallback queue.
     """
     raw_response = None
     try:
+        request = BedrockRequest(**req_params)
+        if category:
+            request = apply_structured_output(request, extraction_tool_config(category, model_id))
+        
         # Call unified Bedrock API
-        resp_json = call_bedrock_unified(BedrockRequest(**req_params), bedrock_client)
+        resp_json = call_bedrock_unified(request, get_bedrock_client())
         logger.info(f"Received response from Bedrock: stopReason={resp_json.get('stopReason')}")
 
         # Enhance response with model metadata
@@ -416,6 +467,22 @@ def _extract_with_single_model(model_id: str, req_params: Dict[str, Any]) -> tup
         try:
             meta = parse_extraction_response(resp_json)
             logger.info(f"Successfully parsed response: {json.dumps(meta, indent=2)}")
+            
+            if category:
+                with span('schema.validate'):
+                    validation = schema_registry.validate(meta, category)
+                if not validation.is_valid:
+                    return ProcessingResult(
+                        is_success=False,
+                        data=None,
+                        status='validation_error',
+                        error_message=f"Schema validation failed for {model_id}: {validation.error_message()}",
+                        model_used=model_id
+                    ), raw_response
+                meta = validation.data
+                if validation.schema_found:
+                    meta['schema_validation'] = validation.summary()
+            
             payload_data = create_payload_data_extraction(meta)
 
             return ProcessingResult(
@@ -460,10 +527,11 @@ def _enhance_raw_response(resp_json: Dict[str, Any], model_id: str, req_params:
 # S3 PERSISTENCE - SUCCESS & FAILURE HANDLING
 # =============================================================================
 
+@traced('save')
 def _save_successful_extraction(resp_json: Dict[str, Any], meta: Dict[str, Any], 
                               payload_data: Dict[str, Any], source_key: str, 
                               category: str, document_number: str, model_used: str,
-                              processing_time: float) -> None:
+                              processing_time: float, prompt_bundle: Dict[str, Any] = None) -> None:
     """
     Save successful extraction results to S3.
     SRP: Single responsibility for S3 persistence of successful extractions.
@@ -483,6 +551,7 @@ def _save_successful_extraction(resp_json: Dict[str, Any], meta: Dict[str, Any],
         enhanced_meta['method_used'] = f"pdf_claude_{model_used}"
         enhanced_meta['processing_time_seconds'] = processing_time
         enhanced_meta['extraction_timestamp'] = resp_json.get('ResponseMetadata', {}).get('HTTPHeaders', {}).get('date')
+        enhanced_meta['prompt_bundle'] = prompt_bundle
         enhanced_meta['file_info'] = {
             'source_key': source_key,
             'category': category,
@@ -495,6 +564,7 @@ def _save_successful_extraction(resp_json: Dict[str, Any], meta: Dict[str, Any],
         enhanced_raw['extraction_model_used'] = model_used
         enhanced_raw['method_used'] = f"pdf_claude_{model_used}"
         enhanced_raw['processing_time_seconds'] = processing_time
+        enhanced_raw['prompt_bundle'] = prompt_bundle
         enhanced_raw['file_info'] = {
             'source_key': source_key,
             'category': category,
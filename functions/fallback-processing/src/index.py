@@ -10,6 +10,7 @@ SIMPLIFIED FLOW:
 2. Determine if classification or extraction based on payload
 3. PHASE 1: PyPDF text extraction → Fallback Model processing
 4. PHASE 2: If failed, Textract text extraction → Fallback Model processing  
+   (SPECULATIVE_TEXTRACT=true: Textract starts together with PyPDF, first usable text wins)
 5. PHASE 3: If both failed, save for manual review
 6. SUCCESS: Save results in extraction/ folder with same format as normal extraction
 
@@ -20,14 +21,16 @@ import json
 import logging
 import os
 import re
-import boto3
-from boto3.dynamodb.conditions import Key
+import threading
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 from shared.aws_clients import create_dynamodb_client, create_s3_client
-from shared.pdf_processor import extract_pdf_text_with_pypdf, extract_pdf_text_with_textract
+from shared.pdf_processor import (
+    extract_pdf_text_with_pypdf, extract_pdf_text_with_textract,
+    PYPDF_EXTRACTOR_VERSION, TEXTRACT_EXTRACTOR_VERSION
+)
 from shared.s3_handler import extract_s3_path, save_to_s3
 from shared.result_builder import build_document_info, extract_document_number_from_path, extract_original_category_from_path
 from shared.bedrock_client import (
@@ -35,8 +38,19 @@ from shared.bedrock_client import (
     call_bedrock_unified, BedrockRequest, is_anthropic_model,
     parse_classification, parse_extraction_response, create_payload_data_extraction
 )
-from shared.prompt_loader import prompt_loader
+from shared.prompt_loader import prompt_loader, CLASSIFICATION_PROMPT
 from shared.processing_result import ProcessingResult
+from shared.text_race import race_text_sources
+from shared.text_quality import score_text_quality
+from shared.text_cache import text_cache, document_hash
+from shared.schema_validator import schema_registry
+from shared.parser_registry import parser_registry
+from shared.structured_output import apply_structured_output, classification_tool_config, extraction_tool_config
+from shared.tracing import tracer, span, traced
+from shared.metrics import metrics
+from shared.profiler import profiler
+from shared.memory_profile import memory_profiler, stage, staged
+from shared.usage_ledger import usage_ledger
 import time
 
 # Configure logging
@@ -46,6 +60,8 @@ logger.setLevel(logging.INFO)
 
 FOLDER_PREFIX = os.environ.get("FOLDER_PREFIX", "par-servicios-poc")
 DESTINATION_BUCKET = os.environ.get("DESTINATION_BUCKET")
+# Start Textract concurrently with PyPDF instead of only after PyPDF + model failed
+SPECULATIVE_TEXTRACT = os.environ.get("SPECULATIVE_TEXTRACT", "false").lower() == "true"
 
 def determine_process_type_and_prompts(payload: Dict[str, Any]) -> Tuple[str, str, str]:
     """
@@ -106,10 +122,15 @@ def create_text_message_for_claude(user_prompt: str, extracted_text: str) -> Lis
         ]
     }]
 
+@traced('fallback.model')
+@staged('fallback.model')
 def try_claude_with_extracted_text(model_id: str, user_prompt: str, system_prompt: str, 
-                                   extracted_text: str, process_type: str) -> ProcessingResult:
+                                   extracted_text: str, process_type: str,
+                                   category: str = None) -> ProcessingResult:
     """
     Attempt processing with Claude using extracted text.
+    Extraction results that fail the category schema are returned as
+    'validation_error' so the next text source (or manual review) is tried.
     
     Args:
         model_id: Claude model to use
@@ -117,6 +138,8 @@ def try_claude_with_extracted_text(model_id: str, user_prompt: str, system_promp
         system_prompt: System prompt  
         extracted_text: Extracted text from PDF
         process_type: 'classification' or 'extraction'
+        category: Classified category of an extraction, used for schema validation
+                  and for the structured-output tool
         
     Returns:
         ProcessingResult: Result of Claude processing
@@ -148,6 +171,11 @@ def try_claude_with_extracted_text(model_id: str, user_prompt: str, system_promp
                 system=system
             )
         
+        if process_type == 'classification':
+            request = apply_structured_output(request, classification_tool_config(model_id))
+        elif category:
+            request = apply_structured_output(request, extraction_tool_config(category, model_id))
+        
         # Call Claude
         logger.info(f"Calling Claude {model_id} with extracted text ({len(extracted_text)} chars)")
         raw_response = call_bedrock_unified(request, bedrock_client)
@@ -169,6 +197,19 @@ def try_claude_with_extracted_text(model_id: str, user_prompt: str, system_promp
                 logger.info(f"Successfully parsed classification: {data.get('category', 'UNKNOWN')}")
             else:  # extraction
                 data = parse_extraction_response(raw_response)
+                if category:
+                    validation = schema_registry.validate(data, category)
+                    if not validation.is_valid:
+                        return ProcessingResult(
+                            is_success=False,
+                            data=None,
+                            status='validation_error',
+                            error_message=f"Schema validation failed for {model_id}: {validation.error_message()}",
+                            model_used=model_id
+                        )
+                    data = validation.data
+                    if validation.schema_found:
+                        data['schema_validation'] = validation.summary()
                 payload_data = create_payload_data_extraction(data)
                 data = {'meta': data, 'payload_data': payload_data, 'raw_response': raw_response}
                 logger.info(f"Successfully parsed extraction")
@@ -201,10 +242,12 @@ def try_claude_with_extracted_text(model_id: str, user_prompt: str, system_promp
             model_used=model_id
         )
 
+@traced('save')
 def save_successful_fallback_to_extraction_folder(result_data: Dict[str, Any], s3_info: Dict[str, str], 
                                                  category: str, document_number: str, 
                                                  method_used: str, processing_time: float,
-                                                 process_type: str, raw_response: Dict[str, Any]) -> None:
+                                                 process_type: str, raw_response: Dict[str, Any],
+                                                 prompt_bundle: Dict[str, Any] = None) -> None:
     """
     Save successful fallback results to extraction/ folder with same format as normal extraction.
     NO longer creates fallback/ folder.
@@ -218,6 +261,7 @@ def save_successful_fallback_to_extraction_folder(result_data: Dict[str, Any], s
         processing_time: Time taken to process
         process_type: "classification" or "extraction"
         raw_response: Raw Bedrock response
+        prompt_bundle: Prompt bundle the result was produced with
     """
     try:
         # Extract filename for unique identifier
@@ -237,6 +281,7 @@ def save_successful_fallback_to_extraction_folder(result_data: Dict[str, Any], s
             enhanced_meta['processing_time_seconds'] = processing_time
             enhanced_meta['came_from_fallback'] = True  # Only difference to indicate origin
             enhanced_meta['extraction_timestamp'] = raw_response.get('ResponseMetadata', {}).get('HTTPHeaders', {}).get('date')
+            enhanced_meta['prompt_bundle'] = prompt_bundle
             enhanced_meta['file_info'] = {
                 'source_key': s3_info['s3_key'],
                 'category': category,
@@ -250,6 +295,7 @@ def save_successful_fallback_to_extraction_folder(result_data: Dict[str, Any], s
             enhanced_raw['method_used'] = method_used
             enhanced_raw['processing_time_seconds'] = processing_time
             enhanced_raw['came_from_fallback'] = True
+            enhanced_raw['prompt_bundle'] = prompt_bundle
             enhanced_raw['file_info'] = {
                 'source_key': s3_info['s3_key'],
                 'category': category,
@@ -289,6 +335,7 @@ def save_successful_fallback_to_extraction_folder(result_data: Dict[str, Any], s
                 "processing_time_seconds": processing_time,
                 "came_from_fallback": True,
                 "classification_timestamp": raw_response.get('ResponseMetadata', {}).get('HTTPHeaders', {}).get('date'),
+                "prompt_bundle": prompt_bundle,
                 "file_info": {
                     "source_key": s3_info['s3_key'],
                     "category": category,
@@ -302,6 +349,7 @@ def save_successful_fallback_to_extraction_folder(result_data: Dict[str, Any], s
             enhanced_raw['method_used'] = method_used
             enhanced_raw['processing_time_seconds'] = processing_time
             enhanced_raw['came_from_fallback'] = True
+            enhanced_raw['prompt_bundle'] = prompt_bundle
             enhanced_raw['file_info'] = {
                 'source_key': s3_info['s3_key'],
                 'category': category,
@@ -322,17 +370,178 @@ def save_successful_fallback_to_extraction_folder(result_data: Dict[str, Any], s
     except Exception as e:
         logger.error(f"Failed to save fallback results to extraction folder: {e}")
 
+def assess_extracted_text(source: str, text: str, text_quality: Dict[str, Any]) -> bool:
+    """
+    Score an extracted text and decide whether it is worth a fallback model call.
+    The score is recorded in text_quality under the source name.
+    
+    Args:
+        source: Text source ('pypdf' or 'textract')
+        text: Extracted text
+        text_quality: Dict collecting scores for processing_metadata
+        
+    Returns:
+        bool: True if the text should be sent to the model
+    """
+    quality = score_text_quality(text)
+    text_quality[source] = quality.to_dict()
+    logger.info(f"{source} text quality: score={quality.score}, usable={quality.is_usable} ({quality.reason})")
+    return quality.is_usable
+
+def build_fallback_success(source: str, extracted_text: str, model_result: ProcessingResult,
+                           fallback_model: str, payload: Dict[str, Any], s3_info: Dict[str, str],
+                           category: str, document_number: str, process_type: str,
+                           pdf_bytes: bytes, start_time: float,
+                           prompt_bundle: Dict[str, Any] = None,
+                           extra_metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Persist a successful fallback result to extraction/ and build the response.
+    
+    Args:
+        source: Text source that succeeded ('pypdf' or 'textract')
+        extracted_text: Text sent to the fallback model
+        model_result: Successful ProcessingResult from the fallback model
+        prompt_bundle: Prompt bundle the result was produced with
+        extra_metadata: Additional processing_metadata fields
+        
+    Returns:
+        dict: Processing result with extracted data
+    """
+    processing_time = time.time() - start_time
+    method_used = f"{source}_claude_{fallback_model}"
+    
+    logger.info(f"SUCCESS: {process_type} completed with {source} + {fallback_model}")
+    
+    # Save to extraction/ folder (NOT fallback/ folder)
+    save_successful_fallback_to_extraction_folder(
+        model_result.data, s3_info, category, document_number,
+        method_used, processing_time, process_type,
+        model_result.data.get('raw_response', {}) if process_type == 'extraction' else {},
+        prompt_bundle
+    )
+    
+    processing_metadata = {
+        'fallback_method': f'{source}_claude',
+        'model_used': model_result.model_used,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'pdf_size_bytes': len(pdf_bytes),
+        'processing_time_seconds': processing_time,
+        'prompt_bundle': prompt_bundle
+    }
+    processing_metadata.update(extra_metadata or {})
+    
+    return {
+        'success': True,
+        'method_used': method_used,
+        'process_type': process_type,
+        'extracted_text': extracted_text,
+        'processed_data': model_result.data,
+        'text_length': len(extracted_text),
+        'document_info': build_document_info(payload.get('path', '')),
+        'processing_metadata': processing_metadata
+    }
+
+def build_text_extractors(pdf_bytes: bytes, s3_info: Dict[str, str], cache_hits: Dict[str, str],
+                          cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """
+    Build PyPDF and Textract extractors backed by the persistent text cache.
+    A re-processed document (new prompt version, reprocessing run) reuses the
+    stored text instead of paying for Textract again.
+    
+    Args:
+        pdf_bytes: PDF content
+        s3_info: S3 bucket and key of the PDF (Textract reads it from S3)
+        cache_hits: Dict collecting the cache tier that served each source
+        cancel_event: Optional event to stop Textract polling early
+        
+    Returns:
+        dict: source name -> callable returning the extracted text
+    """
+    doc_hash = document_hash(pdf_bytes)
+    
+    def cached(source, version, extract_fn):
+        def run():
+            text, tier = text_cache.get_or_extract(doc_hash, source, version, extract_fn)
+            if tier:
+                cache_hits[source] = tier
+            return text
+        return run
+    
+    return {
+        'pypdf': cached('pypdf', PYPDF_EXTRACTOR_VERSION, lambda: extract_pdf_text_with_pypdf(pdf_bytes)),
+        'textract': cached('textract', TEXTRACT_EXTRACTOR_VERSION, lambda: extract_pdf_text_with_textract(
+            pdf_bytes, s3_info['s3_bucket'], s3_info['s3_key'], os.environ.get("REGION"),
+            cancel_event=cancel_event
+        )),
+    }
+
+@traced('text.race')
+def run_speculative_text_race(pdf_bytes: bytes, s3_info: Dict[str, str], fallback_model: str,
+                              user_prompt: str, system_prompt: str, process_type: str,
+                              text_quality: Dict[str, Any], cache_hits: Dict[str, str],
+                              category: str = None) -> Tuple[Optional[str], Optional[str], Optional[ProcessingResult], List[str]]:
+    """
+    Start Textract concurrently with PyPDF and send the first usable text to the fallback model.
+    If the model fails with that text, the other source is tried once it finishes.
+    Textract polling is cancelled as soon as a source succeeds.
+    Quality scores of the texts that finished are recorded in text_quality.
+    
+    Returns:
+        tuple: (source, extracted_text, model_result, sources_attempted);
+               source/text/result are None when no source succeeded
+    """
+    cancel_event = threading.Event()
+    extractors = build_text_extractors(pdf_bytes, s3_info, cache_hits, cancel_event)
+    
+    sources_attempted = []
+    text_gate = lambda source, text: assess_extracted_text(source, text, text_quality)
+    for source, text in race_text_sources(extractors, text_gate, cancel_event):
+        sources_attempted.append(source)
+        model_result = try_claude_with_extracted_text(
+            fallback_model, user_prompt, system_prompt, text, process_type, category
+        )
+        if model_result.is_success:
+            return source, text, model_result, sources_attempted
+        logger.warning(f"{source} text available but Fallback Model processing failed")
+    
+    return None, None, None, sources_attempted
+
 def process_document_with_enhanced_fallback(payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     Enhanced fallback processing: PyPDF→Fallback Model, then Textract→Fallback Model, then manual review.
+    With SPECULATIVE_TEXTRACT=true, Textract starts concurrently with PyPDF and whichever
+    usable text is ready first goes to the model.
     Results are saved in extraction/ folder, NOT fallback/ folder.
     
     Args:
         payload: Document payload from failed processing
         
     Returns:
-        dict: Processing result with extracted data or error info
+        dict: Processing result with extracted data or error info; per-stage timing
+              spans and Bedrock usage are in processing_metadata['timings'] / ['usage']
     """
+    path = payload.get('path', '')
+    category = extract_original_category_from_path(path)
+    document_number = extract_document_number_from_path(path)
+    with tracer.start('fallback', category=category, document_number=document_number) as trace, \
+            usage_ledger.attribute('fallback', document=document_number, category=category) as usage:
+        result = _process_document_with_enhanced_fallback(payload)
+        trace.set(success=bool(result.get('success')), method_used=result.get('method_used'))
+    result.setdefault('processing_metadata', {})['timings'] = trace.to_dict()
+    result['processing_metadata']['usage'] = usage.summary()
+    metrics.count('FallbackPhase', Phase=fallback_phase(result))
+    return result
+
+def fallback_phase(result: Dict[str, Any]) -> str:
+    """Phase that ended fallback processing: 'pypdf', 'textract', 'manual_review' or 'error'."""
+    if result.get('success'):
+        return result.get('method_used', '').split('_claude_')[0]
+    if result.get('processing_metadata', {}).get('fallback_method') == 'error':
+        return 'error'
+    return 'manual_review'
+
+def _process_document_with_enhanced_fallback(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Fallback processing of one document, run inside its trace (see process_document_with_enhanced_fallback)."""
     start_time = time.time()
     path = payload.get('path', '')
     document_number = extract_document_number_from_path(path)
@@ -344,6 +553,11 @@ def process_document_with_enhanced_fallback(payload: Dict[str, Any]) -> Dict[str
         # Determine process type and load prompts
         process_type, system_prompt, user_prompt = determine_process_type_and_prompts(payload)
         logger.info(f"Process type determined: {process_type}")
+        prompt_name = payload.get('result', {}).get('category') if process_type == 'extraction' else CLASSIFICATION_PROMPT
+        # Extractions are validated against the classified category (the one the prompt is for);
+        # the folder category is only used for logging and attribution
+        schema_category = prompt_name if process_type == 'extraction' else None
+        prompt_bundle = prompt_loader.bundle_stamp(prompt_name)
         
         # Get ONLY fallback model
         fallback_model = os.environ.get("FALLBACK_MODEL")
@@ -352,109 +566,91 @@ def process_document_with_enhanced_fallback(payload: Dict[str, Any]) -> Dict[str
         # Extract S3 info and download PDF
         s3_info = extract_s3_info(payload)
         s3_client = create_s3_client()
-        response = s3_client.get_object(Bucket=s3_info['s3_bucket'], Key=s3_info['s3_key'])
-        pdf_bytes = response['Body'].read()
+        with span('s3.download'), stage('s3.download'):
+            response = s3_client.get_object(Bucket=s3_info['s3_bucket'], Key=s3_info['s3_key'])
+            pdf_bytes = response['Body'].read()
         
-        # PHASE 1: PyPDF text extraction + Fallback Model
-        logger.info("PHASE 1: PyPDF text extraction + Fallback Model processing")
-        try:
-            pypdf_text = extract_pdf_text_with_pypdf(pdf_bytes)
-            
-            if pypdf_text and not pypdf_text.startswith("[ERROR"):
-                logger.info(f"PyPDF extraction successful: {len(pypdf_text)} characters")
-                
-                # Try fallback model with PyPDF text
-                pypdf_result = try_claude_with_extracted_text(
-                    fallback_model, user_prompt, system_prompt, pypdf_text, process_type
+        text_quality = {}
+        cache_hits = {}
+        success_context = dict(
+            fallback_model=fallback_model, payload=payload, s3_info=s3_info,
+            category=category, document_number=document_number, process_type=process_type,
+            prompt_bundle=prompt_bundle,
+            pdf_bytes=pdf_bytes, start_time=start_time
+        )
+        
+        if SPECULATIVE_TEXTRACT:
+            # PHASE 1+2 (speculative): PyPDF and Textract race, first usable text wins
+            logger.info("PHASE 1+2: Speculative PyPDF/Textract extraction + Fallback Model processing")
+            source, text, model_result, sources_attempted = run_speculative_text_race(
+                pdf_bytes, s3_info, fallback_model, user_prompt, system_prompt, process_type,
+                text_quality, cache_hits, schema_category
+            )
+            if model_result is not None:
+                return build_fallback_success(
+                    source, text, model_result, extra_metadata={
+                        'speculative_textract': True,
+                        'text_sources_attempted': sources_attempted,
+                        'pypdf_failed': source != 'pypdf',
+                        'text_quality': text_quality,
+                        'text_cache_hits': cache_hits
+                    }, **success_context
                 )
+        else:
+            extractors = build_text_extractors(pdf_bytes, s3_info, cache_hits)
+            
+            # PHASE 1: PyPDF text extraction + Fallback Model
+            logger.info("PHASE 1: PyPDF text extraction + Fallback Model processing")
+            try:
+                pypdf_text = extractors['pypdf']()
                 
-                if pypdf_result.is_success:
-                    processing_time = time.time() - start_time
-                    method_used = f"pypdf_claude_{fallback_model}"
-                    
-                    logger.info(f"SUCCESS: {process_type} completed with PyPDF + {fallback_model}")
+                if assess_extracted_text('pypdf', pypdf_text, text_quality):
+                    logger.info(f"PyPDF extraction successful: {len(pypdf_text)} characters")
                     
-                    # Save to extraction/ folder (NOT fallback/ folder)
-                    save_successful_fallback_to_extraction_folder(
-                        pypdf_result.data, s3_info, category, document_number,
-                        method_used, processing_time, process_type, 
-                        pypdf_result.data.get('raw_response', {}) if process_type == 'extraction' else {}
+                    # Try fallback model with PyPDF text
+                    pypdf_result = try_claude_with_extracted_text(
+                        fallback_model, user_prompt, system_prompt, pypdf_text, process_type, schema_category
                     )
                     
-                    return {
-                        'success': True,
-                        'method_used': method_used,
-                        'process_type': process_type,
-                        'extracted_text': pypdf_text,
-                        'processed_data': pypdf_result.data,
-                        'text_length': len(pypdf_text),
-                        'document_info': build_document_info(path),
-                        'processing_metadata': {
-                            'fallback_method': 'pypdf_claude',
-                            'model_used': pypdf_result.model_used,
-                            'timestamp': datetime.now(timezone.utc).isoformat(),
-                            'pdf_size_bytes': len(pdf_bytes),
-                            'processing_time_seconds': processing_time
-                        }
-                    }
-                
-                logger.warning(f"PyPDF text extraction successful but Fallback Model processing failed")
-            else:
-                logger.warning("PyPDF text extraction failed")
-        except Exception as pypdf_error:
-            logger.error(f"PyPDF processing failed: {pypdf_error}")
-        
-        # PHASE 2: Textract text extraction + Fallback Model
-        logger.info("PHASE 2: Textract text extraction + Fallback Model processing")
-        try:
-            textract_text = extract_pdf_text_with_textract(
-                pdf_bytes, s3_info['s3_bucket'], s3_info['s3_key'], os.environ.get("REGION")
-            )
+                    if pypdf_result.is_success:
+                        return build_fallback_success(
+                            'pypdf', pypdf_text, pypdf_result,
+                            extra_metadata={'text_quality': text_quality, 'text_cache_hits': cache_hits},
+                            **success_context
+                        )
+                    
+                    logger.warning(f"PyPDF text extraction successful but Fallback Model processing failed")
+                else:
+                    logger.warning("PyPDF text extraction failed or below quality threshold")
+            except Exception as pypdf_error:
+                logger.error(f"PyPDF processing failed: {pypdf_error}")
             
-            if textract_text and not textract_text.startswith("[ERROR"):
-                logger.info(f"Textract extraction successful: {len(textract_text)} characters")
+            # PHASE 2: Textract text extraction + Fallback Model
+            logger.info("PHASE 2: Textract text extraction + Fallback Model processing")
+            try:
+                textract_text = extractors['textract']()
                 
-                # Try fallback model with Textract text
-                textract_result = try_claude_with_extracted_text(
-                    fallback_model, user_prompt, system_prompt, textract_text, process_type
-                )
-                
-                if textract_result.is_success:
-                    processing_time = time.time() - start_time
-                    method_used = f"textract_claude_{fallback_model}"
+                if assess_extracted_text('textract', textract_text, text_quality):
+                    logger.info(f"Textract extraction successful: {len(textract_text)} characters")
                     
-                    logger.info(f"SUCCESS: {process_type} completed with Textract + {fallback_model}")
-                    
-                    # Save to extraction/ folder (NOT fallback/ folder)
-                    save_successful_fallback_to_extraction_folder(
-                        textract_result.data, s3_info, category, document_number,
-                        method_used, processing_time, process_type,
-                        textract_result.data.get('raw_response', {}) if process_type == 'extraction' else {}
+                    # Try fallback model with Textract text
+                    textract_result = try_claude_with_extracted_text(
+                        fallback_model, user_prompt, system_prompt, textract_text, process_type, schema_category
                     )
                     
-                    return {
-                        'success': True,
-                        'method_used': method_used,
-                        'process_type': process_type,
-                        'extracted_text': textract_text,
-                        'processed_data': textract_result.data,
-                        'text_length': len(textract_text),
-                        'document_info': build_document_info(path),
-                        'processing_metadata': {
-                            'fallback_method': 'textract_claude',
-                            'model_used': textract_result.model_used,
-                            'pypdf_failed': True,
-                            'timestamp': datetime.now(timezone.utc).isoformat(),
-                            'pdf_size_bytes': len(pdf_bytes),
-                            'processing_time_seconds': processing_time
-                        }
-                    }
-                
-                logger.error("Textract text extraction successful but Fallback Model processing failed")
-            else:
-                logger.error("Textract text extraction failed")
-        except Exception as textract_error:
-            logger.error(f"Textract processing failed: {textract_error}")
+                    if textract_result.is_success:
+                        return build_fallback_success(
+                            'textract', textract_text, textract_result,
+                            extra_metadata={'pypdf_failed': True, 'text_quality': text_quality,
+                                            'text_cache_hits': cache_hits},
+                            **success_context
+                        )
+                    
+                    logger.error("Textract text extraction successful but Fallback Model processing failed")
+                else:
+                    logger.error("Textract text extraction failed or below quality threshold")
+            except Exception as textract_error:
+                logger.error(f"Textract processing failed: {textract_error}")
         
         # PHASE 3: All methods failed - prepare for manual review
         processing_time = time.time() - start_time
@@ -472,6 +668,9 @@ def process_document_with_enhanced_fallback(payload: Dict[str, Any]) -> Dict[str
                 'textract_failed': True,
                 'claude_processing_failed': True,
                 'models_attempted': [fallback_model],
+                'speculative_textract': SPECULATIVE_TEXTRACT,
+                'text_quality': text_quality,
+                'text_cache_hits': cache_hits,
                 'processing_time_seconds': processing_time
             }
         }
@@ -679,11 +878,14 @@ def process_fallback_message(sqs_record: Dict[str, Any]) -> Dict[str, Any]:
                 'status': 'success',
                 'category': extract_original_category_from_path(payload.get('path', '')),
                 'document_number': extract_document_number_from_path(payload.get('path', '')),
+                'path': payload.get('path'),
                 'enhanced_fallback_success': True,
                 'fallback_method': fallback_result.get('method_used', 'none'),
                 'claude_processing_used': 'claude' in fallback_result.get('method_used', ''),
                 'data_extracted': True,
-                'saved_to_extraction_folder': True
+                'saved_to_extraction_folder': True,
+                'timings': fallback_result.get('processing_metadata', {}).get('timings'),
+                'usage': fallback_result.get('processing_metadata', {}).get('usage')
             }
         else:
             # FAILURE: Create manual review record ONLY when everything fails
@@ -730,10 +932,12 @@ def process_fallback_message(sqs_record: Dict[str, Any]) -> Dict[str, Any]:
                     'status': 'success',  # Successfully saved for manual review
                     'category': record['category'],
                     'document_number': record['document_number'],
+                    'path': payload.get('path'),
                     'error_type': record['error_type'],
                     'enhanced_fallback_success': False,
                     'fallback_method': fallback_result.get('method_used', 'none'),
-                    'requires_manual_review': True
+                    'requires_manual_review': True,
+                    'usage': fallback_result.get('processing_metadata', {}).get('usage')
                 }
             else:
                 logger.error(f"Failed to save enhanced fallback message {message_id} to DynamoDB")
@@ -762,6 +966,7 @@ def process_fallback_message(sqs_record: Dict[str, Any]) -> Dict[str, Any]:
 def process_batch_fallback(records: List[Dict[str, Any]]) -> Tuple[List[Dict], List[str]]:
     """Process enhanced fallback batch."""
     logger.info(f"PHASE 1: Processing {len(records)} enhanced fallback messages")
+    metrics.put('DocumentsPerBatch', len(records))
     
     fallback_results = []
     for sqs_record in records:
@@ -788,8 +993,22 @@ def process_batch_fallback(records: List[Dict[str, Any]]) -> Tuple[List[Dict], L
     
     logger.info(f"Enhanced fallback summary: {successful_claude_processing} successful (saved to extraction/), {len(failed_message_ids)} failed")
     
+    # Batch summary with the Bedrock usage rollup, read by bench/usage_report.py
+    # Imported here, not at cold start (see bench/cold_start_budget.json)
+    from shared.report_generator import report_generator
+    report_generator.save_batch_summary(fallback_results, 'enhanced_fallback', {
+        'processing_mode': 'enhanced_fallback_with_extraction_folder',
+        'successful_claude_extractions': successful_claude_processing,
+        'saved_to_extraction_folder': saved_to_extraction_folder,
+        'manual_review_required': sum(1 for r in fallback_results if r.get('requires_manual_review', False))
+    })
+    parser_registry.log_stats()
+    
     return fallback_results, failed_message_ids
 
+@metrics.invocation('fallback-processing')
+@memory_profiler.invocation('fallback-processing')
+@profiler.invocation('fallback-processing')
 def handler(event, context):
     """
     Lambda handler for enhanced fallback processing.
@@ -8,9 +8,15 @@ AWS Bedrock client utilities - MODIFIED VERSION
 import boto3, json, re, logging, os, base64, time, random
 from botocore.config import Config
 from botocore.exceptions import ClientError
-from typing import Dict, Any, Union, List, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, Union, List, Optional, Tuple
+from dataclasses import asdict, dataclass, field
 from .text_utils import clean_text_for_json
+from .response_parser import parse_unstructured_text, parse_natural_language, PATH_PARSE_FAILED, PATH_NESTED_JSON
+from .parser_registry import parser_registry
+from .tracing import span, traced
+from .metrics import metrics, token_counts
+from .usage_ledger import usage_ledger
+from .memory_profile import stage
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -36,6 +42,25 @@ class BedrockRequest:
     system: Optional[List] = None
     toolConfig: Optional[Dict[str, Any]] = None
 
+@dataclass
+class RetryInfo:
+    """Attempts of one Bedrock call made by call_bedrock_with_retry."""
+    attempts: int = 0
+    backoff_seconds: float = 0.0
+    error_codes: List[str] = field(default_factory=list)
+    last_attempt_seconds: float = 0.0
+
+    @property
+    def retries(self) -> int:
+        return max(self.attempts - 1, 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['retries'] = self.retries
+        data['backoff_seconds'] = round(self.backoff_seconds, 3)
+        data['last_attempt_seconds'] = round(self.last_attempt_seconds, 3)
+        return data
+
 def create_bedrock_client():
     """
     Create and return a Bedrock client with enhanced retry configuration.
@@ -69,7 +94,8 @@ def calculate_backoff_delay(attempt: int, base_delay: float = 2.0, max_delay: fl
     final_delay = max(0.5, delay + jitter)  # Minimum 0.1 seconds
     return final_delay
 
-def call_bedrock_with_retry(bedrock_client, api_call, request_params: dict, max_retries: int = 8) -> Dict[str, Any]:
+def call_bedrock_with_retry(bedrock_client, api_call, request_params: dict,
+                            max_retries: int = 8) -> Tuple[Dict[str, Any], RetryInfo]:
     """
     Call Bedrock API with exponential backoff retry for throttling errors.
     
@@ -80,38 +106,50 @@ def call_bedrock_with_retry(bedrock_client, api_call, request_params: dict, max_
         max_retries: Maximum number of retry attempts
         
     Returns:
-        dict: API response
+        tuple: (API response, RetryInfo). When the call fails for good, the
+               raised exception carries the RetryInfo as `retry_info`.
     """
     if max_retries is None:
         max_retries = int(os.environ.get('BEDROCK_RETRY_ATTEMPTS', '8'))
     
     logger.info(f"Starting Bedrock call with max {max_retries} retries")
     last_exception = None
+    info = RetryInfo()
     
     for attempt in range(max_retries + 1):
         try:
             logger.info(f"Bedrock API call attempt {attempt + 1}/{max_retries + 1}")
+            info.attempts = attempt + 1
             
             # Call the API
-            response = api_call(**request_params)
+            started = time.perf_counter()
+            try:
+                response = api_call(**request_params)
+            finally:
+                info.last_attempt_seconds = time.perf_counter() - started
             
             # Success - log and return
             if attempt > 0:
                 logger.info(f"Bedrock call succeeded on attempt {attempt + 1}")
             
-            return response
+            return response, info
             
         except ClientError as e:
             error_code = e.response.get('Error', {}).get('Code', '')
             error_message = str(e)
             last_exception = e
+            info.error_codes.append(error_code or type(e).__name__)
+            _attach_retry_info(e, info)
             
             # Check if it's a throttling error
             if is_throttling_error(error_message) or error_code in ['ThrottlingException', 'TooManyRequestsException']:
                 if attempt < max_retries:
                     delay = calculate_backoff_delay(attempt)
                     logger.warning(f"Throttling detected (attempt {attempt + 1}). Retrying in {delay:.2f} seconds. Error: {error_message}")
-                    time.sleep(delay)
+                    metrics.count('ThrottleRetries', Model=request_params.get('modelId', 'unknown'))
+                    with span('bedrock.backoff', attempt=attempt + 1):
+                        time.sleep(delay)
+                    info.backoff_seconds += delay
                     continue
                 else:
                     logger.error(f"Max retries reached for throttling error: {error_message}")
@@ -123,11 +161,16 @@ def call_bedrock_with_retry(bedrock_client, api_call, request_params: dict, max_
                 
         except Exception as e:
             last_exception = e
+            info.error_codes.append(type(e).__name__)
+            _attach_retry_info(e, info)
             # For non-ClientError exceptions, only retry if it looks like throttling
             if is_throttling_error(str(e)) and attempt < max_retries:
                 delay = calculate_backoff_delay(attempt)
                 logger.warning(f"Potential throttling error (attempt {attempt + 1}). Retrying in {delay:.2f} seconds. Error: {str(e)}")
-                time.sleep(delay)
+                metrics.count('ThrottleRetries', Model=request_params.get('modelId', 'unknown'))
+                with span('bedrock.backoff', attempt=attempt + 1):
+                    time.sleep(delay)
+                info.backoff_seconds += delay
                 continue
             else:
                 logger.error(f"Non-throttling exception, not retrying: {str(e)}")
@@ -137,6 +180,13 @@ def call_bedrock_with_retry(bedrock_client, api_call, request_params: dict, max_
     logger.error(f"All retry attempts failed. Last exception: {str(last_exception)}")
     raise last_exception
 
+def _attach_retry_info(error: Exception, info: RetryInfo) -> None:
+    """Expose the attempts on the exception raised to the caller."""
+    try:
+        error.retry_info = info
+    except AttributeError:
+        pass
+
 def call_converse_api(request: BedrockRequest, bedrock_client) -> Dict[str, Any]:
     """
     Call Bedrock Converse API with retry logic
@@ -156,11 +206,13 @@ def call_converse_api(request: BedrockRequest, bedrock_client) -> Dict[str, Any]
     logger.info(f"Calling Converse API for model: {request.model_id}")
     
     # Use retry wrapper
-    return call_bedrock_with_retry(
+    response, retry_info = call_bedrock_with_retry(
         bedrock_client, 
         bedrock_client.converse, 
         payload
     )
+    response['retry_info'] = retry_info.to_dict()
+    return response
 
 def call_invoke_model_api(request: BedrockRequest, bedrock_client) -> Dict[str, Any]:
     """
@@ -172,11 +224,13 @@ def call_invoke_model_api(request: BedrockRequest, bedrock_client) -> Dict[str,
         "messages": request.messages,
         **request.params
     }
+    if request.toolConfig:
+        payload.update(anthropic_tool_payload(request.toolConfig))
     
     logger.info(f"Calling InvokeModel API for model: {request.model_id}")
     
     # Use retry wrapper for invoke_model
-    response = call_bedrock_with_retry(
+    response, retry_info = call_bedrock_with_retry(
         bedrock_client,
         lambda **kwargs: bedrock_client.invoke_model(**kwargs),
         {
@@ -197,29 +251,54 @@ def call_invoke_model_api(request: BedrockRequest, bedrock_client) -> Dict[str,
         if block.get('type') == 'text':
             text_content = block.get('text', '')
             break
+    
+    # Structured-output responses carry the result in a tool_use block
+    tool_uses = [
+        {"toolUse": {"toolUseId": block.get('id'), "name": block.get('name'), "input": block.get('input', {})}}
+        for block in content_blocks if block.get('type') == 'tool_use'
+    ]
         
-    if not text_content:
+    if not text_content and not tool_uses:
         raise ValueError(f"No text content found in response. Content blocks: {content_blocks}")
         
-    logger.info(f"Successfully extracted text content ({len(text_content)} characters)")
+    logger.info(f"Successfully extracted text content ({len(text_content)} characters, {len(tool_uses)} tool calls)")
 
     # Convert to Converse API format for consistency
+    content = [{"text": text_content}] if text_content else []
     return {
         "output": {
             "message": {
-                "content": [
-                    {
-                        "text": text_content
-                    }
-                ]
+                "content": content + tool_uses
             }
         },
         "stopReason": response_body.get("stop_reason", "end_turn"),
         "usage": response_body.get("usage", {}),
         "ResponseMetadata": response.get('ResponseMetadata', {}),
+        "retry_info": retry_info.to_dict(),
         "raw_anthropic_response": response_body
     }
 
+def anthropic_tool_payload(tool_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Translate a Converse toolConfig into Anthropic Messages API tools/tool_choice.
+    """
+    payload = {
+        "tools": [
+            {
+                "name": tool["toolSpec"]["name"],
+                "description": tool["toolSpec"].get("description", ""),
+                "input_schema": tool["toolSpec"]["inputSchema"]["json"]
+            }
+            for tool in tool_config.get("tools", []) if "toolSpec" in tool
+        ]
+    }
+    tool_choice = tool_config.get("toolChoice", {})
+    if "tool" in tool_choice:
+        payload["tool_choice"] = {"type": "tool", "name": tool_choice["tool"]["name"]}
+    elif "any" in tool_choice:
+        payload["tool_choice"] = {"type": "any"}
+    return payload
+
 # Add rate limiting between calls
 def add_inter_call_delay():
     """Add delay between Bedrock calls to avoid hitting rate limits"""
@@ -265,30 +344,76 @@ def call_bedrock_unified(req: Union[BedrockRequest, Dict[str, Any]], bedrock_cli
     if isinstance(req, dict):
         req = BedrockRequest(**req)
 
-    # Add small delay between calls to avoid rate limiting
-    add_inter_call_delay()
-    
-    # Route to appropriate API based on model type
-    if is_anthropic_model(req.model_id):
-        response = call_invoke_model_api(req, bedrock_client)
-    else:
-        response = call_converse_api(req, bedrock_client)
+    with span('bedrock', model=req.model_id), stage('bedrock'):
+        # Add small delay between calls to avoid rate limiting
+        with span('bedrock.delay'):
+            add_inter_call_delay()
+        
+        # Route to appropriate API based on model type
+        with span('bedrock.call'):
+            try:
+                if is_anthropic_model(req.model_id):
+                    response = call_invoke_model_api(req, bedrock_client)
+                else:
+                    response = call_converse_api(req, bedrock_client)
+            except Exception as e:
+                record_failed_call_metrics(req.model_id, getattr(e, 'retry_info', None))
+                raise
     
     # Add metadata for tracking
     if isinstance(response, dict):
+        retry_info = response.get('retry_info') or {}
+        # Model latency is the successful attempt; throttled attempts and backoff are in retry_info
+        latency_ms = retry_info.get('last_attempt_seconds', 0.0) * 1000
+        record_call_metrics(req.model_id, latency_ms, response.get('usage'), retry_info)
+        usage_ledger.record(req.model_id, response.get('usage'), latency_ms, retry_info)
         response['model_id'] = req.model_id
         response['api_used'] = 'invoke_model' if is_anthropic_model(req.model_id) else 'converse'
         response['model_params'] = req.params
+        response['structured_output'] = bool(req.toolConfig)
     
     return response
 
+def record_call_metrics(model_id: str, latency_ms: float, usage: Optional[Dict[str, Any]],
+                        retry_info: Optional[Dict[str, Any]] = None) -> None:
+    """Record the latency, attempts and token usage of a successful Bedrock call."""
+    metrics.put('BedrockLatency', latency_ms, 'Milliseconds', Model=model_id)
+    if retry_info:
+        metrics.put('BedrockAttempts', retry_info.get('attempts', 1), Model=model_id)
+        if retry_info.get('backoff_seconds'):
+            metrics.put('BackoffTime', retry_info['backoff_seconds'] * 1000, 'Milliseconds', Model=model_id)
+    tokens = token_counts(usage)
+    metrics.put('InputTokens', tokens['input'], Model=model_id)
+    metrics.put('OutputTokens', tokens['output'], Model=model_id)
+    if tokens['cache_read'] or tokens['cache_write']:
+        metrics.put('CacheReadTokens', tokens['cache_read'], Model=model_id)
+        metrics.put('CacheWriteTokens', tokens['cache_write'], Model=model_id)
+
+def record_failed_call_metrics(model_id: str, retry_info: Optional[RetryInfo]) -> None:
+    """Record a Bedrock call that failed after its retries."""
+    metrics.count('BedrockErrors', Model=model_id)
+    if retry_info is not None:
+        metrics.put('BedrockAttempts', retry_info.attempts, Model=model_id)
+        if retry_info.backoff_seconds:
+            metrics.put('BackoffTime', retry_info.backoff_seconds * 1000, 'Milliseconds', Model=model_id)
+
+def _first_text_block(resp_json: dict) -> str:
+    """
+    Text of the first text content block. Structured-output responses may also
+    contain toolUse blocks (e.g. Nova emits a text block before its tool call).
+    """
+    for block in resp_json["output"]["message"]["content"]:
+        if "text" in block:
+            return block["text"]
+    raise KeyError("text")
+
 def _extract_text(resp_json: dict) -> str:
     """
     Bedrock Nova returns:
         {"output":{"message":{"content":[{"text":"..."}]}}}
     """
     try:
-        text = resp_json["output"]["message"]["content"][0]["text"].strip()
+        text = _first_text_block(resp_json).strip()
         return clean_text_for_json(text)
     except (KeyError, IndexError, TypeError):
         raise RuntimeError("Unexpected response shape from Bedrock") from None
@@ -421,38 +546,48 @@ def parse_classification_response_fallback(response: Dict[str, Any], folder_path
         }
         return _normalise(raw_obj, file_path=folder_path)
 
+@traced('parse')
 def parse_classification(resp_json: dict, *, pdf_path: str | None = None) -> dict:
     """
     Parse the classification response from Bedrock with robust error handling.
     """
     try:
+        raw_obj, path = None, None
+        if resp_json.get("structured_output"):
+            raw_obj, path = parser_registry.parse_tool_use(resp_json, resp_json.get("model_id"))
+            if raw_obj is not None:
+                result = _normalise(raw_obj, file_path=pdf_path)
+                metrics.count('ResponsesParsed', ParsePath=path)
+                return result
+        
         raw_text = _extract_text(resp_json)
-        raw_text = _strip_fences(raw_text)          
-
-        try:
-            raw_obj = json.loads(raw_text)
-            logger.debug(f"Raw JSON: {raw_obj}")  # Debugging output
-        except json.JSONDecodeError as e:
-            # last-chance: grab first '{' … last '}'
-            m1, m2 = raw_text.find("{"), raw_text.rfind("}")
-            if m1 != -1 and m2 != -1:
-                raw_obj = json.loads(raw_text[m1:m2+1])
-            else:
-                logger.warning(f"Standard JSON parsing failed: {e}")
-                # Try alternative parsing method
-                return parse_classification_response_fallback(resp_json, pdf_path)
-
-        return _normalise(raw_obj, file_path=pdf_path)
+        raw_obj, path = parser_registry.parse_text(raw_text, resp_json.get("model_id"))
+        
+        # An inner object of a broken classification JSON is not a classification
+        if raw_obj is None or path == PATH_NESTED_JSON:
+            logger.warning("Standard JSON parsing failed")
+            # Try alternative parsing method
+            metrics.count('ResponsesParsed', ParsePath='classification_fallback')
+            return parse_classification_response_fallback(resp_json, pdf_path)
+        logger.debug(f"Raw JSON ({path}): {raw_obj}")  # Debugging output
+
+        result = _normalise(raw_obj, file_path=pdf_path)
+        metrics.count('ResponsesParsed', ParsePath=path)
+        return result
         
     except Exception as e:
         logger.error(f"Error in standard classification parsing: {e}")
         # Fallback to alternative parsing
+        metrics.count('ResponsesParsed', ParsePath='classification_fallback')
         return parse_classification_response_fallback(resp_json, pdf_path)
 
+@traced('parse')
 def parse_extraction_response(resp: dict) -> dict:
     """
     Parse a Bedrock response dict and extract data for extraction.
     Handles JSON, text responses, and creates structured data from natural language.
+    JSON is decoded by the parser registered for the model family (resp['model_id'],
+    set by call_bedrock_unified).
 
     Args:
         resp: The Bedrock response
@@ -460,103 +595,29 @@ def parse_extraction_response(resp: dict) -> dict:
     Returns:
         dict: The extracted data
     """
-    # Extract the text from the response
-    text = resp["output"]["message"]["content"][0]["text"]
-    logger.info(f"Parsing extraction response ({len(text)} characters)")
-    
-    # MÉTODO 1: Buscar JSON envuelto en markdown
-    match = re.search(r"```json\s*(\{[\s\S]*?\})\s*```", text)
-    if match:
-        try:
-            raw = match.group(1)
-            data = json.loads(raw)
-            logger.info("Successfully parsed JSON from markdown code block")
+    if resp.get("structured_output"):
+        data, path = parser_registry.parse_tool_use(resp, resp.get("model_id"))
+        if data is not None:
+            logger.info("Extraction response parsed via tool_use")
+            metrics.count('ResponsesParsed', ParsePath=path)
             return data
-        except json.JSONDecodeError as e:
-            logger.warning(f"Failed to parse JSON from markdown: {e}")
-    
-    # MÉTODO 2: Buscar JSON directo
-    try:
-        start_idx = text.find('{')
-        if start_idx != -1:
-            brace_count = 0
-            end_idx = -1
-            
-            for i in range(start_idx, len(text)):
-                if text[i] == '{':
-                    brace_count += 1
-                elif text[i] == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        end_idx = i
-                        break
-            
-            if end_idx != -1:
-                raw = text[start_idx:end_idx + 1]
-                data = json.loads(raw)
-                logger.info("Successfully parsed raw JSON from response text")
-                return data
-    except (json.JSONDecodeError, ValueError) as e:
-        logger.debug(f"Raw JSON parsing failed: {e}")
-    
-    # MÉTODO 3: Buscar múltiples objetos JSON
-    try:
-        json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-        matches = re.findall(json_pattern, text, re.DOTALL)
-        
-        for match_text in matches:
-            try:
-                data = json.loads(match_text)
-                logger.info("Successfully parsed JSON using flexible regex")
-                return data
-            except json.JSONDecodeError:
-                continue
-    except Exception as e:
-        logger.debug(f"Flexible regex parsing failed: {e}")
     
-    # MÉTODO 4: Analizar respuestas especiales
-    if "ForReview" in text or "no document" in text.lower() or "not see any PDF" in text:
-        logger.info("Model indicated document cannot be processed, creating ForReview response")
-        return {
-            "result": {
-                "PrincipalCompanyName": "ForReview",
-                "DocumentCategory": "ForReview", 
-                "TaxId": "ForReview",
-                "IdentificationType": "ForReview",
-                "Country": "ForReview",
-                "IdentificationDetails": {
-                    "Source": "ForReview",
-                    "Indicators": [],
-                    "ConflictingSources": ["Model indicated no document provided"],
-                    "RequiresReview": "true"
-                },
-                "RelatedParties": []
-            },
-            "DocumentType": "unknown",
-            "Category": "ForReview"
-        }
+    # Extract the text from the response
+    text = _first_text_block(resp)
+    logger.info(f"Parsing extraction response ({len(text)} characters)")
     
-    # MÉTODO 5: Extraer información de texto natural (NUEVO)
-    logger.info("Attempting to parse structured information from natural text response")
-    try:
-        return parse_natural_language_response(text)
-    except Exception as e:
-        logger.warning(f"Natural language parsing failed: {e}")
+    data, path = parser_registry.parse_text(text, resp.get("model_id"))
+    if data is None:
+        data, path = parse_unstructured_text(text)
     
-    # MÉTODO 6: Crear respuesta de error estructurada
-    logger.error(f"All parsing methods failed. Creating error response.")
-    logger.error(f"Response text (first 500 chars): {text[:500]}...")
+    if path == PATH_PARSE_FAILED:
+        logger.error(f"All parsing methods failed. Creating error response.")
+        logger.error(f"Response text (first 500 chars): {text[:500]}...")
+    else:
+        logger.info(f"Extraction response parsed via {path}")
+    metrics.count('ResponsesParsed', ParsePath=path)
     
-    return {
-        "result": {
-            "error_type": "parsing_failed",
-            "error_message": "Could not parse response as JSON or extract structured data",
-            "raw_response_snippet": text[:500],
-            "requires_manual_review": True
-        },
-        "DocumentType": "unknown",
-        "Category": "unknown"
-    }
+    return data
 
 def create_payload_data_extraction(data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -580,92 +641,4 @@ def parse_natural_language_response(text: str) -> dict:
     Handles cases where the model returns useful information but not in JSON format.
     """
     logger.info("Parsing natural language response for structured data")
-    
-    # Patrones para extraer información específica
-    extracted_data = {
-        "result": {
-            "parsing_method": "natural_language_extraction",
-            "original_response": text[:1000]  # Primeros 1000 caracteres
-        },
-        "DocumentType": "company",
-        "Category": "unknown"
-    }
-    
-    # Extraer NIT/Identificación fiscal
-    nit_patterns = [
-        r"NIT[:\s]*\.?(\d+[\.\-]\d+[\.\-]\d+)",
-        r"NIT[:\s]*(\d+[\.\-]\d+[\.\-]\d+)",
-        r"NIT[:\s]*(\d+)",
-        r"identificación[:\s]+(\d+[\.\-]\d+[\.\-]\d+)",
-        r"número[:\s]+(\d+[\.\-]\d+[\.\-]\d+)"
-    ]
-    
-    for pattern in nit_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            extracted_data["result"]["TaxId"] = match.group(1).strip()
-            break
-    
-    # Extraer nombre de empresa
-    company_patterns = [
-        r"sociedad\s+([^\n]+?)(?:\s+NIT|\s+de|\n)",
-        r"empresa\s+([^\n]+?)(?:\s+NIT|\s+de|\n)",
-        r"compañía\s+([^\n]+?)(?:\s+NIT|\s+de|\n)",
-        r"([A-Z][A-Z\s]+S\.A\.S?)",
-        r"([A-Z][A-Z\s]+LTDA)",
-        r"([A-Z][A-Z\s]+S\.A)"
-    ]
-    
-    for pattern in company_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            company_name = match.group(1).strip()
-            if len(company_name) > 3:  # Evitar coincidencias muy cortas
-                extracted_data["result"]["PrincipalCompanyName"] = company_name
-                break
-    
-    # Buscar tabla de accionistas o socios
-    related_parties = []
-    
-    # Patrón para encontrar información de accionistas
-    shareholder_patterns = [
-        r"(\w+(?:\s+\w+)*)\s*\|\s*(\d+[\.\,\d]*)\s*\|\s*(\d+[\.\,\d]*)\s*\|\s*(\d+%?)",
-        r"(\w+(?:\s+\w+)*)\s+(\d+[\.\,\d]+)\s+(\d+[\.\,\d]+)\s+(\d+%?)",
-    ]
-    
-    for pattern in shareholder_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            name, doc, shares, percentage = match
-            if len(name.strip()) > 2:  # Nombres válidos
-                related_parties.append({
-                    "name": name.strip(),
-                    "identification": doc.strip(),
-                    "shares": shares.strip(),
-                    "percentage": percentage.strip()
-                })
-    
-    if related_parties:
-        extracted_data["result"]["RelatedParties"] = related_parties
-    
-    # Determinar categoría basada en contenido
-    if "accionista" in text.lower() or "acciones" in text.lower():
-        extracted_data["result"]["DocumentCategory"] = "Shareholder Information"
-        extracted_data["Category"] = "ACC"
-    elif "representante" in text.lower() or "legal" in text.lower():
-        extracted_data["result"]["DocumentCategory"] = "Legal Representative"
-        extracted_data["Category"] = "CERL"
-    
-    # Marcar campos faltantes como ForReview
-    required_fields = ["PrincipalCompanyName", "TaxId", "DocumentCategory"]
-    for field in required_fields:
-        if field not in extracted_data["result"]:
-            extracted_data["result"][field] = "ForReview"
-    
-    # Agregar metadatos de extracción
-    extracted_data["result"]["extraction_confidence"] = "medium"
-    extracted_data["result"]["requires_verification"] = True
-    
-    logger.info(f"Natural language extraction completed. Found: Company={extracted_data['result'].get('PrincipalCompanyName', 'N/A')}, TaxId={extracted_data['result'].get('TaxId', 'N/A')}, Parties={len(related_parties)}")
-    
-    return extracted_data
\ No newline at end of file
+    return parse_natural_language(text)
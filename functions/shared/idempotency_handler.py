@@ -17,9 +17,11 @@ import logging
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from .s3_handler import extract_s3_path
+from .tracing import traced
 
 logger = logging.getLogger(__name__)
 
+@traced('lock.acquire')
 def acquire_processing_lock(dynamodb_client, folder_path, s3_client):
     """
     DynamoDB-based exactly-once processing safeguard using atomic conditional PutItem.
@@ -95,6 +97,7 @@ def acquire_processing_lock(dynamodb_client, folder_path, s3_client):
         # On error, err on the side of processing to avoid blocking valid requests
         return True, f"Error acquiring lock - proceeding anyway: {str(e)}"
 
+@traced('lock.release')
 def release_processing_lock(dynamodb_client, folder_path, s3_client, success=True):
     """
     Release the DynamoDB processing lock and update status.
@@ -0,0 +1,277 @@
+"""
+Memory high-water marks per invocation and per processing stage.
+
+Every invocation logs one 'memory' record (a JSON line) and emits the
+ContainerPeakMemory metric. The record holds:
+- the container's peak RSS at the start and end of the invocation
+- the RSS growth of the invocation
+- the Lambda memory setting
+- duration and CPU time
+bench/memory_advisor.py reads these records to recommend memory settings.
+
+The peak RSS (ru_maxrss) is the highest RSS over the life of the process,
+so on a warm container it repeats the largest peak of an earlier
+invocation. It is the container's peak, which is what the memory setting
+must hold. The invocation's own growth is
+container_peak_rss_mb - container_peak_rss_start_mb (rss_growth_mb), zero
+when the invocation stayed below an earlier peak.
+
+A fraction of invocations (TRACEMALLOC_SAMPLE_RATE) also run tracemalloc. In
+them, each stage records its peak of traced Python memory and the source lines
+whose allocations grew the most while it ran:
+
+    @memory_profiler.invocation('fallback-processing')
+    def handler(event, context):
+        ...
+
+    @staged('fallback.model')
+    def try_claude_with_extracted_text(...):
+        ...
+
+    with stage('pypdf'):
+        text = extract_pdf_text_with_pypdf(pdf_bytes)
+
+Like spans, stages are no-ops outside a traced invocation and in threads the
+handler starts. tracemalloc slows allocation-heavy code down, which is why it
+only runs in sampled invocations. MEMORY_METRICS_ENABLED=false turns the
+records off.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from .metrics import metrics
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Allocation sites kept per stage
+TOP_ALLOCATIONS = 5
+
+# Frames recorded per allocation
+TRACEMALLOC_FRAMES = 1
+
+_MB = 1024 * 1024
+
+_current_recorder = contextvars.ContextVar('current_memory_recorder', default=None)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak RSS of this process (container) in MB, None where getrusage is unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / _MB if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def cpu_seconds() -> float:
+    """User plus system CPU time of this process, all threads included."""
+    if resource is None:
+        return time.process_time()
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+class _Stage:
+    """Context manager recording one stage of a traced invocation."""
+
+    __slots__ = ('recorder', 'name', 'peak', 'start', 'current', 'snapshot')
+
+    def __init__(self, recorder: 'StageRecorder', name: str):
+        self.recorder = recorder
+        self.name = name
+        self.peak = 0
+
+    def __enter__(self) -> '_Stage':
+        self.recorder.checkpoint()
+        self.current = self.recorder.tracemalloc.get_traced_memory()[0]
+        self.snapshot = self.recorder.snapshot()
+        self.recorder.open.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        duration = time.perf_counter() - self.start
+        self.recorder.checkpoint()
+        if self in self.recorder.open:
+            self.recorder.open.remove(self)
+        current = self.recorder.tracemalloc.get_traced_memory()[0]
+        self.recorder.stages.append({
+            'name': self.name,
+            'duration_ms': round(duration * 1000, 3),
+            'peak_traced_mb': round(self.peak / _MB, 3),
+            'net_traced_mb': round((current - self.current) / _MB, 3),
+            'top_allocations': self.recorder.top_allocations(self.snapshot),
+        })
+        self.snapshot = None
+        return False
+
+
+class _NoopStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        return False
+
+
+NOOP_STAGE = _NoopStage()
+
+
+class StageRecorder:
+    """
+    tracemalloc peaks and allocation sites of the stages of one invocation.
+
+    The traced peak is reset at every stage boundary; the peak reached since
+    the last boundary is credited to every stage open at that moment, so
+    nested stages and their parents both see it.
+    """
+
+    def __init__(self):
+        import tracemalloc
+
+        self.tracemalloc = tracemalloc
+        self.open: List[_Stage] = []
+        self.stages: List[Dict[str, Any]] = []
+
+    def start(self) -> None:
+        self.tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    def stop(self) -> None:
+        self.tracemalloc.stop()
+
+    def checkpoint(self) -> None:
+        peak = self.tracemalloc.get_traced_memory()[1]
+        for open_stage in self.open:
+            open_stage.peak = max(open_stage.peak, peak)
+        self.tracemalloc.reset_peak()
+
+    def snapshot(self):
+        """Traced allocations, without those of tracemalloc's own snapshots."""
+        return self.tracemalloc.take_snapshot().filter_traces(
+            [self.tracemalloc.Filter(False, self.tracemalloc.__file__)])
+
+    def top_allocations(self, before) -> List[Dict[str, Any]]:
+        """Source lines whose traced memory grew the most since the snapshot."""
+        top = []
+        for diff in self.snapshot().compare_to(before, 'lineno')[:TOP_ALLOCATIONS]:
+            if diff.size_diff <= 0:
+                break
+            frame = diff.traceback[0]
+            top.append({
+                'site': f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                'size_kb': round(diff.size_diff / 1024, 1),
+                'count': diff.count_diff,
+            })
+        return top
+
+
+class MemoryProfiler:
+    """
+    Logs a memory record per invocation and traces the stages of sampled ones.
+
+    Args:
+        enabled: Log memory records and metrics (default: MEMORY_METRICS_ENABLED, true)
+        tracemalloc_rate: Fraction of invocations traced with tracemalloc
+                          (default: TRACEMALLOC_SAMPLE_RATE, 0)
+    """
+
+    def __init__(self, enabled: bool = None, tracemalloc_rate: float = None):
+        if enabled is None:
+            enabled = os.environ.get("MEMORY_METRICS_ENABLED", "true").lower() == "true"
+        if tracemalloc_rate is None:
+            tracemalloc_rate = float(os.environ.get("TRACEMALLOC_SAMPLE_RATE", "0"))
+        self.enabled = enabled
+        self.tracemalloc_rate = tracemalloc_rate
+
+    def _should_trace(self) -> bool:
+        if self.tracemalloc_rate <= 0 or random.random() >= self.tracemalloc_rate:
+            return False
+        import tracemalloc
+        # Somebody else (a test, a debugging session) is already tracing
+        return not tracemalloc.is_tracing()
+
+    @contextmanager
+    def invocation(self, function: str):
+        """
+        Context manager (or handler decorator) recording the container's
+        peak RSS and the invocation's growth of it and, when sampled, the
+        memory of its stages.
+
+        Args:
+            function: Function name of the record
+        """
+        if not self.enabled:
+            yield None
+            return
+        recorder = StageRecorder() if self._should_trace() else None
+        token = _current_recorder.set(recorder)
+        record = {'event': 'memory', 'function': function,
+                  'memory_limit_mb': int(os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", "0")) or None,
+                  'container_peak_rss_start_mb': peak_rss_mb(), 'traced': recorder is not None}
+        cpu_start, start = cpu_seconds(), time.perf_counter()
+        if recorder is not None:
+            recorder.start()
+        try:
+            yield record
+        finally:
+            if recorder is not None:
+                recorder.stop()
+                record['stages'] = recorder.stages
+            _current_recorder.reset(token)
+            record['duration_ms'] = round((time.perf_counter() - start) * 1000, 3)
+            record['cpu_ms'] = round((cpu_seconds() - cpu_start) * 1000, 3)
+            record['container_peak_rss_mb'] = peak_rss_mb()
+            if record['container_peak_rss_mb'] is not None:
+                record['rss_growth_mb'] = round(
+                    record['container_peak_rss_mb'] - record['container_peak_rss_start_mb'], 1)
+            self.emit(record)
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        """Log the record as one JSON line and put the ContainerPeakMemory metric."""
+        try:
+            logger.info(json.dumps(record, default=str))
+            if record.get('container_peak_rss_mb') is not None:
+                metrics.put('ContainerPeakMemory', record['container_peak_rss_mb'], 'Megabytes')
+        except Exception as e:
+            logger.warning(f"Could not emit memory record: {str(e)}")
+
+
+def stage(name: str):
+    """Record a stage of the current traced invocation; a no-op without one."""
+    recorder = _current_recorder.get()
+    if recorder is None:
+        return NOOP_STAGE
+    return _Stage(recorder, name)
+
+
+def staged(name: str):
+    """Decorator recording each call of a function as a stage of the current traced invocation."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _current_recorder.get()
+            if recorder is None:
+                return func(*args, **kwargs)
+            with _Stage(recorder, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Global instance for Lambda usage
+memory_profiler = MemoryProfiler()
@@ -0,0 +1,237 @@
+"""
+Pipeline KPIs as CloudWatch Embedded Metric Format (EMF) log lines.
+
+Metrics are buffered in memory while a handler runs and written when the
+invocation ends, one JSON line per dimension set, so recording a value costs
+a dict lookup and a list append instead of a log write:
+
+    @metrics.invocation('extraction')
+    def handler(event, context):
+        ...
+        metrics.put('BedrockLatency', 1840.0, 'Milliseconds', Model=model_id)
+
+CloudWatch turns the lines into metrics in METRICS_NAMESPACE. Every metric
+gets the Function dimension. Other dimensions must be declared in DIMENSIONS;
+values outside a declared set, and values past the first
+MAX_DIMENSION_VALUES of an open dimension, are reported as 'other', so the
+number of metric series stays bounded whatever the models or parse paths.
+
+Metrics recorded by the pipeline:
+- BedrockLatency, InputTokens, OutputTokens, CacheReadTokens, CacheWriteTokens (Model);
+  the latency is the successful attempt's, without throttled attempts and backoff
+- BedrockAttempts, BackoffTime, BedrockErrors (Model): attempts per call, time spent
+  sleeping between them, calls that failed after their retries
+- ThrottleRetries (Model): one per throttled attempt that is retried
+- ResponsesParsed (ParsePath): how each model response was decoded
+- FallbackPhase (Phase): where fallback processing ended
+- DocumentsPerBatch
+
+The lines are printed to stdout: Lambda's log formatter prefixes logger
+records, and CloudWatch only extracts metrics from lines that are pure JSON.
+METRICS_ENABLED=false turns recording and flushing into no-ops.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from .response_parser import PARSE_PATHS
+
+logger = logging.getLogger(__name__)
+
+OTHER = 'other'
+
+# Fallback phase that produced the result (or manual review / error)
+FALLBACK_PHASES = ('pypdf', 'textract', 'manual_review', 'error')
+
+# Parse paths, plus tool_use (structured output) and classification's regex fallback
+METRIC_PARSE_PATHS = PARSE_PATHS + ('tool_use', 'classification_fallback')
+
+# Allowed dimensions: None means any value, up to MAX_DIMENSION_VALUES distinct values
+DIMENSIONS = {
+    'Function': None,
+    'Model': None,
+    'ParsePath': METRIC_PARSE_PATHS,
+    'Phase': FALLBACK_PHASES,
+}
+
+# Distinct values kept per open dimension over the container's life
+MAX_DIMENSION_VALUES = 10
+
+# EMF accepts at most 100 values per metric in one line
+MAX_VALUES_PER_LINE = 100
+
+# Flush early when this many values are buffered (metrics recorded outside invocations)
+MAX_BUFFERED_VALUES = 10000
+
+# Bedrock usage keys (Converse / InvokeModel) for each token count
+_USAGE_KEYS = {
+    'input': ('inputTokens', 'input_tokens'),
+    'output': ('outputTokens', 'output_tokens'),
+    'cache_read': ('cacheReadInputTokens', 'cache_read_input_tokens'),
+    'cache_write': ('cacheWriteInputTokens', 'cache_creation_input_tokens'),
+}
+
+
+def token_counts(usage: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Token counts of a Bedrock response's usage block, for either API.
+
+    Args:
+        usage: response['usage'] (Converse camelCase or Anthropic snake_case keys)
+
+    Returns:
+        dict: input, output, cache_read and cache_write token counts (0 when absent)
+    """
+    usage = usage or {}
+    counts = {}
+    for name, keys in _USAGE_KEYS.items():
+        value = next((usage[key] for key in keys if usage.get(key) is not None), 0)
+        try:
+            counts[name] = int(value)
+        except (TypeError, ValueError):
+            counts[name] = 0
+    return counts
+
+
+class Metrics:
+    """
+    Buffer of metric values per dimension set, flushed as EMF lines.
+
+    Args:
+        namespace: CloudWatch namespace (default: METRICS_NAMESPACE, 'BedrockAgent/Pipeline')
+        enabled: Record metrics (default: METRICS_ENABLED, true)
+        stream: Where lines are written (default: sys.stdout at flush time)
+    """
+
+    def __init__(self, namespace: str = None, enabled: bool = None, stream=None):
+        if enabled is None:
+            enabled = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+        self.namespace = namespace or os.environ.get("METRICS_NAMESPACE", "BedrockAgent/Pipeline")
+        self.enabled = enabled
+        self.stream = stream
+        self.function = os.environ.get("AWS_LAMBDA_FUNCTION_NAME", "local")
+        self._buffer: Dict[Tuple[Tuple[str, str], ...], Dict[str, Tuple[str, List[float]]]] = {}
+        self._buffered = 0
+        self._seen: Dict[str, set] = {}
+        self._lock = threading.Lock()
+
+    def _dimension_value(self, key: str, value: Any) -> str:
+        if key not in DIMENSIONS:
+            raise ValueError(f"Undeclared metric dimension: {key}")
+        value = str(value)
+        allowed = DIMENSIONS[key]
+        if allowed is not None:
+            return value if value in allowed else OTHER
+        seen = self._seen.setdefault(key, set())
+        if value not in seen:
+            if len(seen) >= MAX_DIMENSION_VALUES:
+                return OTHER
+            seen.add(value)
+        return value
+
+    def put(self, name: str, value: float, unit: str = 'Count', **dimensions) -> None:
+        """
+        Record one value of a metric.
+
+        Args:
+            name: Metric name
+            value: Metric value
+            unit: CloudWatch unit ('Count', 'Milliseconds', ...)
+            **dimensions: Dimensions declared in DIMENSIONS
+        """
+        if not self.enabled:
+            return
+        if name in DIMENSIONS:
+            raise ValueError(f"Metric name clashes with a dimension: {name}")
+        with self._lock:
+            dimensions['Function'] = dimensions.get('Function', self.function)
+            key = tuple(sorted((k, self._dimension_value(k, v)) for k, v in dimensions.items()))
+            metrics = self._buffer.setdefault(key, {})
+            metrics.setdefault(name, (unit, []))[1].append(value)
+            self._buffered += 1
+            overflow = self._buffered >= MAX_BUFFERED_VALUES
+        if overflow:
+            self.flush()
+
+    def count(self, name: str, **dimensions) -> None:
+        """Record one occurrence of an event."""
+        self.put(name, 1, 'Count', **dimensions)
+
+    def documents(self) -> List[Dict[str, Any]]:
+        """The buffered metrics as EMF documents, without clearing the buffer."""
+        with self._lock:
+            buffer = {key: {name: (unit, list(values)) for name, (unit, values) in metrics.items()}
+                      for key, metrics in self._buffer.items()}
+        return self._documents(buffer)
+
+    def _documents(self, buffer) -> List[Dict[str, Any]]:
+        timestamp = int(time.time() * 1000)
+        documents = []
+        for key, metrics in buffer.items():
+            longest = max(len(values) for _, values in metrics.values())
+            for offset in range(0, longest, MAX_VALUES_PER_LINE):
+                chunk = {name: (unit, values[offset:offset + MAX_VALUES_PER_LINE])
+                         for name, (unit, values) in metrics.items() if values[offset:offset + MAX_VALUES_PER_LINE]}
+                document = {
+                    '_aws': {
+                        'Timestamp': timestamp,
+                        'CloudWatchMetrics': [{
+                            'Namespace': self.namespace,
+                            'Dimensions': [[k for k, _ in key]],
+                            'Metrics': [{'Name': name, 'Unit': unit} for name, (unit, _) in chunk.items()],
+                        }],
+                    },
+                }
+                document.update(key)
+                for name, (_, values) in chunk.items():
+                    document[name] = values[0] if len(values) == 1 else values
+                documents.append(document)
+        return documents
+
+    def flush(self) -> int:
+        """
+        Write the buffered metrics as EMF lines and clear the buffer.
+
+        Returns:
+            int: Number of lines written
+        """
+        if not self.enabled:
+            return 0
+        with self._lock:
+            buffer, self._buffer = self._buffer, {}
+            self._buffered = 0
+        documents = self._documents(buffer)
+        if not documents:
+            return 0
+        try:
+            stream = self.stream or sys.stdout
+            stream.write(''.join(json.dumps(doc, separators=(',', ':')) + '\n' for doc in documents))
+            stream.flush()
+        except Exception as e:
+            logger.warning(f"Could not write metrics: {str(e)}")
+        return len(documents)
+
+    @contextmanager
+    def invocation(self, function: str):
+        """
+        Context manager (or handler decorator) setting the Function dimension
+        and flushing the metrics when the invocation ends.
+
+        Args:
+            function: Function name for the Function dimension
+        """
+        self.function = function
+        try:
+            yield self
+        finally:
+            self.flush()
+
+
+# Global instance for Lambda usage
+metrics = Metrics()
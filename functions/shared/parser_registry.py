@@ -0,0 +1,294 @@
+"""
+Per-model-family response parser registry.
+
+Each model family gets a parser for the way it actually formats JSON, so a
+response goes straight to the cheapest correct decode instead of through every
+fallback stage:
+- nova: JSON inside a ```json fence
+- anthropic: raw JSON object
+- mistral (Mistral, Pixtral): fenced JSON, sometimes with markdown-escaped underscores (\\_)
+- llama: JSON after a short preamble, sometimes with trailing commas
+
+A parser returns ParseOutcome(None, None) when its fast path does not apply;
+the registry then runs the generic extract_json_object scan and counts it as a
+fallback. Per-parser stats (calls, fast-path hits, fallbacks, misses, latency,
+parse paths) show which fallback paths are still needed.
+
+Responses to structured-output requests (toolConfig) are read from their
+toolUse block instead. Per-model stats split by mode ('text' / 'tool_use')
+make parse failure rate and parse time comparable between the two.
+
+Usage:
+    outcome = parser_registry.parse_text(text, model_id)
+    outcome = parser_registry.parse_tool_use(response, model_id)
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .response_parser import ParseOutcome, extract_json_object, PATH_FENCED_JSON, PATH_RAW_JSON
+
+PATH_TOOL_USE = 'tool_use'
+MODE_TEXT = 'text'
+MODE_TOOL_USE = 'tool_use'
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FAMILY = 'default'
+
+_DECODER = json.JSONDecoder()
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+
+ParserFn = Callable[[str], ParseOutcome]
+
+
+def model_family(model_id: Optional[str]) -> str:
+    """
+    Map a Bedrock model or inference profile ID to its parser family.
+
+    Args:
+        model_id: e.g. 'us.amazon.nova-pro-v1:0', 'us.mistral.pixtral-large-2502-v1:0'
+
+    Returns:
+        str: 'nova', 'anthropic', 'mistral', 'llama' or 'default'
+    """
+    model_id = (model_id or '').lower()
+    if 'anthropic' in model_id or 'claude' in model_id:
+        return 'anthropic'
+    if 'nova' in model_id:
+        return 'nova'
+    if 'mistral' in model_id or 'pixtral' in model_id:
+        return 'mistral'
+    if 'llama' in model_id:
+        return 'llama'
+    return DEFAULT_FAMILY
+
+
+def _decode_at(text: str, start: int, path: str) -> ParseOutcome:
+    """raw_decode the object starting at text[start] ('{'), or (None, None)."""
+    if start == -1:
+        return ParseOutcome(None, None)
+    try:
+        data, _ = _DECODER.raw_decode(text, start)
+    except ValueError:
+        return ParseOutcome(None, None)
+    return ParseOutcome(data, path) if isinstance(data, dict) else ParseOutcome(None, None)
+
+
+def _fenced_start(text: str) -> int:
+    """Offset of the '{' opening a ```json fence, or -1."""
+    fence = text.find('```json')
+    return text.find('{', fence) if fence != -1 else -1
+
+
+class ParserStats:
+    """Counters and latency of one parser."""
+
+    def __init__(self):
+        self.calls = 0
+        self.fast_path = 0
+        self.fallback = 0
+        self.no_json = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.paths = Counter()
+
+    def record(self, outcome: ParseOutcome, fast: bool, elapsed: float) -> None:
+        self.calls += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        if outcome.data is None:
+            self.no_json += 1
+        elif fast:
+            self.fast_path += 1
+        else:
+            self.fallback += 1
+        self.paths[outcome.path or 'no_json'] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'fast_path': self.fast_path,
+            'fallback': self.fallback,
+            'no_json': self.no_json,
+            'failure_rate': round(self.no_json / self.calls, 4) if self.calls else 0.0,
+            'avg_ms': round(self.total_seconds / self.calls * 1000, 3) if self.calls else 0.0,
+            'max_ms': round(self.max_seconds * 1000, 3),
+            'paths': dict(self.paths)
+        }
+
+
+class ParserRegistry:
+    """
+    Registry of JSON parsers keyed by model family.
+    """
+
+    def __init__(self):
+        self._parsers: Dict[str, ParserFn] = {}
+        self._stats: Dict[str, ParserStats] = {}
+        self._model_stats: Dict[Tuple[str, str], ParserStats] = {}
+        self._lock = threading.Lock()
+
+    def register(self, family: str):
+        """
+        Decorator registering a parser function for a model family.
+
+        Args:
+            family: Family name as returned by model_family()
+        """
+        def decorator(func: ParserFn) -> ParserFn:
+            self._parsers[family] = func
+            return func
+        return decorator
+
+    def get(self, model_id: Optional[str]) -> Tuple[str, ParserFn]:
+        """
+        Get (family, parser) for a model, falling back to the default parser.
+        """
+        family = model_family(model_id)
+        if family not in self._parsers:
+            family = DEFAULT_FAMILY
+        return family, self._parsers[family]
+
+    def parse_text(self, text: str, model_id: Optional[str] = None) -> ParseOutcome:
+        """
+        Decode the JSON object of a response text with the model's parser.
+
+        Args:
+            text: Response text
+            model_id: Model that produced the text
+
+        Returns:
+            ParseOutcome: (dict, path) or (None, None) if no JSON object decodes
+        """
+        family, parser = self.get(model_id)
+        start = time.perf_counter()
+
+        outcome = parser(text)
+        fast = outcome.data is not None
+        if not fast and family != DEFAULT_FAMILY:
+            outcome = extract_json_object(text)
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._stats.setdefault(family, ParserStats()).record(outcome, fast, elapsed)
+            self._model_stats.setdefault((model_id or 'unknown', MODE_TEXT), ParserStats()).record(outcome, fast, elapsed)
+        if not fast and outcome.data is not None:
+            logger.info(f"{family} parser fast path missed; generic scan found JSON via {outcome.path}")
+        return outcome
+
+    def parse_tool_use(self, response: Dict[str, Any], model_id: Optional[str] = None) -> ParseOutcome:
+        """
+        Read the input of the first toolUse block of a structured-output response.
+
+        Args:
+            response: Converse-shaped Bedrock response
+            model_id: Model that produced the response
+
+        Returns:
+            ParseOutcome: (tool input, 'tool_use') or (None, None) if the model did not call the tool
+        """
+        start = time.perf_counter()
+        outcome = ParseOutcome(None, None)
+        try:
+            for block in response["output"]["message"]["content"]:
+                tool_use = block.get("toolUse") if isinstance(block, dict) else None
+                if tool_use and isinstance(tool_use.get("input"), dict):
+                    outcome = ParseOutcome(tool_use["input"], PATH_TOOL_USE)
+                    break
+        except (KeyError, TypeError):
+            pass
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._model_stats.setdefault((model_id or 'unknown', MODE_TOOL_USE), ParserStats()).record(
+                outcome, True, elapsed
+            )
+        if outcome.data is None:
+            logger.warning(f"Structured-output response from {model_id} has no toolUse block")
+        return outcome
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-parser statistics since container start (or the last reset)."""
+        with self._lock:
+            return {family: stats.to_dict() for family, stats in self._stats.items()}
+
+    def model_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Parse statistics per model ID and mode ('text' / 'tool_use')."""
+        with self._lock:
+            result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            for (model_id, mode), stats in self._model_stats.items():
+                result.setdefault(model_id, {})[mode] = stats.to_dict()
+            return result
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._model_stats.clear()
+
+    def log_stats(self) -> None:
+        for family, stats in self.stats().items():
+            logger.info(f"Parser stats [{family}]: {json.dumps(stats)}")
+        for model_id, modes in self.model_stats().items():
+            for mode, stats in modes.items():
+                logger.info(f"Parse stats [{model_id}/{mode}]: calls={stats['calls']} "
+                            f"failure_rate={stats['failure_rate']} avg_ms={stats['avg_ms']}")
+
+
+# Global instance for Lambda usage
+parser_registry = ParserRegistry()
+register_parser = parser_registry.register
+
+
+@register_parser(DEFAULT_FAMILY)
+def parse_default(text: str) -> ParseOutcome:
+    """Unknown models: full fence/outermost/nested scan."""
+    return extract_json_object(text)
+
+
+@register_parser('nova')
+def parse_nova(text: str) -> ParseOutcome:
+    """Nova wraps its JSON in a ```json fence."""
+    start = _fenced_start(text)
+    if start != -1:
+        return _decode_at(text, start, PATH_FENCED_JSON)
+    return _decode_at(text, text.find('{'), PATH_RAW_JSON)
+
+
+@register_parser('anthropic')
+def parse_anthropic(text: str) -> ParseOutcome:
+    """Claude returns the raw object, occasionally fenced."""
+    start = text.find('{')
+    path = PATH_FENCED_JSON if text.lstrip().startswith('```') else PATH_RAW_JSON
+    return _decode_at(text, start, path)
+
+
+@register_parser('mistral')
+def parse_mistral(text: str) -> ParseOutcome:
+    """Mistral/Pixtral fence their JSON and may escape underscores in keys (company\\_name)."""
+    start = _fenced_start(text)
+    path = PATH_FENCED_JSON if start != -1 else PATH_RAW_JSON
+    if start == -1:
+        start = text.find('{')
+    outcome = _decode_at(text, start, path)
+    if outcome.data is None and start != -1 and '\\_' in text:
+        outcome = _decode_at(text[start:].replace('\\_', '_'), 0, path)
+    return outcome
+
+
+@register_parser('llama')
+def parse_llama(text: str) -> ParseOutcome:
+    """Llama prefixes a short preamble and sometimes leaves trailing commas."""
+    start = _fenced_start(text)
+    path = PATH_FENCED_JSON if start != -1 else PATH_RAW_JSON
+    if start == -1:
+        start = text.find('{')
+    outcome = _decode_at(text, start, path)
+    if outcome.data is None and start != -1:
+        outcome = _decode_at(_TRAILING_COMMA.sub(r'\1', text[start:]), 0, path)
+    return outcome
@@ -1,15 +1,29 @@
 import io, base64, logging, os, boto3, time
 from pathlib import Path
-from PyPDF2 import PdfReader, PdfWriter
 from botocore.config import Config
 from typing import Dict, Any
 from .text_utils import clean_text_for_json
+from .textract_aggregator import TextractTextAggregator
+from .tracing import traced
+from .memory_profile import staged
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Extractor versions used in text cache keys - bump when the extracted text changes
+# (PYPDF_EXTRACTOR_VERSION is resolved on first access, see __getattr__)
+TEXTRACT_EXTRACTOR_VERSION = "textract-detect-text-v2"  # v2: per-page aggregation in reading order
+
+
+def __getattr__(name):
+    # PyPDF2 is imported on first use only: extraction-scoring never parses PDFs locally
+    if name == 'PYPDF_EXTRACTOR_VERSION':
+        from PyPDF2 import __version__ as pypdf2_version
+        return f"pypdf2-{pypdf2_version}-v1"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def sanitize_name(raw_name: str) -> str:
     """
     Strip off any disallowed characters (including periods) from a filename.
@@ -25,11 +39,14 @@ def sanitize_name(raw_name: str) -> str:
     return safe or "document"  # fallback if everything got stripped
 
 
+@traced('pypdf')
+@staged('pypdf')
 def extract_pdf_text_with_pypdf(pdf_bytes: bytes) -> str:
     """
     Extract text from PDF using PyPDF2 as fallback when PDF is too large.
     """
     try:
+        from PyPDF2 import PdfReader
         text_content = ""
         
         reader = PdfReader(io.BytesIO(pdf_bytes))
@@ -51,17 +68,24 @@ def extract_pdf_text_with_pypdf(pdf_bytes: bytes) -> str:
         logger.error(f"Error extracting text with PyPDF2: {e}")
         return f"[ERROR EXTRACTING TEXT: {str(e)}]"
 
-def extract_pdf_text_with_textract(pdf_bytes: bytes, s3_bucket: str, s3_key: str, region: str = None) -> str:
+@traced('textract')
+@staged('textract')
+def extract_pdf_text_with_textract(pdf_bytes: bytes, s3_bucket: str, s3_key: str, region: str = None,
+                                   cancel_event=None) -> str:
     """
     Extract text from PDF using AWS Textract - PRODUCTION FLOW
+
+    Args:
+        cancel_event: Optional threading.Event; when set, polling stops early
+                      (used when Textract runs speculatively alongside PyPDF)
     """
     try:
         # Use configured region or environment default
         region = region or os.environ.get("REGION", "us-east-2")
         
-        # Create Textract client
+        # Create Textract client (own session: may run in a worker thread)
         config = Config(read_timeout=1000)
-        textract_client = boto3.client(
+        textract_client = boto3.Session().client(
             service_name='textract',
             region_name=region,
             config=config
@@ -101,7 +125,11 @@ def extract_pdf_text_with_textract(pdf_bytes: bytes, s3_bucket: str, s3_key: str
                 raise RuntimeError(f"Textract job failed: {error_msg}")
             elif job_status in ['IN_PROGRESS', 'PARTIAL_SUCCESS']:
                 logger.info(f"Job status: {job_status}, waiting...")
-                time.sleep(wait_interval)
+                if cancel_event is not None:
+                    if cancel_event.wait(wait_interval):
+                        raise RuntimeError("Textract polling cancelled")
+                else:
+                    time.sleep(wait_interval)
                 elapsed_time += wait_interval
             else:
                 raise RuntimeError(f"Unexpected job status: {job_status}")
@@ -112,9 +140,8 @@ def extract_pdf_text_with_textract(pdf_bytes: bytes, s3_bucket: str, s3_key: str
         
         # STEP 2: GET RESULTS (ONLY AFTER COMPLETION)
         logger.info("Getting job results...")
-        text_content = ""
         next_token = None
-        all_lines = []  # Collect all lines
+        aggregator = TextractTextAggregator()  # Per-page line buffers, rendered once
         
         # Process all result pages
         while True:
@@ -126,29 +153,10 @@ def extract_pdf_text_with_textract(pdf_bytes: bytes, s3_bucket: str, s3_key: str
             else:
                 result_response = textract_client.get_document_text_detection(JobId=job_id)
             
-            # Extract lines from blocks
+            # Collect LINE blocks into their page buffers
             blocks = result_response.get('Blocks', [])
             logger.info(f"Processing {len(blocks)} blocks")
-            
-            # Collect only LINE blocks (simpler)
-            page_lines = {}
-            for block in blocks:
-                if block['BlockType'] == 'LINE':
-                    page_num = block.get('Page', 1)
-                    line_text = block.get('Text', '').strip()
-                    
-                    if line_text:  # Only non-empty lines
-                        if page_num not in page_lines:
-                            page_lines[page_num] = []
-                        page_lines[page_num].append(line_text)
-            
-            # Add lines by page to total collection
-            for page_num in sorted(page_lines.keys()):
-                if page_num not in [item for item in all_lines if item.startswith("--- PÁGINA")]:
-                    all_lines.append(f"--- PÁGINA {page_num} ---")
-                
-                for line in page_lines[page_num]:
-                    all_lines.append(line)
+            aggregator.add_blocks(blocks)
             
             # Check if there are more result pages
             next_token = result_response.get('NextToken')
@@ -158,8 +166,9 @@ def extract_pdf_text_with_textract(pdf_bytes: bytes, s3_bucket: str, s3_key: str
             logger.info("Getting next page of results...")
         
         # STEP 3: BUILD FINAL TEXT
-        if all_lines:
-            text_content = '\n'.join(all_lines)
+        if aggregator.line_count:
+            logger.info(f"Aggregated {aggregator.line_count} lines across {aggregator.page_count} pages")
+            text_content = aggregator.render()
         else:
             logger.warning("No text lines found in Textract response")
             text_content = "[NO CONTENT DETECTED BY TEXTRACT]"
@@ -244,6 +253,8 @@ def create_converse_message(prompt: str, role: str, pdf_bytes: bytes = None, pdf
     
     return {"role": role, "content": content}
 
+@traced('s3.download')
+@staged('s3.download')
 def download_pdf_from_s3(pdf_path):
     """
     Download PDF from S3 for Anthropic models.
@@ -279,6 +290,7 @@ def download_pdf_from_s3(pdf_path):
         
     return pdf_bytes
 
+@staged('message.build')
 def create_message(prompt: str,
                    role: str,
                    pdf_bytes: bytes | None = None,
@@ -309,11 +321,13 @@ def create_message(prompt: str,
     else:
         return create_converse_message(prompt, role, pdf_bytes, pdf_path, s3_bucket_owner)
 
+@traced('pdf.first_page')
 def get_first_pdf_page(pdf_bytes):
     """
     Extract the first page from a PDF.
     """
     try:
+        from PyPDF2 import PdfReader, PdfWriter
         inputpdf = PdfReader(io.BytesIO(pdf_bytes))
         if len(inputpdf.pages) > 0:
             first_page = inputpdf.pages[0]
@@ -334,6 +348,7 @@ def detect_scanned_pdf(pdf_bytes: bytes, text_threshold: int = 20) -> bool:
     Returns True if the PDF appears to be a scanned/image - only PDF.
     We consider it scanned if no page yields more than text_threshold chars.
     """
+    from PyPDF2 import PdfReader
     reader = PdfReader(io.BytesIO(pdf_bytes))
     for page in reader.pages:
         text = page.extract_text() or ""
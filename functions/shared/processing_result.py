@@ -160,6 +160,7 @@ def build_combined_metadata_and_raw(
         'error_message': result.error_message,
         'method_used': meta_dict.get('method_used', 'unknown'),
         'processing_time_seconds': meta_dict.get('processing_time_seconds', 0),
+        'prompt_bundle': meta_dict.get('prompt_bundle'),
 
         # Model information
         'successful_model': successful_model,
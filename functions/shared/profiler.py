@@ -0,0 +1,222 @@
+"""
+Opt-in sampling profiler for slow invocations.
+
+A sampled invocation runs a background thread that records the Python stack of
+every thread each PROFILE_INTERVAL_MS. When the invocation took longer than
+PROFILE_THRESHOLD_MS, the samples are saved to S3 as folded stacks, the input
+format of flamegraph.pl and speedscope:
+
+    MainThread;index.py:handler;index.py:process_batch_classification;... 42
+
+Handlers opt in with a decorator under the metrics one:
+
+    @metrics.invocation('classification')
+    @profiler.invocation('classification')
+    def handler(event, context):
+        ...
+
+Profiling stays off unless PROFILING_ENABLED=true. Its cost is bounded twice:
+only PROFILE_SAMPLE_RATE of the invocations run the sampler (one stack walk per
+interval, no tracing hooks), and at most PROFILE_MAX_UPLOADS_PER_HOUR profiles
+per container are saved. Profiles go to
+s3://PROFILE_BUCKET/FOLDER_PREFIX/profiles/<function>/<date>/.
+"""
+
+import collections
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Counter, Deque, Optional
+
+logger = logging.getLogger(__name__)
+
+# Frames kept per stack; deeper stacks keep their innermost frames
+MAX_STACK_DEPTH = 64
+
+
+def _frame_label(code) -> str:
+    # ';' separates frames in folded stacks
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}".replace(';', ':')
+
+
+def fold_stack(frame, max_depth: int = MAX_STACK_DEPTH) -> str:
+    """
+    A frame's stack as folded frames, outermost first.
+
+    Args:
+        frame: Innermost frame
+        max_depth: Frames kept (the outermost ones are dropped)
+
+    Returns:
+        str: 'file.py:function;file.py:function;...'
+    """
+    labels = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class StackSampler:
+    """
+    Thread counting the stacks of the other threads at a fixed interval.
+
+    Args:
+        interval: Seconds between samples
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter[str] = collections.Counter()
+        self.count = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self) -> 'StackSampler':
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def sample(self) -> None:
+        """Record the current stack of every thread but the sampler."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = fold_stack(frame)
+            if stack:
+                self.samples[f"{names.get(ident, ident)};{stack}"] += 1
+        self.count += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.debug(f"Stack sample failed: {str(e)}")
+
+    def folded(self) -> str:
+        """The samples as folded stack lines ('frame;frame;... count')."""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def _upload_to_s3(bucket: str, key: str, body: str) -> None:
+    from .aws_clients import create_s3_client
+
+    create_s3_client().put_object(Bucket=bucket, Key=key, Body=body.encode('utf-8'), ContentType='text/plain')
+
+
+class Profiler:
+    """
+    Samples a fraction of invocations and saves the profiles of the slow ones.
+
+    Args:
+        enabled: Profile invocations (default: PROFILING_ENABLED, false)
+        sample_rate: Fraction of invocations sampled (default: PROFILE_SAMPLE_RATE, 0.05)
+        interval_ms: Time between stack samples (default: PROFILE_INTERVAL_MS, 10)
+        threshold_ms: Invocation duration above which the profile is saved
+                      (default: PROFILE_THRESHOLD_MS, 60000)
+        max_uploads_per_hour: Profiles saved per container and hour
+                              (default: PROFILE_MAX_UPLOADS_PER_HOUR, 4)
+        bucket: Destination bucket (default: PROFILE_BUCKET, then DESTINATION_BUCKET)
+        uploader: Called as uploader(bucket, key, body) to save a profile (default: S3 put_object)
+    """
+
+    def __init__(self, enabled: bool = None, sample_rate: float = None, interval_ms: float = None,
+                 threshold_ms: float = None, max_uploads_per_hour: int = None, bucket: str = None,
+                 uploader: Callable[[str, str, str], None] = None):
+        if enabled is None:
+            enabled = os.environ.get("PROFILING_ENABLED", "false").lower() == "true"
+        self.enabled = enabled
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.environ.get("PROFILE_SAMPLE_RATE", "0.05"))
+        self.interval_ms = interval_ms if interval_ms is not None else float(os.environ.get("PROFILE_INTERVAL_MS", "10"))
+        self.threshold_ms = threshold_ms if threshold_ms is not None else float(os.environ.get("PROFILE_THRESHOLD_MS", "60000"))
+        self.max_uploads_per_hour = max_uploads_per_hour if max_uploads_per_hour is not None \
+            else int(os.environ.get("PROFILE_MAX_UPLOADS_PER_HOUR", "4"))
+        self.bucket = bucket or os.environ.get("PROFILE_BUCKET") or os.environ.get("DESTINATION_BUCKET")
+        self.prefix = f"{os.environ.get('FOLDER_PREFIX', 'par-servicios-poc')}/profiles"
+        self.uploader = uploader or _upload_to_s3
+        self._uploads: Deque[float] = collections.deque()
+        self._lock = threading.Lock()
+
+    def should_sample(self) -> bool:
+        """Whether to sample the next invocation."""
+        return self.enabled and self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _reserve_upload(self) -> bool:
+        """Take one of the hour's uploads, if any is left."""
+        now = time.monotonic()
+        with self._lock:
+            while self._uploads and now - self._uploads[0] >= 3600:
+                self._uploads.popleft()
+            if len(self._uploads) >= self.max_uploads_per_hour:
+                return False
+            self._uploads.append(now)
+            return True
+
+    def save(self, function: str, sampler: StackSampler, duration_ms: float) -> Optional[str]:
+        """
+        Save a slow invocation's profile, unless this hour's uploads are used up.
+
+        Args:
+            function: Function name, part of the key
+            sampler: The invocation's finished sampler
+            duration_ms: Invocation duration
+
+        Returns:
+            str: S3 URI of the profile, or None when it was not saved
+        """
+        if not sampler.samples or not self.bucket:
+            return None
+        if not self._reserve_upload():
+            logger.info(f"Profile of {function} ({duration_ms:.0f} ms) not saved: "
+                        f"{self.max_uploads_per_hour} profiles already saved this hour")
+            return None
+        now = datetime.now(timezone.utc)
+        key = (f"{self.prefix}/{function}/{now:%Y-%m-%d}/"
+               f"{now:%H%M%S}_{int(duration_ms)}ms_{uuid.uuid4().hex[:8]}.folded")
+        try:
+            self.uploader(self.bucket, key, sampler.folded())
+        except Exception as e:
+            logger.warning(f"Could not save profile of {function}: {str(e)}")
+            return None
+        uri = f"s3://{self.bucket}/{key}"
+        logger.info(f"Saved profile of slow {function} invocation ({duration_ms:.0f} ms, "
+                    f"{sampler.count} samples) to {uri}")
+        return uri
+
+    @contextmanager
+    def invocation(self, function: str):
+        """
+        Context manager (or handler decorator) sampling the invocation's stacks
+        and saving them when it is slower than the threshold.
+
+        Args:
+            function: Function name for the profile key
+        """
+        if not self.should_sample():
+            yield self
+            return
+        sampler = StackSampler(self.interval_ms / 1000).start()
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            sampler.stop()
+            if duration_ms >= self.threshold_ms:
+                self.save(function, sampler, duration_ms)
+
+
+# Global instance for Lambda usage
+profiler = Profiler()
@@ -0,0 +1,208 @@
+"""
+Versioned prompt bundles.
+
+A Lambda's instructions/ directory is a prompt bundle. Its manifest.json records
+the bundle version and the SHA-256 of every prompt file:
+
+    {
+      "version": "1.0.0",
+      "sha256": "<bundle hash>",
+      "files": {"system.txt": "<sha256>", "RUT/user.txt": "<sha256>", ...}
+    }
+
+The bundle hash is the SHA-256 of the sorted "path sha256" lines, so it only
+depends on prompt contents. PromptLoader computes it from the prompts it loaded
+and checks it against the manifest. The active bundle is stamped into every
+classification and extraction result as 'prompt_bundle'. Result caches can key
+on it (result_cache_key), and reprocessing jobs can skip results that were
+already produced with the active bundle (is_current).
+
+Regenerate the manifest after editing prompts:
+    python functions/shared/prompt_bundle.py functions/extraction-scoring/src/instructions --version 1.1.0
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+UNVERSIONED = 'unversioned'
+
+
+def bundle_sha256(file_hashes: Dict[str, str]) -> str:
+    """
+    Hash of a bundle from the SHA-256 of its files.
+
+    Args:
+        file_hashes: SHA-256 by path relative to the instructions directory
+
+    Returns:
+        str: Hex digest
+    """
+    lines = ''.join(f"{path} {file_hashes[path]}\n" for path in sorted(file_hashes))
+    return hashlib.sha256(lines.encode('utf-8')).hexdigest()
+
+
+@dataclass(frozen=True)
+class PromptBundle:
+    """Version and content hash of the prompts a Lambda is running with."""
+    version: str
+    sha256: str
+    files: Dict[str, str] = field(default_factory=dict)
+    verified: bool = False
+    mismatches: Tuple[str, ...] = ()
+
+    def stamp(self, prompt_name: str = None, prompt_sha256: str = None) -> Dict[str, Any]:
+        """
+        Bundle fields recorded in a result.
+
+        Args:
+            prompt_name: Prompt set used ('classification' or a category)
+            prompt_sha256: Hash of that prompt set
+
+        Returns:
+            dict: prompt_bundle entry
+        """
+        return {
+            'version': self.version,
+            'sha256': self.sha256,
+            'verified': self.verified,
+            'prompt': prompt_name,
+            'prompt_sha256': prompt_sha256
+        }
+
+
+def load_manifest(instructions_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    Read the manifest of a bundle.
+
+    Returns:
+        dict or None if the bundle has no (readable) manifest
+    """
+    manifest_path = Path(instructions_dir) / MANIFEST_FILE
+    if not manifest_path.exists():
+        return None
+    try:
+        return json.loads(manifest_path.read_text(encoding='utf-8'))
+    except Exception as e:
+        logger.error(f"Invalid prompt bundle manifest {manifest_path}: {e}")
+        return None
+
+
+def build_bundle(file_hashes: Dict[str, str], manifest: Optional[Dict[str, Any]]) -> PromptBundle:
+    """
+    Build the active bundle from the hashes of the loaded prompt files and
+    check it against the manifest.
+
+    Args:
+        file_hashes: SHA-256 of the loaded files, by relative path
+        manifest: Bundle manifest (None if missing)
+
+    Returns:
+        PromptBundle: verified if every file matches the manifest
+    """
+    sha256 = bundle_sha256(file_hashes)
+    if manifest is None:
+        return PromptBundle(version=UNVERSIONED, sha256=sha256, files=dict(file_hashes))
+
+    expected = manifest.get('files', {})
+    mismatches = tuple(sorted(
+        path for path in set(expected) | set(file_hashes) if expected.get(path) != file_hashes.get(path)
+    ))
+    if mismatches:
+        logger.error(f"Prompt bundle {manifest.get('version')} does not match its manifest: {', '.join(mismatches)}")
+    return PromptBundle(
+        version=manifest.get('version', UNVERSIONED),
+        sha256=sha256,
+        files=dict(file_hashes),
+        verified=not mismatches,
+        mismatches=mismatches
+    )
+
+
+def hash_bundle_files(instructions_dir: Path) -> Dict[str, str]:
+    """SHA-256 of every prompt file (*.txt) under an instructions directory."""
+    instructions_dir = Path(instructions_dir)
+    return {
+        path.relative_to(instructions_dir).as_posix(): hashlib.sha256(path.read_bytes()).hexdigest()
+        for path in sorted(instructions_dir.rglob('*.txt'))
+    }
+
+
+def build_manifest(instructions_dir: Path, version: str) -> Dict[str, Any]:
+    """
+    Build the manifest of a bundle from the files on disk.
+
+    Args:
+        instructions_dir: Bundle directory
+        version: Bundle version
+
+    Returns:
+        dict: Manifest
+    """
+    files = hash_bundle_files(instructions_dir)
+    return {'version': version, 'sha256': bundle_sha256(files), 'files': files}
+
+
+def result_cache_key(document_id: str, prompt_bundle: Dict[str, Any]) -> str:
+    """
+    Cache key of a result: the same document processed with the same prompts.
+
+    Args:
+        document_id: Document hash or versioned S3 key
+        prompt_bundle: 'prompt_bundle' entry of the result (PromptBundle.stamp)
+
+    Returns:
+        str: Cache key
+    """
+    return f"{prompt_bundle.get('sha256')}/{prompt_bundle.get('prompt')}/{document_id}"
+
+
+def is_current(result: Dict[str, Any], bundle: PromptBundle) -> bool:
+    """
+    Whether a stored result was produced with the given bundle, i.e. whether
+    reprocessing the document would run the same prompts again.
+
+    Args:
+        result: Stored classification or extraction result
+        bundle: Active bundle
+
+    Returns:
+        bool
+    """
+    stamp = result.get('prompt_bundle') or {}
+    return stamp.get('sha256') == bundle.sha256
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write the manifest.json of a prompt bundle")
+    parser.add_argument('instructions_dir', type=Path)
+    parser.add_argument('--version', help='Bundle version (default: keep the current one)')
+    parser.add_argument('--check', action='store_true', help='Only check that the manifest is up to date')
+    args = parser.parse_args()
+
+    current = load_manifest(args.instructions_dir) or {}
+    manifest = build_manifest(args.instructions_dir, args.version or current.get('version', '1.0.0'))
+
+    if args.check:
+        up_to_date = current.get('files') == manifest['files'] and current.get('sha256') == manifest['sha256']
+        print(f"{args.instructions_dir}: {'up to date' if up_to_date else 'OUT OF DATE'}")
+        raise SystemExit(0 if up_to_date else 1)
+
+    if current.get('files') not in (None, manifest['files']) and args.version in (None, current.get('version')):
+        print(f"Warning: prompts changed but version {manifest['version']} was kept; pass --version")
+
+    manifest_path = args.instructions_dir / MANIFEST_FILE
+    manifest_path.write_text(json.dumps(manifest, indent=2) + '\n', encoding='utf-8')
+    print(f"Wrote {manifest_path}: version {manifest['version']}, sha256 {manifest['sha256'][:12]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,84 +2,245 @@
 Prompt loading utilities for Lambda functions.
 
 This module handles loading classification and extraction prompts from filesystem.
-Uses Option A: read files each invocation for reliability and consistency.
+Every prompt under {LAMBDA_TASK_ROOT}/instructions is loaded and validated once
+at cold start (the global prompt_loader is built at import time) and kept as an
+immutable PromptSet with precomputed SHA-256 hashes, usable as cache keys and to
+tell which prompt version produced a result or a prompt-cache entry.
+
+Layout:
+- instructions/system.txt, instructions/user.txt -> 'classification'
+- instructions/{CATEGORY}/system.txt, user.txt   -> CATEGORY (CERL, CECRL, RUT, RUB, ACC)
+
+With PROMPT_HOT_RELOAD=true, a prompt is re-read when the mtime of one of its
+files changes (one stat per file per lookup), e.g. for local iteration on
+prompts in a long-running process. Lambda deployments replace the code package,
+so hot reload stays off there and lookups never touch the filesystem.
+
+The instructions directory is a versioned prompt bundle (see prompt_bundle):
+its manifest.json is checked once at load, and bundle_stamp() returns the
+'prompt_bundle' entry recorded in every classification and extraction result.
 """
 
+import hashlib
 import os
 import logging
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from string import Template
-from typing import Tuple, Dict
+from typing import Any, Tuple, Dict, Optional
+
+from .prompt_bundle import PromptBundle, build_bundle, load_manifest
 
 logger = logging.getLogger(__name__)
 
+CLASSIFICATION_PROMPT = 'classification'
+PROMPT_FILES = ('system.txt', 'user.txt')
+
+PROMPT_HOT_RELOAD = os.environ.get("PROMPT_HOT_RELOAD", "false").lower() == "true"
+
+
+@dataclass(frozen=True)
+class PromptSet:
+    """Validated system/user prompt pair of one classification or extraction task."""
+    name: str
+    system: str
+    user: str
+    system_sha256: str
+    user_sha256: str
+    sha256: str
+    mtimes: Tuple[float, float]
+    directory: str
+
+    def as_tuple(self) -> Tuple[str, str]:
+        return self.system, self.user
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_prompt_set(name: str, directory: Path) -> PromptSet:
+    """
+    Read and validate the system/user prompts of one directory.
+
+    Args:
+        name: Prompt name ('classification' or a category)
+        directory: Directory holding system.txt and user.txt
+
+    Returns:
+        PromptSet
+
+    Raises:
+        FileNotFoundError: A prompt file is missing
+        ValueError: A prompt file is empty
+    """
+    texts = []
+    hashes = []
+    mtimes = []
+    for file_name in PROMPT_FILES:
+        path = directory / file_name
+        if not path.exists():
+            kind = file_name.split('.')[0].capitalize()
+            raise FileNotFoundError(f"{kind} prompt not found for {name}: {path}")
+        # Hash the file bytes so hashes match the bundle manifest
+        data = path.read_bytes()
+        text = data.decode('utf-8').replace('\r\n', '\n')
+        if not text.strip():
+            raise ValueError(f"Prompt file is empty for {name}: {path}")
+        texts.append(text)
+        hashes.append(_sha256(data))
+        mtimes.append(path.stat().st_mtime)
+
+    system_prompt, user_prompt = texts
+    system_sha256, user_sha256 = hashes
+    return PromptSet(
+        name=name,
+        system=system_prompt,
+        user=user_prompt,
+        system_sha256=system_sha256,
+        user_sha256=user_sha256,
+        sha256=_sha256((system_sha256 + user_sha256).encode('ascii')),
+        mtimes=tuple(mtimes),
+        directory=str(directory)
+    )
+
+
 class PromptLoader:
     """
     Handles loading prompts from filesystem.
-    Uses read-every-time approach for reliability in production.
+    All prompts are loaded once at construction and served from memory.
     """
-    
-    def __init__(self):
-        self.task_root = os.environ.get("LAMBDA_TASK_ROOT", os.getcwd())
-        logger.info(f"PromptLoader initialized with task_root: {self.task_root}")
-    
+
+    def __init__(self, task_root: str = None, hot_reload: bool = None):
+        self.task_root = task_root or os.environ.get("LAMBDA_TASK_ROOT", os.getcwd())
+        self.instructions_dir = Path(self.task_root) / "instructions"
+        self.hot_reload = PROMPT_HOT_RELOAD if hot_reload is None else hot_reload
+        self._prompts: Dict[str, PromptSet] = {}
+        self._lock = threading.Lock()
+        self._manifest = load_manifest(self.instructions_dir)
+        self.load_seconds = self.load_all()
+        self.bundle = self._build_bundle()
+        logger.info(f"PromptLoader initialized with task_root: {self.task_root} "
+                    f"({len(self._prompts)} prompt sets in {self.load_seconds * 1000:.1f} ms, "
+                    f"bundle {self.bundle.version} {self.bundle.sha256[:12]})")
+
+    def _directory(self, name: str) -> Path:
+        return self.instructions_dir if name == CLASSIFICATION_PROMPT else self.instructions_dir / name
+
+    def load_all(self) -> float:
+        """
+        Load and validate every prompt set under the instructions directory.
+        Invalid prompt sets are logged and skipped; looking them up raises the
+        same error later.
+
+        Returns:
+            float: Seconds spent loading
+        """
+        start = time.perf_counter()
+        if not self.instructions_dir.is_dir():
+            logger.info(f"No instructions directory at {self.instructions_dir}")
+            return 0.0
+
+        names = [CLASSIFICATION_PROMPT] if (self.instructions_dir / PROMPT_FILES[0]).exists() else []
+        names += sorted(d.name for d in self.instructions_dir.iterdir() if d.is_dir())
+        for name in names:
+            try:
+                prompt_set = load_prompt_set(name, self._directory(name))
+                self._prompts[name] = prompt_set
+                logger.debug(f"Prompts loaded for {name}: system={len(prompt_set.system)} chars, "
+                             f"user={len(prompt_set.user)} chars, sha256={prompt_set.sha256[:12]}")
+            except Exception as e:
+                logger.error(f"Invalid prompts for {name}: {e}")
+        return time.perf_counter() - start
+
+    def _build_bundle(self) -> PromptBundle:
+        file_hashes = {}
+        for name, prompt_set in self._prompts.items():
+            prefix = '' if name == CLASSIFICATION_PROMPT else f"{name}/"
+            file_hashes[f"{prefix}{PROMPT_FILES[0]}"] = prompt_set.system_sha256
+            file_hashes[f"{prefix}{PROMPT_FILES[1]}"] = prompt_set.user_sha256
+        return build_bundle(file_hashes, self._manifest)
+
+    def bundle_stamp(self, name: str) -> Dict[str, Any]:
+        """
+        'prompt_bundle' entry for a result produced with a prompt set.
+
+        Args:
+            name: 'classification' or a document category
+
+        Returns:
+            dict: Bundle version/hash plus the hash of the prompt set used
+        """
+        prompt_set = self._prompts.get(name)
+        return self.bundle.stamp(name, prompt_set.sha256 if prompt_set else None)
+
+    def _is_stale(self, prompt_set: PromptSet) -> bool:
+        directory = Path(prompt_set.directory)
+        try:
+            mtimes = tuple((directory / file_name).stat().st_mtime for file_name in PROMPT_FILES)
+        except OSError:
+            return True
+        return mtimes != prompt_set.mtimes
+
+    def get_prompt_set(self, name: str) -> PromptSet:
+        """
+        Get the prompt set of a task.
+
+        Args:
+            name: 'classification' or a document category
+
+        Returns:
+            PromptSet
+        """
+        prompt_set = self._prompts.get(name)
+        if prompt_set is not None and not (self.hot_reload and self._is_stale(prompt_set)):
+            return prompt_set
+
+        with self._lock:
+            prompt_set = load_prompt_set(name, self._directory(name))
+            previous = self._prompts.get(name)
+            if previous is not None and previous.sha256 != prompt_set.sha256:
+                logger.info(f"Reloaded prompts for {name}: {previous.sha256[:12]} -> {prompt_set.sha256[:12]}")
+            self._prompts[name] = prompt_set
+            if previous is None or previous.sha256 != prompt_set.sha256:
+                self.bundle = self._build_bundle()
+        return prompt_set
+
+    def prompt_hashes(self) -> Dict[str, str]:
+        """SHA-256 of every loaded prompt set, by name."""
+        return {name: prompt_set.sha256 for name, prompt_set in sorted(self._prompts.items())}
+
     def get_classification_prompts(self) -> Tuple[str, str]:
         """
         Get classification prompts (system, user).
-        Reads from filesystem each time for consistency.
-        
+
         Returns:
             tuple: (system_prompt, user_prompt)
         """
         try:
-            system_path = Path(self.task_root) / "instructions" / "system.txt"
-            user_path = Path(self.task_root) / "instructions" / "user.txt"
-            
-            if not system_path.exists():
-                raise FileNotFoundError(f"System prompt not found: {system_path}")
-            if not user_path.exists():
-                raise FileNotFoundError(f"User prompt not found: {user_path}")
-            
-            system_prompt = system_path.read_text(encoding='utf-8')
-            user_prompt = user_path.read_text(encoding='utf-8')
-            
-            logger.debug(f"Classification prompts loaded: system={len(system_prompt)} chars, user={len(user_prompt)} chars")
-            
-            return system_prompt, user_prompt
-            
+            return self.get_prompt_set(CLASSIFICATION_PROMPT).as_tuple()
+
         except Exception as e:
             logger.error(f"Error loading classification prompts: {e}")
             raise
-    
+
     def get_extraction_prompts(self, category: str) -> Tuple[str, str]:
         """
         Get extraction prompts for a specific category.
-        
+
         Args:
             category: Document category (CERL, CECRL, RUT, RUB, ACC)
-            
+
         Returns:
             tuple: (system_prompt, user_prompt)
         """
         try:
-            system_path = Path(self.task_root) / "instructions" / category / "system.txt"
-            user_path = Path(self.task_root) / "instructions" / category / "user.txt"
-            
-            if not system_path.exists():
-                raise FileNotFoundError(f"System prompt not found for {category}: {system_path}")
-            if not user_path.exists():
-                raise FileNotFoundError(f"User prompt not found for {category}: {user_path}")
-            
-            system_prompt = system_path.read_text(encoding='utf-8')
-            user_prompt = user_path.read_text(encoding='utf-8')
-            
-            logger.debug(f"Extraction prompts loaded for {category}: system={len(system_prompt)} chars, user={len(user_prompt)} chars")
-            
-            return system_prompt, user_prompt
-            
+            return self.get_prompt_set(category).as_tuple()
+
         except Exception as e:
             logger.error(f"Error loading extraction prompts for {category}: {e}")
             raise
-    
+
 # Global instance for Lambda usage
 prompt_loader = PromptLoader()
@@ -17,26 +17,92 @@ import re
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, List
-from .s3_handler import save_to_s3, extract_s3_path
+from .s3_handler import save_to_s3, save_json_chunks_to_s3, extract_s3_path
 from .text_utils import clean_text_for_json
+from .usage_ledger import is_successful, rollup
 
 logger = logging.getLogger(__name__)
 
+def _is_clean_text(text: str) -> bool:
+    """
+    Whether clean_text_for_json would return the string unchanged, without
+    cleaning it. Printable strings contain no control, format or whitespace
+    characters other than the space, so only space runs and edges remain to check.
+    """
+    return text.isprintable() and '  ' not in text and text[:1] != ' ' and text[-1:] != ' '
+
+
 def clean_dict_for_json(obj):
     """
-    Recursively clean all string values in a dictionary/list structure
-    to ensure JSON compatibility.
+    Clean all string values in a dictionary/list structure to ensure JSON
+    compatibility.
+
+    Iterative (no recursion limit on deep payloads) and copy-on-write: a dict or
+    list is only copied when one of its strings, or one of its nested
+    containers, actually changes. Unchanged containers are returned as is, so
+    the result may share objects with the input and must not be mutated in place.
+
+    Args:
+        obj: dict, list, str or any other JSON value
+
+    Returns:
+        Cleaned value
     """
-    if isinstance(obj, dict):
-        return {key: clean_dict_for_json(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [clean_dict_for_json(item) for item in obj]
-    elif isinstance(obj, str):
-        # Clean text for JSON compatibility
-        return clean_text_for_json(obj)
-    else:
+    if isinstance(obj, str):
+        return obj if _is_clean_text(obj) else clean_text_for_json(obj)
+    if not isinstance(obj, (dict, list)):
         return obj
 
+    # Frame: [container, (key, value) iterator, replaced values by key, key of the child being cleaned]
+    stack = [[obj, iter(obj.items()) if isinstance(obj, dict) else enumerate(obj), None, None]]
+    while True:
+        frame = stack[-1]
+        for key, value in frame[1]:
+            if isinstance(value, str):
+                if not _is_clean_text(value):
+                    cleaned = clean_text_for_json(value)
+                    if cleaned != value:
+                        if frame[2] is None:
+                            frame[2] = {}
+                        frame[2][key] = cleaned
+            elif isinstance(value, dict) and value:
+                frame[3] = key
+                stack.append([value, iter(value.items()), None, None])
+                break
+            elif isinstance(value, list) and value:
+                frame[3] = key
+                stack.append([value, enumerate(value), None, None])
+                break
+        else:
+            container, _, changes, _ = stack.pop()
+            if changes:
+                container = dict(container) if isinstance(container, dict) else list(container)
+                for key, value in changes.items():
+                    container[key] = value
+            if not stack:
+                return container
+            parent = stack[-1]
+            if changes:
+                if parent[2] is None:
+                    parent[2] = {}
+                parent[2][parent[3]] = container
+
+
+def iter_json_chunks(obj, indent: int = 2):
+    """
+    Clean a structure and encode it as JSON chunk by chunk, for
+    save_json_chunks_to_s3: the document is never held as a single string.
+
+    Args:
+        obj: Structure to save
+        indent: JSON indentation (as in save_to_s3)
+
+    Returns:
+        Iterator of JSON text chunks
+    """
+    encoder = json.JSONEncoder(indent=indent, ensure_ascii=False)
+    return encoder.iterencode(clean_dict_for_json(obj))
+
 class ReportGenerator:
     """
     Production report generator that saves results to S3.
@@ -186,6 +252,8 @@ class ReportGenerator:
                           batch_metadata: Dict[str, Any] = None) -> None:
         """
         Save batch processing summary to S3.
+        Bedrock tokens and cost of the results that carry 'usage' are rolled
+        up per model, phase and category under 'usage'.
         
         Args:
             batch_results: List of individual results from the batch
@@ -199,19 +267,19 @@ class ReportGenerator:
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
-            # Calculate batch statistics
+            # Calculate batch statistics (each handler flags success differently)
             total_documents = len(batch_results)
-            successful_documents = sum(1 for r in batch_results if r.get("success", False))
+            successful_documents = sum(1 for r in batch_results if is_successful(r))
             failed_documents = total_documents - successful_documents
             
             # Group by category
             by_category = {}
             for result in batch_results:
-                category = result.get("category", "UNKNOWN")
+                category = result.get("category") or (result.get("usage") or {}).get("category") or "UNKNOWN"
                 if category not in by_category:
                     by_category[category] = {"total": 0, "successful": 0, "failed": 0}
                 by_category[category]["total"] += 1
-                if result.get("success", False):
+                if is_successful(result):
                     by_category[category]["successful"] += 1
                 else:
                     by_category[category]["failed"] += 1
@@ -228,6 +296,7 @@ class ReportGenerator:
                     "processing_mode": batch_metadata.get('processing_mode', 'simplified_processing') if batch_metadata else 'simplified_processing'
                 },
                 "by_category": by_category,
+                "usage": rollup(batch_results),
                 "batch_metadata": batch_metadata or {},
                 "detailed_results": batch_results
             }
@@ -238,14 +307,11 @@ class ReportGenerator:
                 summary["batch_summary"]["manual_review_required"] = batch_metadata.get('manual_review_required', 0)
                 summary["batch_summary"]["successful_claude_extractions"] = batch_metadata.get('successful_claude_extractions', 0)
             
-            # Clean data before saving
-            cleaned_summary = clean_dict_for_json(summary)
-            
             # Build S3 key
             summary_key = f"{self.folder_prefix}/batch_summaries/{process_type}/batch_summary_{timestamp}.json"
             
-            # Save to S3
-            save_to_s3(cleaned_summary, self.destination_bucket, summary_key)
+            # Clean and stream to S3 (detailed_results embeds whole extraction payloads)
+            save_json_chunks_to_s3(iter_json_chunks(summary), self.destination_bucket, summary_key)
             
             logger.info(f"Batch summary saved: {summary_key}")
             logger.info(f"Batch stats: {successful_documents}/{total_documents} successful ({summary['batch_summary']['success_rate']:.1%})")
@@ -0,0 +1,284 @@
+"""
+Model response parsing utilities.
+
+Locates and decodes the JSON object in a model's text response in one linear
+pass: json.JSONDecoder.raw_decode reads the object starting at the first '{'
+(or the ```json fence) and stops at its closing brace, honouring strings and
+escapes. Only when that object is invalid or truncated does a structural scan
+look for decodable inner objects. All patterns are compiled once at import time.
+
+Parse paths (reported with every result):
+- fenced_json: object inside a ```json fence
+- raw_json: outermost object in the text
+- nested_json: first decodable inner object when the outermost one is invalid or truncated
+- for_review: model said there was no document to process
+- natural_language: fields recovered from prose with regexes
+- parse_failed: structured error response
+"""
+
+import json
+import logging
+import re
+from collections import namedtuple
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+ParseOutcome = namedtuple('ParseOutcome', ['data', 'path'])
+
+PATH_FENCED_JSON = 'fenced_json'
+PATH_RAW_JSON = 'raw_json'
+PATH_NESTED_JSON = 'nested_json'
+PATH_FOR_REVIEW = 'for_review'
+PATH_NATURAL_LANGUAGE = 'natural_language'
+PATH_PARSE_FAILED = 'parse_failed'
+
+PARSE_PATHS = (
+    PATH_FENCED_JSON, PATH_RAW_JSON, PATH_NESTED_JSON,
+    PATH_FOR_REVIEW, PATH_NATURAL_LANGUAGE, PATH_PARSE_FAILED
+)
+
+# Upper bound on json.loads attempts per response when the outermost object is invalid
+MAX_JSON_CANDIDATES = 20
+
+_DECODER = json.JSONDecoder()
+_FENCE_OPEN = re.compile(r"```json\s*(?=\{)")
+_STRUCTURAL = re.compile(r'[{}"\\]')
+
+_NIT_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r"NIT[:\s]*\.?(\d+[\.\-]\d+[\.\-]\d+)",
+    r"NIT[:\s]*(\d+[\.\-]\d+[\.\-]\d+)",
+    r"NIT[:\s]*(\d+)",
+    r"identificación[:\s]+(\d+[\.\-]\d+[\.\-]\d+)",
+    r"número[:\s]+(\d+[\.\-]\d+[\.\-]\d+)"
+)]
+
+_COMPANY_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r"sociedad\s+([^\n]+?)(?:\s+NIT|\s+de|\n)",
+    r"empresa\s+([^\n]+?)(?:\s+NIT|\s+de|\n)",
+    r"compañía\s+([^\n]+?)(?:\s+NIT|\s+de|\n)",
+    r"([A-Z][A-Z\s]+S\.A\.S?)",
+    r"([A-Z][A-Z\s]+LTDA)",
+    r"([A-Z][A-Z\s]+S\.A)"
+)]
+
+_SHAREHOLDER_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r"(\w+(?:\s+\w+)*)\s*\|\s*(\d+[\.\,\d]*)\s*\|\s*(\d+[\.\,\d]*)\s*\|\s*(\d+%?)",
+    r"(\w+(?:\s+\w+)*)\s+(\d+[\.\,\d]+)\s+(\d+[\.\,\d]+)\s+(\d+%?)",
+)]
+
+
+def find_json_spans(text: str, start: int = 0) -> List[Tuple[int, int]]:
+    """
+    Find every balanced {...} span in one pass over the text.
+
+    Double quotes and backslash escapes are honoured inside objects, so braces
+    within string values are ignored. Text before the first '{' is never
+    treated as a string.
+
+    Args:
+        text: Response text
+        start: Offset where scanning begins
+
+    Returns:
+        list: (start, end) spans, end exclusive, ordered by start offset
+              (an outer object always precedes the objects it contains)
+    """
+    spans: List[Tuple[int, int]] = []
+    stack: List[int] = []
+    in_string = False
+    skip_to = -1
+
+    for match in _STRUCTURAL.finditer(text, start):
+        pos = match.start()
+        if pos < skip_to:
+            continue
+        char = match.group()
+
+        if in_string:
+            if char == '\\':
+                skip_to = pos + 2
+            elif char == '"':
+                in_string = False
+        elif char == '{':
+            stack.append(pos)
+        elif not stack:
+            continue
+        elif char == '"':
+            in_string = True
+        elif char == '}':
+            spans.append((stack.pop(), pos + 1))
+
+    spans.sort()
+    return spans
+
+
+def extract_json_object(text: str) -> ParseOutcome:
+    """
+    Decode the JSON object embedded in a model response.
+
+    The object opening a ```json fence is preferred; otherwise the outermost
+    object in the text. When that object does not decode (e.g. truncated
+    output), inner objects are tried in order, up to MAX_JSON_CANDIDATES.
+
+    Returns:
+        ParseOutcome: (dict, path) or (None, None) if no object decodes
+    """
+    fence = _FENCE_OPEN.search(text)
+    scan_start = fence.end() if fence else text.find('{')
+    if scan_start == -1:
+        return ParseOutcome(None, None)
+
+    try:
+        data, _ = _DECODER.raw_decode(text, scan_start)
+        return ParseOutcome(data, PATH_FENCED_JSON if fence else PATH_RAW_JSON)
+    except ValueError as e:
+        logger.debug(f"Outermost JSON object at {scan_start} failed: {e}")
+
+    candidates = [span for span in find_json_spans(text, scan_start) if span[0] != scan_start]
+    for span_start, span_end in candidates[:MAX_JSON_CANDIDATES]:
+        try:
+            return ParseOutcome(json.loads(text[span_start:span_end]), PATH_NESTED_JSON)
+        except ValueError as e:
+            logger.debug(f"JSON candidate at {span_start} failed: {e}")
+
+    return ParseOutcome(None, None)
+
+
+def is_for_review_text(text: str) -> bool:
+    """Model stated there was no document to process."""
+    return "ForReview" in text or "no document" in text.lower() or "not see any PDF" in text
+
+
+def build_for_review_response() -> Dict[str, Any]:
+    return {
+        "result": {
+            "PrincipalCompanyName": "ForReview",
+            "DocumentCategory": "ForReview",
+            "TaxId": "ForReview",
+            "IdentificationType": "ForReview",
+            "Country": "ForReview",
+            "IdentificationDetails": {
+                "Source": "ForReview",
+                "Indicators": [],
+                "ConflictingSources": ["Model indicated no document provided"],
+                "RequiresReview": "true"
+            },
+            "RelatedParties": []
+        },
+        "DocumentType": "unknown",
+        "Category": "ForReview"
+    }
+
+
+def build_parse_failed_response(text: str) -> Dict[str, Any]:
+    return {
+        "result": {
+            "error_type": "parsing_failed",
+            "error_message": "Could not parse response as JSON or extract structured data",
+            "raw_response_snippet": text[:500],
+            "requires_manual_review": True
+        },
+        "DocumentType": "unknown",
+        "Category": "unknown"
+    }
+
+
+def parse_natural_language(text: str) -> Dict[str, Any]:
+    """
+    Extract structured data from a prose (non-JSON) model response.
+
+    Args:
+        text: Response text
+
+    Returns:
+        dict: Extraction-shaped result with missing fields set to 'ForReview'
+    """
+    result: Dict[str, Any] = {
+        "parsing_method": "natural_language_extraction",
+        "original_response": text[:1000]
+    }
+    extracted_data = {"result": result, "DocumentType": "company", "Category": "unknown"}
+
+    for pattern in _NIT_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            result["TaxId"] = match.group(1).strip()
+            break
+
+    for pattern in _COMPANY_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            company_name = match.group(1).strip()
+            if len(company_name) > 3:  # Evitar coincidencias muy cortas
+                result["PrincipalCompanyName"] = company_name
+                break
+
+    related_parties = []
+    for pattern in _SHAREHOLDER_PATTERNS:
+        for name, doc, shares, percentage in pattern.findall(text):
+            if len(name.strip()) > 2:
+                related_parties.append({
+                    "name": name.strip(),
+                    "identification": doc.strip(),
+                    "shares": shares.strip(),
+                    "percentage": percentage.strip()
+                })
+    if related_parties:
+        result["RelatedParties"] = related_parties
+
+    lowered = text.lower()
+    if "accionista" in lowered or "acciones" in lowered:
+        result["DocumentCategory"] = "Shareholder Information"
+        extracted_data["Category"] = "ACC"
+    elif "representante" in lowered or "legal" in lowered:
+        result["DocumentCategory"] = "Legal Representative"
+        extracted_data["Category"] = "CERL"
+
+    for field in ("PrincipalCompanyName", "TaxId", "DocumentCategory"):
+        result.setdefault(field, "ForReview")
+
+    result["extraction_confidence"] = "medium"
+    result["requires_verification"] = True
+
+    logger.info(f"Natural language extraction completed. Found: Company={result.get('PrincipalCompanyName', 'N/A')}, TaxId={result.get('TaxId', 'N/A')}, Parties={len(related_parties)}")
+    return extracted_data
+
+
+def parse_unstructured_text(text: str) -> ParseOutcome:
+    """
+    Build an extraction result from a response without a decodable JSON object:
+    ForReview detection, then natural-language extraction, then a structured error.
+
+    Args:
+        text: Response text
+
+    Returns:
+        ParseOutcome: (data, path) with path for_review, natural_language or parse_failed
+    """
+    if is_for_review_text(text):
+        return ParseOutcome(build_for_review_response(), PATH_FOR_REVIEW)
+
+    try:
+        return ParseOutcome(parse_natural_language(text), PATH_NATURAL_LANGUAGE)
+    except Exception as e:
+        logger.warning(f"Natural language parsing failed: {e}")
+
+    return ParseOutcome(build_parse_failed_response(text), PATH_PARSE_FAILED)
+
+
+def parse_extraction_text(text: str) -> ParseOutcome:
+    """
+    Parse an extraction response text, falling back from JSON to ForReview
+    detection, natural-language extraction and finally a structured error.
+
+    Args:
+        text: Response text
+
+    Returns:
+        ParseOutcome: (data, path) where path is one of PARSE_PATHS
+    """
+    outcome = extract_json_object(text)
+    if outcome.data is not None:
+        return outcome
+    return parse_unstructured_text(text)
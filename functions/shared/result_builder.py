@@ -185,7 +185,8 @@ def build_model_info(model_id: str, api_used: str, response_data: dict = None, f
         'api_used': api_used,
         'timestamp': datetime.now(timezone.utc).isoformat(),
         'usage': response_data.get('usage', {}) if response_data else {},
-        'stop_reason': response_data.get('stopReason') if response_data else None
+        'stop_reason': response_data.get('stopReason') if response_data else None,
+        'retry_info': response_data.get('retry_info', {}) if response_data else {}
     }
     
     if fallback_info:
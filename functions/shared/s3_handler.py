@@ -1,13 +1,19 @@
 import json
 import logging
 import os
+import tempfile
 import boto3
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterable, Tuple
+
+from .tracing import traced
+from .memory_profile import staged
 
 # Configure logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@traced('s3.put')
+@staged('s3.put')
 def save_to_s3(data: Dict[str, Any], bucket: str, key: str) -> None:
     """
     Save data to S3 as JSON.
@@ -33,6 +39,38 @@ def save_to_s3(data: Dict[str, Any], bucket: str, key: str) -> None:
         logger.error(f"Error saving to S3: {str(e)}")
         raise
 
+@traced('s3.put')
+@staged('s3.put')
+def save_json_chunks_to_s3(chunks: Iterable[str], bucket: str, key: str,
+                           spool_bytes: int = 8 * 1024 * 1024) -> int:
+    """
+    Save JSON produced in chunks (JSONEncoder.iterencode) to S3 without building
+    the whole document in memory: chunks are spooled to a temporary file, which
+    only moves to /tmp once it exceeds spool_bytes.
+
+    Args:
+        chunks: JSON text chunks
+        bucket: The S3 bucket name
+        key: The S3 key
+        spool_bytes: Size kept in memory before spilling to disk
+
+    Returns:
+        int: Size of the saved object in bytes
+    """
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=spool_bytes) as body:
+            for chunk in chunks:
+                body.write(chunk.encode('utf-8'))
+            size = body.tell()
+            body.seek(0)
+            s3_client = boto3.client('s3', region_name=os.environ.get("REGION", "us-east-2"))
+            s3_client.upload_fileobj(body, bucket, key, ExtraArgs={'ContentType': 'application/json'})
+        logger.info(f"Saved JSON to s3://{bucket}/{key} ({size} bytes)")
+        return size
+    except Exception as e:
+        logger.error(f"Error saving to S3: {str(e)}")
+        raise
+
 def extract_s3_path(s3_uri: str) -> Tuple[str, str]:
     """
     Extract bucket and key from an S3 URI.
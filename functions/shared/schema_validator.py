@@ -0,0 +1,300 @@
+"""
+Schema-driven validation of extraction outputs.
+
+Each extractable category has a JSON Schema in shared/schemas/{CATEGORY}.json
+describing the output contract of its prompt. Schemas are compiled once per
+container into a tree of field rules (precompiled patterns, alias lookups) and
+applied to parse_extraction_response output in a single pass that both
+validates and normalizes:
+
+- keys are matched case- and underscore-insensitively (plus 'x-aliases') and
+  renamed to the schema's canonical names
+- strings are stripped, numbers given for string fields are converted to strings
+- future dates with two transposed year digits (e.g. 2042 for 2024) are corrected
+- 'ForReview' placeholders are accepted for any field and reported
+
+Missing required fields and wrong types on required fields make a result
+invalid, so it can be routed to fallback before being persisted. Pattern, enum,
+format and optional-field type problems are reported as warnings.
+
+Supported schema keywords: type, properties, required, items, pattern, enum,
+format (date), $ref (to #/$defs/...) and the x-aliases extension.
+"""
+
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Data files shipped with this module (read by the lambda-wrapper bundle tracer)
+__bundle_data__ = ['schemas/*.json']
+
+SCHEMA_DIR = Path(os.environ.get('EXTRACTION_SCHEMA_DIR', Path(__file__).parent / 'schemas'))
+
+REVIEW_PLACEHOLDER = 'ForReview'
+MIN_DOCUMENT_YEAR = 1800
+
+_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+_JSON_TYPES = {
+    'string': (str,),
+    'number': (int, float),
+    'integer': (int,),
+    'boolean': (bool,),
+    'array': (list,),
+    'object': (dict,),
+    'null': (type(None),),
+}
+
+
+def _fold(key: str) -> str:
+    return key.replace('_', '').lower()
+
+
+def correct_future_date(date_str: str) -> Tuple[str, bool]:
+    """
+    Correct a future date caused by a common OCR error: two adjacent year
+    digits transposed (e.g. 2042 read for 2024). Document dates are never in
+    the future, so the first transposition giving a past year is used.
+
+    Args:
+        date_str: Date in YYYY-MM-DD format
+
+    Returns:
+        tuple: (date, was_corrected)
+    """
+    try:
+        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+    except ValueError:
+        return date_str, False
+
+    current_year = datetime.now().year
+    if date_obj.year <= current_year:
+        return date_str, False
+
+    digits = f"{date_obj.year:04d}"
+    for i in (2, 1, 0):
+        candidate = int(digits[:i] + digits[i + 1] + digits[i] + digits[i + 2:])
+        if MIN_DOCUMENT_YEAR <= candidate <= current_year:
+            try:
+                return date_obj.replace(year=candidate).strftime("%Y-%m-%d"), True
+            except ValueError:  # 29 February
+                continue
+    return date_str, False
+
+
+@dataclass
+class ValidationResult:
+    category: str
+    is_valid: bool
+    data: Dict[str, Any]
+    errors: List[Dict[str, str]] = field(default_factory=list)
+    warnings: List[Dict[str, str]] = field(default_factory=list)
+    corrections: List[Dict[str, str]] = field(default_factory=list)
+    review_fields: List[str] = field(default_factory=list)
+    schema_found: bool = True
+
+    def summary(self) -> Dict[str, Any]:
+        """Validation outcome without the normalized data (for metadata/logging)."""
+        return {
+            'category': self.category,
+            'is_valid': self.is_valid,
+            'schema_found': self.schema_found,
+            'errors': self.errors,
+            'warnings': self.warnings,
+            'corrections': self.corrections,
+            'review_fields': self.review_fields
+        }
+
+    def error_message(self) -> str:
+        return '; '.join(f"{issue['path']}: {issue['message']}" for issue in self.errors)
+
+
+class _FieldRule:
+    """Compiled form of one schema node."""
+
+    __slots__ = ('types', 'properties', 'lookup', 'required', 'items', 'pattern', 'enum', 'format')
+
+    def __init__(self, node: Dict[str, Any], defs: Dict[str, Any]):
+        if '$ref' in node:
+            node = defs[node['$ref'].rsplit('/', 1)[-1]]
+
+        node_type = node.get('type')
+        type_names = node_type if isinstance(node_type, list) else [node_type] if node_type else []
+        self.types = tuple(t for name in type_names for t in _JSON_TYPES[name])
+
+        self.properties: Dict[str, '_FieldRule'] = {}
+        self.lookup: Dict[str, str] = {}
+        for name, child in node.get('properties', {}).items():
+            self.properties[name] = _FieldRule(child, defs)
+            self.lookup[_fold(name)] = name
+            for alias in child.get('x-aliases', []):
+                self.lookup.setdefault(_fold(alias), name)
+        self.required = tuple(node.get('required', []))
+
+        self.items = _FieldRule(node['items'], defs) if 'items' in node else None
+        self.pattern = re.compile(node['pattern']) if 'pattern' in node else None
+        self.enum = frozenset(node['enum']) if 'enum' in node else None
+        self.format = node.get('format')
+
+
+class CompiledSchema:
+    """
+    A category schema compiled for repeated validation.
+    """
+
+    def __init__(self, category: str, schema: Dict[str, Any]):
+        self.category = category
+        self.title = schema.get('title', category)
+        self.root = _FieldRule(schema, schema.get('$defs', {}))
+
+    def validate(self, data: Dict[str, Any]) -> ValidationResult:
+        """
+        Validate and normalize one parsed extraction output.
+
+        Args:
+            data: Output of parse_extraction_response
+
+        Returns:
+            ValidationResult: Normalized copy of the data plus flagged fields
+        """
+        result = ValidationResult(category=self.category, is_valid=True, data={})
+        result.data = self._check(data, self.root, '$', True, result)
+        result.is_valid = not result.errors
+        return result
+
+    def _check(self, value: Any, rule: _FieldRule, path: str, required: bool,
+               result: ValidationResult) -> Any:
+        if value == REVIEW_PLACEHOLDER:
+            result.review_fields.append(path)
+            return value
+
+        mismatch = rule.types and (not isinstance(value, rule.types)
+                                   or isinstance(value, bool) and bool not in rule.types)
+        if mismatch:
+            if str in rule.types and isinstance(value, (int, float)) and not isinstance(value, bool):
+                value = str(value)
+            else:
+                issues = result.errors if required else result.warnings
+                expected = '/'.join(sorted({t.__name__ for t in rule.types}))
+                issues.append({'path': path, 'code': 'type',
+                               'message': f"expected {expected}, got {type(value).__name__}"})
+                return value
+
+        if isinstance(value, dict):
+            return self._check_object(value, rule, path, result)
+        if isinstance(value, list):
+            if rule.items is None:
+                return value
+            return [self._check(item, rule.items, f"{path}[{i}]", False, result)
+                    for i, item in enumerate(value)]
+        if isinstance(value, str):
+            return self._check_string(value.strip(), rule, path, result)
+        return value
+
+    def _check_object(self, value: Dict[str, Any], rule: _FieldRule, path: str,
+                      result: ValidationResult) -> Dict[str, Any]:
+        normalized = {}
+        for key, child_value in value.items():
+            name = rule.lookup.get(_fold(key), key)
+            if name in normalized:
+                # Two spellings of the same field: keep the first one
+                result.warnings.append({'path': f"{path}.{key}", 'code': 'duplicate',
+                                        'message': f"duplicates {name}"})
+                continue
+            child_rule = rule.properties.get(name)
+            normalized[name] = child_value if child_rule is None else self._check(
+                child_value, child_rule, f"{path}.{name}", name in rule.required, result
+            )
+
+        for name in rule.required:
+            if name not in normalized or normalized[name] in (None, ''):
+                result.errors.append({'path': f"{path}.{name}", 'code': 'required',
+                                      'message': 'missing required field'})
+        return normalized
+
+    def _check_string(self, value: str, rule: _FieldRule, path: str,
+                      result: ValidationResult) -> str:
+        if not value:
+            return value
+
+        if rule.enum is not None and value not in rule.enum:
+            result.warnings.append({'path': path, 'code': 'enum',
+                                    'message': f"'{value}' not in {sorted(rule.enum)}"})
+        if rule.pattern is not None and not rule.pattern.match(value):
+            result.warnings.append({'path': path, 'code': 'pattern',
+                                    'message': f"'{value}' does not match {rule.pattern.pattern}"})
+        if rule.format == 'date':
+            if not _DATE_PATTERN.match(value):
+                result.warnings.append({'path': path, 'code': 'format',
+                                        'message': f"'{value}' is not a YYYY-MM-DD date"})
+            else:
+                corrected, was_corrected = correct_future_date(value)
+                if was_corrected:
+                    result.corrections.append({'path': path, 'from': value, 'to': corrected})
+                    value = corrected
+        return value
+
+
+class SchemaRegistry:
+    """
+    Loads and compiles category schemas once per container.
+    """
+
+    def __init__(self, schema_dir: Path = None):
+        self.schema_dir = Path(schema_dir or SCHEMA_DIR)
+        self._compiled: Dict[str, Optional[CompiledSchema]] = {}
+
+    def get(self, category: str) -> Optional[CompiledSchema]:
+        """
+        Get the compiled schema of a category.
+
+        Returns:
+            CompiledSchema or None if the category has no schema
+        """
+        if category not in self._compiled:
+            schema_path = self.schema_dir / f"{category}.json"
+            compiled = None
+            try:
+                if schema_path.exists():
+                    compiled = CompiledSchema(category, json.loads(schema_path.read_text(encoding='utf-8')))
+                    logger.info(f"Compiled extraction schema for {category}: {compiled.title}")
+                else:
+                    logger.info(f"No extraction schema for category {category}")
+            except Exception as e:
+                logger.error(f"Failed to compile extraction schema {schema_path}: {e}")
+            self._compiled[category] = compiled
+        return self._compiled[category]
+
+    def validate(self, data: Dict[str, Any], category: str) -> ValidationResult:
+        """
+        Validate and normalize an extraction output against its category schema.
+        Categories without a schema pass through unchanged.
+
+        Args:
+            data: Output of parse_extraction_response
+            category: Document category (ACC, CECRL, CERL, RUB, RUT)
+
+        Returns:
+            ValidationResult
+        """
+        schema = self.get(category)
+        if schema is None:
+            return ValidationResult(category=category, is_valid=True, data=data, schema_found=False)
+
+        result = schema.validate(data)
+        if not result.is_valid:
+            logger.warning(f"{category} extraction failed schema validation: {result.error_message()}")
+        elif result.warnings or result.corrections:
+            logger.info(f"{category} extraction validated with {len(result.warnings)} warnings "
+                        f"and {len(result.corrections)} corrections")
+        return result
+
+# Global instance for Lambda usage
+schema_registry = SchemaRegistry()
@@ -1,6 +1,8 @@
 import json, logging, os, boto3
 from typing import Dict, Any
 
+from .tracing import traced
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger()
@@ -18,6 +20,7 @@ def build_payload(meta: Dict[str, Any]) -> dict:
         "category": meta.get("category", "UNKNOWN")
     }
 
+@traced('sqs.send')
 def send_to_extraction_queue(payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     Send a message to the extraction SQS queue.
@@ -46,6 +49,7 @@ def send_to_extraction_queue(payload: Dict[str, Any]) -> Dict[str, Any]:
         logger.error(f"Error sending message to SQS: {str(e)}")
         raise
 
+@traced('sqs.send')
 def send_to_fallback_queue_extraction(payload: Dict[str, Any]) -> None:
     """
     Send a message to the fallback SQS queue for extraction.
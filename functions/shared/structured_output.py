@@ -0,0 +1,174 @@
+"""
+Structured-output mode for Bedrock requests.
+
+With STRUCTURED_OUTPUT=true, classification and extraction requests send the
+expected JSON schema as a single tool and force the model to call it. The
+result is then read from the toolUse input block (parser_registry.parse_tool_use)
+instead of being located and repaired in free text.
+
+- Classification uses CLASSIFICATION_SCHEMA ({category, text}).
+- Extraction uses the category schema from shared/schemas (see schema_validator),
+  reduced to the keywords every Bedrock model accepts in a tool input schema.
+- Only model families with reliable forced tool use are switched; other models
+  keep the free-text path.
+- Anthropic models cannot combine forced tool choice with extended thinking,
+  so 'thinking' is dropped from their params in this mode.
+"""
+
+import json
+import logging
+import os
+from dataclasses import replace
+from typing import Any, Dict, Optional
+
+from .bedrock_client import BedrockRequest
+from .parser_registry import model_family
+from .schema_validator import SCHEMA_DIR
+
+logger = logging.getLogger(__name__)
+
+STRUCTURED_OUTPUT = os.environ.get("STRUCTURED_OUTPUT", "false").lower() == "true"
+
+CLASSIFICATION_TOOL = "record_classification"
+EXTRACTION_TOOL = "record_extraction"
+
+STRUCTURED_OUTPUT_FAMILIES = {'nova', 'anthropic', 'mistral'}
+
+CLASSIFICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "category": {
+            "type": "string",
+            "enum": ["CERL", "CECRL", "RUT", "RUB", "ACC", "BLANK", "LINK_ONLY", "BY_REVIEW"]
+        },
+        "text": {
+            "type": "string",
+            "description": "All text extracted from the document; empty for BLANK"
+        }
+    },
+    "required": ["category", "text"]
+}
+
+# Keywords kept in tool input schemas; the rest (pattern, format, $schema,
+# x-aliases, ...) is either unsupported by some models or only used by validation
+_TOOL_SCHEMA_KEYWORDS = {'type', 'properties', 'required', 'items', 'enum', 'description'}
+
+_tool_schema_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+
+
+def supports_structured_output(model_id: str) -> bool:
+    """Whether the model's family reliably honours a forced tool call."""
+    return model_family(model_id) in STRUCTURED_OUTPUT_FAMILIES
+
+
+def to_tool_schema(node: Dict[str, Any], defs: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Reduce a JSON Schema to a tool input schema: resolve $ref, keep the first of
+    several types, turn 'format: date' into a description and drop other keywords.
+    """
+    defs = node.get('$defs', {}) if defs is None else defs
+    if '$ref' in node:
+        node = defs[node['$ref'].rsplit('/', 1)[-1]]
+
+    tool_schema: Dict[str, Any] = {}
+    for key, value in node.items():
+        if key not in _TOOL_SCHEMA_KEYWORDS:
+            continue
+        if key == 'type' and isinstance(value, list):
+            value = value[0]
+        elif key == 'properties':
+            value = {name: to_tool_schema(child, defs) for name, child in value.items()}
+        elif key == 'items':
+            value = to_tool_schema(value, defs)
+        tool_schema[key] = value
+
+    if node.get('format') == 'date' and 'description' not in tool_schema:
+        tool_schema['description'] = 'Date in YYYY-MM-DD format'
+    return tool_schema
+
+
+def build_tool_config(tool_name: str, description: str, schema: Dict[str, Any],
+                      model_id: str) -> Dict[str, Any]:
+    """
+    Build a Converse toolConfig with one tool the model is forced to call.
+
+    Args:
+        tool_name: Tool name
+        description: Tool description shown to the model
+        schema: Tool input schema
+        model_id: Target model (Mistral only accepts toolChoice 'any')
+
+    Returns:
+        dict: Converse toolConfig
+    """
+    tool_choice = {"any": {}} if model_family(model_id) == 'mistral' else {"tool": {"name": tool_name}}
+    return {
+        "tools": [{
+            "toolSpec": {
+                "name": tool_name,
+                "description": description,
+                "inputSchema": {"json": schema}
+            }
+        }],
+        "toolChoice": tool_choice
+    }
+
+
+def classification_tool_config(model_id: str) -> Dict[str, Any]:
+    return build_tool_config(
+        CLASSIFICATION_TOOL,
+        "Record the document category and all of its extracted text.",
+        CLASSIFICATION_SCHEMA, model_id
+    )
+
+
+def extraction_tool_config(category: str, model_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Build the extraction toolConfig for a category.
+
+    Returns:
+        dict or None if the category has no schema
+    """
+    if category not in _tool_schema_cache:
+        schema_path = SCHEMA_DIR / f"{category}.json"
+        try:
+            _tool_schema_cache[category] = (
+                to_tool_schema(json.loads(schema_path.read_text(encoding='utf-8')))
+                if schema_path.exists() else None
+            )
+        except Exception as e:
+            logger.error(f"Failed to build tool schema for {category}: {e}")
+            _tool_schema_cache[category] = None
+
+    schema = _tool_schema_cache[category]
+    if schema is None:
+        return None
+    return build_tool_config(
+        EXTRACTION_TOOL,
+        f"Record the data extracted from the {category} document, following the output schema.",
+        schema, model_id
+    )
+
+
+def apply_structured_output(request: BedrockRequest, tool_config: Optional[Dict[str, Any]]) -> BedrockRequest:
+    """
+    Switch a request to structured output when enabled and supported by its model.
+
+    Args:
+        request: Request built for the free-text path
+        tool_config: Tool configuration (None keeps the free-text path)
+
+    Returns:
+        BedrockRequest: Request with toolConfig set, or the original request
+    """
+    if not STRUCTURED_OUTPUT or tool_config is None or not supports_structured_output(request.model_id):
+        return request
+
+    params = request.params
+    if model_family(request.model_id) == 'anthropic' and 'thinking' in params:
+        params = {key: value for key, value in params.items() if key != 'thinking'}
+        # top_p=1 is the default; some Claude models reject temperature and top_p together
+        params.pop('top_p', None)
+
+    logger.info(f"Structured output enabled for {request.model_id}")
+    return replace(request, params=params, toolConfig=tool_config)
@@ -0,0 +1,213 @@
+"""
+Persistent cache for PDF text extraction results.
+
+PyPDF and Textract output depends only on the PDF content and the extractor,
+so it is cached by SHA-256 of the PDF bytes plus extractor name and version.
+Two tiers are used:
+- local disk under /tmp, which survives between invocations of a warm Lambda container;
+  capped at TEXT_CACHE_LOCAL_MAX_MB (least recently used entries are evicted first)
+- S3 under {FOLDER_PREFIX}/text_cache/, shared by all Lambdas and the notebook-test harness
+
+Bumping an extractor version (see pdf_processor) invalidates its cached entries.
+Cache failures never break processing: they are logged and treated as misses.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+
+# The local tier is evicted down to this fraction of its cap, so eviction does not run on every write
+LOCAL_EVICTION_TARGET = 0.8
+
+
+def document_hash(pdf_bytes: bytes) -> str:
+    """SHA-256 hex digest of the PDF content."""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def is_cacheable_text(text: Optional[str]) -> bool:
+    """Only successful extractions are cached; errors may be transient."""
+    return bool(text) and not text.startswith("[ERROR")
+
+
+class TextExtractionCache:
+    """
+    Two-tier (local disk + S3) cache of extracted PDF text.
+
+    Args:
+        bucket: S3 bucket of the shared tier (default: TEXT_CACHE_BUCKET, then DESTINATION_BUCKET;
+                without one only the local tier is used)
+        prefix: S3 key prefix (default: TEXT_CACHE_PREFIX or {FOLDER_PREFIX}/text_cache)
+        local_dir: Local tier directory (default: TEXT_CACHE_LOCAL_DIR or /tmp/text_cache)
+        s3_client: S3 client (default: created on first use)
+        enabled: Use the cache (default: TEXT_CACHE_ENABLED, true)
+        local_max_mb: Size cap of the local tier (default: TEXT_CACHE_LOCAL_MAX_MB, 100)
+    """
+
+    def __init__(self, bucket: str = None, prefix: str = None, local_dir: str = None,
+                 s3_client=None, enabled: bool = None, local_max_mb: float = None):
+        self.bucket = bucket or os.environ.get("TEXT_CACHE_BUCKET") or os.environ.get("DESTINATION_BUCKET")
+        folder_prefix = os.environ.get("FOLDER_PREFIX", "par-servicios-poc")
+        self.prefix = (prefix or os.environ.get("TEXT_CACHE_PREFIX") or f"{folder_prefix}/text_cache").rstrip('/')
+        self.local_dir = Path(local_dir or os.environ.get("TEXT_CACHE_LOCAL_DIR", "/tmp/text_cache"))
+        if enabled is None:
+            enabled = os.environ.get("TEXT_CACHE_ENABLED", "true").lower() == "true"
+        self.enabled = enabled
+        if local_max_mb is None:
+            local_max_mb = float(os.environ.get("TEXT_CACHE_LOCAL_MAX_MB", "100"))
+        self.local_max_bytes = int(local_max_mb * _MB)
+        self._local_bytes = None  # size of the local tier, scanned on the first write
+        self._local_lock = threading.Lock()
+        self._s3_client = s3_client
+
+    @property
+    def s3_client(self):
+        if self._s3_client is None:
+            from .aws_clients import create_s3_client
+            self._s3_client = create_s3_client()
+        return self._s3_client
+
+    def build_key(self, doc_hash: str, extractor: str, version: str) -> str:
+        """Relative cache key: {extractor}/{version}/{hash[:2]}/{hash}.json"""
+        return f"{extractor}/{version}/{doc_hash[:2]}/{doc_hash}.json"
+
+    def get(self, doc_hash: str, extractor: str, version: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look up a cached text.
+
+        Returns:
+            tuple: (text, tier) where tier is 'local' or 's3'; (None, None) on miss
+        """
+        if not self.enabled:
+            return None, None
+
+        key = self.build_key(doc_hash, extractor, version)
+
+        local_path = self.local_dir / key
+        try:
+            if local_path.exists():
+                entry = json.loads(local_path.read_text(encoding='utf-8'))
+                # Mark the entry as recently used for eviction
+                os.utime(local_path)
+                return entry['text'], 'local'
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable local text cache entry {local_path}: {e}")
+
+        if not self.bucket:
+            return None, None
+
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=f"{self.prefix}/{key}")
+            entry = json.loads(response['Body'].read())
+        except Exception as e:
+            error_code = getattr(e, 'response', {}).get('Error', {}).get('Code', '')
+            if error_code not in ('NoSuchKey', '404'):
+                logger.warning(f"Text cache S3 lookup failed for {key}: {e}")
+            return None, None
+
+        self._write_local(key, entry)
+        return entry['text'], 's3'
+
+    def put(self, doc_hash: str, extractor: str, version: str, text: str) -> None:
+        """Store a text in both tiers (errors are logged, never raised)."""
+        if not self.enabled or not is_cacheable_text(text):
+            return
+
+        key = self.build_key(doc_hash, extractor, version)
+        entry = {
+            'text': text,
+            'extractor': extractor,
+            'extractor_version': version,
+            'document_sha256': doc_hash,
+            'char_count': len(text),
+            'created_at': datetime.now(timezone.utc).isoformat()
+        }
+
+        self._write_local(key, entry)
+
+        if not self.bucket:
+            return
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket,
+                Key=f"{self.prefix}/{key}",
+                Body=json.dumps(entry, ensure_ascii=False).encode('utf-8'),
+                ContentType='application/json'
+            )
+            logger.info(f"Cached {extractor} text in s3://{self.bucket}/{self.prefix}/{key}")
+        except Exception as e:
+            logger.warning(f"Failed to store text cache entry {key} in S3: {e}")
+
+    def get_or_extract(self, doc_hash: str, extractor: str, version: str,
+                       extract_fn: Callable[[], str]) -> Tuple[str, Optional[str]]:
+        """
+        Return the cached text or run the extractor and cache its output.
+
+        Args:
+            doc_hash: document_hash() of the PDF
+            extractor: Extractor name ('pypdf', 'textract')
+            version: Extractor version string
+            extract_fn: Callable performing the extraction on a miss
+
+        Returns:
+            tuple: (text, tier) where tier is 'local', 's3' or None if freshly extracted
+        """
+        text, tier = self.get(doc_hash, extractor, version)
+        if text is not None:
+            logger.info(f"Text cache hit ({tier}) for {extractor} {doc_hash[:12]}: {len(text)} characters")
+            return text, tier
+
+        text = extract_fn()
+        self.put(doc_hash, extractor, version, text)
+        return text, None
+
+    def _write_local(self, key: str, entry: dict) -> None:
+        local_path = self.local_dir / key
+        try:
+            data = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+            with self._local_lock:
+                if self._local_bytes is None:
+                    self._local_bytes = sum(p.stat().st_size for p in self._local_entries())
+                replaced = local_path.stat().st_size if local_path.exists() else 0
+                local_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = local_path.with_suffix('.tmp')
+                tmp_path.write_bytes(data)
+                tmp_path.replace(local_path)
+                self._local_bytes += len(data) - replaced
+                if self._local_bytes > self.local_max_bytes:
+                    self._evict_local()
+        except Exception as e:
+            logger.warning(f"Failed to write local text cache entry {local_path}: {e}")
+
+    def _local_entries(self):
+        return [p for p in self.local_dir.rglob('*.json') if p.is_file()] if self.local_dir.exists() else []
+
+    def _evict_local(self) -> None:
+        """Delete the least recently used local entries until the tier is under its target size."""
+        target = self.local_max_bytes * LOCAL_EVICTION_TARGET
+        entries = sorted(((p.stat().st_mtime, p.stat().st_size, p) for p in self._local_entries()),
+                         key=lambda entry: entry[0])
+        total, evicted = sum(size for _, size, _ in entries), 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+                evicted += 1
+            except OSError as e:
+                logger.warning(f"Failed to evict local text cache entry {path}: {e}")
+        self._local_bytes = total
+        logger.info(f"Evicted {evicted} local text cache entries ({total / _MB:.1f} MB left)")
+
+# Global instance for Lambda usage
+text_cache = TextExtractionCache()
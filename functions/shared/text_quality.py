@@ -0,0 +1,142 @@
+"""
+Text quality scoring for extracted PDF text.
+
+Cheap heuristics that decide whether a PyPDF or Textract text is worth an
+expensive fallback model call. Scanned PDFs often yield empty text, a few
+characters, or runs of garbage glyphs from broken font encodings; those are
+rejected before they reach the model.
+"""
+
+import os
+import re
+import string
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional
+
+# Minimum combined score for a text to be sent to the model
+MIN_QUALITY_SCORE = float(os.environ.get('TEXT_QUALITY_MIN_SCORE', '0.5'))
+# Hard floors, independent of the combined score
+MIN_TEXT_CHARS = int(os.environ.get('TEXT_QUALITY_MIN_CHARS', '50'))
+MIN_PRINTABLE_RATIO = 0.85
+
+_PAGE_HEADER = re.compile(r'--- PÁGINA \d+ ---')
+_WORD = re.compile(r'[^\W\d_]+')
+
+_READABLE_CHARS = frozenset(
+    string.ascii_letters + string.digits + string.punctuation
+    + "áéíóúÁÉÍÓÚñÑüÜàèìòùÀÈÌÒÙçÇ¿¡°ºª€$«»“”‘’–—•·§"
+)
+
+# Frequent Spanish words plus vocabulary of the supported document categories
+_SPANISH_WORDS = frozenset("""
+a al algo ante año años antes así aun bajo bien cada como con contra cual cuando de del desde
+donde dos durante e el ella ellos en entre era es esa ese eso esta este esto estos fecha fue
+ha han hasta hay la las le les lo los más mas me mi mismo muy ni no nos o otra otro para pero
+por porque que qué se según ser si sí sin sino sobre su sus también tiene todo todos tres
+tu un una uno unos y ya
+acciones accionista accionistas acta actividad administración artículo asamblea bogotá
+calle cámara capital cargo cédula certificado certificación certifica ciudad código colombia
+comercio composición constitución contador control cuota cuotas departamento dirección
+documento domicilio económica empresa entidad escritura expedición expedida fiscal folio
+gerente general identificación inscripción inscrito junta legal libro limitada ltda
+matrícula municipio nacional natural nit nombre número objeto página participación
+persona principal razón registro renovación representación representante responsabilidad
+revisor rut s.a s.a.s sas social socios sociedad suplente tributario tributaria único
+valor vigencia
+""".split())
+
+
+@dataclass
+class TextQualityScore:
+    score: float
+    is_usable: bool
+    reason: str
+    char_count: int
+    page_count: int
+    chars_per_page: float
+    printable_ratio: float
+    word_ratio: float
+    digit_density: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _unusable(reason: str, char_count: int = 0) -> TextQualityScore:
+    return TextQualityScore(
+        score=0.0, is_usable=False, reason=reason, char_count=char_count, page_count=0,
+        chars_per_page=0.0, printable_ratio=0.0, word_ratio=0.0, digit_density=0.0
+    )
+
+
+def score_text_quality(text: Optional[str], page_count: Optional[int] = None,
+                       min_score: Optional[float] = None) -> TextQualityScore:
+    """
+    Score an extracted text and decide whether it is worth a model call.
+
+    Combined score (0-1):
+        40% printable ratio (readable Latin/Spanish characters over non-space characters)
+        30% Spanish dictionary-word ratio (saturates at 25% of words)
+        20% characters per page (saturates at 200)
+        10% digit density penalty (above 50% digits)
+
+    Args:
+        text: Text from PyPDF or Textract (with '--- PÁGINA n ---' headers)
+        page_count: Number of pages; derived from page headers when omitted
+        min_score: Threshold override (defaults to TEXT_QUALITY_MIN_SCORE)
+
+    Returns:
+        TextQualityScore: Metrics, combined score and usability decision
+    """
+    if not text:
+        return _unusable('empty_text')
+    if text.startswith('[ERROR') or text.startswith('[NO CONTENT'):
+        return _unusable('extraction_error', len(text))
+
+    if page_count is None:
+        page_count = len(_PAGE_HEADER.findall(text))
+    body = _PAGE_HEADER.sub(' ', text)
+    page_count = max(page_count, 1)
+
+    compact = ''.join(body.split())
+    char_count = len(compact)
+    if char_count == 0:
+        return _unusable('empty_text')
+
+    readable = sum(1 for ch in compact if ch in _READABLE_CHARS)
+    digits = sum(1 for ch in compact if ch.isdigit())
+    printable_ratio = readable / char_count
+    digit_density = digits / char_count
+
+    words = _WORD.findall(body.lower())
+    word_ratio = sum(1 for w in words if w in _SPANISH_WORDS) / len(words) if words else 0.0
+    chars_per_page = char_count / page_count
+
+    score = (
+        0.4 * printable_ratio
+        + 0.3 * min(1.0, word_ratio / 0.25)
+        + 0.2 * min(1.0, chars_per_page / 200)
+        + 0.1 * (1.0 if digit_density <= 0.5 else max(0.0, 1.0 - (digit_density - 0.5) * 2))
+    )
+    threshold = MIN_QUALITY_SCORE if min_score is None else min_score
+
+    if char_count < MIN_TEXT_CHARS:
+        is_usable, reason = False, 'too_short'
+    elif printable_ratio < MIN_PRINTABLE_RATIO:
+        is_usable, reason = False, 'garbage_characters'
+    elif score < threshold:
+        is_usable, reason = False, 'low_score'
+    else:
+        is_usable, reason = True, 'ok'
+
+    return TextQualityScore(
+        score=round(score, 4),
+        is_usable=is_usable,
+        reason=reason,
+        char_count=char_count,
+        page_count=page_count,
+        chars_per_page=round(chars_per_page, 1),
+        printable_ratio=round(printable_ratio, 4),
+        word_ratio=round(word_ratio, 4),
+        digit_density=round(digit_density, 4)
+    )
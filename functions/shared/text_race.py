@@ -0,0 +1,65 @@
+"""
+Speculative text extraction utilities for the fallback Lambda.
+
+Runs several text extractors (PyPDF, Textract) concurrently and yields their
+output in completion order, so the caller can send the first usable text to
+the model while slower extractors are still running. Extractors that are no
+longer needed are signalled to stop through a shared threading.Event.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def race_text_sources(extractors: Dict[str, Callable[[], str]],
+                      text_gate: Callable[[str, str], bool],
+                      cancel_event: Optional[threading.Event] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Run text extractors concurrently and yield usable texts as they finish.
+
+    Texts rejected by text_gate and extractors that raise are logged and skipped.
+    When the caller stops iterating (e.g. after a successful model call), the
+    cancel_event is set so long-running extractors such as Textract polling can
+    stop early; their results are ignored.
+
+    Args:
+        extractors: Mapping of source name ('pypdf', 'textract') to a callable returning text
+        text_gate: Predicate (source_name, text) deciding whether a text is worth a model call
+        cancel_event: Event shared with the extractors to request cancellation
+
+    Yields:
+        tuple: (source_name, text) for each text that passes the gate
+    """
+    cancel_event = cancel_event or threading.Event()
+    executor = ThreadPoolExecutor(max_workers=len(extractors), thread_name_prefix="text-race")
+    futures = {executor.submit(extractor): source for source, extractor in extractors.items()}
+    pending = set(futures)
+
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                source = futures[future]
+                try:
+                    text = future.result()
+                except Exception as e:
+                    logger.error(f"Speculative {source} extraction failed: {e}")
+                    continue
+
+                if not text_gate(source, text):
+                    logger.warning(f"Speculative {source} text rejected by quality gate")
+                    continue
+
+                logger.info(f"Speculative {source} text ready: {len(text)} characters")
+                yield source, text
+    finally:
+        if pending:
+            logger.info(f"Cancelling speculative extractors: {[futures[f] for f in pending]}")
+        cancel_event.set()
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
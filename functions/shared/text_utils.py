@@ -1,24 +1,112 @@
+import logging
+import re
+import sys
+import unicodedata
+from typing import Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Code points of category Cc (control) and Cf (format), by Unicode database version.
+# Generated with: [c for c in range(sys.maxunicode + 1) if unicodedata.category(chr(c)) in ('Cc', 'Cf')]
+_CONTROL_FORMAT_RANGES_15 = (
+    (0x0000, 0x001F), (0x007F, 0x009F), (0x00AD, 0x00AD), (0x0600, 0x0605), (0x061C, 0x061C),
+    (0x06DD, 0x06DD), (0x070F, 0x070F), (0x0890, 0x0891), (0x08E2, 0x08E2), (0x180E, 0x180E),
+    (0x200B, 0x200F), (0x202A, 0x202E), (0x2060, 0x2064), (0x2066, 0x206F), (0xFEFF, 0xFEFF),
+    (0xFFF9, 0xFFFB), (0x110BD, 0x110BD), (0x110CD, 0x110CD), (0x13430, 0x1343F), (0x1BCA0, 0x1BCA3),
+    (0x1D173, 0x1D17A), (0xE0001, 0xE0001), (0xE0020, 0xE007F),
+)
+CONTROL_FORMAT_RANGES = {
+    '14.0.0': tuple((start, 0x13438 if start == 0x13430 else end) for start, end in _CONTROL_FORMAT_RANGES_15),
+    '15.0.0': _CONTROL_FORMAT_RANGES_15,
+    '15.1.0': _CONTROL_FORMAT_RANGES_15,
+}
+
+# Control characters kept by clean_text_for_json: whitespace, collapsed to a single space
+_KEPT_CONTROLS = '\t\n\r\x0b\x0c\x85'
+
+_removed_pattern = None
+_ASCII_REMOVED = bytes(c for c in range(0x80) if unicodedata.category(chr(c)) == 'Cc' and chr(c) not in _KEPT_CONTROLS)
+
+
+def _scan_control_format_ranges():
+    """Cc/Cf ranges of the running Unicode database (slow: ~0.25 s, only for unknown versions)."""
+    ranges = []
+    for code in range(sys.maxunicode + 1):
+        if unicodedata.category(chr(code)) in ('Cc', 'Cf'):
+            if ranges and ranges[-1][1] == code - 1:
+                ranges[-1][1] = code
+            else:
+                ranges.append([code, code])
+    return tuple((start, end) for start, end in ranges)
+
+
+def _removed_characters():
+    """Compiled character class of the control and format characters removed from text."""
+    global _removed_pattern
+    if _removed_pattern is None:
+        ranges = CONTROL_FORMAT_RANGES.get(unicodedata.unidata_version)
+        if ranges is None:
+            logger.info(f"No control character table for Unicode {unicodedata.unidata_version}, scanning")
+            ranges = _scan_control_format_ranges()
+        parts = []
+        for start, end in ranges:
+            # Split the range around the kept whitespace controls
+            bounds = [start] + sorted(ord(c) for c in _KEPT_CONTROLS if start <= ord(c) <= end) + [end + 1]
+            for low, high in zip(bounds, bounds[1:]):
+                low = low + 1 if chr(low) in _KEPT_CONTROLS else low
+                if low < high:
+                    parts.append(f"{re.escape(chr(low))}-{re.escape(chr(high - 1))}")
+        _removed_pattern = re.compile(f"[{''.join(parts)}]")
+    return _removed_pattern
+
+
+def _remove_controls(text):
+    """Remove control/format characters except whitespace controls."""
+    if text.isascii():
+        return text.encode('ascii').translate(None, _ASCII_REMOVED).decode('ascii')
+    return _removed_characters().sub('', text)
+
+
 def clean_text_for_json(text):
     """
     Clean text to remove unusual line terminators and other problematic characters
     that can break JSON parsing and file handling.
+
+    Control (Cc) and format (Cf) characters are removed, except tab, newlines,
+    vertical tab, form feed and NEL, which are whitespace like the Unicode line
+    and paragraph separators: every whitespace run becomes a single space.
     """
     if not isinstance(text, str):
         return text
-    
-    import unicodedata
-    
-    # Remove unusual line terminators
-    text = text.replace('\u2028', ' ')  # Line Separator (LS)
-    text = text.replace('\u2029', ' ')  # Paragraph Separator (PS)
-    text = text.replace('\u000B', ' ')  # Vertical Tab
-    text = text.replace('\u000C', ' ')  # Form Feed
-    text = text.replace('\u0085', ' ')  # Next Line (NEL)
-    
-    # Remove other control characters that can cause issues
-    text = ''.join(char for char in text if unicodedata.category(char) not in ['Cc', 'Cf'] or char in ['\n', '\r', '\t'])
-    
-    # Normalize whitespace
-    text = ' '.join(text.split())
-    
-    return text
\ No newline at end of file
+
+    return ' '.join(_remove_controls(text).split())
+
+
+def iter_clean_text(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Streaming clean_text_for_json: cleans text arriving in chunks (pages, file
+    reads) without joining it first. ''.join(iter_clean_text(chunks)) equals
+    clean_text_for_json(''.join(chunks)); words split across chunks are kept whole.
+
+    Args:
+        chunks: Text chunks in order
+
+    Yields:
+        str: Cleaned text pieces
+    """
+    carry = ''
+    emitted = False
+    for chunk in chunks:
+        if not chunk:
+            continue
+        text = carry + _remove_controls(chunk)
+        words = text.split()
+        carry = ''
+        if words and not text[-1].isspace():
+            # The last word may continue in the next chunk
+            carry = words.pop()
+        if words:
+            yield (' ' if emitted else '') + ' '.join(words)
+            emitted = True
+    if carry:
+        yield (' ' if emitted else '') + carry
@@ -0,0 +1,117 @@
+"""
+Textract block aggregation utilities.
+
+Textract paginates GetDocumentTextDetection results with NextToken, and those
+result pages do not line up with PDF pages: the lines of one PDF page can be
+split across several responses. This module buffers LINE blocks per PDF page
+as responses arrive and renders the final text once, in reading order.
+"""
+
+import logging
+from typing import Dict, Any, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+PAGE_HEADER_TEMPLATE = "--- PÁGINA {} ---"
+
+# Lines whose top edges differ by less than this fraction of the line height
+# are treated as belonging to the same visual row.
+ROW_TOLERANCE_RATIO = 0.5
+
+# (top, left, height, arrival_order, text)
+_LineEntry = Tuple[float, float, float, int, str]
+
+
+def _line_geometry(block: Dict[str, Any]) -> Tuple[float, float, float]:
+    """
+    Get (top, left, height) from a block's BoundingBox.
+    Blocks without geometry sort after positioned lines, in arrival order.
+    """
+    box = (block.get('Geometry') or {}).get('BoundingBox') or {}
+    if 'Top' not in box:
+        return float('inf'), 0.0, 0.0
+    return float(box['Top']), float(box.get('Left', 0.0)), float(box.get('Height', 0.0))
+
+
+class TextractTextAggregator:
+    """
+    Streaming aggregator for Textract LINE blocks.
+
+    Usage:
+        aggregator = TextractTextAggregator()
+        for response in responses:
+            aggregator.add_blocks(response.get('Blocks', []))
+        text = aggregator.render()
+    """
+
+    def __init__(self):
+        self._pages: Dict[int, List[_LineEntry]] = {}
+        self._arrival = 0
+
+    @property
+    def page_count(self) -> int:
+        return len(self._pages)
+
+    @property
+    def line_count(self) -> int:
+        return self._arrival
+
+    def add_blocks(self, blocks: Iterable[Dict[str, Any]]) -> int:
+        """
+        Buffer the non-empty LINE blocks of one Textract response.
+
+        Args:
+            blocks: 'Blocks' list from a GetDocumentTextDetection response
+
+        Returns:
+            int: Number of lines added
+        """
+        added = 0
+        for block in blocks:
+            if block.get('BlockType') != 'LINE':
+                continue
+            line_text = block.get('Text', '').strip()
+            if not line_text:
+                continue
+
+            top, left, height = _line_geometry(block)
+            self._pages.setdefault(block.get('Page', 1), []).append(
+                (top, left, height, self._arrival, line_text)
+            )
+            self._arrival += 1
+            added += 1
+        return added
+
+    def page_lines(self, page_num: int) -> List[str]:
+        """
+        Get the lines of a page in reading order (top-to-bottom, then left-to-right
+        within a visual row).
+        """
+        entries = sorted(self._pages.get(page_num, []), key=lambda e: (e[0], e[3]))
+
+        ordered: List[str] = []
+        row: List[_LineEntry] = []
+        row_limit = 0.0
+        for entry in entries:
+            top, _, height, _, _ = entry
+            if row and top <= row_limit and top != float('inf'):
+                row.append(entry)
+                continue
+            ordered.extend(e[4] for e in sorted(row, key=lambda e: (e[1], e[3])))
+            row = [entry]
+            row_limit = top + height * ROW_TOLERANCE_RATIO
+        ordered.extend(e[4] for e in sorted(row, key=lambda e: (e[1], e[3])))
+        return ordered
+
+    def render(self) -> str:
+        """
+        Build the final text: one header per page followed by its lines.
+
+        Returns:
+            str: Aggregated text, or "" if no lines were collected
+        """
+        parts: List[str] = []
+        for page_num in sorted(self._pages):
+            parts.append(PAGE_HEADER_TEMPLATE.format(page_num))
+            parts.extend(self.page_lines(page_num))
+        return '\n'.join(parts)
@@ -0,0 +1,244 @@
+"""
+Per-document timing spans.
+
+Each handler starts one trace per document (classification, extraction,
+fallback). The trace becomes the current trace of the calling context, so
+code below it - shared modules included - opens nested spans with span() or
+@traced without the trace being passed around:
+
+    with tracer.start('extraction', category=category) as trace:
+        with span('request.build'):
+            ...
+        call_bedrock_unified(request, client)   # spans 'bedrock' > 'bedrock.call'
+    result['timings'] = trace.to_dict()
+
+A finished trace is a tree of spans (start offset and duration in ms, errors,
+attributes) plus the total time per span name. It is returned in the result
+metadata and logged as one JSON line.
+
+Spans opened without a current trace are no-ops, as are all spans when
+TRACING_ENABLED=false: span() then costs one context variable lookup and
+returns a shared no-op object. Threads started by a handler (Textract racing
+PyPDF) do not inherit the trace, so their work is not recorded as spans.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_trace = contextvars.ContextVar('current_trace', default=None)
+
+
+class Span:
+    """A timed section of a trace."""
+
+    __slots__ = ('name', 'attributes', 'start', 'duration', 'error', 'children')
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.start = 0.0
+        self.duration = None
+        self.error = None
+        self.children: List['Span'] = []
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        data = {
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 3),
+            'duration_ms': None if self.duration is None else round(self.duration * 1000, 3),
+        }
+        if self.attributes:
+            data['attributes'] = self.attributes
+        if self.error:
+            data['error'] = self.error
+        if self.children:
+            data['children'] = [child.to_dict(origin) for child in self.children]
+        return data
+
+
+class _ActiveSpan:
+    """Context manager timing a span inside its trace."""
+
+    __slots__ = ('trace', 'span')
+
+    def __init__(self, trace: 'Trace', span: Span):
+        self.trace = trace
+        self.span = span
+
+    def __enter__(self) -> Span:
+        stack = self.trace._stack
+        stack[-1].children.append(self.span)
+        stack.append(self.span)
+        self.span.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.span.duration = time.perf_counter() - self.span.start
+        if exc_type is not None:
+            self.span.error = exc_type.__name__
+        stack = self.trace._stack
+        if stack[-1] is self.span:
+            stack.pop()
+        return False
+
+
+class _NoopSpan:
+    """Stands in for spans and traces when tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        return False
+
+    def set(self, **attributes) -> None:
+        pass
+
+    def span(self, name: str, **attributes) -> '_NoopSpan':
+        return self
+
+    def to_dict(self) -> None:
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """
+    Spans of one document. Entering the trace makes it the current trace;
+    leaving it stops the clock and logs it.
+
+    Args:
+        name: Trace name (the processing stage)
+        attributes: Attributes of the root span (category, document number...)
+        log: Log the finished trace as a JSON line
+    """
+
+    def __init__(self, name: str, attributes: Dict[str, Any] = None, log: bool = True):
+        self.root = Span(name, dict(attributes or {}))
+        self._stack = [self.root]
+        self._token = None
+        self._log = log
+
+    def span(self, name: str, **attributes) -> _ActiveSpan:
+        return _ActiveSpan(self, Span(name, attributes))
+
+    def set(self, **attributes) -> None:
+        self.root.set(**attributes)
+
+    def __enter__(self) -> 'Trace':
+        self._token = _current_trace.set(self)
+        self.root.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.root.duration = time.perf_counter() - self.root.start
+        if exc_type is not None:
+            self.root.error = exc_type.__name__
+        _current_trace.reset(self._token)
+        if self._log:
+            self.log()
+        return False
+
+    def totals(self) -> Dict[str, float]:
+        """Total ms per span name (nested spans are counted in their parents too)."""
+        totals: Dict[str, float] = {}
+        pending = list(self.root.children)
+        while pending:
+            span = pending.pop()
+            if span.duration is not None:
+                totals[span.name] = round(totals.get(span.name, 0.0) + span.duration * 1000, 3)
+            pending.extend(span.children)
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The span tree and per-name totals, for result metadata."""
+        data = self.root.to_dict(self.root.start)
+        data['totals_ms'] = self.totals()
+        return data
+
+    def log(self) -> None:
+        """Emit the trace as one structured log line."""
+        duration = self.root.duration
+        logger.info(json.dumps({
+            'event': 'trace',
+            'trace': self.root.name,
+            'duration_ms': None if duration is None else round(duration * 1000, 3),
+            'error': self.root.error,
+            'attributes': self.root.attributes,
+            'totals_ms': self.totals(),
+        }, default=str))
+
+
+class Tracer:
+    """
+    Starts document traces, or no-op traces when tracing is disabled.
+
+    Args:
+        enabled: Record spans (default: TRACING_ENABLED, true)
+        log_traces: Log finished traces (default: TRACE_LOG, true)
+    """
+
+    def __init__(self, enabled: bool = None, log_traces: bool = None):
+        if enabled is None:
+            enabled = os.environ.get("TRACING_ENABLED", "true").lower() == "true"
+        if log_traces is None:
+            log_traces = os.environ.get("TRACE_LOG", "true").lower() == "true"
+        self.enabled = enabled
+        self.log_traces = log_traces
+
+    def start(self, name: str, **attributes):
+        """A Trace to enter around one document's processing (no-op when disabled)."""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Trace(name, attributes, log=self.log_traces)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def span(name: str, **attributes):
+    """Open a span in the current trace; a no-op without one."""
+    trace = _current_trace.get()
+    if trace is None:
+        return NOOP_SPAN
+    return trace.span(name, **attributes)
+
+
+def annotate(**attributes) -> None:
+    """Add attributes to the current trace's root span."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.set(**attributes)
+
+
+def traced(name: str):
+    """Decorator recording each call of a function as a span of the current trace."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with trace.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Global instance for Lambda usage
+tracer = Tracer()
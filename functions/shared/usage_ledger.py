@@ -0,0 +1,269 @@
+"""
+Token and cost ledger for Bedrock calls.
+
+call_bedrock_unified records the tokens (from the response's usage block),
+latency and model of every call. Each handler opens an attribution per
+document and phase; calls made inside it are charged to that document:
+
+    with usage_ledger.attribute('extraction') as usage:
+        ... call_bedrock_unified(request, client) ...
+    usage.set(document='984174004', category='CERL')
+    result['usage'] = usage.summary()
+
+rollup() adds document summaries up per model, category and phase, with the
+cost per successful document; ReportGenerator.save_batch_summary stores it
+with the batch. bench/usage_report.py aggregates stored summaries offline.
+
+Costs use on-demand prices in USD per 1K tokens (PRICING, matched by model ID
+substring). MODEL_PRICING (JSON, same shape) adds or overrides prices.
+"""
+
+import contextvars
+import json
+import logging
+import os
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from .metrics import token_counts
+
+logger = logging.getLogger(__name__)
+
+# On-demand prices, USD per 1K tokens
+PRICING = {
+    'nova-pro': {'input': 0.0008, 'output': 0.0032, 'cache_read': 0.0002, 'cache_write': 0.0},
+    'nova-lite': {'input': 0.00006, 'output': 0.00024, 'cache_read': 0.000015, 'cache_write': 0.0},
+    'nova-micro': {'input': 0.000035, 'output': 0.00014, 'cache_read': 0.00000875, 'cache_write': 0.0},
+    'claude-sonnet-4': {'input': 0.003, 'output': 0.015, 'cache_read': 0.0003, 'cache_write': 0.00375},
+    'claude-3-7-sonnet': {'input': 0.003, 'output': 0.015, 'cache_read': 0.0003, 'cache_write': 0.00375},
+    'claude-3-5-sonnet': {'input': 0.003, 'output': 0.015, 'cache_read': 0.0003, 'cache_write': 0.00375},
+    'claude-3-5-haiku': {'input': 0.0008, 'output': 0.004, 'cache_read': 0.00008, 'cache_write': 0.001},
+    'pixtral-large': {'input': 0.002, 'output': 0.006, 'cache_read': 0.0, 'cache_write': 0.0},
+}
+
+TOKEN_FIELDS = ('input_tokens', 'output_tokens', 'cache_read_tokens', 'cache_write_tokens')
+
+_current_usage = contextvars.ContextVar('current_usage', default=None)
+
+
+@dataclass
+class UsageEntry:
+    """One Bedrock call."""
+    model_id: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    latency_ms: float = 0.0
+    attempts: int = 1
+    backoff_ms: float = 0.0
+    cost_usd: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def empty_totals() -> Dict[str, Any]:
+    totals = {'calls': 0, 'latency_ms': 0.0, 'backoff_ms': 0.0, 'cost_usd': 0.0}
+    totals.update({field: 0 for field in TOKEN_FIELDS})
+    return totals
+
+
+def add_call(totals: Dict[str, Any], call: Dict[str, Any]) -> None:
+    """Add one call (UsageEntry dict) to running totals."""
+    totals['calls'] += 1
+    for field in TOKEN_FIELDS:
+        totals[field] += call.get(field) or 0
+    totals['latency_ms'] = round(totals['latency_ms'] + (call.get('latency_ms') or 0.0), 3)
+    totals['backoff_ms'] = round(totals['backoff_ms'] + (call.get('backoff_ms') or 0.0), 3)
+    totals['cost_usd'] = round(totals['cost_usd'] + (call.get('cost_usd') or 0.0), 6)
+
+
+class DocumentUsage:
+    """
+    Calls charged to one document in one phase.
+
+    Args:
+        phase: Pipeline phase ('classification', 'extraction', 'fallback')
+        document: Document number
+        category: Document category
+    """
+
+    def __init__(self, phase: str, document: str = None, category: str = None):
+        self.phase = phase
+        self.document = document
+        self.category = category
+        self.calls: List[UsageEntry] = []
+
+    def set(self, document: str = None, category: str = None) -> None:
+        if document is not None:
+            self.document = document
+        if category is not None:
+            self.category = category
+
+    def totals(self) -> Dict[str, Any]:
+        totals = empty_totals()
+        for call in self.calls:
+            add_call(totals, call.to_dict())
+        return totals
+
+    def summary(self) -> Dict[str, Any]:
+        """The document's calls and totals, for result metadata and batch rollups."""
+        return {
+            'document': self.document,
+            'category': self.category,
+            'phase': self.phase,
+            'calls': [call.to_dict() for call in self.calls],
+            'totals': self.totals(),
+        }
+
+
+class UsageLedger:
+    """
+    Records Bedrock calls against the current document attribution.
+
+    Args:
+        pricing: Prices per model ID substring (default: PRICING plus MODEL_PRICING)
+    """
+
+    def __init__(self, pricing: Dict[str, Dict[str, float]] = None):
+        if pricing is None:
+            pricing = dict(PRICING)
+            try:
+                pricing.update(json.loads(os.environ.get('MODEL_PRICING') or '{}'))
+            except ValueError as e:
+                logger.warning(f"Ignoring invalid MODEL_PRICING: {str(e)}")
+        self.pricing = pricing
+        self._unpriced = set()
+
+    def price(self, model_id: str) -> Optional[Dict[str, float]]:
+        """Prices of the longest pricing key found in the model ID, None if unknown."""
+        model_id = (model_id or '').lower()
+        matches = [key for key in self.pricing if key in model_id]
+        if not matches:
+            if model_id not in self._unpriced:
+                self._unpriced.add(model_id)
+                logger.warning(f"No price for model {model_id}; its cost is recorded as 0")
+            return None
+        return self.pricing[max(matches, key=len)]
+
+    def cost(self, model_id: str, tokens: Dict[str, int]) -> float:
+        """
+        Cost of a call in USD.
+
+        Args:
+            model_id: Bedrock model or inference profile ID
+            tokens: Token counts as returned by token_counts()
+
+        Returns:
+            float: Cost in USD (0 for unpriced models)
+        """
+        prices = self.price(model_id)
+        if prices is None:
+            return 0.0
+        return round(sum(tokens[kind] * prices.get(kind, 0.0) for kind in tokens) / 1000, 6)
+
+    @contextmanager
+    def attribute(self, phase: str, document: str = None, category: str = None):
+        """
+        Charge the Bedrock calls made inside the block to one document.
+
+        Args:
+            phase: Pipeline phase
+            document: Document number (can be set later on the yielded DocumentUsage)
+            category: Document category (idem)
+        """
+        usage = DocumentUsage(phase, document, category)
+        token = _current_usage.set(usage)
+        try:
+            yield usage
+        finally:
+            _current_usage.reset(token)
+
+    def record(self, model_id: str, usage: Optional[Dict[str, Any]], latency_ms: float,
+               retry_info: Optional[Dict[str, Any]] = None) -> UsageEntry:
+        """
+        Record a Bedrock call against the current attribution, if any.
+
+        Args:
+            model_id: Model that answered
+            usage: response['usage']
+            latency_ms: Latency of the successful attempt
+            retry_info: response['retry_info'] (attempts and backoff)
+
+        Returns:
+            UsageEntry: The recorded call
+        """
+        tokens = token_counts(usage)
+        entry = UsageEntry(
+            model_id=model_id,
+            input_tokens=tokens['input'],
+            output_tokens=tokens['output'],
+            cache_read_tokens=tokens['cache_read'],
+            cache_write_tokens=tokens['cache_write'],
+            latency_ms=round(latency_ms, 3),
+            attempts=(retry_info or {}).get('attempts', 1),
+            backoff_ms=round((retry_info or {}).get('backoff_seconds', 0.0) * 1000, 3),
+            cost_usd=self.cost(model_id, tokens),
+        )
+        current = _current_usage.get()
+        if current is not None:
+            current.calls.append(entry)
+        return entry
+
+
+def is_successful(result: Dict[str, Any]) -> bool:
+    """Success flag of a classification, extraction or fallback batch result."""
+    if 'success' in result:
+        return bool(result['success'])
+    if 'enhanced_fallback_success' in result:
+        return bool(result['enhanced_fallback_success'])
+    return result.get('status') == 'success'
+
+
+def rollup(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Add up the usage of processed documents.
+
+    Args:
+        results: Batch results, each with 'usage' (DocumentUsage.summary()) and 'success'
+
+    Returns:
+        dict: totals, by_model, by_phase and by_category; categories also get
+              documents, successful_documents and the tokens and cost per successful document
+    """
+    totals = empty_totals()
+    by_model: Dict[str, Dict[str, Any]] = {}
+    by_phase: Dict[str, Dict[str, Any]] = {}
+    by_category: Dict[str, Dict[str, Any]] = {}
+
+    for result in results:
+        usage = result.get('usage')
+        if not usage:
+            continue
+        category = usage.get('category') or result.get('category') or 'UNKNOWN'
+        category_totals = by_category.setdefault(
+            category, dict(empty_totals(), documents=0, successful_documents=0))
+        category_totals['documents'] += 1
+        if is_successful(result):
+            category_totals['successful_documents'] += 1
+        phase_totals = by_phase.setdefault(usage.get('phase') or 'unknown', empty_totals())
+        for call in usage.get('calls', []):
+            add_call(totals, call)
+            add_call(by_model.setdefault(call.get('model_id') or 'unknown', empty_totals()), call)
+            add_call(phase_totals, call)
+            add_call(category_totals, call)
+
+    for category_totals in by_category.values():
+        successful = category_totals['successful_documents']
+        tokens = category_totals['input_tokens'] + category_totals['output_tokens']
+        category_totals['tokens_per_successful_document'] = round(tokens / successful, 1) if successful else None
+        category_totals['cost_per_successful_document'] = \
+            round(category_totals['cost_usd'] / successful, 6) if successful else None
+
+    return {'totals': totals, 'by_model': by_model, 'by_phase': by_phase, 'by_category': by_category}
+
+
+# Global instance for Lambda usage
+usage_ledger = UsageLedger()
@@ -44,6 +44,11 @@ class ConfigLoader:
                 'bedrock_model': 'amazon.nova-pro-v1:0',
                 'fallback_model': 'us.anthropic.claude-sonnet-4-20250514-v1:0',
                 'output_dir': 'outputs',
+                # Results bucket of the Lambdas: holds the text cache shared with the fallback Lambda
+                'destination_bucket': os.environ.get('TEXT_CACHE_BUCKET') or os.environ.get('DESTINATION_BUCKET'),
+                'folder_prefix': os.environ.get('FOLDER_PREFIX', 'par-servicios-poc'),
+                'parallel_workers': 4,  # Concurrent tests in TestManager.run_parallel
+                'bedrock_calls_per_minute': 30,
                 'CECRL': True,  # Enable all document types since we have examples
                 'CERL': True,
                 'RUT': True,
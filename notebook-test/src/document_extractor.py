@@ -7,6 +7,8 @@ import logging
 import json
 import sys
 import os
+import importlib
+import importlib.util
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
 import boto3
@@ -29,21 +31,53 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# Production shared package (functions/shared), loaded under its own name because
+# notebook-test/shared would shadow it as "shared"
+PRODUCTION_SHARED_DIR = Path(__file__).resolve().parents[2] / "functions" / "shared"
+PRODUCTION_SHARED_ALIAS = "production_shared"
+
+def load_production_text_tools():
+    """
+    Load the production text extractors and text cache so the notebook harness
+    shares cached PyPDF/Textract output with the fallback Lambda.
+    
+    Returns:
+        tuple: (pdf_processor module, text_cache module) or (None, None) if unavailable
+    """
+    try:
+        if PRODUCTION_SHARED_ALIAS not in sys.modules:
+            spec = importlib.util.spec_from_file_location(
+                PRODUCTION_SHARED_ALIAS, PRODUCTION_SHARED_DIR / "__init__.py",
+                submodule_search_locations=[str(PRODUCTION_SHARED_DIR)]
+            )
+            package = importlib.util.module_from_spec(spec)
+            sys.modules[PRODUCTION_SHARED_ALIAS] = package
+            spec.loader.exec_module(package)
+        pdf_processor = importlib.import_module(f"{PRODUCTION_SHARED_ALIAS}.pdf_processor")
+        text_cache = importlib.import_module(f"{PRODUCTION_SHARED_ALIAS}.text_cache")
+        return pdf_processor, text_cache
+    except Exception as e:
+        logger.warning(f"Could not load production text extractors from {PRODUCTION_SHARED_DIR}: {e}")
+        return None, None
+
 class DocumentExtractor:
     """Handles document extraction using real Bedrock logic"""
     
     def __init__(self, config_loader=None):
         # Use configuration from YAML if provided
         if config_loader:
-            self.aws_profile = config_loader.get_settings().get('aws_profile', 'par_servicios')
-            self.aws_region = config_loader.get_settings().get('aws_region', 'us-east-2')
+            self.settings = config_loader.get_settings()
+            self.aws_profile = self.settings.get('aws_profile', 'par_servicios')
+            self.aws_region = self.settings.get('aws_region', 'us-east-2')
         else:
             # Fallback defaults for standalone testing
+            self.settings = {}
             self.aws_profile = "par_servicios"
             self.aws_region = "us-east-2"
         
         self.bedrock_client = None
         self.s3_client = None
+        self.text_cache = None
         self._initialize_clients()
     
     def _initialize_clients(self):
@@ -77,6 +111,69 @@ class DocumentExtractor:
             self.s3_client = None
     
     
+    def extract_document_text(self, s3_path: str, extractor: str = "pypdf") -> Dict[str, Any]:
+        """
+        Extract document text with the production PyPDF/Textract extractors,
+        reusing the shared text cache (same S3 entries as the fallback Lambda).
+        The cache bucket is settings destination_bucket (TEXT_CACHE_BUCKET or
+        DESTINATION_BUCKET in the environment); without one this is an error.
+        
+        Args:
+            s3_path: S3 path to PDF document
+            extractor: 'pypdf' or 'textract'
+            
+        Returns:
+            Dictionary with status, text and cache tier ('local', 's3' or None)
+        """
+        result = {"status": "pending", "s3_path": s3_path, "extractor": extractor}
+        
+        pdf_processor, text_cache_module = load_production_text_tools()
+        if not pdf_processor or not self.s3_client:
+            result["status"] = "error"
+            result["error"] = "Production text extractors or S3 client not available"
+            return result
+        
+        cache_bucket = self.settings.get('destination_bucket')
+        if not cache_bucket:
+            result["status"] = "error"
+            result["error"] = ("No text cache bucket configured: set settings destination_bucket "
+                               "(or TEXT_CACHE_BUCKET / DESTINATION_BUCKET) to the Lambdas' results bucket")
+            return result
+        
+        try:
+            if self.text_cache is None:
+                folder_prefix = self.settings.get('folder_prefix', 'par-servicios-poc')
+                self.text_cache = text_cache_module.TextExtractionCache(
+                    bucket=cache_bucket, prefix=f"{folder_prefix}/text_cache",
+                    local_dir=str(Path(self.settings.get('output_dir', 'outputs')) / "text_cache"),
+                    s3_client=self.s3_client
+                )
+            
+            bucket, key = s3_path[5:].split('/', 1)
+            pdf_bytes = self.s3_client.get_object(Bucket=bucket, Key=key)['Body'].read()
+            doc_hash = text_cache_module.document_hash(pdf_bytes)
+            
+            if extractor == "textract":
+                version = pdf_processor.TEXTRACT_EXTRACTOR_VERSION
+                extract_fn = lambda: pdf_processor.extract_pdf_text_with_textract(pdf_bytes, bucket, key, self.aws_region)
+            else:
+                version = pdf_processor.PYPDF_EXTRACTOR_VERSION
+                extract_fn = lambda: pdf_processor.extract_pdf_text_with_pypdf(pdf_bytes)
+            
+            text, tier = self.text_cache.get_or_extract(doc_hash, extractor, version, extract_fn)
+            
+            result["status"] = "error" if text.startswith("[ERROR") else "success"
+            result["text"] = text
+            result["cache_tier"] = tier
+            result["document_sha256"] = doc_hash
+            
+        except Exception as e:
+            logger.error(f"Text extraction failed for {s3_path}: {e}")
+            result["status"] = "error"
+            result["error"] = str(e)
+        
+        return result
+    
     def load_prompt_files(self, prompt_version: str, document_type: str) -> Optional[Dict[str, str]]:
         """
         Load prompt files for specific version and document type
@@ -115,7 +212,8 @@ class DocumentExtractor:
             return None
     
     def extract_from_document(self, s3_path: str, prompt_version: str, 
-                            document_type: str, model_id: str) -> Dict[str, Any]:
+                            document_type: str, model_id: str,
+                            pdf_bytes: Optional[bytes] = None) -> Dict[str, Any]:
         """
         Extract data from document using Bedrock
         
@@ -124,6 +222,7 @@ class DocumentExtractor:
             prompt_version: Prompt version to use
             document_type: Document type (CECRL, CERL, etc.)
             model_id: Bedrock model ID
+            pdf_bytes: PDF content already downloaded (sent inline instead of the S3 reference)
             
         Returns:
             Dictionary with extraction result
@@ -148,18 +247,26 @@ class DocumentExtractor:
                 result["error"] = f"Failed to load prompts for {document_type} {prompt_version}"
                 return result
             
-            # Use S3 direct access (optimized - no download needed)
-            logger.info(f"Using S3 direct access for {s3_path} (optimized)")
-            
-            # Use Bedrock for extraction with S3 direct access
-            extracted_data = self._bedrock_extraction(
-                prompts, model_id, document_type, s3_path, s3_uri=s3_path
-            )
+            if pdf_bytes is not None:
+                # PDF already downloaded (e.g. cached by the parallel runner)
+                extracted_data = self._bedrock_extraction(
+                    prompts, model_id, document_type, s3_path, pdf_bytes=pdf_bytes
+                )
+                result["pdf_size_bytes"] = len(pdf_bytes)
+            else:
+                # Use S3 direct access (optimized - no download needed)
+                logger.info(f"Using S3 direct access for {s3_path} (optimized)")
+                
+                # Use Bedrock for extraction with S3 direct access
+                extracted_data = self._bedrock_extraction(
+                    prompts, model_id, document_type, s3_path, s3_uri=s3_path
+                )
             
             if extracted_data:
                 result["status"] = "success"
                 result["extracted_data"] = extracted_data
-                result["optimization"] = "S3 direct access - no download needed"
+                if pdf_bytes is None:
+                    result["optimization"] = "S3 direct access - no download needed"
             else:
                 result["status"] = "error"
                 result["error"] = "Bedrock extraction failed"
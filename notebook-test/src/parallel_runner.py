@@ -0,0 +1,323 @@
+"""
+Parallel Evaluation Runner for Notebook-Test Framework
+Runs test cells (test case × document × prompt version) on a bounded worker
+pool under a Bedrock rate limit, streams each finished cell to a JSONL file
+and skips the cells that file already holds when a run is resumed
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cell statuses a resumed run keeps: the model answered and the answer was validated.
+# "extraction_failed" (throttling, timeouts and other failed Bedrock calls) and "error" are run again
+FINISHED_STATUSES = {"success", "failed"}
+
+# Converse document blocks are limited to 4.5 MB; larger PDFs go by S3 reference
+MAX_INLINE_PDF_BYTES = 4_500_000
+
+
+def cell_key(test_case_key: str, document_key: str, prompt_version: str, model_id: str) -> str:
+    """Identity of a cell in the results file"""
+    return f"{test_case_key}|{document_key}|{prompt_version}|{model_id}"
+
+
+class RateLimiter:
+    """Spaces calls evenly so all workers together stay under calls_per_minute"""
+
+    def __init__(self, calls_per_minute: Optional[float], clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.interval = 60.0 / calls_per_minute if calls_per_minute else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Wait for the next call slot
+
+        Returns:
+            Seconds waited
+        """
+        if not self.interval:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        wait = start - now
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class PDFCache:
+    """
+    Downloads each document's PDF once for all its prompt versions
+
+    Concurrent requests for the same document wait for the first download.
+    PDFs are kept in memory and, with a cache_dir, on disk across runs.
+    """
+
+    def __init__(self, fetch: Callable[[str], bytes], cache_dir: Optional[str] = ".cache/pdfs"):
+        self._fetch = fetch
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._pdfs: Dict[str, bytes] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.downloads = 0
+        self.hits = 0
+
+    def _path(self, s3_path: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{hashlib.sha256(s3_path.encode('utf-8')).hexdigest()[:32]}.pdf"
+
+    def get(self, s3_path: str) -> bytes:
+        """
+        PDF bytes of a document
+
+        Args:
+            s3_path: S3 path of the PDF
+
+        Returns:
+            PDF content
+        """
+        with self._lock:
+            document_lock = self._locks.setdefault(s3_path, threading.Lock())
+        with document_lock:
+            if s3_path in self._pdfs:
+                self.hits += 1
+                return self._pdfs[s3_path]
+            path = self._path(s3_path)
+            if path is not None and path.exists():
+                pdf_bytes = path.read_bytes()
+                self.hits += 1
+            else:
+                pdf_bytes = self._fetch(s3_path)
+                self.downloads += 1
+                if path is not None:
+                    try:
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        path.write_bytes(pdf_bytes)
+                    except OSError as e:
+                        logger.warning(f"Could not cache {s3_path} on disk: {e}")
+            self._pdfs[s3_path] = pdf_bytes
+            return pdf_bytes
+
+
+class ResultStore:
+    """Append-only JSONL file of finished cells, reloaded to resume a run"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            content = self.path.read_bytes()
+            if content and not content.endswith(b"\n"):
+                # Drop a line cut short by an interrupted run, so the next record starts on its own line
+                content = content[:content.rfind(b"\n") + 1]
+                with open(self.path, 'r+b') as f:
+                    f.truncate(len(content))
+            for line in content.decode('utf-8').splitlines():
+                try:
+                    record = json.loads(line)
+                    self.records[record["cell"]] = record
+                except (ValueError, KeyError):
+                    continue
+            logger.info(f"Loaded {len(self.records)} finished cells from {self.path}")
+
+    def is_finished(self, cell: str) -> bool:
+        record = self.records.get(cell)
+        return record is not None and record.get("result", {}).get("status") in FINISHED_STATUSES
+
+    def append(self, record: Dict[str, Any]):
+        """Write one cell and flush it to disk before the next one"""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.records[record["cell"]] = record
+
+
+class ParallelEvaluator:
+    """Runs the cells of a TestManager's test cases concurrently"""
+
+    def __init__(self, test_manager, results_path: str, max_workers: int = 4,
+                 calls_per_minute: Optional[float] = 30.0, pdf_cache: Optional[PDFCache] = None,
+                 inline_pdfs: bool = True):
+        """
+        Args:
+            test_manager: TestManager whose configuration and validation are used
+            results_path: JSONL file the cells are streamed to (and resumed from)
+            max_workers: Cells run at the same time
+            calls_per_minute: Bedrock calls per minute across all workers (None or 0: no limit)
+            pdf_cache: PDF cache (default: outputs/pdf_cache, downloaded with the extractor's S3 client)
+            inline_pdfs: Send the cached PDF bytes to Bedrock instead of an S3 reference
+        """
+        self.test_manager = test_manager
+        self.store = ResultStore(results_path)
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = RateLimiter(calls_per_minute)
+        settings = test_manager.config_loader.get_settings()
+        self.pdf_cache = pdf_cache or PDFCache(
+            self._download, cache_dir=str(Path(settings.get('output_dir', 'outputs')) / "pdf_cache"))
+        self.inline_pdfs = inline_pdfs
+        self.model_id = settings.get('bedrock_model', 'us.amazon.nova-pro-v1:0')
+
+    def _download(self, s3_path: str) -> bytes:
+        s3_client = self.test_manager.document_extractor.s3_client
+        if s3_client is None:
+            raise RuntimeError("S3 client not available")
+        bucket, key = s3_path[5:].split('/', 1)
+        return s3_client.get_object(Bucket=bucket, Key=key)['Body'].read()
+
+    def plan(self, test_case_keys: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        """
+        Cells of the enabled documents of the test cases
+
+        Args:
+            test_case_keys: Test cases to run (default: all with enabled documents)
+
+        Returns:
+            List of cells (cell, test_case, document, prompt_version)
+        """
+        enabled_docs = self.test_manager.get_enabled_tests()
+        cells = []
+        for test_case_key in test_case_keys or list(enabled_docs.keys()):
+            test_case_info = self.test_manager.config_loader.get_test_case_info(test_case_key)
+            if not test_case_info or not test_case_info.get('enabled', False):
+                continue
+            for document_key in enabled_docs.get(test_case_key, []):
+                for prompt_version in self.test_manager.get_prompts_to_test(test_case_info, document_key):
+                    cells.append({
+                        "cell": cell_key(test_case_key, document_key, prompt_version, self.model_id),
+                        "test_case": test_case_key,
+                        "document": document_key,
+                        "prompt_version": prompt_version,
+                    })
+        return cells
+
+    def _pdf_bytes(self, document_info: Dict[str, Any]) -> Optional[bytes]:
+        """Cached PDF to send inline, or None to let Bedrock read it from S3"""
+        if not self.inline_pdfs or self.test_manager.document_extractor.bedrock_client is None:
+            return None
+        pdf_bytes = self.pdf_cache.get(document_info['s3_path'])
+        return pdf_bytes if len(pdf_bytes) <= MAX_INLINE_PDF_BYTES else None
+
+    def _run_cell(self, cell: Dict[str, str]) -> Dict[str, Any]:
+        tm = self.test_manager
+        started = time.perf_counter()
+        try:
+            document_info = tm.config_loader.get_document_info(cell["document"])
+            test_case_info = tm.config_loader.get_test_case_info(cell["test_case"])
+            pdf_bytes = self._pdf_bytes(document_info)
+            self.rate_limiter.acquire()
+            result = tm._run_single_test(cell["document"], document_info, cell["prompt_version"],
+                                         test_case_info, pdf_bytes=pdf_bytes)
+        except Exception as e:
+            logger.error(f"Error testing {cell['document']} with {cell['prompt_version']}: {e}")
+            result = {
+                "document": cell["document"],
+                "prompt_version": cell["prompt_version"],
+                "status": "error",
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
+        record = dict(cell, model_id=self.model_id, result=result,
+                      duration_seconds=round(time.perf_counter() - started, 3),
+                      completed_at=datetime.now().isoformat())
+        # Stored by the worker, so a cell that called Bedrock is kept even if the run is interrupted
+        self.store.append(record)
+        return record
+
+    def run(self, test_case_keys: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Run the cells not finished yet and stream each one to the results file
+
+        Args:
+            test_case_keys: Test cases to run (default: all with enabled documents)
+
+        Returns:
+            Results per test case, in the format of TestManager.run_test_case
+        """
+        cells = self.plan(test_case_keys)
+        pending = [cell for cell in cells if not self.store.is_finished(cell["cell"])]
+        logger.info(f"{len(cells)} cells: {len(cells) - len(pending)} already finished, {len(pending)} to run "
+                    f"with {self.max_workers} workers")
+
+        done = 0
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="evaluation")
+        try:
+            futures = [pool.submit(self._run_cell, cell) for cell in pending]
+            for future in as_completed(futures):
+                record = future.result()
+                done += 1
+                logger.info(f"[{done}/{len(pending)}] {record['document']} {record['prompt_version']}: "
+                            f"{record['result'].get('status')} ({record['duration_seconds']:.1f}s)")
+        except BaseException:
+            # Ctrl-C or a failure: queued cells are not started; running ones store their result when done
+            pool.shutdown(wait=False, cancel_futures=True)
+            logger.warning(f"Run interrupted after {done}/{len(pending)} cells; resume to run the rest")
+            raise
+        pool.shutdown()
+
+        logger.info(f"PDFs: {self.pdf_cache.downloads} downloaded, {self.pdf_cache.hits} reused")
+        return self.assemble(cells)
+
+    def assemble(self, cells: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Results per test case from the results file
+
+        Args:
+            cells: Cells of the run (see plan)
+
+        Returns:
+            Dictionary of test case key to results, as TestManager.run_test_case returns them
+        """
+        all_results = {}
+        for cell in cells:
+            test_case_key = cell["test_case"]
+            if test_case_key not in all_results:
+                test_case_info = self.test_manager.config_loader.get_test_case_info(test_case_key) or {}
+                all_results[test_case_key] = {
+                    "test_case": test_case_key,
+                    "category": test_case_info.get('category'),
+                    "description": test_case_info.get('description'),
+                    "timestamp": datetime.now().isoformat(),
+                    "documents_tested": [],
+                    "prompts_tested": [],
+                    "results": {},
+                    "summary": {"total_executions": 0, "successful": 0, "failed": 0, "errors": []}
+                }
+            results = all_results[test_case_key]
+            if cell["document"] not in results["documents_tested"]:
+                results["documents_tested"].append(cell["document"])
+            if cell["prompt_version"] not in results["prompts_tested"]:
+                results["prompts_tested"].append(cell["prompt_version"])
+
+            results["summary"]["total_executions"] += 1
+            record = self.store.records.get(cell["cell"])
+            result = record["result"] if record else {"status": "not_run"}
+            results["results"].setdefault(cell["document"], {})[cell["prompt_version"]] = result
+            if result.get("status") == "success":
+                results["summary"]["successful"] += 1
+            else:
+                results["summary"]["failed"] += 1
+                if result.get("status") == "error":
+                    results["summary"]["errors"].append(
+                        f"Error testing {cell['document']} with {cell['prompt_version']}: {result.get('error')}")
+        return all_results
@@ -15,6 +15,7 @@ sys.path.append('shared')
 
 from config_loader import ConfigLoader
 from document_extractor import DocumentExtractor
+from parallel_runner import ParallelEvaluator
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,20 @@ class TestManager:
         """Get all enabled test combinations"""
         return self.config_loader.get_enabled_documents()
     
+    def get_prompts_to_test(self, test_case_info: Dict, document_key: str) -> List[str]:
+        """
+        Get prompt versions to test for a document
+        
+        Args:
+            test_case_info: Test case configuration
+            document_key: Document identifier
+            
+        Returns:
+            Prompt versions configured for the document, or for the test case if none
+        """
+        document_config = test_case_info.get('documents', {}).get(document_key) or {}
+        return document_config.get('prompts_to_test') or test_case_info.get('prompts_to_test', [])
+    
     def run_test_case(self, test_case_key: str) -> Dict[str, Any]:
         """
         Run a specific test case
@@ -79,8 +94,14 @@ class TestManager:
             logger.info(f"No enabled documents for test case: {test_case_key}")
             return {"status": "no_documents", "test_case": test_case_key}
         
-        # Get prompts to test
-        prompts_to_test = test_case_info.get('prompts_to_test', [])
+        # Get prompts to test (configured per document)
+        prompts_by_document = {
+            document_key: self.get_prompts_to_test(test_case_info, document_key)
+            for document_key in documents_to_test
+        }
+        prompts_to_test = list(dict.fromkeys(
+            prompt for prompts in prompts_by_document.values() for prompt in prompts
+        ))
         
         results = {
             "test_case": test_case_key,
@@ -91,7 +112,7 @@ class TestManager:
             "prompts_tested": prompts_to_test,
             "results": {},
             "summary": {
-                "total_executions": len(documents_to_test) * len(prompts_to_test),
+                "total_executions": sum(len(prompts) for prompts in prompts_by_document.values()),
                 "successful": 0,
                 "failed": 0,
                 "errors": []
@@ -103,7 +124,7 @@ class TestManager:
             document_info = self.config_loader.get_document_info(document_key)
             results["results"][document_key] = {}
             
-            for prompt_version in prompts_to_test:
+            for prompt_version in prompts_by_document[document_key]:
                 logger.info(f"Testing {document_key} with {prompt_version}")
                 
                 try:
@@ -142,7 +163,8 @@ class TestManager:
         return results
     
     def _run_single_test(self, document_key: str, document_info: Dict, 
-                        prompt_version: str, test_case_info: Dict) -> Dict[str, Any]:
+                        prompt_version: str, test_case_info: Dict,
+                        pdf_bytes: Optional[bytes] = None) -> Dict[str, Any]:
         """
         Run a single test (one document, one prompt version)
         
@@ -151,6 +173,7 @@ class TestManager:
             document_info: Document configuration
             prompt_version: Prompt version to use
             test_case_info: Test case configuration
+            pdf_bytes: PDF content already downloaded (default: read by Bedrock from S3)
             
         Returns:
             Dictionary with test result
@@ -170,7 +193,8 @@ class TestManager:
                 s3_path=document_info['s3_path'],
                 prompt_version=prompt_version,
                 document_type=document_info['type'],
-                model_id=settings.get('bedrock_model', 'us.amazon.nova-pro-v1:0')
+                model_id=settings.get('bedrock_model', 'us.amazon.nova-pro-v1:0'),
+                pdf_bytes=pdf_bytes
             )
             
             if extraction_result.get('status') == 'success':
@@ -377,6 +401,43 @@ class TestManager:
         
         return all_results
     
+    def run_parallel(self, test_case_keys: Optional[List[str]] = None, results_path: Optional[str] = None,
+                     max_workers: Optional[int] = None, calls_per_minute: Optional[float] = None,
+                     resume: bool = True) -> Dict[str, Any]:
+        """
+        Run enabled test cases concurrently, streaming each result to a JSONL file
+        
+        Args:
+            test_case_keys: Test cases to run (default: all enabled)
+            results_path: Results file (default: outputs/parallel/<test cases>.jsonl)
+            max_workers: Concurrent tests (default: settings parallel_workers, 4)
+            calls_per_minute: Bedrock calls per minute, 0 for no limit
+                              (default: settings bedrock_calls_per_minute, 30)
+            resume: Skip tests already finished in the results file
+            
+        Returns:
+            Dictionary with results per test case, as run_all_enabled
+        """
+        settings = self.config_loader.get_settings()
+        if results_path is None:
+            name = "-".join(sorted(test_case_keys)) if test_case_keys else "all_enabled"
+            if not resume:
+                name += f"_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            results_path = str(Path(settings.get('output_dir', 'outputs')) / "parallel" / f"{name}.jsonl")
+        elif not resume and Path(results_path).exists():
+            Path(results_path).unlink()
+        
+        if max_workers is None:
+            max_workers = settings.get('parallel_workers', 4)
+        if calls_per_minute is None:
+            calls_per_minute = settings.get('bedrock_calls_per_minute', 30)
+        
+        logger.info(f"Running test cases in parallel, results in {results_path}")
+        evaluator = ParallelEvaluator(self, results_path, max_workers=max_workers, calls_per_minute=calls_per_minute)
+        all_results = evaluator.run(test_case_keys)
+        self.results.update(all_results)
+        return all_results
+    
     def show_results_summary(self, results: Dict[str, Any]):
         """Display results summary"""
         if isinstance(results, dict) and "test_case" in results:
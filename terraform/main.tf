@@ -156,6 +156,7 @@ module "classification_lambda" {
   source         = "./modules/lambda-wrapper"
   source_path    = "${path.module}/../functions/classification/src"
   shared_folder  = "${path.module}/../functions/shared"
+  trace_shared_imports = true
   project_prefix = "${var.project_prefix}-${local.account_id}"
   function_name  = "${var.stage_name}-classification"
   handler        = "index.handler"
@@ -172,6 +173,12 @@ module "classification_lambda" {
     BEDROCK_RETRY_ATTEMPTS = "8"
     INTER_CALL_DELAY = "5.0"
     BATCH_PROCESSING_DELAY = "2.0"
+    STRUCTURED_OUTPUT = "false"
+    TRACING_ENABLED = "true"
+    METRICS_ENABLED = "true"
+    PROFILING_ENABLED = "false"
+    MEMORY_METRICS_ENABLED = "true"
+    TRACEMALLOC_SAMPLE_RATE = "0"
   }
   policy_statements = local.lambda_policy_statements
   allowed_triggers = {
@@ -186,6 +193,7 @@ module "extraction_scoring_lambda" {
   source         = "./modules/lambda-wrapper"
   source_path    = "${path.module}/../functions/extraction-scoring/src"
   shared_folder  = "${path.module}/../functions/shared"
+  trace_shared_imports = true
   project_prefix = "${var.project_prefix}-${local.account_id}"
   function_name  = "${var.stage_name}-extraction-scoring"
   handler        = "index.handler"
@@ -201,6 +209,12 @@ module "extraction_scoring_lambda" {
     BEDROCK_RETRY_ATTEMPTS = "8"
     INTER_CALL_DELAY = "5.0"
     BATCH_PROCESSING_DELAY = "5.0"
+    STRUCTURED_OUTPUT = "false"
+    TRACING_ENABLED = "true"
+    METRICS_ENABLED = "true"
+    PROFILING_ENABLED = "false"
+    MEMORY_METRICS_ENABLED = "true"
+    TRACEMALLOC_SAMPLE_RATE = "0"
   }
   policy_statements = local.lambda_policy_statements
   allowed_triggers = {
@@ -215,6 +229,7 @@ module "fallback_processing_lambda" {
   source         = "./modules/lambda-wrapper"
   source_path    = "${path.module}/../functions/fallback-processing/src"
   shared_folder  = "${path.module}/../functions/shared"
+  trace_shared_imports = true
   project_prefix = "${var.project_prefix}-${local.account_id}"
   function_name  = "${var.stage_name}-fallback-processing"
   handler        = "index.handler"
@@ -227,6 +242,16 @@ module "fallback_processing_lambda" {
     REGION              = var.aws_region
     FOLDER_PREFIX       = var.project_prefix
     S3_ORIGIN_BUCKET    = module.filling_desk_bucket.s3_bucket_id
+    SPECULATIVE_TEXTRACT = "false"
+    TEXT_QUALITY_MIN_SCORE = "0.5"
+    TEXT_CACHE_ENABLED  = "true"
+    TEXT_CACHE_LOCAL_MAX_MB = "100"
+    STRUCTURED_OUTPUT   = "false"
+    TRACING_ENABLED     = "true"
+    METRICS_ENABLED     = "true"
+    PROFILING_ENABLED   = "false"
+    MEMORY_METRICS_ENABLED = "true"
+    TRACEMALLOC_SAMPLE_RATE = "0.05"
   }
   policy_statements = local.lambda_policy_statements
   allowed_triggers = {
@@ -27,7 +27,8 @@ locals {
   shared_config = var.shared_folder != "" ? [{
     path          = var.shared_folder
     prefix_in_zip = "shared"
-    patterns      = [".*"]  # Include everything from shared folder
+    # Everything from the shared folder, or only the modules traced from the handler
+    patterns      = length(data.external.shared_imports) > 0 ? jsondecode(data.external.shared_imports[0].result.shared_patterns) : [".*"]
   }] : []
   
   # Use terraform-aws-lambda's built-in packaging with conditional shared folder
@@ -21,3 +21,15 @@ module "lambda" {
   memory_size = var.memory_size != null ? var.memory_size : local.default_memory_size
   timeout     = var.timeout != null ? var.timeout : local.default_timeout
 }
+
+# Shared modules reachable from the handler, traced statically at plan time
+data "external" "shared_imports" {
+  count   = var.trace_shared_imports && var.shared_folder != "" ? 1 : 0
+  program = ["python3", "${path.module}/scripts/trace_bundle.py", "--terraform-external"]
+
+  query = {
+    source_path   = var.source_path
+    shared_folder = var.shared_folder
+    handler       = var.handler
+  }
+}
@@ -10,4 +10,8 @@ output "lambda_function_arn" {
 output "lambda_function_invoke_arn" {
   description = "Invoke ARN of the Lambda function"
   value = module.lambda.lambda_function_invoke_arn
-}
\ No newline at end of file
+}
+output "bundled_shared_modules" {
+  description = "Shared modules packaged with the function (all when trace_shared_imports is false)"
+  value       = length(data.external.shared_imports) > 0 ? split(",", data.external.shared_imports[0].result.shared_modules) : ["*"]
+}
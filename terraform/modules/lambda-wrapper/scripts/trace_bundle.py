@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Static import tracer for minimal Lambda bundles.
+
+Starting from a function's handler module, follows every import statement
+(including imports inside functions, which are deferred but still needed at
+runtime) through the function's source folder and the shared folder, and
+returns the shared modules the function actually uses. Modules that read data
+files next to them declare them in a module-level list, which is read
+statically:
+
+    __bundle_data__ = ['schemas/*.json']
+
+Used by the lambda-wrapper module as a Terraform external data source
+(trace_shared_imports = true): the traced modules become the include patterns
+of the shared folder, so each zip only ships its part of functions/shared.
+
+Command line report (bundle contents, third-party imports vs requirements.txt,
+zip sizes and optionally the cold-start import time of both bundles):
+    python terraform/modules/lambda-wrapper/scripts/trace_bundle.py functions/classification/src \\
+        --shared functions/shared [--zip /tmp/classification.zip] [--measure]
+"""
+
+import argparse
+import ast
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+SHARED_PACKAGE = 'shared'
+DATA_DECLARATION = '__bundle_data__'
+
+# Distribution names in requirements.txt whose import name differs
+IMPORT_NAMES = {'typing-extensions': 'typing_extensions', 'python-dateutil': 'dateutil', 'pyyaml': 'yaml'}
+# Imported by other requirements, never directly
+TRANSITIVE_REQUIREMENTS = {'botocore', 'jmespath', 's3transfer', 'urllib3', 'six', 'python-dateutil'}
+
+
+@dataclass
+class BundleTrace:
+    """Result of tracing one handler."""
+    handler: str
+    local_modules: List[str] = field(default_factory=list)
+    shared_modules: List[str] = field(default_factory=list)
+    shared_files: List[str] = field(default_factory=list)
+    third_party: List[str] = field(default_factory=list)
+    unresolved: List[str] = field(default_factory=list)
+
+    def shared_patterns(self) -> List[str]:
+        """terraform-aws-lambda patterns for the shared folder: exclude all, include traced files."""
+        return ['!.*'] + [re.escape(path) for path in self.shared_files]
+
+
+class ImportTracer:
+    """
+    Traces the import graph of a handler through its source and shared folders.
+    """
+
+    def __init__(self, source_dir: Path, shared_dir: Optional[Path] = None):
+        self.source_dir = Path(source_dir).resolve()
+        self.shared_dir = Path(shared_dir).resolve() if shared_dir else None
+        self.stdlib = set(getattr(sys, 'stdlib_module_names', ())) | set(sys.builtin_module_names)
+
+    def _module_file(self, module: str) -> Optional[Path]:
+        """File of a first-party module, or None if it is not first-party."""
+        parts = module.split('.')
+        if parts[0] == SHARED_PACKAGE and self.shared_dir is not None:
+            base, rest = self.shared_dir, parts[1:]
+        else:
+            base, rest = self.source_dir, parts
+        candidate = base.joinpath(*rest) if rest else base
+        if candidate.is_dir() and (candidate / '__init__.py').exists():
+            return candidate / '__init__.py'
+        if candidate.with_suffix('.py').is_file() and rest:
+            return candidate.with_suffix('.py')
+        return None
+
+    @staticmethod
+    def _package_of(module: str, module_file: Path) -> str:
+        return module if module_file.name == '__init__.py' else module.rpartition('.')[0]
+
+    def _imports(self, module: str, module_file: Path) -> Set[str]:
+        """Absolute names imported anywhere in a module (candidates: x.y and x.y.name)."""
+        tree = ast.parse(module_file.read_text(encoding='utf-8'), filename=str(module_file))
+        package = self._package_of(module, module_file)
+        names = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    base_parts = package.split('.') if package else []
+                    base_parts = base_parts[:len(base_parts) - (node.level - 1)]
+                    base = '.'.join(base_parts + ([node.module] if node.module else []))
+                else:
+                    base = node.module
+                names.add(base)
+                names.update(f"{base}.{alias.name}" for alias in node.names if alias.name != '*')
+        return names
+
+    @staticmethod
+    def _data_patterns(module_file: Path) -> List[str]:
+        tree = ast.parse(module_file.read_text(encoding='utf-8'))
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(
+                    isinstance(target, ast.Name) and target.id == DATA_DECLARATION for target in node.targets):
+                return list(ast.literal_eval(node.value))
+        return []
+
+    def trace(self, handler_module: str = 'index') -> BundleTrace:
+        """
+        Trace every first-party module reachable from the handler module.
+
+        Args:
+            handler_module: Module named in the Lambda handler setting ('index' for 'index.handler')
+
+        Returns:
+            BundleTrace
+        """
+        result = BundleTrace(handler=handler_module)
+        seen: Dict[str, Path] = {}
+        third_party: Set[str] = set()
+        pending = [handler_module]
+
+        while pending:
+            module = pending.pop()
+            if module in seen:
+                continue
+            module_file = self._module_file(module)
+            if module_file is None:
+                if module == handler_module:
+                    result.unresolved.append(module)
+                continue
+            seen[module] = module_file
+
+            # A package's __init__ runs before any of its submodules
+            parent = module.rpartition('.')[0]
+            if parent:
+                pending.append(parent)
+
+            for name in self._imports(module, module_file):
+                top = name.split('.')[0]
+                if self._module_file(name) is not None:
+                    pending.append(name)
+                elif top == SHARED_PACKAGE or self._module_file(top) is not None:
+                    continue  # attribute imported from a first-party module (from shared.x import func)
+                elif top not in self.stdlib:
+                    third_party.add(top)
+
+        shared_files = set()
+        for module, module_file in seen.items():
+            if self.shared_dir is not None and module_file.is_relative_to(self.shared_dir):
+                result.shared_modules.append(module)
+                shared_files.add(module_file.relative_to(self.shared_dir).as_posix())
+                for pattern in self._data_patterns(module_file):
+                    for data_file in module_file.parent.glob(pattern):
+                        shared_files.add(data_file.relative_to(self.shared_dir).as_posix())
+            else:
+                result.local_modules.append(module)
+
+        result.local_modules.sort()
+        result.shared_modules.sort()
+        result.shared_files = sorted(shared_files)
+        result.third_party = sorted(third_party)
+        return result
+
+
+def read_requirements(source_dir: Path) -> List[str]:
+    """Distribution names in a function's requirements.txt."""
+    path = Path(source_dir) / 'requirements.txt'
+    if not path.exists():
+        return []
+    names = []
+    for line in path.read_text(encoding='utf-8').splitlines():
+        line = line.split('#')[0].strip()
+        if line:
+            names.append(re.split(r'[<>=!~\[; ]', line, maxsplit=1)[0].lower())
+    return names
+
+
+def unused_requirements(requirements: List[str], third_party: List[str]) -> List[str]:
+    """Requirements no traced module imports (transitive dependencies excluded)."""
+    imported = {name.lower() for name in third_party}
+    return [name for name in requirements
+            if name not in TRANSITIVE_REQUIREMENTS and IMPORT_NAMES.get(name, name).lower() not in imported]
+
+
+def _bundle_files(source_dir: Path, shared_dir: Path, shared_files: Optional[List[str]]) -> Dict[str, Path]:
+    files = {}
+    for path in sorted(source_dir.rglob('*')):
+        if path.is_file() and '__pycache__' not in path.parts and path.name != 'requirements.txt':
+            files[path.relative_to(source_dir).as_posix()] = path
+    if shared_files is None:
+        shared_files = [p.relative_to(shared_dir).as_posix() for p in sorted(shared_dir.rglob('*'))
+                        if p.is_file() and '__pycache__' not in p.parts]
+    for rel in shared_files:
+        files[f"{SHARED_PACKAGE}/{rel}"] = shared_dir / rel
+    return files
+
+
+def build_zip(files: Dict[str, Path]) -> bytes:
+    """Zip the first-party part of a bundle (dependencies are added by the pip build step)."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, path in files.items():
+            archive.write(path, name)
+    return buffer.getvalue()
+
+
+def measure_import_ms(zip_bytes: bytes, module: str = 'index', runs: int = 5) -> float:
+    """Median import time of the handler from an extracted bundle, in fresh interpreters."""
+    snippet = (f"import time; s = time.perf_counter(); import {module}; "
+               f"print((time.perf_counter() - s) * 1000)")
+    with tempfile.TemporaryDirectory() as task_root:
+        zipfile.ZipFile(io.BytesIO(zip_bytes)).extractall(task_root)
+        env = dict(os.environ, LAMBDA_TASK_ROOT=task_root, PYTHONPATH=task_root)
+        env.setdefault('REGION', 'us-east-2')
+        timings = sorted(
+            float(subprocess.run([sys.executable, '-c', snippet], cwd=task_root, env=env,
+                                 capture_output=True, text=True, check=True).stdout.strip().splitlines()[-1])
+            for _ in range(runs)
+        )
+    return timings[len(timings) // 2]
+
+
+def external_data_source() -> None:
+    """Terraform external data source protocol: JSON query on stdin, flat JSON of strings on stdout."""
+    query = json.load(sys.stdin)
+    handler_module = query.get('handler', 'index.handler').rsplit('.', 1)[0]
+    trace = ImportTracer(Path(query['source_path']), Path(query['shared_folder'])).trace(handler_module)
+    if trace.unresolved:
+        sys.exit(f"Handler module not found: {', '.join(trace.unresolved)}")
+    json.dump({
+        'shared_patterns': json.dumps(trace.shared_patterns()),
+        'shared_modules': ','.join(trace.shared_modules),
+    }, sys.stdout)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--terraform-external':
+        external_data_source()
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('source_dir', type=Path)
+    parser.add_argument('--shared', type=Path, required=True)
+    parser.add_argument('--handler', default='index.handler')
+    parser.add_argument('--zip', type=Path, help='Write the minimal first-party bundle to this path')
+    parser.add_argument('--measure', action='store_true', help='Compare cold-start import time of both bundles')
+    args = parser.parse_args()
+
+    handler_module = args.handler.rsplit('.', 1)[0]
+    source_dir, shared_dir = args.source_dir.resolve(), args.shared.resolve()
+    trace = ImportTracer(source_dir, shared_dir).trace(handler_module)
+    if trace.unresolved:
+        sys.exit(f"Handler module not found: {', '.join(trace.unresolved)}")
+
+    all_shared = sorted(p.stem for p in shared_dir.glob('*.py') if p.stem != '__init__')
+    used = {module.split('.', 1)[1] for module in trace.shared_modules if '.' in module}
+    print(f"{source_dir}: {len(trace.local_modules)} local, {len(trace.shared_modules)} shared modules")
+    print(f"  shared modules kept:    {', '.join(sorted(used))}")
+    print(f"  shared modules dropped: {', '.join(name for name in all_shared if name not in used) or '-'}")
+    print(f"  shared data files:      {', '.join(f for f in trace.shared_files if not f.endswith('.py')) or '-'}")
+    print(f"  third-party imports:    {', '.join(trace.third_party) or '-'}")
+    unused = unused_requirements(read_requirements(source_dir), trace.third_party)
+    print(f"  unused requirements:    {', '.join(unused) or '-'}")
+
+    full_zip = build_zip(_bundle_files(source_dir, shared_dir, None))
+    minimal_zip = build_zip(_bundle_files(source_dir, shared_dir, trace.shared_files))
+    print(f"  first-party zip:        {len(full_zip) / 1024:.1f} KB -> {len(minimal_zip) / 1024:.1f} KB")
+    if args.zip:
+        args.zip.write_bytes(minimal_zip)
+        print(f"  wrote {args.zip}")
+    if args.measure:
+        print(f"  cold-start import:      {measure_import_ms(full_zip, handler_module):.1f} ms -> "
+              f"{measure_import_ms(minimal_zip, handler_module):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -98,4 +98,10 @@ variable "shared_folder" {
   type        = string
   description = "List of comands to execute"
   default     = ""
-}
\ No newline at end of file
+}
+
+variable "trace_shared_imports" {
+  type        = bool
+  description = "Only package the shared modules reachable from the handler (scripts/trace_bundle.py)"
+  default     = false
+}
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test the attempt metadata of Bedrock retries and where it is surfaced.
+"""
+
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+
+from botocore.exceptions import ClientError
+
+import shared.bedrock_client as bedrock_client
+from shared.bedrock_client import call_bedrock_unified, call_bedrock_with_retry
+from shared.metrics import metrics
+from shared.result_builder import build_model_info
+from shared.usage_ledger import usage_ledger
+
+NOVA = "us.amazon.nova-pro-v1:0"
+
+
+class _RecordedSleeps:
+    """Stands in for the time module: sleeps are recorded, not slept."""
+
+    def __init__(self):
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+    def perf_counter(self):
+        return time.perf_counter()
+
+    def time(self):
+        return time.time()
+
+
+def _error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'Converse')
+
+
+class _FlakyClient:
+    def __init__(self, failures):
+        self.failures = list(failures)
+
+    def converse(self, **kwargs):
+        if self.failures:
+            raise _error(self.failures.pop(0))
+        return {'output': {'message': {'content': [{'text': '{}'}]}}, 'stopReason': 'end_turn',
+                'usage': {'inputTokens': 10, 'outputTokens': 2}}
+
+
+def _with_recorded_sleeps(func):
+    recorded = _RecordedSleeps()
+    saved_time, saved_delay = bedrock_client.time, os.environ.get('INTER_CALL_DELAY')
+    bedrock_client.time = recorded
+    os.environ['INTER_CALL_DELAY'] = '0'
+    try:
+        return func(), recorded.sleeps
+    finally:
+        bedrock_client.time = saved_time
+        if saved_delay is None:
+            del os.environ['INTER_CALL_DELAY']
+        else:
+            os.environ['INTER_CALL_DELAY'] = saved_delay
+
+
+def test_retry_info_counts_attempts_backoff_and_error_codes():
+    """Throttled attempts are retried and reported with the time slept between them"""
+    client = _FlakyClient(['ThrottlingException', 'ThrottlingException'])
+
+    (response, info), sleeps = _with_recorded_sleeps(
+        lambda: call_bedrock_with_retry(client, client.converse, {'modelId': NOVA}))
+
+    assert response['stopReason'] == 'end_turn'
+    assert (info.attempts, info.retries) == (3, 2)
+    assert info.error_codes == ['ThrottlingException', 'ThrottlingException']
+    assert len(sleeps) == 2
+    assert abs(info.backoff_seconds - sum(sleeps)) < 1e-9
+    assert info.to_dict()['retries'] == 2
+
+
+def test_failed_call_carries_retry_info():
+    """A non-throttling error is not retried, and the raised error exposes its attempts"""
+    client = _FlakyClient(['ValidationException'])
+
+    try:
+        _with_recorded_sleeps(lambda: call_bedrock_with_retry(client, client.converse, {'modelId': NOVA}))
+    except ClientError as e:
+        assert (e.retry_info.attempts, e.retry_info.error_codes) == (1, ['ValidationException'])
+        assert e.retry_info.backoff_seconds == 0.0
+    else:
+        raise AssertionError("ValidationException was swallowed")
+
+
+def test_retry_info_reaches_model_info_metrics_and_ledger():
+    """Attempts and backoff flow into the response, build_model_info, EMF metrics and the usage ledger"""
+    client = _FlakyClient(['ThrottlingException'])
+    saved_stream, saved_enabled = metrics.stream, metrics.enabled
+    metrics.stream, metrics.enabled = io.StringIO(), True
+    try:
+        metrics.flush()
+        with usage_ledger.attribute('extraction') as usage:
+            response, sleeps = _with_recorded_sleeps(
+                lambda: call_bedrock_unified({'model_id': NOVA, 'messages': [], 'params': {}}, client))
+        documents = metrics.documents()
+    finally:
+        metrics.flush()
+        metrics.stream, metrics.enabled = saved_stream, saved_enabled
+
+    assert response['retry_info']['attempts'] == 2
+    assert build_model_info(NOVA, 'converse', response)['retry_info'] == response['retry_info']
+    model_line = next(doc for doc in documents if doc.get('Model') == NOVA and 'BedrockLatency' in doc)
+    assert model_line['BedrockAttempts'] == 2
+    assert model_line['ThrottleRetries'] == 1
+    assert model_line['BackoffTime'] == response['retry_info']['backoff_seconds'] * 1000
+    call = usage.summary()['calls'][0]
+    assert call['attempts'] == 2
+    assert abs(call['backoff_ms'] - sleeps[0] * 1000) < 1
+
+
+if __name__ == "__main__":
+    test_retry_info_counts_attempts_backoff_and_error_codes()
+    test_failed_call_carries_retry_info()
+    test_retry_info_reaches_model_info_metrics_and_ledger()
+    print("✅ All Bedrock retry telemetry tests passed")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test benchmark baselines (save, load, regression checks) and the single-handler harness.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / 'bench'))
+
+from baseline import compare, load_baseline, save_baseline
+from simulator import SimulationConfig, synthetic_documents
+from simulator.harness import HandlerHarness
+
+BASELINE = {
+    'extraction/batch3': {'docs_per_sec': 1.0, 'latency_p95': 10.0, 'peak_rss_mb': 100.0,
+                          'bedrock_calls_per_doc': 1.0},
+}
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    """Throughput must not drop, latency/memory/calls must not grow, beyond each tolerance"""
+    current = {
+        'extraction/batch3': {'docs_per_sec': 0.9, 'latency_p95': 14.0, 'peak_rss_mb': 110.0,
+                              'bedrock_calls_per_doc': 1.5},
+        'fallback/batch3': {'docs_per_sec': 0.1},
+    }
+
+    regressions = compare(BASELINE, current)
+
+    assert [(r.scenario, r.metric) for r in regressions] == [
+        ('extraction/batch3', 'latency_p95'),
+        ('extraction/batch3', 'bedrock_calls_per_doc'),
+    ]
+    assert round(regressions[0].change, 2) == 0.4
+
+
+def test_improvements_and_scaled_tolerance_pass():
+    """Faster runs never regress, and a scaled tolerance absorbs noise"""
+    faster = {'extraction/batch3': {'docs_per_sec': 2.0, 'latency_p95': 5.0, 'peak_rss_mb': 90.0,
+                                    'bedrock_calls_per_doc': 1.0}}
+    noisy = {'extraction/batch3': {'docs_per_sec': 0.8, 'latency_p95': 12.8}}
+
+    assert compare(BASELINE, faster) == []
+    assert compare(BASELINE, noisy, scale=1.0) != []
+    assert compare(BASELINE, noisy, scale=1.5) == []
+
+
+def test_baseline_round_trip():
+    """Saved baselines keep their metrics and settings"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'baseline.json'
+        save_baseline(path, BASELINE, settings={'time_scale': 0.01})
+        baseline = load_baseline(path)
+
+    assert baseline['scenarios'] == BASELINE
+    assert baseline['meta']['settings'] == {'time_scale': 0.01}
+    assert 'python' in baseline['meta']
+
+
+def test_harness_invokes_extraction_with_sqs_batch():
+    """A batch in classification's payload format is extracted with one Bedrock call per document"""
+    documents = synthetic_documents(4, scanned_rate=0.0, seed=3)
+    harness = HandlerHarness('extraction-scoring', documents,
+                             SimulationConfig(time_scale=0.002, log_level='CRITICAL'))
+    try:
+        with harness.active():
+            results = [harness.invoke(batch) for batch in harness.batches(3)]
+    finally:
+        harness.close()
+
+    assert [result.size for result in results] == [3, 1]
+    assert all(result.status_code == 200 and result.error is None for result in results)
+    assert harness.bedrock_calls() == 4
+    assert harness.aws.sqs.depth(harness.queues['fallback']) == (0, 0)
+    extractions = harness.aws.s3.keys('sim-json-evaluation-results', 'par-servicios-poc/extraction/')
+    assert len(extractions) == 4
+
+
+if __name__ == "__main__":
+    test_compare_flags_only_regressions_beyond_tolerance()
+    test_improvements_and_scaled_tolerance_pass()
+    test_baseline_round_trip()
+    test_harness_invokes_extraction_with_sqs_batch()
+    print("✅ All bench baseline tests passed")
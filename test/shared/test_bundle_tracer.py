@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test the static import tracer used to build minimal per-function Lambda bundles.
+"""
+
+import io
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / 'terraform' / 'modules' / 'lambda-wrapper' / 'scripts'))
+
+from trace_bundle import ImportTracer, build_zip, _bundle_files, read_requirements, unused_requirements
+
+FUNCTIONS_DIR = REPO_ROOT / 'functions'
+SHARED_DIR = FUNCTIONS_DIR / 'shared'
+
+
+def _trace(function: str):
+    return ImportTracer(FUNCTIONS_DIR / function / 'src', SHARED_DIR).trace('index')
+
+
+def test_handlers_only_ship_the_shared_modules_they_import():
+    classification = _trace('classification')
+    extraction = _trace('extraction-scoring')
+    fallback = _trace('fallback-processing')
+
+    for trace in (classification, extraction, fallback):
+        assert trace.local_modules == ['index']
+        assert not trace.unresolved
+        assert {'shared', 'shared.bedrock_client', 'shared.prompt_loader'} <= set(trace.shared_modules)
+        assert 'shared.report_generator' in trace.shared_modules
+        assert '__init__.py' in trace.shared_files
+
+    # Imported inside functions only, still needed at runtime
+    assert 'shared.text_race' in fallback.shared_modules
+    assert 'shared.text_race' not in extraction.shared_modules
+    assert 'shared.sqs_handler' not in fallback.shared_modules
+
+
+def test_declared_data_files_are_bundled():
+    trace = _trace('extraction-scoring')
+    assert 'schemas/RUT.json' in trace.shared_files
+    assert '!.*' == trace.shared_patterns()[0]
+    assert 'schemas/RUT\\.json' in trace.shared_patterns()
+
+
+def test_requirements_match_traced_imports():
+    for function in ('classification', 'extraction-scoring', 'fallback-processing'):
+        source_dir = FUNCTIONS_DIR / function / 'src'
+        trace = ImportTracer(source_dir, SHARED_DIR).trace('index')
+        assert unused_requirements(read_requirements(source_dir), trace.third_party) == [], function
+
+    assert unused_requirements(['boto3', 'botocore', 'pydantic', 'typing-extensions'], ['boto3']) == \
+        ['pydantic', 'typing-extensions']
+
+
+def test_relative_imports_and_minimal_zip():
+    with tempfile.TemporaryDirectory() as root:
+        source, shared = Path(root) / 'src', Path(root) / 'shared'
+        (shared / 'sub').mkdir(parents=True)
+        source.mkdir()
+        (source / 'index.py').write_text(
+            "from shared.a import run\n\ndef handler(event, context):\n    import yaml\n    return run()\n")
+        (shared / '__init__.py').write_text('')
+        (shared / 'a.py').write_text("import json\nfrom .sub import b\n\ndef run():\n    return b.VALUE\n")
+        (shared / 'sub' / '__init__.py').write_text('')
+        (shared / 'sub' / 'b.py').write_text("from ..c import VALUE\n")
+        (shared / 'c.py').write_text("VALUE = 1\n")
+        (shared / 'unused.py').write_text("import numpy\n")
+
+        trace = ImportTracer(source, shared).trace('index')
+        assert trace.shared_files == ['__init__.py', 'a.py', 'c.py', 'sub/__init__.py', 'sub/b.py']
+        assert trace.third_party == ['yaml']
+
+        archive = zipfile.ZipFile(io.BytesIO(build_zip(_bundle_files(source, shared, trace.shared_files))))
+        assert 'shared/unused.py' not in archive.namelist()
+        assert 'index.py' in archive.namelist()
+
+
+if __name__ == "__main__":
+    test_handlers_only_ship_the_shared_modules_they_import()
+    test_declared_data_files_are_bundled()
+    test_requirements_match_traced_imports()
+    test_relative_imports_and_minimal_zip()
+    print("✅ All bundle tracer tests passed")
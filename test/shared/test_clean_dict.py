@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test the iterative copy-on-write clean_dict_for_json and chunked JSON encoding.
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+
+from shared.report_generator import _is_clean_text, clean_dict_for_json, iter_json_chunks
+from shared.text_utils import clean_text_for_json
+
+
+def _reference(obj):
+    """clean_dict_for_json as previously implemented (recursive, copies everything)."""
+    if isinstance(obj, dict):
+        return {key: _reference(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [_reference(item) for item in obj]
+    elif isinstance(obj, str):
+        return clean_text_for_json(obj)
+    return obj
+
+
+def _payload():
+    return {
+        'document_number': '900123456',
+        'extraction_result': {
+            'companyName': 'ACME  S.A.S.\x0c',
+            'shareholders': [{'name': 'Juan Pérez', 'percentage': 50.0},
+                             {'name': ' María\u2028Gómez ', 'percentage': 50.0}],
+            'flags': [],
+        },
+        'model_info': {'model_id': 'us.amazon.nova-pro-v1:0', 'tokens': 1200, 'fallback': None},
+        'extracted_text': 'Razón social\nNIT 900.123.456-7',
+        'clean': {'nested': ['already clean', 'Cámara de Comercio', 3, True]},
+    }
+
+
+def test_matches_previous_implementation():
+    payload = _payload()
+    assert clean_dict_for_json(payload) == _reference(payload)
+    for value in ('  x ', 'ok', '', None, 7, [], {}):
+        assert clean_dict_for_json(value) == _reference(value)
+
+    for text in ('plain', 'Cámara de Comercio', '', ' lead', 'trail ', 'two  spaces', 'tab\there',
+                 'nbsp\u00a0', 'zw\u200bsp', 'line\u2028sep'):
+        assert _is_clean_text(text) == (clean_text_for_json(text) == text), repr(text)
+
+
+def test_only_changed_containers_are_copied():
+    payload = _payload()
+    cleaned = clean_dict_for_json(payload)
+
+    assert cleaned is not payload
+    assert cleaned['extraction_result'] is not payload['extraction_result']
+    assert cleaned['extraction_result']['shareholders'][0] is payload['extraction_result']['shareholders'][0]
+    assert cleaned['extraction_result']['shareholders'][1] is not payload['extraction_result']['shareholders'][1]
+    assert cleaned['model_info'] is payload['model_info']
+    assert cleaned['clean'] is payload['clean']
+    # Input is left untouched
+    assert payload['extraction_result']['companyName'] == 'ACME  S.A.S.\x0c'
+
+    already_clean = _reference(payload)
+    assert clean_dict_for_json(already_clean) is already_clean
+
+
+def test_deep_structures_do_not_recurse():
+    deep = leaf = {}
+    for _ in range(5000):
+        leaf['child'] = [{'text': 'a  b'}]
+        leaf = leaf['child'][0]
+    cleaned = clean_dict_for_json(deep)
+
+    node = cleaned
+    for _ in range(5000):
+        node = node['child'][0]
+    assert node == {'text': 'a b'}
+    assert cleaned['child'][0]['text'] == 'a b'
+
+
+def test_json_chunks_match_save_to_s3_encoding():
+    payload = _payload()
+    assert ''.join(iter_json_chunks(payload)) == json.dumps(_reference(payload), indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    test_matches_previous_implementation()
+    test_only_changed_containers_are_copied()
+    test_deep_structures_do_not_recurse()
+    test_json_chunks_match_save_to_s3_encoding()
+    print("✅ All clean_dict_for_json tests passed")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test the load-shape generators and the simulator's mapping scaling, throttling and queue-age sampling.
+"""
+
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / 'bench'))
+
+from simulator import PipelineSimulator, SimClock, SimulationConfig, default_functions, synthetic_documents
+from simulator.aws_fakes import FakeSQS
+from simulator.load_shapes import LOAD_SHAPES, arrivals
+
+
+def test_shapes_spread_every_document_over_the_duration():
+    """Every shape gives one sorted upload time per document, reproducible from its seed"""
+    for shape in LOAD_SHAPES:
+        times = arrivals(shape, 200, 3600.0, seed=3)
+
+        assert len(times) == 200 and times == sorted(times), shape
+        assert times[0] >= 0.0 and times[-1] < 3600.0 * 1.5, shape
+        assert arrivals(shape, 200, 3600.0, seed=3) == times, shape
+
+
+def test_shapes_follow_their_profile():
+    """Bursts leave quiet gaps, ramps back-load traffic, diurnal traffic peaks mid-period"""
+    bursts = arrivals('burst', 60, 3600.0, seed=1, burst_size=20, burst_seconds=30.0)
+    gaps = sorted(later - earlier for earlier, later in zip(bursts, bursts[1:]))
+    assert all(gap <= 30.0 for gap in gaps[:-2]) and gaps[-2] > 300.0
+
+    ramp = arrivals('ramp', 400, 1000.0, seed=1)
+    assert sum(t >= 500.0 for t in ramp) > 2 * sum(t < 500.0 for t in ramp)
+
+    diurnal = arrivals('diurnal', 400, 1000.0, seed=1, period=1000.0, amplitude=1.0)
+    assert sum(250.0 <= t < 750.0 for t in diurnal) > 3 * sum(t < 250.0 or t >= 750.0 for t in diurnal)
+
+    try:
+        arrivals('sawtooth', 10, 100.0)
+        assert False, "unknown shapes should be rejected"
+    except ValueError:
+        pass
+
+
+def test_oldest_message_age():
+    """The oldest message not yet deleted sets the queue age, in flight or not"""
+    clock = SimClock(0.001)
+    sqs = FakeSQS(clock)
+    queue = sqs.create_queue('work')
+    assert sqs.oldest_age(queue) == 0.0
+
+    sqs.enqueue(queue, '{"n": 1}')
+    clock.sleep(5.0)
+    sqs.enqueue(queue, '{"n": 2}')
+    message = sqs.receive(queue, 1)[0]
+    assert sqs.oldest_age(queue) >= 5.0
+
+    sqs.delete(queue, message)
+    assert sqs.oldest_age(queue) < 5.0
+
+
+def test_mapping_above_function_concurrency_is_throttled():
+    """Batches beyond the function's concurrency are throttled and redelivered after the visibility timeout"""
+    functions = [replace(f, initial_concurrency=1, maximum_concurrency=3, cold_start=2.0)
+                 for f in default_functions(concurrency=1)]
+    config = SimulationConfig(time_scale=0.002, functions=functions, visibility_timeout=30.0,
+                              queue_sample_interval=5.0, log_level='CRITICAL')
+    documents = synthetic_documents(9, categories=('RUT',))
+
+    report = PipelineSimulator(documents, config).run(arrivals=[0.0] * 9)
+
+    classification = report.functions['classification']
+    assert report.outcomes['extracted'] == 9
+    assert classification['throttles'] > 0 and classification['throttled_messages'] >= classification['throttles']
+    assert 0.0 < classification['throttle_rate'] < 1.0
+    assert classification['peak_concurrency'] == 1 and classification['peak_scaled_concurrency'] > 1
+    assert classification['cold_starts'] == 1
+    assert classification['queue_age']['max'] >= 30.0
+    assert classification['max_queue_depth'] == 9
+
+
+if __name__ == "__main__":
+    test_shapes_spread_every_document_over_the_duration()
+    test_shapes_follow_their_profile()
+    test_oldest_message_age()
+    test_mapping_above_function_concurrency_is_throttled()
+    print("✅ All load shape tests passed")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test the per-invocation memory records, tracemalloc stages and the offline memory advisor.
+"""
+
+import io
+import json
+import logging
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / 'functions'))
+sys.path.insert(0, str(REPO_ROOT / 'bench'))
+
+from shared.memory_profile import MemoryProfiler, stage, staged
+from shared.metrics import metrics
+from memory_advisor import advise, estimate_duration_ms, format_report, parse_records
+
+
+@staged('build')
+def _build(blocks):
+    return [bytes(1024) for _ in range(blocks)]
+
+
+def test_invocation_record_without_tracemalloc():
+    """Every invocation gets the container peak RSS, its growth, duration and CPU time; stages are no-ops when not traced"""
+    profiler = MemoryProfiler(enabled=True, tracemalloc_rate=0.0)
+
+    with profiler.invocation('classification') as record:
+        with stage('bedrock'):
+            _build(10)
+
+    assert record['event'] == 'memory' and record['function'] == 'classification'
+    assert record['traced'] is False and 'stages' not in record
+    assert record['container_peak_rss_mb'] >= record['container_peak_rss_start_mb'] > 0
+    assert record['rss_growth_mb'] == round(record['container_peak_rss_mb'] - record['container_peak_rss_start_mb'], 1)
+    assert record['duration_ms'] >= 0 and record['cpu_ms'] >= 0
+
+
+def test_traced_stages_record_peaks_and_allocation_sites():
+    """Traced invocations record each stage's traced peak, nested stages included, and its allocation sites"""
+    profiler = MemoryProfiler(enabled=True, tracemalloc_rate=1.0)
+
+    with profiler.invocation('fallback-processing') as record:
+        with stage('pypdf'):
+            kept = _build(2048)
+            scratch = bytearray(4 * 1024 * 1024)
+            del scratch
+
+    stages = {s['name']: s for s in record['stages']}
+    assert record['traced'] is True
+    assert [s['name'] for s in record['stages']] == ['build', 'pypdf']
+    assert stages['build']['peak_traced_mb'] >= 2.0
+    # The 4 MB scratch buffer is freed, but it is the outer stage's peak
+    assert stages['pypdf']['peak_traced_mb'] >= 6.0
+    assert 2.0 <= stages['pypdf']['net_traced_mb'] < 4.0
+    assert stages['build']['top_allocations'][0]['site'].startswith('test_memory_profile.py:')
+    assert len(kept) == 2048
+
+
+def test_records_are_logged_and_measured():
+    """The record is logged as one JSON line the advisor can parse, and ContainerPeakMemory is put"""
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    log = logging.getLogger('shared.memory_profile')
+    saved_level, saved_enabled, saved_stream = log.level, metrics.enabled, metrics.stream
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    metrics.enabled, metrics.stream = True, io.StringIO()
+    try:
+        metrics.flush()
+        with MemoryProfiler(enabled=True, tracemalloc_rate=0.0).invocation('extraction-scoring'):
+            pass
+        documents = metrics.documents()
+    finally:
+        metrics.flush()
+        log.removeHandler(handler)
+        log.setLevel(saved_level)
+        metrics.enabled, metrics.stream = saved_enabled, saved_stream
+
+    records = list(parse_records(f"[INFO]\t2026-10-18T10:00:00Z\treq-1\t{line}" for line in stream.getvalue().splitlines()))
+    assert len(records) == 1 and records[0]['function'] == 'extraction-scoring'
+    assert any('ContainerPeakMemory' in doc for doc in documents)
+
+
+def _records(function, count, peak_mb, duration_ms, cpu_ms, memory_mb=1024, growth_mb=0.0):
+    return [{'event': 'memory', 'function': function, 'memory_limit_mb': memory_mb,
+             'container_peak_rss_mb': peak_mb, 'rss_growth_mb': growth_mb,
+             'duration_ms': duration_ms, 'cpu_ms': cpu_ms} for _ in range(count)]
+
+
+def test_advisor_recommends_sizes_that_fit_the_peak():
+    """I/O-bound functions go to the smallest size that fits; CPU-bound ones gain from more memory"""
+    records = (_records('classification', 20, 180.0, 4000.0, 200.0)
+               + _records('fallback-processing', 20, 700.0, 10000.0, 9000.0))
+
+    report = advise(json.loads(json.dumps(r)) for r in records)
+
+    classification = report['classification']
+    assert classification['required_mb'] == 225.0
+    assert classification['cheapest_mb'] == 256
+    fallback = report['fallback-processing']
+    assert all(e['memory_mb'] >= 875 for e in fallback['estimates'] if e['fits'])
+    assert fallback['cheapest_mb'] >= 1024
+    assert fallback['balanced_mb'] >= fallback['cheapest_mb']
+    assert estimate_duration_ms(10000.0, 9000.0, 1024, 1769) < estimate_duration_ms(10000.0, 9000.0, 1024, 1024)
+    assert estimate_duration_ms(10000.0, 9000.0, 1769, 3008) == 10000.0
+
+
+def test_advisor_sizes_for_the_container_peak_and_reports_growth():
+    """Warm invocations repeat the container peak; sizing uses it, growth shows the invocation that set it"""
+    records = (_records('extraction-scoring', 1, 400.0, 3000.0, 300.0, growth_mb=250.0)
+               + _records('extraction-scoring', 19, 400.0, 3000.0, 300.0))
+
+    entry = advise(records)['extraction-scoring']
+
+    assert entry['container_peak_rss_max_mb'] == 400.0 and entry['required_mb'] == 500.0
+    assert entry['rss_growth_max_mb'] == 250.0
+    assert 'invocation RSS growth' in format_report({'extraction-scoring': entry})
+
+
+if __name__ == "__main__":
+    test_invocation_record_without_tracemalloc()
+    test_traced_stages_record_peaks_and_allocation_sites()
+    test_records_are_logged_and_measured()
+    test_advisor_recommends_sizes_that_fit_the_peak()
+    test_advisor_sizes_for_the_container_peak_and_reports_growth()
+    print("✅ All memory profile tests passed")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test EMF pipeline metrics: line format, bounded dimensions, per-invocation flushing.
+"""
+
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+
+from shared.bedrock_client import parse_extraction_response, record_call_metrics
+from shared.metrics import MAX_DIMENSION_VALUES, OTHER, Metrics, metrics, token_counts
+
+NOVA = "us.amazon.nova-pro-v1:0"
+
+
+def _lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_emf_line_per_dimension_set():
+    """Values of one dimension set share a line; each line declares its metrics and dimensions"""
+    stream = io.StringIO()
+    emf = Metrics(namespace='Test/Pipeline', enabled=True, stream=stream)
+    emf.function = 'extraction-scoring'
+
+    emf.put('BedrockLatency', 1200.0, 'Milliseconds', Model=NOVA)
+    emf.put('BedrockLatency', 900.0, 'Milliseconds', Model=NOVA)
+    emf.put('InputTokens', 5000, Model=NOVA)
+    emf.put('DocumentsPerBatch', 3)
+
+    assert emf.flush() == 2
+    by_model = {line.get('Model'): line for line in _lines(stream)}
+    line = by_model[NOVA]
+    directive = line['_aws']['CloudWatchMetrics'][0]
+    assert directive['Namespace'] == 'Test/Pipeline'
+    assert directive['Dimensions'] == [['Function', 'Model']]
+    assert {'Name': 'BedrockLatency', 'Unit': 'Milliseconds'} in directive['Metrics']
+    assert line['BedrockLatency'] == [1200.0, 900.0]
+    assert line['InputTokens'] == 5000
+    assert line['Function'] == 'extraction-scoring'
+    assert by_model[None]['DocumentsPerBatch'] == 3
+
+
+def test_dimension_cardinality_is_bounded():
+    """Unknown closed values and open values past the limit become 'other'; undeclared keys fail"""
+    emf = Metrics(enabled=True, stream=io.StringIO())
+
+    for i in range(MAX_DIMENSION_VALUES + 5):
+        emf.count('ThrottleRetries', Model=f"model-{i}")
+    emf.count('ResponsesParsed', ParsePath='raw_json')
+    emf.count('ResponsesParsed', ParsePath='made_up_path')
+    emf.count('FallbackPhase', Phase='textract')
+
+    models = {doc.get('Model') for doc in emf.documents() if 'ThrottleRetries' in doc}
+    assert len(models) == MAX_DIMENSION_VALUES + 1
+    assert OTHER in models
+    paths = {doc['ParsePath'] for doc in emf.documents() if 'ResponsesParsed' in doc}
+    assert paths == {'raw_json', OTHER}
+
+    try:
+        emf.count('ResponsesParsed', DocumentKey='s3://bucket/doc.pdf')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("undeclared dimension accepted")
+
+
+def test_flushed_once_per_invocation():
+    """Nothing is written while the handler runs; the buffer is written and cleared when it returns"""
+    stream = io.StringIO()
+    emf = Metrics(enabled=True, stream=stream)
+
+    @emf.invocation('fallback-processing')
+    def handler(event, context):
+        for phase in event['phases']:
+            emf.count('FallbackPhase', Phase=phase)
+        assert stream.getvalue() == ''
+        return {'statusCode': 200}
+
+    assert handler({'phases': ['pypdf', 'pypdf', 'manual_review']}, None) == {'statusCode': 200}
+
+    lines = _lines(stream)
+    assert len(lines) == 2
+    assert {line['Phase']: line['FallbackPhase'] for line in lines} == {'pypdf': [1, 1], 'manual_review': 1}
+    assert all(line['Function'] == 'fallback-processing' for line in lines)
+    assert emf.flush() == 0
+
+
+def test_long_series_split_and_disabled_noop():
+    """More than 100 values of a metric span several lines; disabled metrics write nothing"""
+    stream = io.StringIO()
+    emf = Metrics(enabled=True, stream=stream)
+    for i in range(250):
+        emf.put('BedrockLatency', float(i), 'Milliseconds', Model=NOVA)
+    emf.flush()
+    assert [len(line['BedrockLatency']) for line in _lines(stream)] == [100, 100, 50]
+
+    disabled_stream = io.StringIO()
+    disabled = Metrics(enabled=False, stream=disabled_stream)
+    disabled.put('BedrockLatency', 1.0, 'Milliseconds', Model=NOVA)
+    assert disabled.documents() == []
+    assert disabled.flush() == 0
+    assert disabled_stream.getvalue() == ''
+
+
+def test_token_counts_and_bedrock_recording():
+    """Both usage formats are read, and parse paths and calls reach the shared metrics"""
+    assert token_counts({'inputTokens': 10, 'outputTokens': 2, 'cacheReadInputTokens': 7}) == \
+        {'input': 10, 'output': 2, 'cache_read': 7, 'cache_write': 0}
+    assert token_counts({'input_tokens': 4, 'output_tokens': 1, 'cache_creation_input_tokens': 3}) == \
+        {'input': 4, 'output': 1, 'cache_read': 0, 'cache_write': 3}
+    assert token_counts(None) == {'input': 0, 'output': 0, 'cache_read': 0, 'cache_write': 0}
+
+    saved_stream, saved_enabled = metrics.stream, metrics.enabled
+    metrics.stream, metrics.enabled = io.StringIO(), True
+    try:
+        metrics.flush()
+        record_call_metrics(NOVA, 1500.0, {'inputTokens': 900, 'outputTokens': 80})
+        parse_extraction_response({'model_id': NOVA, 'output': {'message': {'content': [
+            {'text': '```json\n{"result": {"CompanyName": "ACME"}}\n```'}]}}})
+        documents = metrics.documents()
+    finally:
+        metrics.flush()
+        metrics.stream, metrics.enabled = saved_stream, saved_enabled
+
+    model_line = next(doc for doc in documents if doc.get('Model') == NOVA)
+    assert model_line['BedrockLatency'] == 1500.0
+    assert (model_line['InputTokens'], model_line['OutputTokens']) == (900, 80)
+    assert 'CacheReadTokens' not in model_line
+    assert next(doc for doc in documents if 'ResponsesParsed' in doc)['ParsePath'] == 'fenced_json'
+
+
+if __name__ == "__main__":
+    test_emf_line_per_dimension_set()
+    test_dimension_cardinality_is_bounded()
+    test_flushed_once_per_invocation()
+    test_long_series_split_and_disabled_noop()
+    test_token_counts_and_bedrock_recording()
+    print("✅ All metrics tests passed")
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Test the notebook-test parallel runner: rate limiting, the PDF cache, streamed results and resumed runs.
+"""
+
+import _thread
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / 'notebook-test' / 'src'))
+
+import parallel_runner
+from config_loader import ConfigLoader
+from parallel_runner import ParallelEvaluator, PDFCache, RateLimiter, ResultStore
+import test_manager
+
+CONFIG = """
+documents:
+  passport:
+    s3_path: "s3://bucket/CECRL/1/passport.pdf"
+    type: "CECRL"
+    test_type: "field_accuracy"
+    test_config:
+      prompts_to_test: ["v1", "v2", "v3"]
+      expected_results:
+        firstName: "Dirk"
+  cedula:
+    s3_path: "s3://bucket/CECRL/2/cedula.pdf"
+    type: "CECRL"
+    test_type: "field_accuracy"
+    test_config:
+      prompts_to_test: ["v2"]
+      expected_results:
+        firstName: "Ana"
+"""
+
+
+class FakeExtractor:
+    """
+    Answers every extraction with the expected names. The listed (s3_path, prompt) pairs fail once:
+    fail_once raises, throttle_once returns the error DocumentExtractor gives for a failed Bedrock call
+    """
+
+    def __init__(self, fail_once=(), throttle_once=(), delay=0.01):
+        self.bedrock_client = object()
+        self.delay = delay
+        self.s3_client = None
+        self.fail_once = set(fail_once)
+        self.throttle_once = set(throttle_once)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def extract_from_document(self, s3_path, prompt_version, document_type, model_id, pdf_bytes=None):
+        with self._lock:
+            self.calls.append((s3_path, prompt_version, pdf_bytes))
+            if (s3_path, prompt_version) in self.fail_once:
+                self.fail_once.discard((s3_path, prompt_version))
+                raise ConnectionError("read timeout")
+            if (s3_path, prompt_version) in self.throttle_once:
+                self.throttle_once.discard((s3_path, prompt_version))
+                return {"status": "error", "error": "Bedrock extraction failed"}
+        time.sleep(self.delay)
+        name = "Dirk" if "passport" in s3_path else "Ana"
+        return {"status": "success", "extracted_data": {"firstName": name}, "pdf_size_bytes": len(pdf_bytes or b"")}
+
+
+def _test_manager(config_dir, extractor):
+    """TestManager on a YAML configuration, without AWS clients"""
+    Path(config_dir, 'cecrl.yaml').write_text(CONFIG, encoding='utf-8')
+    tm = test_manager.TestManager.__new__(test_manager.TestManager)
+    tm.config_loader = ConfigLoader(config_dir)
+    tm.results = {}
+    tm.document_extractor = extractor
+    return tm
+
+
+def test_rate_limiter_spaces_calls_across_threads():
+    """Calls are spaced by 60/calls_per_minute seconds; no limit never waits"""
+    now = [100.0]
+    waits = []
+    limiter = RateLimiter(30, clock=lambda: now[0], sleep=waits.append)
+
+    assert [limiter.acquire() for _ in range(3)] == [0.0, 2.0, 4.0]
+    assert waits == [2.0, 4.0]
+    now[0] = 110.0
+    assert limiter.acquire() == 0.0
+    assert RateLimiter(None).acquire() == 0.0
+
+
+def test_pdf_cache_downloads_each_document_once():
+    """Concurrent requests share one download; a new cache reads the PDF back from disk"""
+    downloads = []
+
+    def fetch(s3_path):
+        downloads.append(s3_path)
+        time.sleep(0.05)
+        return b"%PDF-" + s3_path.encode()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PDFCache(fetch, cache_dir=tmp)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get("s3://bucket/a.pdf"))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert downloads == ["s3://bucket/a.pdf"] and cache.downloads == 1 and cache.hits == 4
+        assert results == [b"%PDF-s3://bucket/a.pdf"] * 5
+
+        assert PDFCache(fetch, cache_dir=tmp).get("s3://bucket/a.pdf") == b"%PDF-s3://bucket/a.pdf"
+        assert len(downloads) == 1
+
+
+def test_parallel_run_streams_results_and_resumes():
+    """Prompts come per document, results are streamed as they finish, and a resumed run only redoes errors"""
+    with tempfile.TemporaryDirectory() as tmp:
+        extractor = FakeExtractor(fail_once={("s3://bucket/CECRL/1/passport.pdf", "v2")})
+        tm = _test_manager(tmp, extractor)
+        results_path = Path(tmp) / 'parallel' / 'run.jsonl'
+        cache = PDFCache(lambda s3_path: b"%PDF-" + s3_path.encode(), cache_dir=None)
+
+        evaluator = ParallelEvaluator(tm, str(results_path), max_workers=4, calls_per_minute=None, pdf_cache=cache)
+        first = evaluator.run()
+
+        summary = first['field_accuracy_test']['summary']
+        assert summary['total_executions'] == 4 and summary['successful'] == 3 and len(summary['errors']) == 1
+        assert first['field_accuracy_test']['results']['cedula'].keys() == {'v2'}
+        assert cache.downloads == 2 and cache.hits == 2
+        assert all(pdf_bytes == b"%PDF-" + s3_path.encode() for s3_path, _, pdf_bytes in extractor.calls)
+        assert len(results_path.read_text(encoding='utf-8').splitlines()) == 4
+
+        # An interrupted write leaves a partial line behind
+        with open(results_path, 'a', encoding='utf-8') as f:
+            f.write('{"cell": "field_accur')
+        assert len(ResultStore(str(results_path)).records) == 4
+
+        calls = len(extractor.calls)
+        second = ParallelEvaluator(tm, str(results_path), calls_per_minute=None, pdf_cache=cache).run()
+
+        assert extractor.calls[calls:] == [("s3://bucket/CECRL/1/passport.pdf", "v2", extractor.calls[0][2])]
+        assert second['field_accuracy_test']['summary']['successful'] == 4
+        record = json.loads(results_path.read_text(encoding='utf-8').splitlines()[-1])
+        assert record['document'] == 'passport' and record['result']['status'] == 'success'
+
+
+def test_failed_model_calls_are_retried_on_resume():
+    """Cells whose Bedrock call failed (extraction_failed) are run again; answered ones are kept"""
+    with tempfile.TemporaryDirectory() as tmp:
+        extractor = FakeExtractor(throttle_once={("s3://bucket/CECRL/2/cedula.pdf", "v2")})
+        tm = _test_manager(tmp, extractor)
+        results_path = str(Path(tmp) / 'run.jsonl')
+        cache = PDFCache(lambda s3_path: b"%PDF-", cache_dir=None)
+
+        first = ParallelEvaluator(tm, results_path, calls_per_minute=None, pdf_cache=cache).run()
+        assert first['field_accuracy_test']['results']['cedula']['v2']['status'] == 'extraction_failed'
+
+        calls = len(extractor.calls)
+        second = ParallelEvaluator(tm, results_path, calls_per_minute=None, pdf_cache=cache).run()
+
+        assert [call[:2] for call in extractor.calls[calls:]] == [("s3://bucket/CECRL/2/cedula.pdf", "v2")]
+        assert second['field_accuracy_test']['summary']['successful'] == 4
+
+
+def test_interrupted_run_keeps_every_cell_that_called_bedrock():
+    """On Ctrl-C queued cells are not started, started ones are stored, and a resume only runs the rest"""
+    with tempfile.TemporaryDirectory() as tmp:
+        extractor = FakeExtractor(delay=0.2)
+        tm = _test_manager(tmp, extractor)
+        results_path = str(Path(tmp) / 'run.jsonl')
+        cache = PDFCache(lambda s3_path: b"%PDF-", cache_dir=None)
+
+        timer = threading.Timer(0.3, _thread.interrupt_main)
+        timer.start()
+        try:
+            ParallelEvaluator(tm, results_path, max_workers=1, calls_per_minute=None, pdf_cache=cache).run()
+            assert False, "the run should have been interrupted"
+        except KeyboardInterrupt:
+            pass
+        finally:
+            timer.cancel()
+        # Let the cell that was running finish
+        time.sleep(0.4)
+
+        interrupted_calls = len(extractor.calls)
+        assert 0 < interrupted_calls < 4
+        assert len(ResultStore(results_path).records) == interrupted_calls
+
+        resumed = ParallelEvaluator(tm, results_path, max_workers=1, calls_per_minute=None, pdf_cache=cache).run()
+
+        assert len(extractor.calls) == 4
+        assert resumed['field_accuracy_test']['summary']['successful'] == 4
+
+
+def test_run_parallel_rate_limit_defaults_and_can_be_turned_off():
+    """run_parallel takes the limit from the settings unless given; 0 turns it off"""
+    limits = []
+
+    class RecordingRateLimiter(RateLimiter):
+        def __init__(self, calls_per_minute, **kwargs):
+            limits.append(calls_per_minute)
+            super().__init__(calls_per_minute, **kwargs)
+
+    saved = parallel_runner.RateLimiter
+    parallel_runner.RateLimiter = RecordingRateLimiter
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            extractor = FakeExtractor()
+            # Without a Bedrock client the PDFs are not downloaded
+            extractor.bedrock_client = None
+            tm = _test_manager(tmp, extractor)
+            tm.config_loader.get_settings()['bedrock_calls_per_minute'] = 6000
+
+            results = tm.run_parallel(results_path=str(Path(tmp) / 'unlimited.jsonl'), calls_per_minute=0)
+            tm.run_parallel(results_path=str(Path(tmp) / 'default.jsonl'))
+    finally:
+        parallel_runner.RateLimiter = saved
+
+    assert limits == [0, 6000]
+    assert results['field_accuracy_test']['summary']['successful'] == 4
+
+
+def test_run_test_case_uses_prompts_per_document():
+    """The serial runner tests each document with its own prompt versions"""
+    with tempfile.TemporaryDirectory() as tmp:
+        extractor = FakeExtractor()
+        results = _test_manager(tmp, extractor).run_test_case('field_accuracy_test')
+
+    assert results['prompts_tested'] == ['v1', 'v2', 'v3']
+    assert results['summary']['total_executions'] == 4 and results['summary']['successful'] == 4
+    assert sorted(call[1] for call in extractor.calls if 'cedula' in call[0]) == ['v2']
+
+
+if __name__ == "__main__":
+    test_rate_limiter_spaces_calls_across_threads()
+    test_pdf_cache_downloads_each_document_once()
+    test_parallel_run_streams_results_and_resumes()
+    test_failed_model_calls_are_retried_on_resume()
+    test_interrupted_run_keeps_every_cell_that_called_bedrock()
+    test_run_parallel_rate_limit_defaults_and_can_be_turned_off()
+    test_run_test_case_uses_prompts_per_document()
+    print("✅ All parallel runner tests passed")
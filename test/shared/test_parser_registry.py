@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test the per-model-family response parser registry.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+
+from shared.parser_registry import ParserRegistry, parser_registry, model_family, parse_default
+from shared.bedrock_client import parse_classification, parse_extraction_response
+
+
+def test_model_family_dispatch():
+    assert model_family("us.amazon.nova-pro-v1:0") == "nova"
+    assert model_family("us.anthropic.claude-3-7-sonnet-20250219-v1:0") == "anthropic"
+    assert model_family("us.mistral.pixtral-large-2502-v1:0") == "mistral"
+    assert model_family("us.meta.llama4-maverick-17b-instruct-v1:0") == "llama"
+    assert model_family("cohere.command-r") == "default"
+    assert model_family(None) == "default"
+
+
+def test_family_quirks_are_handled_on_the_fast_path():
+    parser_registry.reset_stats()
+
+    mistral = '```json\n{"company\\_name": "ACME"}\n```'
+    assert parser_registry.parse_text(mistral, "mistral.pixtral").data == {"company_name": "ACME"}
+
+    llama = 'Here is the JSON:\n{"taxId": "900", "parties": [1, 2,],}'
+    assert parser_registry.parse_text(llama, "meta.llama3").data == {"taxId": "900", "parties": [1, 2]}
+
+    stats = parser_registry.stats()
+    assert stats["mistral"]["fast_path"] == 1
+    assert stats["llama"]["fast_path"] == 1
+
+
+def test_fast_path_miss_falls_back_to_generic_scan_and_is_counted():
+    parser_registry.reset_stats()
+    truncated = '{"result": {"parties": [{"name": "ANA"}, {"name": "LU'
+
+    outcome = parser_registry.parse_text(truncated, "anthropic.claude")
+    assert outcome == ({"name": "ANA"}, "nested_json")
+
+    assert parser_registry.parse_text("sin json", "anthropic.claude").data is None
+
+    stats = parser_registry.stats()["anthropic"]
+    assert (stats["calls"], stats["fast_path"], stats["fallback"], stats["no_json"]) == (2, 0, 1, 1)
+    assert stats["paths"] == {"nested_json": 1, "no_json": 1}
+
+
+def test_custom_registry_uses_default_for_unregistered_families():
+    registry = ParserRegistry()
+    registry.register("default")(parse_default)
+
+    assert registry.get("us.amazon.nova-lite-v1:0")[0] == "default"
+    assert registry.parse_text('texto {"a": 1}', "us.amazon.nova-lite-v1:0").data == {"a": 1}
+
+
+def test_bedrock_parsers_dispatch_on_response_model_id():
+    resp = {"model_id": "us.amazon.nova-pro-v1:0",
+            "output": {"message": {"content": [{"text": '```json\n{"category": "RUT", "text": "x"}\n```'}]}}}
+    assert parse_classification(resp, pdf_path="s3://b/RUT/900123456/doc.pdf")["category"] == "RUT"
+    assert parse_extraction_response(resp) == {"category": "RUT", "text": "x"}
+
+
+if __name__ == "__main__":
+    test_model_family_dispatch()
+    test_family_quirks_are_handled_on_the_fast_path()
+    test_fast_path_miss_falls_back_to_generic_scan_and_is_counted()
+    test_custom_registry_uses_default_for_unregistered_families()
+    test_bedrock_parsers_dispatch_on_response_model_id()
+    print("✅ All parser registry tests passed")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test the local pipeline simulator: fake AWS semantics and end-to-end runs of the real handlers.
+"""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / 'bench'))
+
+from simulator import (
+    FaultProfile,
+    ModelProfile,
+    PipelineSimulator,
+    SimClock,
+    SimulationConfig,
+    default_functions,
+    synthetic_documents,
+)
+from simulator.aws_fakes import FakeDynamoDB, FakeSQS, _TokenBucket
+
+PRIMARY_MODEL = 'us.amazon.nova-pro-v1:0'
+CLASSIFICATION_MODEL = 'us.amazon.nova-lite-v1:0'
+
+
+def _config(**kwargs):
+    """Fast simulation; classification uses its own model so extraction faults can be isolated."""
+    functions = default_functions(concurrency=3)
+    functions[0].env['BEDROCK_MODEL'] = CLASSIFICATION_MODEL
+    return SimulationConfig(time_scale=0.002, functions=functions, log_level='CRITICAL', **kwargs)
+
+
+def test_sqs_redrives_to_dead_letter_queue():
+    """Unacknowledged messages come back after the visibility timeout, then go to the DLQ"""
+    clock = SimClock(0.001)
+    sqs = FakeSQS(clock)
+    dlq = sqs.create_queue('dlq')
+    queue = sqs.create_queue('work', visibility_timeout=5.0, max_receive_count=2, dead_letter_queue=dlq)
+    sqs.enqueue(queue, '{"n": 1}')
+
+    assert len(sqs.receive(queue, 10)) == 1
+    assert sqs.receive(queue, 10) == []
+    clock.sleep(6.0)
+    assert [m.receive_count for m in sqs.receive(queue, 10)] == [2]
+    clock.sleep(6.0)
+    assert sqs.receive(queue, 10) == []
+    assert sqs.depth(queue) == (0, 0)
+    assert len(dlq.messages) == 1
+
+
+def test_dynamodb_conditional_put_and_update():
+    """attribute_not_exists rejects a second put; update_item applies SET expressions"""
+    table = FakeDynamoDB(SimClock(0.001))
+    table.create_table('idem', ('pk',))
+    table.put_item(TableName='idem', Item={'pk': {'S': 'a'}}, ConditionExpression='attribute_not_exists(pk)')
+
+    try:
+        table.put_item(TableName='idem', Item={'pk': {'S': 'a'}}, ConditionExpression='attribute_not_exists(pk)')
+        assert False, "second put should fail"
+    except table.exceptions.ConditionalCheckFailedException:
+        pass
+
+    table.update_item(TableName='idem', Key={'pk': {'S': 'a'}}, UpdateExpression='SET #s = :s',
+                      ExpressionAttributeNames={'#s': 'status'}, ExpressionAttributeValues={':s': {'S': 'DONE'}})
+    assert table.items('idem') == [{'pk': {'S': 'a'}, 'status': {'S': 'DONE'}}]
+    assert table.conditional_check_failures == 1
+
+
+def test_token_bucket_limits_request_rate():
+    """A 60 rpm model admits its burst, then one request per simulated second"""
+    bucket = _TokenBucket(60, now=0.0)
+    admitted = sum(bucket.take(0.0) for _ in range(20))
+    assert admitted == 5
+    assert bucket.take(1.0)
+    assert not bucket.take(1.0)
+
+
+def test_pipeline_extracts_every_document():
+    """Every document is classified and extracted once, with idempotency records"""
+    documents = synthetic_documents(6, scanned_rate=0.0, seed=11)
+    simulator = PipelineSimulator(documents, _config())
+    report = simulator.run()
+
+    assert report.completed
+    assert report.outcomes['extracted'] == 6
+    assert report.functions['fallback-processing']['invocations'] == 0
+    assert report.bedrock['calls_per_document'] == 2.0
+    assert report.bedrock['unresolved_documents'] == 0
+    assert report.latency['p50'] <= report.latency['p99']
+    assert len(simulator.aws.dynamodb.items('sim-idempotency')) == 6
+    for trace in simulator.traces.values():
+        assert [span.function for span in trace.spans] == ['classification', 'extraction-scoring']
+        assert trace.classified_as == trace.document.category
+
+
+def test_malformed_extractions_go_to_fallback_with_textract():
+    """Truncated primary answers send documents to the fallback, which reads scanned PDFs with Textract"""
+    documents = synthetic_documents(4, scanned_rate=1.0, seed=5)
+    config = _config(models={PRIMARY_MODEL: ModelProfile(faults=FaultProfile(malformed_rate=1.0))})
+    simulator = PipelineSimulator(documents, config)
+    report = simulator.run()
+
+    assert report.outcomes['fallback_extracted'] == 4
+    assert report.functions['fallback-processing']['messages'] == 4
+    assert report.aws_calls['textract.start_document_text_detection'] == 4
+    assert report.bedrock['malformed'] >= 4
+    for trace in simulator.traces.values():
+        assert trace.spans[-1].function == 'fallback-processing'
+
+
+def test_classification_errors_are_recorded():
+    """Documents whose classification keeps failing end in errors/classification"""
+    documents = synthetic_documents(2, scanned_rate=0.0, seed=2)
+    config = _config(env={'BEDROCK_RETRY_ATTEMPTS': '1'},
+                     models={CLASSIFICATION_MODEL: ModelProfile(faults=FaultProfile(error_rate=1.0))})
+    simulator = PipelineSimulator(documents, config)
+    report = simulator.run()
+
+    assert report.outcomes['classification_failed'] == 2
+    assert report.functions['extraction-scoring']['invocations'] == 0
+
+
+if __name__ == "__main__":
+    test_sqs_redrives_to_dead_letter_queue()
+    test_dynamodb_conditional_put_and_update()
+    test_token_bucket_limits_request_rate()
+    test_pipeline_extracts_every_document()
+    test_malformed_extractions_go_to_fallback_with_textract()
+    test_classification_errors_are_recorded()
+    print("✅ All pipeline simulator tests passed")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test the sampling profiler: folded stacks, slow-invocation threshold and upload limit.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+
+from shared.profiler import Profiler, StackSampler, fold_stack
+
+
+def _spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _profiler(**kwargs):
+    uploads = []
+    options = dict(enabled=True, sample_rate=1.0, interval_ms=1, threshold_ms=0, max_uploads_per_hour=10,
+                   bucket='results-bucket', uploader=lambda bucket, key, body: uploads.append((bucket, key, body)))
+    options.update(kwargs)
+    return Profiler(**options), uploads
+
+
+def test_fold_stack_is_outermost_first():
+    """Folded stacks list frames from the outermost caller to the current function"""
+    def inner():
+        return fold_stack(sys._getframe())
+
+    stack = inner()
+
+    assert stack.endswith('test_profiler.py:test_fold_stack_is_outermost_first;test_profiler.py:inner')
+    assert len(fold_stack(sys._getframe(), max_depth=2).split(';')) == 2
+
+
+def test_sampler_records_other_threads():
+    """The sampler counts the stacks of the other threads, never its own"""
+    sampler = StackSampler(interval=0.001).start()
+    worker = threading.Thread(target=_spin, args=(0.05,), name='worker')
+    worker.start()
+    worker.join()
+    sampler.stop()
+
+    assert sampler.count > 0
+    assert any(stack.startswith('worker;') and stack.endswith('test_profiler.py:_spin') for stack in sampler.samples)
+    assert not any(stack.startswith('stack-sampler;') for stack in sampler.samples)
+    line = sampler.folded().splitlines()[0]
+    assert line.rsplit(' ', 1)[1].isdigit()
+
+
+def test_slow_invocation_profile_is_saved():
+    """An invocation over the threshold saves its folded stacks under the function's prefix"""
+    profiler, uploads = _profiler()
+
+    @profiler.invocation('classification')
+    def handler(event, context):
+        _spin(0.05)
+        return 'done'
+
+    assert handler({}, None) == 'done'
+    assert len(uploads) == 1
+    bucket, key, body = uploads[0]
+    assert bucket == 'results-bucket'
+    assert key.startswith(f"{profiler.prefix}/classification/") and key.endswith('.folded')
+    assert 'test_profiler.py:handler;test_profiler.py:_spin' in body
+
+
+def test_fast_and_unsampled_invocations_are_not_saved():
+    """Invocations under the threshold, or outside the sample rate, save nothing"""
+    fast, fast_uploads = _profiler(threshold_ms=60000)
+    unsampled, unsampled_uploads = _profiler(sample_rate=0.0)
+    disabled, disabled_uploads = _profiler(enabled=False)
+
+    for profiler in (fast, unsampled, disabled):
+        with profiler.invocation('extraction-scoring'):
+            _spin(0.01)
+
+    assert fast_uploads == [] and unsampled_uploads == [] and disabled_uploads == []
+    assert not unsampled.should_sample() and not disabled.should_sample()
+
+
+def test_uploads_are_rate_limited():
+    """No more than max_uploads_per_hour profiles are saved, and a failed upload does not raise"""
+    profiler, uploads = _profiler(max_uploads_per_hour=2)
+    for _ in range(4):
+        with profiler.invocation('fallback-processing'):
+            _spin(0.01)
+
+    assert len(uploads) == 2
+
+    def failing_uploader(bucket, key, body):
+        raise RuntimeError('AccessDenied')
+
+    broken, _ = _profiler(uploader=failing_uploader)
+    with broken.invocation('fallback-processing'):
+        _spin(0.01)
+
+
+if __name__ == "__main__":
+    test_fold_stack_is_outermost_first()
+    test_sampler_records_other_threads()
+    test_slow_invocation_profile_is_saved()
+    test_fast_and_unsampled_invocations_are_not_saved()
+    test_uploads_are_rate_limited()
+    print("✅ All profiler tests passed")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test startup prompt loading, hashing, mtime hot reload and prompt bundles.
+"""
+
+import dataclasses
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+
+from shared.prompt_loader import PromptLoader, CLASSIFICATION_PROMPT
+from shared.prompt_bundle import MANIFEST_FILE, build_manifest, is_current, load_manifest, result_cache_key
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _write_prompts(directory: Path, system: str, user: str):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / 'system.txt').write_text(system, encoding='utf-8')
+    (directory / 'user.txt').write_text(user, encoding='utf-8')
+
+
+def test_all_prompts_loaded_at_startup_with_hashes():
+    loader = PromptLoader(task_root=str(REPO_ROOT / 'functions' / 'extraction-scoring' / 'src'))
+
+    hashes = loader.prompt_hashes()
+    assert sorted(hashes) == ['ACC', 'CECRL', 'CERL', 'RUB', 'RUT']
+    assert len(set(hashes.values())) == 5
+
+    rut = loader.get_prompt_set('RUT')
+    assert loader.get_extraction_prompts('RUT') == (rut.system, rut.user)
+    assert loader.get_prompt_set('RUT') is rut
+    try:
+        rut.system = 'changed'
+        assert False, "PromptSet must be immutable"
+    except dataclasses.FrozenInstanceError:
+        pass
+
+
+def test_missing_and_invalid_prompts_raise_on_lookup():
+    with tempfile.TemporaryDirectory() as root:
+        instructions = Path(root) / 'instructions'
+        _write_prompts(instructions, 'clasifica', 'documento')
+        _write_prompts(instructions / 'RUT', 'extrae', '   ')
+
+        loader = PromptLoader(task_root=root)
+        assert loader.prompt_hashes().keys() == {CLASSIFICATION_PROMPT}
+        assert loader.get_classification_prompts() == ('clasifica', 'documento')
+
+        for category, error in (('RUT', ValueError), ('ACC', FileNotFoundError)):
+            try:
+                loader.get_extraction_prompts(category)
+                assert False, f"{category} should not load"
+            except error:
+                pass
+
+
+def test_hot_reload_on_mtime_change():
+    with tempfile.TemporaryDirectory() as root:
+        directory = Path(root) / 'instructions' / 'ACC'
+        _write_prompts(directory, 'v1', 'usuario')
+
+        static = PromptLoader(task_root=root)
+        reloading = PromptLoader(task_root=root, hot_reload=True)
+        first = reloading.get_prompt_set('ACC')
+
+        (directory / 'system.txt').write_text('v2', encoding='utf-8')
+        os.utime(directory / 'system.txt', (first.mtimes[0] + 10, first.mtimes[0] + 10))
+
+        assert static.get_extraction_prompts('ACC')[0] == 'v1'
+        second = reloading.get_prompt_set('ACC')
+        assert second.system == 'v2'
+        assert second.user_sha256 == first.user_sha256
+        assert second.sha256 != first.sha256
+
+
+def test_committed_bundle_manifests_are_up_to_date():
+    for function in ('classification', 'extraction-scoring', 'fallback-processing'):
+        instructions = REPO_ROOT / 'functions' / function / 'src' / 'instructions'
+        manifest = load_manifest(instructions)
+        assert manifest == build_manifest(instructions, manifest['version']), \
+            f"Regenerate {instructions / MANIFEST_FILE} with functions/shared/prompt_bundle.py"
+
+        loader = PromptLoader(task_root=str(instructions.parent))
+        assert loader.bundle.verified
+        assert loader.bundle.sha256 == manifest['sha256']
+
+
+def test_bundle_stamp_and_manifest_mismatch():
+    with tempfile.TemporaryDirectory() as root:
+        instructions = Path(root) / 'instructions'
+        _write_prompts(instructions / 'RUT', 'extrae', 'documento')
+        (instructions / MANIFEST_FILE).write_text(
+            json.dumps(build_manifest(instructions, '1.2.0')), encoding='utf-8')
+
+        loader = PromptLoader(task_root=root)
+        stamp = loader.bundle_stamp('RUT')
+        assert (stamp['version'], stamp['verified'], stamp['prompt']) == ('1.2.0', True, 'RUT')
+        assert stamp['prompt_sha256'] == loader.get_prompt_set('RUT').sha256
+        assert is_current({'prompt_bundle': stamp}, loader.bundle)
+        assert result_cache_key('abc', stamp) == f"{stamp['sha256']}/RUT/abc"
+
+        (instructions / 'RUT' / 'user.txt').write_text('documento v2', encoding='utf-8')
+        edited = PromptLoader(task_root=root)
+        assert not edited.bundle.verified
+        assert edited.bundle.mismatches == ('RUT/user.txt',)
+        assert not is_current({'prompt_bundle': stamp}, edited.bundle)
+
+
+if __name__ == "__main__":
+    test_all_prompts_loaded_at_startup_with_hashes()
+    test_missing_and_invalid_prompts_raise_on_lookup()
+    test_hot_reload_on_mtime_change()
+    test_committed_bundle_manifests_are_up_to_date()
+    test_bundle_stamp_and_manifest_mismatch()
+    print("✅ All prompt loader tests passed")
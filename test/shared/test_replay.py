@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test the replay harness: captures read from RAW/ responses and batch summaries, replayed through the handlers.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / 'bench'))
+
+from simulator import SimulationConfig, synthetic_documents
+from simulator.harness import HandlerHarness
+from simulator.pipeline import DESTINATION_BUCKET
+from simulator.replay import ReplayHarness, capture_documents, load_capture
+
+
+def _write(root, key, content):
+    path = Path(root) / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(content), encoding='utf-8')
+
+
+def _raw(source_key, content, **extra):
+    raw = {'output': {'message': {'role': 'assistant', 'content': content}}, 'stopReason': 'tool_use',
+           'usage': {'inputTokens': 1000, 'outputTokens': 50}, 'metrics': {'latencyMs': 3200},
+           'file_info': {'source_key': source_key, 'category': 'RUT', 'document_number': '900123456',
+                         'file_id': Path(source_key).stem}}
+    raw.update(extra)
+    return raw
+
+
+def _record(function, documents, root):
+    """Run a function on the documents and copy the results bucket to root, as a capture."""
+    harness = HandlerHarness(function, documents, SimulationConfig(time_scale=0.002, log_level='CRITICAL'))
+    with harness.active():
+        for batch in harness.batches(3):
+            harness.invoke(batch)
+    for key in harness.aws.s3.keys(DESTINATION_BUCKET):
+        path = Path(root) / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(harness.aws.s3.get(DESTINATION_BUCKET, key).body)
+
+
+def _replay(function, root):
+    capture = load_capture(root)
+    documents, placeholders = capture_documents(capture)
+    harness = ReplayHarness(function, capture, documents,
+                            SimulationConfig(time_scale=0.002, log_level='CRITICAL'), placeholders)
+    return harness.replay()
+
+
+def test_capture_reads_recordings_and_batches():
+    """RAW/ artifacts become recordings; summaries give batches, the rest is grouped by save time"""
+    with tempfile.TemporaryDirectory() as tmp:
+        classification = _raw('par-servicios-poc/RUT/900123456/a.pdf',
+                              [{'toolUse': {'toolUseId': 't1', 'name': 'record_classification',
+                                            'input': {'category': 'RUT', 'text': 'REGISTRO UNICO TRIBUTARIO'}}}],
+                              retry_info={'attempts': 2, 'error_codes': ['ThrottlingException']})
+        _write(tmp, 'RAW/RUT/900123456/raw_classification_a_20261001_100000.json', classification)
+        for name, second in (('b', 10), ('c', 20), ('d', 50)):
+            extraction = _raw(f'par-servicios-poc/RUT/900123456/{name}.pdf', [], metrics={})
+            extraction.pop('output')
+            extraction['raw_anthropic_response'] = {'content': [{'type': 'text', 'text': '{"nit": "900123456"}'}],
+                                                    'stop_reason': 'end_turn'}
+            extraction['retry_info'] = {'last_attempt_seconds': 1.5}
+            _write(tmp, f'RAW/RUT/900123456/raw_extraction_{name}_20261001_1000{second}.json', extraction)
+        fallback = _raw('par-servicios-poc/RUT/900123456/e.pdf', [{'text': '{"nit": "900123456"}'}],
+                        came_from_fallback=True)
+        _write(tmp, 'RAW/RUT/900123456/raw_extraction_e_20261001_110000.json', fallback)
+        _write(tmp, 'RAW/RUT/900123456/raw_extraction_f_20261001_110000.json', {'file_info': {}})
+        _write(tmp, 'par-servicios-poc/batch_summaries/extraction/batch_summary_20261001_100100.json', {
+            'batch_summary': {'process_type': 'extraction', 'timestamp': '2026-10-01T10:01:00'},
+            'detailed_results': [{'document_info': {'s3_key': 's3://origin/par-servicios-poc/RUT/900123456/b.pdf'}},
+                                 {'key': 'par-servicios-poc/RUT/900123456/c.pdf'}],
+        })
+
+        capture = load_capture(tmp, batch_sizes={'classification': 3, 'extraction-scoring': 3,
+                                                 'fallback-processing': 3}, max_gap=10)
+
+    by_file = {r.file_id: r for r in capture.recordings}
+    assert capture.skipped == 1 and len(capture.recordings) == 5
+    assert by_file['a'].phase == 'classification' and by_file['a'].error_codes == ['ThrottlingException']
+    assert by_file['a'].latency == 3.2 and by_file['a'].answer()['category'] == 'RUT'
+    assert by_file['b'].latency == 1.5 and by_file['b'].answer() == {'nit': '900123456'}
+    assert by_file['e'].phase == 'fallback' and by_file['e'].function == 'fallback-processing'
+    batches = [(b.function, [Path(k).stem for k in b.keys]) for b in capture.batches]
+    assert ('extraction-scoring', ['b', 'c']) in batches
+    assert ('extraction-scoring', ['d']) in batches
+    assert ('classification', ['a']) in batches and ('fallback-processing', ['e']) in batches
+
+
+def test_replay_serves_recorded_responses_and_errors():
+    """A recorded run replays with no unrecorded calls, its throttling included, and gives the same results again"""
+    with tempfile.TemporaryDirectory() as tmp:
+        _record('classification', synthetic_documents(4), tmp)
+        raw_path = sorted(Path(tmp).rglob('raw_classification_*.json'))[0]
+        raw = json.loads(raw_path.read_text(encoding='utf-8'))
+        raw['retry_info'] = {'attempts': 2, 'error_codes': ['ThrottlingException']}
+        raw_path.write_text(json.dumps(raw), encoding='utf-8')
+
+        first = _replay('classification', tmp)
+        second = _replay('classification', tmp)
+
+    assert first.documents == 4 and first.placeholders == 4
+    assert first.regressions == [] and first.replayed_successes == 4
+    assert first.bedrock['replayed'] == 4 and first.bedrock['unrecorded'] == 0
+    assert first.bedrock['throttled'] == 1
+    assert first.bedrock == second.bedrock
+    assert [b.status_code for b in first.batches] == [b.status_code for b in second.batches]
+    assert 'classification: 2 batches, 4 documents' in first.format()
+
+
+def test_replay_reports_documents_that_no_longer_succeed():
+    """A recorded success whose replayed answer the handler rejects is reported as a regression"""
+    with tempfile.TemporaryDirectory() as tmp:
+        _record('extraction-scoring', synthetic_documents(3), tmp)
+        raw_path = sorted(Path(tmp).rglob('raw_extraction_*.json'))[0]
+        raw = json.loads(raw_path.read_text(encoding='utf-8'))
+        raw['output']['message']['content'] = [{'text': '{"truncated": "ans'}]
+        raw['stopReason'] = 'max_tokens'
+        raw_path.write_text(json.dumps(raw), encoding='utf-8')
+
+        report = _replay('extraction-scoring', tmp)
+
+    assert report.recorded_successes == 3
+    assert report.regressions == [raw['file_info']['source_key']]
+    assert report.metrics()['success_rate'] < 1.0
+
+
+if __name__ == "__main__":
+    test_capture_reads_recordings_and_batches()
+    test_replay_serves_recorded_responses_and_errors()
+    test_replay_reports_documents_that_no_longer_succeed()
+    print("✅ All replay tests passed")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test the single-pass extraction response parser and its parse paths.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+
+from shared.response_parser import find_json_spans, parse_extraction_text
+from shared.bedrock_client import parse_extraction_response
+
+
+def test_fenced_and_raw_json():
+    fenced = 'Aquí está:\n```json\n{"result": {"taxId": "900123456"}}\n```'
+    assert parse_extraction_text(fenced) == ({"result": {"taxId": "900123456"}}, 'fenced_json')
+
+    raw = 'Resultado {"result": {"companyName": "ACME S.A.S"}} fin'
+    assert parse_extraction_text(raw) == ({"result": {"companyName": "ACME S.A.S"}}, 'raw_json')
+
+
+def test_braces_and_escapes_inside_strings():
+    text = '{"result": {"note": "llaves } y { con \\"comillas\\" \\\\"}, "ok": true}'
+    data, path = parse_extraction_text(text)
+
+    assert path == 'raw_json'
+    assert data["result"]["note"] == 'llaves } y { con "comillas" \\'
+    assert find_json_spans(text) == [(0, len(text)), (11, text.index(', "ok"'))]
+
+
+def test_truncated_response_uses_first_inner_object():
+    text = '```json\n{"result": {"relatedParties": [{"name": "ANA"}, {"name": "LUIS"'
+    data, path = parse_extraction_text(text)
+
+    assert path == 'nested_json'
+    assert data == {"name": "ANA"}
+
+
+def test_non_json_paths():
+    data, path = parse_extraction_text("I do not see any PDF attached.")
+    assert path == 'for_review'
+    assert data["Category"] == 'ForReview'
+
+    data, path = parse_extraction_text("La sociedad ACME LTDA NIT: 900.123.456 tiene accionistas")
+    assert path == 'natural_language'
+    assert data["result"]["TaxId"] == "900.123.456"
+    assert data["Category"] == "ACC"
+
+
+def test_parse_extraction_response_returns_data():
+    resp = {"output": {"message": {"content": [{"text": '```json\n{"a": 1}\n```'}]}}}
+    assert parse_extraction_response(resp) == {"a": 1}
+
+
+if __name__ == "__main__":
+    test_fenced_and_raw_json()
+    test_braces_and_escapes_inside_strings()
+    test_truncated_response_uses_first_inner_object()
+    test_non_json_paths()
+    test_parse_extraction_response_returns_data()
+    print("✅ All response parser tests passed")
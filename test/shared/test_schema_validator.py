@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test schema-driven validation and normalization of extraction outputs.
+"""
+
+import json
+import os
+import sys
+from dataclasses import replace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../bench'))
+
+from shared.schema_validator import schema_registry, correct_future_date
+from simulator import SimulationConfig, synthetic_documents
+from simulator.harness import HandlerHarness
+from simulator.pipeline import DESTINATION_BUCKET
+
+
+def test_keys_are_normalized_to_schema_names():
+    data = {
+        "result": {
+            "companyName": " ACME S.A.S ",
+            "tax_id": 900123456,
+            "relatedParties": [
+                {"firstName": "Ana", "identificationNumber": 52123456, "participationPercentage": "50"}
+            ]
+        },
+        "confidenceScores": {"companyName": 95}
+    }
+    validation = schema_registry.validate(data, "RUB")
+
+    assert validation.is_valid
+    result = validation.data["result"]
+    assert result["CompanyName"] == "ACME S.A.S"
+    assert result["TaxId"] == "900123456"
+    assert result["RelatedParties"][0] == {"FirstName": "Ana", "IdNumber": "52123456", "ParticipationPercentage": "50"}
+    # Keys outside the schema are kept as-is
+    assert validation.data["confidenceScores"] == {"companyName": 95}
+
+
+def test_missing_required_fields_make_result_invalid():
+    validation = schema_registry.validate({"result": {"CompanyName": "ACME"}}, "CERL")
+    assert not validation.is_valid
+    assert validation.errors == [{'path': '$.result.TaxId', 'code': 'required', 'message': 'missing required field'}]
+
+    parse_failed = {"result": {"error_type": "parsing_failed"}, "Category": "unknown"}
+    assert not schema_registry.validate(parse_failed, "RUT").is_valid
+
+    assert not schema_registry.validate({"result": "texto"}, "ACC").is_valid
+
+
+def test_flags_bad_fields_and_review_placeholders():
+    data = {"result": {"CompanyName": "ACME", "TaxId": "ForReview", "VerificationDigit": "12",
+                       "DocumentGenerationDate": "20/01/2024", "RelatedParties": "ninguno"}}
+    validation = schema_registry.validate(data, "RUT")
+
+    assert validation.is_valid
+    assert validation.review_fields == ["$.result.TaxId"]
+    codes = {(w['path'], w['code']) for w in validation.warnings}
+    assert codes == {
+        ("$.result.VerificationDigit", "pattern"),
+        ("$.result.DocumentGenerationDate", "format"),
+        ("$.result.RelatedParties", "type"),
+    }
+
+
+def test_future_dates_are_corrected():
+    data = {"result": {"CompanyName": "ACME", "TaxId": "900123456", "IncorporationDate": "2091-05-01"}}
+    validation = schema_registry.validate(data, "CERL")
+
+    assert validation.data["result"]["IncorporationDate"] == "2019-05-01"
+    assert validation.corrections == [{'path': '$.result.IncorporationDate', 'from': '2091-05-01', 'to': '2019-05-01'}]
+    assert correct_future_date("2015-03-15") == ("2015-03-15", False)
+    assert correct_future_date("9999-01-01") == ("9999-01-01", False)
+    assert correct_future_date("not-a-date") == ("not-a-date", False)
+
+
+def test_categories_without_schema_pass_through():
+    data = {"anything": 1}
+    validation = schema_registry.validate(data, "BLANK")
+    assert validation.is_valid and not validation.schema_found
+    assert validation.data is data
+
+
+def test_fallback_validates_against_classified_category():
+    """A RUT filed under a CECRL folder is extracted with the RUT prompt and validated against the RUT schema"""
+    documents = [replace(d, key=d.key.replace('/RUT/', '/CECRL/'))
+                 for d in synthetic_documents(2, categories=('RUT',))]
+    harness = HandlerHarness('fallback-processing', documents,
+                             SimulationConfig(time_scale=0.002, log_level='CRITICAL'))
+    with harness.active():
+        harness.invoke(documents)
+
+    keys = [key for key in harness.aws.s3.keys(DESTINATION_BUCKET) if '/extraction/' in key]
+    assert len(keys) == 2 and all('/extraction/CECRL/' in key for key in keys)
+    for key in keys:
+        saved = json.loads(harness.aws.s3.get(DESTINATION_BUCKET, key).body)
+        assert saved['schema_validation']['category'] == 'RUT' and saved['prompt_bundle']['prompt'] == 'RUT'
+        assert saved['file_info']['category'] == 'CECRL'
+
+
+if __name__ == "__main__":
+    test_keys_are_normalized_to_schema_names()
+    test_missing_required_fields_make_result_invalid()
+    test_flags_bad_fields_and_review_placeholders()
+    test_future_dates_are_corrected()
+    test_categories_without_schema_pass_through()
+    test_fallback_validates_against_classified_category()
+    print("✅ All schema validator tests passed")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test structured-output mode: tool schemas, request switching and toolUse parsing.
+"""
+
+import json
+import os
+import sys
+from dataclasses import replace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../bench'))
+
+import shared.structured_output as structured_output
+from shared.bedrock_client import BedrockRequest, anthropic_tool_payload, parse_classification, \
+    parse_extraction_response
+from shared.parser_registry import parser_registry
+from shared.structured_output import apply_structured_output, build_tool_config, classification_tool_config, \
+    extraction_tool_config, to_tool_schema
+from simulator import SimulationConfig, synthetic_documents
+from simulator.harness import HandlerHarness
+from simulator.pipeline import DESTINATION_BUCKET
+
+NOVA = "us.amazon.nova-pro-v1:0"
+CLAUDE = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+PIXTRAL = "us.mistral.pixtral-large-2502-v1:0"
+
+
+def tool_response(model_id, tool_input, text=None):
+    content = [{"text": text}] if text else []
+    content.append({"toolUse": {"toolUseId": "t1", "name": "record", "input": tool_input}})
+    return {"model_id": model_id, "structured_output": True, "output": {"message": {"content": content}}}
+
+
+def test_tool_schema_resolves_refs_and_drops_validation_keywords():
+    schema = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "type": "object",
+        "properties": {
+            "TaxId": {"type": ["string", "null"], "pattern": "^\\d+$", "x-aliases": ["nit"]},
+            "Date": {"type": "string", "format": "date"},
+            "Parties": {"type": "array", "items": {"$ref": "#/$defs/party"}}
+        },
+        "required": ["TaxId"],
+        "$defs": {"party": {"type": "object", "properties": {"Name": {"type": "string"}}}}
+    }
+
+    assert to_tool_schema(schema) == {
+        "type": "object",
+        "properties": {
+            "TaxId": {"type": "string"},
+            "Date": {"type": "string", "description": "Date in YYYY-MM-DD format"},
+            "Parties": {"type": "array", "items": {"type": "object", "properties": {"Name": {"type": "string"}}}}
+        },
+        "required": ["TaxId"]
+    }
+
+    config = extraction_tool_config("RUT", NOVA)
+    assert config["tools"][0]["toolSpec"]["inputSchema"]["json"]["type"] == "object"
+    assert extraction_tool_config("BLANK", NOVA) is None
+
+
+def test_tool_choice_per_model_family():
+    schema = {"type": "object"}
+    assert build_tool_config("record", "d", schema, NOVA)["toolChoice"] == {"tool": {"name": "record"}}
+    assert build_tool_config("record", "d", schema, PIXTRAL)["toolChoice"] == {"any": {}}
+
+    payload = anthropic_tool_payload(classification_tool_config(CLAUDE))
+    assert payload["tool_choice"] == {"type": "tool", "name": "record_classification"}
+    assert payload["tools"][0]["input_schema"]["required"] == ["category", "text"]
+
+
+def test_apply_structured_output_only_when_enabled_and_supported():
+    params = {"maxTokens": 4000, "temperature": 0.1}
+    request = BedrockRequest(model_id=NOVA, messages=[], params=params)
+
+    structured_output.STRUCTURED_OUTPUT = False
+    assert apply_structured_output(request, classification_tool_config(NOVA)) is request
+
+    structured_output.STRUCTURED_OUTPUT = True
+    try:
+        _check_enabled(request, params)
+    finally:
+        structured_output.STRUCTURED_OUTPUT = False
+
+
+def _check_enabled(request, params):
+    switched = apply_structured_output(request, classification_tool_config(NOVA))
+    assert switched.toolConfig["tools"][0]["toolSpec"]["name"] == "record_classification"
+    assert request.toolConfig is None
+
+    llama = BedrockRequest(model_id="us.meta.llama3-70b", messages=[], params=params)
+    assert apply_structured_output(llama, classification_tool_config(llama.model_id)) is llama
+    assert apply_structured_output(request, None) is request
+
+    claude_params = {"max_tokens": 8000, "temperature": 1, "top_p": 1,
+                     "thinking": {"type": "enabled", "budget_tokens": 2000}}
+    claude = BedrockRequest(model_id=CLAUDE, messages=[], params=claude_params)
+    switched = apply_structured_output(claude, extraction_tool_config("RUT", CLAUDE))
+    assert switched.params == {"max_tokens": 8000, "temperature": 1}
+    assert "thinking" in claude.params
+
+
+def test_structured_responses_are_read_from_tool_use():
+    extraction = {"result": {"TaxId": "900123456"}}
+    assert parse_extraction_response(tool_response(NOVA, extraction, text="Recording the data.")) == extraction
+
+    resp = tool_response(CLAUDE, {"category": "RUT", "text": "REGISTRO UNICO TRIBUTARIO"})
+    assert parse_classification(resp, pdf_path="s3://b/RUT/900123456/doc.pdf")["category"] == "RUT"
+
+    # Model answered in text instead of calling the tool: the text path still applies
+    text_only = {"model_id": NOVA, "structured_output": True,
+                 "output": {"message": {"content": [{"text": '```json\n{"result": {"TaxId": "1"}}\n```'}]}}}
+    assert parse_extraction_response(text_only) == {"result": {"TaxId": "1"}}
+
+
+def test_model_stats_split_text_and_tool_use_modes():
+    parser_registry.reset_stats()
+
+    parser_registry.parse_tool_use(tool_response(NOVA, {"a": 1}), NOVA)
+    parser_registry.parse_tool_use({"output": {"message": {"content": [{"text": "no tool"}]}}}, NOVA)
+    parser_registry.parse_text('```json\n{"a": 1}\n```', NOVA)
+
+    stats = parser_registry.model_stats()[NOVA]
+    assert (stats["tool_use"]["calls"], stats["tool_use"]["no_json"]) == (2, 1)
+    assert stats["tool_use"]["failure_rate"] == 0.5
+    assert stats["text"]["paths"] == {"fenced_json": 1}
+
+
+def test_fallback_tool_follows_classified_category():
+    """The fallback forces the tool of the classified category, not the one of the folder the PDF is filed in"""
+    documents = [replace(d, key=d.key.replace('/RUT/', '/CECRL/'))
+                 for d in synthetic_documents(1, categories=('RUT',))]
+    harness = HandlerHarness('fallback-processing', documents,
+                             SimulationConfig(time_scale=0.002, log_level='CRITICAL',
+                                              env={'STRUCTURED_OUTPUT': 'true'}))
+    tools = []
+    invoke_model = harness.aws.bedrock.invoke_model
+
+    def recording_invoke_model(modelId, body, **kwargs):
+        tools.extend(json.loads(body).get('tools', []))
+        return invoke_model(modelId, body, **kwargs)
+
+    harness.aws.bedrock.invoke_model = recording_invoke_model
+    with harness.active():
+        harness.invoke(documents)
+
+    assert tools and all('RUT document' in tool['description'] for tool in tools)
+    assert 'VerificationDigit' in tools[0]['input_schema']['properties']['result']['properties']
+    assert any('/extraction/CECRL/' in key for key in harness.aws.s3.keys(DESTINATION_BUCKET))
+
+
+if __name__ == "__main__":
+    test_tool_schema_resolves_refs_and_drops_validation_keywords()
+    test_tool_choice_per_model_family()
+    test_apply_structured_output_only_when_enabled_and_supported()
+    test_structured_responses_are_read_from_tool_use()
+    test_model_stats_split_text_and_tool_use_modes()
+    test_fallback_tool_follows_classified_category()
+    print("✅ All structured output tests passed")
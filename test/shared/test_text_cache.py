@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test the two-tier (local disk + S3) cache of extracted PDF text.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../notebook-test/src'))
+
+from shared.text_cache import TextExtractionCache, document_hash
+from document_extractor import DocumentExtractor, load_production_text_tools
+
+
+class NoSuchKey(Exception):
+    response = {'Error': {'Code': 'NoSuchKey'}}
+
+
+class FakeS3Client:
+    def __init__(self):
+        self.objects = {}
+
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise NoSuchKey(Key)
+        return {'Body': io.BytesIO(self.objects[(Bucket, Key)])}
+
+    def put_object(self, Bucket, Key, Body, ContentType=None):
+        self.objects[(Bucket, Key)] = Body
+
+
+def _cache(local_dir, s3_client):
+    return TextExtractionCache(bucket='dest', prefix='poc/text_cache', local_dir=local_dir,
+                               s3_client=s3_client, enabled=True)
+
+
+def test_miss_extracts_then_hits_local_tier():
+    s3 = FakeS3Client()
+    calls = []
+    doc_hash = document_hash(b'%PDF-1.4 test')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _cache(tmp, s3)
+        extract = lambda: calls.append(1) or "--- PÁGINA 1 ---\ntexto"
+
+        assert cache.get_or_extract(doc_hash, 'pypdf', 'v1', extract) == ("--- PÁGINA 1 ---\ntexto", None)
+        assert cache.get_or_extract(doc_hash, 'pypdf', 'v1', extract) == ("--- PÁGINA 1 ---\ntexto", 'local')
+        assert len(calls) == 1
+        assert ('dest', f"poc/text_cache/pypdf/v1/{doc_hash[:2]}/{doc_hash}.json") in s3.objects
+
+
+def test_s3_tier_is_shared_across_containers():
+    s3 = FakeS3Client()
+    doc_hash = document_hash(b'%PDF-1.4 shared')
+
+    with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+        _cache(first, s3).put(doc_hash, 'textract', 'v2', "texto textract")
+
+        cold = _cache(second, s3)
+        assert cold.get(doc_hash, 'textract', 'v2') == ("texto textract", 's3')
+        # S3 hits are copied to the local tier
+        assert cold.get(doc_hash, 'textract', 'v2') == ("texto textract", 'local')
+        # A new extractor version is a miss
+        assert cold.get(doc_hash, 'textract', 'v3') == (None, None)
+
+
+def test_errors_are_not_cached_and_disabled_cache_is_bypassed():
+    s3 = FakeS3Client()
+    doc_hash = document_hash(b'%PDF-1.4 broken')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _cache(tmp, s3)
+        cache.put(doc_hash, 'pypdf', 'v1', "[ERROR EXTRACTING TEXT: bad]")
+        assert cache.get(doc_hash, 'pypdf', 'v1') == (None, None)
+        assert not s3.objects
+
+        disabled = TextExtractionCache(bucket='dest', local_dir=tmp, s3_client=s3, enabled=False)
+        disabled.put(doc_hash, 'pypdf', 'v1', "texto")
+        assert disabled.get(doc_hash, 'pypdf', 'v1') == (None, None)
+        assert not s3.objects
+
+
+def test_local_tier_evicts_least_recently_used_entries():
+    """The local tier stays under its cap; entries read recently outlive older ones"""
+    hashes = [document_hash(f'%PDF-1.4 {n}'.encode()) for n in range(5)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TextExtractionCache(bucket=None, local_dir=tmp, enabled=True, local_max_mb=2000 / (1024 * 1024))
+        for doc_hash in hashes[:3]:
+            cache.put(doc_hash, 'pypdf', 'v1', "x" * 300)
+            time.sleep(0.01)
+        assert cache.get(hashes[0], 'pypdf', 'v1')[1] == 'local'
+        time.sleep(0.01)
+        for doc_hash in hashes[3:]:
+            cache.put(doc_hash, 'pypdf', 'v1', "x" * 300)
+            time.sleep(0.01)
+
+        size = sum(p.stat().st_size for p in Path(tmp).rglob('*.json'))
+        assert size <= 2000
+        assert cache.get(hashes[0], 'pypdf', 'v1')[1] == 'local'
+        assert cache.get(hashes[1], 'pypdf', 'v1') == (None, None) and cache.get(hashes[2], 'pypdf', 'v1') == (None, None)
+        assert cache.get(hashes[-1], 'pypdf', 'v1')[1] == 'local'
+
+
+def _notebook_extractor(s3_client, settings):
+    """DocumentExtractor without AWS clients of its own"""
+    extractor = DocumentExtractor.__new__(DocumentExtractor)
+    extractor.settings = settings
+    extractor.aws_region = 'us-east-2'
+    extractor.s3_client = s3_client
+    extractor.text_cache = None
+    return extractor
+
+
+def test_notebook_shares_the_lambda_text_cache_bucket():
+    """The notebook reads the fallback Lambda's S3 entries, and refuses to run without a bucket"""
+    pdf_processor, _ = load_production_text_tools()
+    s3 = FakeS3Client()
+    pdf = b'%PDF-1.4 shared with the lambda'
+    s3.objects[('origin', 'RUT/1/doc.pdf')] = pdf
+    doc_hash = document_hash(pdf)
+
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as lambda_tmp:
+        TextExtractionCache(bucket='results', prefix='poc/text_cache', local_dir=lambda_tmp, s3_client=s3,
+                            enabled=True).put(doc_hash, 'pypdf', pdf_processor.PYPDF_EXTRACTOR_VERSION, "texto")
+
+        unconfigured = _notebook_extractor(s3, {'output_dir': tmp}).extract_document_text('s3://origin/RUT/1/doc.pdf')
+        assert unconfigured['status'] == 'error' and 'destination_bucket' in unconfigured['error']
+
+        settings = {'output_dir': tmp, 'destination_bucket': 'results', 'folder_prefix': 'poc'}
+        result = _notebook_extractor(s3, settings).extract_document_text('s3://origin/RUT/1/doc.pdf')
+
+    assert result['status'] == 'success' and result['text'] == "texto" and result['cache_tier'] == 's3'
+
+
+if __name__ == "__main__":
+    test_miss_extracts_then_hits_local_tier()
+    test_s3_tier_is_shared_across_containers()
+    test_errors_are_not_cached_and_disabled_cache_is_bypassed()
+    test_local_tier_evicts_least_recently_used_entries()
+    test_notebook_shares_the_lambda_text_cache_bucket()
+    print("✅ All text cache tests passed")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test text quality scoring used to gate fallback model calls.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+
+from shared.text_quality import score_text_quality
+
+SPANISH_PAGE = (
+    "--- PÁGINA 1 --- CÁMARA DE COMERCIO DE BOGOTÁ CERTIFICADO DE EXISTENCIA Y "
+    "REPRESENTACIÓN LEGAL. Nombre: EMPRESA EJEMPLO S.A.S. NIT: 900.123.456-7 "
+    "Domicilio: Bogotá D.C. Matrícula No. 01234567 del 12 de marzo de 2015. "
+    "El representante legal de la sociedad es el gerente general y su suplente."
+)
+
+
+def test_readable_spanish_text_is_usable():
+    quality = score_text_quality(SPANISH_PAGE)
+
+    assert quality.is_usable
+    assert quality.reason == 'ok'
+    assert quality.page_count == 1
+    assert quality.printable_ratio > 0.95
+    assert quality.word_ratio > 0.25
+
+
+def test_error_and_empty_texts_are_rejected():
+    assert score_text_quality(None).reason == 'empty_text'
+    assert score_text_quality("--- PÁGINA 1 ---").reason == 'empty_text'
+    assert score_text_quality("[ERROR EXTRACTING TEXT: bad]").reason == 'extraction_error'
+    assert score_text_quality("[NO CONTENT DETECTED BY TEXTRACT]").reason == 'extraction_error'
+
+
+def test_short_text_is_rejected():
+    quality = score_text_quality("--- PÁGINA 1 --- NIT 900123")
+
+    assert not quality.is_usable
+    assert quality.reason == 'too_short'
+
+
+def test_garbage_glyphs_are_rejected():
+    garbage = "--- PÁGINA 1 --- " + " ".join(["�□x"] * 60)
+    quality = score_text_quality(garbage)
+
+    assert not quality.is_usable
+    assert quality.reason == 'garbage_characters'
+    assert quality.printable_ratio < 0.5
+
+
+def test_sparse_text_over_many_pages_scores_lower():
+    dense = score_text_quality(SPANISH_PAGE)
+    sparse = score_text_quality(SPANISH_PAGE, page_count=40)
+
+    assert sparse.chars_per_page < dense.chars_per_page
+    assert sparse.score < dense.score
+
+
+def test_threshold_override():
+    assert not score_text_quality(SPANISH_PAGE, min_score=1.01).is_usable
+
+
+if __name__ == "__main__":
+    test_readable_spanish_text_is_usable()
+    test_error_and_empty_texts_are_rejected()
+    test_short_text_is_rejected()
+    test_garbage_glyphs_are_rejected()
+    test_sparse_text_over_many_pages_scores_lower()
+    test_threshold_override()
+    print("✅ Text quality tests passed")
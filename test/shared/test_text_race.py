@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test speculative text extraction racing used by the fallback Lambda.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+
+from shared.text_race import race_text_sources
+
+
+def _usable(source, text):
+    return bool(text) and not text.startswith("[ERROR")
+
+
+def test_fastest_usable_source_is_yielded_first():
+    """The quicker extractor wins even if it is declared last"""
+    extractors = {
+        'textract': lambda: (time.sleep(0.2), "texto textract")[1],
+        'pypdf': lambda: "texto pypdf",
+    }
+
+    results = list(race_text_sources(extractors, _usable))
+
+    assert [source for source, _ in results] == ['pypdf', 'textract']
+
+
+def test_rejected_and_failing_sources_are_skipped():
+    """Texts failing the gate and raising extractors are not yielded"""
+    def broken():
+        raise RuntimeError("boom")
+
+    extractors = {
+        'pypdf': lambda: "[ERROR EXTRACTING TEXT: bad pdf]",
+        'textract': broken,
+        'other': lambda: "texto valido",
+    }
+
+    results = list(race_text_sources(extractors, _usable))
+
+    assert results == [('other', "texto valido")]
+
+
+def test_stopping_early_cancels_pending_extractors():
+    """Closing the iterator signals slow extractors through the cancel event"""
+    cancel_event = threading.Event()
+    started = threading.Event()
+    observed = {}
+
+    def slow_textract():
+        started.set()
+        observed['cancelled'] = cancel_event.wait(5)
+        return "[ERROR EXTRACTING TEXT WITH TEXTRACT: cancelled]"
+
+    extractors = {'pypdf': lambda: "texto pypdf", 'textract': slow_textract}
+
+    race = race_text_sources(extractors, _usable, cancel_event)
+    source, _ = next(race)
+    assert started.wait(2)
+    race.close()
+
+    assert source == 'pypdf'
+    assert cancel_event.is_set()
+    deadline = time.time() + 2
+    while 'cancelled' not in observed and time.time() < deadline:
+        time.sleep(0.01)
+    assert observed.get('cancelled') is True
+
+
+if __name__ == "__main__":
+    test_fastest_usable_source_is_yielded_first()
+    test_rejected_and_failing_sources_are_skipped()
+    test_stopping_early_cancels_pending_extractors()
+    print("✅ Text race tests passed")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test clean_text_for_json against the previous unicodedata implementation and
+the streaming iter_clean_text variant.
+"""
+
+import os
+import random
+import sys
+import unicodedata
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+
+from shared.text_utils import (CONTROL_FORMAT_RANGES, _scan_control_format_ranges,
+                               clean_text_for_json, iter_clean_text)
+
+
+def _reference(text):
+    """clean_text_for_json as previously implemented."""
+    for char in ('\u2028', '\u2029', '\u000B', '\u000C', '\u0085'):
+        text = text.replace(char, ' ')
+    text = ''.join(char for char in text if unicodedata.category(char) not in ['Cc', 'Cf'] or char in ['\n', '\r', '\t'])
+    return ' '.join(text.split())
+
+
+SAMPLES = [
+    '',
+    '   ',
+    'Razón social:\x0cCÁMARA  DE\u2028COMERCIO\x85de\u200bBogotá\x00 ',
+    'NIT\t900.123.456-7\r\n\r\nRepresentante\x1clegal\x1f\u00ad',
+    'plain ascii\x0b\x07text\x7f with\x1b[0m escapes\n',
+    '\ufeffBOM \u202eRTL\u202c mark \U000e0041tag \U00013435hiero',
+]
+
+
+def test_matches_previous_implementation():
+    for text in SAMPLES:
+        assert clean_text_for_json(text) == _reference(text), repr(text)
+    assert clean_text_for_json(None) is None
+    assert clean_text_for_json(42) == 42
+
+
+def test_every_control_and_format_character():
+    # The table for this Python's Unicode database matches a full scan
+    assert CONTROL_FORMAT_RANGES[unicodedata.unidata_version] == _scan_control_format_ranges()
+
+    for start, end in _scan_control_format_ranges() + ((0x2028, 0x2029), (0x00A0, 0x00A0), (0x3000, 0x3000)):
+        for code in range(start, end + 1):
+            text = f"a{chr(code)}b {chr(code)}"
+            assert clean_text_for_json(text) == _reference(text), hex(code)
+
+
+def test_streaming_matches_whole_text():
+    rng = random.Random(3)
+    alphabet = ['palabra', 'año', ' ', '  ', '\n', '\x0c', '\x85', '\u200b', '\x00', '\u2028', 'x']
+    for _ in range(200):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 6))))
+        chunks = [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+        assert ''.join(iter_clean_text(chunks)) == clean_text_for_json(text), repr(chunks)
+
+    assert list(iter_clean_text(['pala', 'bra ', '', 'dos'])) == ['palabra', ' dos']
+
+
+if __name__ == "__main__":
+    test_matches_previous_implementation()
+    test_every_control_and_format_character()
+    test_streaming_matches_whole_text()
+    print("✅ All text utils tests passed")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test streaming aggregation of Textract LINE blocks.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+
+from shared.textract_aggregator import TextractTextAggregator
+
+
+def _line(text, page, top=None, left=0.1, height=0.02):
+    block = {'BlockType': 'LINE', 'Text': text, 'Page': page}
+    if top is not None:
+        block['Geometry'] = {'BoundingBox': {'Top': top, 'Left': left, 'Height': height, 'Width': 0.3}}
+    return block
+
+
+def test_page_split_across_next_token_responses():
+    """A page split across two result pages gets a single header"""
+    aggregator = TextractTextAggregator()
+    aggregator.add_blocks([_line("uno", 1, 0.1), _line("dos", 2, 0.1)])
+    aggregator.add_blocks([_line("tres", 2, 0.2), _line("cuatro", 1, 0.2)])
+
+    text = aggregator.render()
+
+    assert text.count("--- PÁGINA 1 ---") == 1
+    assert text.count("--- PÁGINA 2 ---") == 1
+    assert text.split('\n') == [
+        "--- PÁGINA 1 ---", "uno", "cuatro",
+        "--- PÁGINA 2 ---", "dos", "tres",
+    ]
+
+
+def test_reading_order_uses_geometry():
+    """Lines are ordered top-to-bottom, then left-to-right within a row"""
+    aggregator = TextractTextAggregator()
+    aggregator.add_blocks([
+        _line("pie", 1, top=0.9),
+        _line("valor", 1, top=0.301, left=0.6),
+        _line("NIT:", 1, top=0.300, left=0.1),
+        _line("titulo", 1, top=0.05),
+    ])
+
+    assert aggregator.page_lines(1) == ["titulo", "NIT:", "valor", "pie"]
+
+
+def test_blocks_without_geometry_keep_arrival_order():
+    """Non-LINE, empty and geometry-less blocks are handled"""
+    aggregator = TextractTextAggregator()
+    added = aggregator.add_blocks([
+        {'BlockType': 'PAGE', 'Page': 1},
+        _line("b", 1),
+        _line("   ", 1),
+        {'BlockType': 'WORD', 'Text': 'x', 'Page': 1},
+        _line("a", 1),
+    ])
+
+    assert added == 2
+    assert aggregator.line_count == 2
+    assert aggregator.page_lines(1) == ["b", "a"]
+
+
+def test_empty_aggregator_renders_empty_text():
+    aggregator = TextractTextAggregator()
+    assert aggregator.render() == ""
+    assert aggregator.page_count == 0
+
+
+if __name__ == "__main__":
+    test_page_split_across_next_token_responses()
+    test_reading_order_uses_geometry()
+    test_blocks_without_geometry_keep_arrival_order()
+    test_empty_aggregator_renders_empty_text()
+    print("✅ Textract aggregator tests passed")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test per-document timing spans (shared.tracing).
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../functions'))
+
+from shared.tracing import NOOP_SPAN, Tracer, annotate, current_trace, span, traced
+
+
+@traced('parse')
+def _parse(text):
+    time.sleep(0.01)
+    return text.upper()
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_nested_spans_and_totals():
+    """Spans nest under the span open when they start, and totals sum them per name"""
+    with Tracer(enabled=True, log_traces=False).start('extraction', category='CERL') as trace:
+        with span('bedrock', model='nova'):
+            with span('bedrock.call'):
+                time.sleep(0.01)
+        assert _parse('ok') == 'OK'
+        assert _parse('ok') == 'OK'
+        annotate(key='doc.pdf')
+
+    timings = trace.to_dict()
+
+    assert timings['name'] == 'extraction'
+    assert timings['attributes'] == {'category': 'CERL', 'key': 'doc.pdf'}
+    assert [child['name'] for child in timings['children']] == ['bedrock', 'parse', 'parse']
+    assert timings['children'][0]['children'][0]['name'] == 'bedrock.call'
+    assert timings['children'][0]['attributes'] == {'model': 'nova'}
+    assert set(timings['totals_ms']) == {'bedrock', 'bedrock.call', 'parse'}
+    assert timings['totals_ms']['parse'] >= 20
+    assert timings['duration_ms'] >= timings['totals_ms']['bedrock'] + timings['totals_ms']['parse']
+    assert current_trace() is None
+
+
+def test_errors_are_recorded_and_raised():
+    """A failing span and its trace keep the exception type, and the exception propagates"""
+    tracer = Tracer(enabled=True, log_traces=False)
+    try:
+        with tracer.start('fallback') as trace:
+            with span('s3.download'):
+                raise ValueError("bad key")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("exception was swallowed")
+
+    timings = trace.to_dict()
+
+    assert timings['error'] == 'ValueError'
+    assert timings['children'][0]['error'] == 'ValueError'
+    assert current_trace() is None
+
+
+def test_disabled_and_traceless_spans_are_noops():
+    """Without a current trace, or with tracing disabled, spans record nothing"""
+    assert span('bedrock') is NOOP_SPAN
+    assert _parse('x') == 'X'
+    annotate(key='ignored')
+
+    with Tracer(enabled=False).start('classification') as trace:
+        assert current_trace() is None
+        with span('bedrock') as inner:
+            inner.set(model='nova')
+        trace.set(success=True)
+
+    assert trace is NOOP_SPAN
+    assert trace.to_dict() is None
+
+
+def test_finished_trace_is_logged_as_json():
+    """One JSON line per trace with its duration, attributes and totals"""
+    records = _Records()
+    logger = logging.getLogger('shared.tracing')
+    logger.addHandler(records)
+    logger.setLevel(logging.INFO)
+    try:
+        with Tracer(enabled=True, log_traces=True).start('classification', message_id='m-1'):
+            with span('save'):
+                pass
+    finally:
+        logger.removeHandler(records)
+        logger.setLevel(logging.NOTSET)
+
+    assert len(records.messages) == 1
+    line = json.loads(records.messages[0])
+    assert line['event'] == 'trace'
+    assert line['trace'] == 'classification'
+    assert line['attributes'] == {'message_id': 'm-1'}
+    assert set(line['totals_ms']) == {'save'}
+    assert line['error'] is None
+
+
+if __name__ == "__main__":
+    test_nested_spans_and_totals()
+    test_errors_are_recorded_and_raised()
+    test_disabled_and_traceless_spans_are_noops()
+    test_finished_trace_is_logged_as_json()
+    print("✅ All tracing tests passed")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test the Bedrock token/cost ledger, batch rollups and the offline usage report.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / 'functions'))
+sys.path.insert(0, str(REPO_ROOT / 'bench'))
+
+from shared.bedrock_client import call_bedrock_unified
+from shared.usage_ledger import UsageLedger, rollup, usage_ledger
+from usage_report import aggregate, in_period, iter_local_summaries
+from simulator import SimulationConfig, synthetic_documents
+from simulator.harness import HandlerHarness
+from simulator.pipeline import DESTINATION_BUCKET
+
+NOVA = "us.amazon.nova-pro-v1:0"
+CLAUDE = "us.anthropic.claude-sonnet-4-20250514-v1:0"
+PRICING = {
+    'nova-pro': {'input': 0.001, 'output': 0.004},
+    'claude': {'input': 0.002, 'output': 0.010, 'cache_read': 0.0002},
+    'claude-sonnet-4': {'input': 0.003, 'output': 0.015, 'cache_read': 0.0003},
+}
+
+
+class _ConverseClient:
+    def converse(self, **kwargs):
+        return {'output': {'message': {'content': [{'text': '{"category": "CERL"}'}]}},
+                'stopReason': 'end_turn',
+                'usage': {'inputTokens': 1200, 'outputTokens': 40, 'totalTokens': 1240}}
+
+
+def _document(phase, category, success, calls):
+    ledger = UsageLedger(pricing=PRICING)
+    with ledger.attribute(phase, document='900123456', category=category) as usage:
+        for model_id, tokens in calls:
+            ledger.record(model_id, tokens, latency_ms=1000.0)
+    return {'category': category, 'success': success, 'usage': usage.summary()}
+
+
+def test_calls_are_charged_to_the_current_document():
+    """Tokens and cost go to the open attribution; calls outside any attribution are not kept"""
+    ledger = UsageLedger(pricing=PRICING)
+    outside = ledger.record(NOVA, {'inputTokens': 100}, latency_ms=5.0)
+
+    with ledger.attribute('extraction') as usage:
+        ledger.record(NOVA, {'inputTokens': 2000, 'outputTokens': 500}, latency_ms=1500.0)
+        ledger.record(CLAUDE, {'input_tokens': 1000, 'output_tokens': 100, 'cache_read_input_tokens': 5000},
+                      latency_ms=3000.0)
+    usage.set(document='900123456', category='CERL')
+    summary = usage.summary()
+
+    assert outside.cost_usd == 0.0001
+    assert summary['document'] == '900123456' and summary['phase'] == 'extraction'
+    assert [call['model_id'] for call in summary['calls']] == [NOVA, CLAUDE]
+    # Longest matching price key wins: claude-sonnet-4, not claude
+    assert summary['calls'][1]['cost_usd'] == round((1000 * 0.003 + 100 * 0.015 + 5000 * 0.0003) / 1000, 6)
+    assert summary['totals']['calls'] == 2
+    assert summary['totals']['input_tokens'] == 3000
+    assert summary['totals']['cache_read_tokens'] == 5000
+    assert summary['totals']['latency_ms'] == 4500.0
+    assert UsageLedger(pricing=PRICING).cost('us.meta.llama3-70b', {'input': 1000, 'output': 0}) == 0.0
+
+
+def test_bedrock_calls_are_recorded_by_call_bedrock_unified():
+    """The shared ledger sees every call made through call_bedrock_unified"""
+    saved_delay = os.environ.get('INTER_CALL_DELAY')
+    os.environ['INTER_CALL_DELAY'] = '0'
+    try:
+        with usage_ledger.attribute('classification', category='RUT') as usage:
+            call_bedrock_unified({'model_id': NOVA, 'messages': [], 'params': {}}, _ConverseClient())
+    finally:
+        if saved_delay is None:
+            del os.environ['INTER_CALL_DELAY']
+        else:
+            os.environ['INTER_CALL_DELAY'] = saved_delay
+
+    totals = usage.summary()['totals']
+    assert (totals['calls'], totals['input_tokens'], totals['output_tokens']) == (1, 1200, 40)
+    assert totals['cost_usd'] > 0
+
+
+def test_rollup_by_model_phase_and_category():
+    """Batch rollups split usage per model, phase and category, with cost per successful document"""
+    results = [
+        _document('extraction', 'CERL', True, [(NOVA, {'inputTokens': 1000, 'outputTokens': 250})]),
+        _document('extraction', 'CERL', False, [(NOVA, {'inputTokens': 1000, 'outputTokens': 250})]),
+        _document('fallback', 'CERL', True, [(CLAUDE, {'input_tokens': 2000, 'output_tokens': 500})]),
+        {'category': 'RUT', 'success': True, 'usage': None},
+    ]
+    results[2]['enhanced_fallback_success'] = results[2].pop('success')
+
+    report = rollup(results)
+
+    assert report['totals']['calls'] == 3
+    assert set(report['by_model']) == {NOVA, CLAUDE}
+    assert report['by_phase']['extraction']['calls'] == 2
+    assert report['by_phase']['fallback']['cost_usd'] == round((2000 * 0.003 + 500 * 0.015) / 1000, 6)
+    cerl = report['by_category']['CERL']
+    assert (cerl['documents'], cerl['successful_documents']) == (3, 2)
+    assert cerl['tokens_per_successful_document'] == 2500.0
+    assert cerl['cost_per_successful_document'] == round(cerl['cost_usd'] / 2, 6)
+    assert 'RUT' not in report['by_category']
+
+
+def test_usage_report_aggregates_stored_summaries():
+    """The offline report merges batches, filters by date and adds latency percentiles"""
+    summaries = [
+        {'batch_summary': {'timestamp': '2026-10-05T10:00:00+00:00'},
+         'detailed_results': [_document('extraction', 'RUB', True, [(NOVA, {'inputTokens': 800})])]},
+        {'batch_summary': {'timestamp': '2026-10-06T10:00:00+00:00'},
+         'detailed_results': [_document('extraction', 'RUB', True, [(NOVA, {'inputTokens': 800})] * 3)]},
+        {'batch_summary': {'timestamp': '2026-09-30T23:59:00+00:00'}, 'detailed_results': []},
+    ]
+
+    report = aggregate(s for s in summaries if in_period(s, since='2026-10-01', until='2026-10-06'))
+
+    assert (report['batches'], report['documents']) == (2, 2)
+    assert report['by_model'][NOVA]['calls'] == 4
+    assert report['by_model'][NOVA]['latency_p95_ms'] == 1000.0
+    assert report['by_category']['RUB']['tokens_per_successful_document'] == 1600.0
+
+
+def test_handlers_save_batch_summaries_with_usage():
+    """Every handler saves its batch under batch_summaries/ with the usage rollup, which the report reads"""
+    process_types = {'classification': 'classification', 'extraction-scoring': 'extraction',
+                     'fallback-processing': 'enhanced_fallback'}
+    with tempfile.TemporaryDirectory() as tmp:
+        for function, process_type in process_types.items():
+            harness = HandlerHarness(function, synthetic_documents(3, categories=('RUT',)),
+                                     SimulationConfig(time_scale=0.002, log_level='CRITICAL'))
+            with harness.active():
+                for batch in harness.batches(3):
+                    harness.invoke(batch)
+
+            keys = harness.aws.s3.keys(DESTINATION_BUCKET, f'par-servicios-poc/batch_summaries/{process_type}/')
+            assert len(keys) == 1, (function, keys)
+            summary = json.loads(harness.aws.s3.get(DESTINATION_BUCKET, keys[0]).body)
+            assert summary['batch_summary']['total_documents'] == 3
+            assert summary['usage']['totals']['calls'] >= 3, function
+            # Source key of each document, for replay batch grouping
+            assert all(result['usage']['calls'] and (result.get('path') or result.get('key'))
+                       for result in summary['detailed_results'])
+            Path(tmp, f'batch_summary_{process_type}.json').write_text(json.dumps(summary), encoding='utf-8')
+
+        report = aggregate(iter_local_summaries(Path(tmp)))
+
+    assert (report['batches'], report['documents']) == (3, 9)
+    assert set(report['by_phase']) == {'classification', 'extraction', 'fallback'}
+
+
+if __name__ == "__main__":
+    test_calls_are_charged_to_the_current_document()
+    test_bedrock_calls_are_recorded_by_call_bedrock_unified()
+    test_rollup_by_model_phase_and_category()
+    test_usage_report_aggregates_stored_summaries()
+    test_handlers_save_batch_summaries_with_usage()
+    print("✅ All usage ledger tests passed")